@@ -8,6 +8,7 @@ Main Python class for DataProfiler app logic. This class shouldn't interact dire
 
 # Python
 from typing import Literal, Callable
+import logging
 import os
 from io import TextIOWrapper
 from time import time
@@ -15,34 +16,49 @@ from datetime import datetime, timedelta
 import math
 from pathlib import Path
 from pprint import pprint
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed, CancelledError
 
+import numpy as np
 import pandas as pd
 import pyodbc
-import plotly.express as px
-from plotly.graph_objects import Figure
-import plotly.io as pio
 
 # Data Profiler
 from .helpers.models.ProjectInfo import BaseProjectInfo, ExistingProjectProjectInfo
 from .helpers.models.TransformOptions import TransformOptions
-from .helpers.models.Responses import BaseDBResponse, TransformResponse, DBDownloadResponse
+from .helpers.models.Responses import BaseDBResponse, TransformResponse, DBDownloadResponse, TransformPreviewResponse
 from .helpers.models.DataFiles import UploadFileType, UploadedFilePaths
-from .helpers.models.GeneralModels import DownloadDataOptions, UnitOfMeasure
+from .helpers.models.GeneralModels import DownloadDataOptions, UnitOfMeasure, DownloadFileFormat
+from .helpers.models.Progress import ProgressStage, ProgressEvent, ProgressSnapshot
 
 from .helpers.constants.data_file_constants import FILE_TYPES_COLUMNS_MAPPER
-from .helpers.constants.plotly_theme import apex_template
+from .helpers.constants.app_constants import DOWNLOAD_ALL_MAX_WORKERS, SQL_DIR, SQL_DIR_DEV, DESCRIBE_STREAMING_MIN_FILE_SIZE
 
 from .helpers.functions.functions import find_new_file_path
 from .helpers.functions.data_file_functions import validate_file_structure, read_and_cleanse_uploaded_data_file
+from .helpers.functions.describer_functions import add_fences, count_numeric_flags, summarize_numeric_column, histogram_bins, box_plot_stats, build_charts_json, \
+    write_charts_html, ColumnChartSpec, DESCRIBE_COUNT_COLS
 
 from .helpers.data_directory import DataDirectory
+from .helpers.cancellation import CancellationToken, OperationCancelled
+from .helpers.instrumentation import RunInstrumentation, span
+from .helpers.run_profiler import RunProfiler
+from .helpers.run_log import RunLogFile, configure_console_logging
+from .helpers.memory_governor import MemoryGovernor
+from .helpers.upload_preview import PreviewSampler, estimate_output_tables, velocity_distribution
+from .helpers.throughput_history import ThroughputHistory
+from .helpers.transform_spill import TransformSpill, transform_fingerprint
+from .helpers.progress_tracker import ProgressTracker, UPLOAD_STAGE_WEIGHTS, DOWNLOAD_STAGE_WEIGHTS, DELETE_STAGE_WEIGHTS
+from .helpers.excel_reader import read_excel_sheet, clear_excel_cache
+from .helpers.streaming_describer import describe_file_streaming, histogram_bins as streaming_histogram_bins, box_plot_stats as streaming_box_plot_stats
 
 from .services.output_tables_service import OutputTablesService
+from .database.database_manager import DatabaseConnectionPool
+from .database.sql_registry import load_sql_registry
 from .services.transform_service import TransformService
 
 
-pio.templates['apex_template'] = apex_template
-
+logger = logging.getLogger(__name__)
 
 
 class DataProfiler:
@@ -53,6 +69,8 @@ class DataProfiler:
         self.project_number = project_number
         self.dev = dev
 
+        configure_console_logging(dev=self.dev)
+
         self.outputs_dir = os.getcwd()
 
         if self.dev and os.path.isdir('logs'):
@@ -64,6 +82,9 @@ class DataProfiler:
 
         self.project_exists = False
         self.project_info = None
+
+        # Load + validate every SQL template up front, so a bad template fails here rather than mid-upload
+        load_sql_registry(SQL_DIR_DEV if self.dev else SQL_DIR)
         
         # If project exists, update relevant variables
         project_numbers = self.get_output_tables_projects()
@@ -123,7 +144,24 @@ class DataProfiler:
         with OutputTablesService(dev=self.dev) as service:
             self.project_info = service.get_project_info(self.get_project_number())
 
-    def download_data(self, download_option: DownloadDataOptions, target_directory: str) -> DBDownloadResponse:
+    def download_data(self, download_option: DownloadDataOptions, target_directory: str, file_format: DownloadFileFormat | None = None, 
+                      update_progress_text_func: Callable[[str | ProgressSnapshot], None] = None, cancel_token: CancellationToken | None = None) -> DBDownloadResponse:
+        '''
+        Download a project's data or a pre-made report to a subfolder of target_directory
+
+        Params
+        ------
+        download_option : DownloadDataOptions  
+            what to download. DownloadDataOptions.ALL downloads every report and the StorageAnalyzer inputs in one job, 
+            running them concurrently over a shared connection pool
+        file_format : DownloadFileFormat | None  
+            format of the downloaded files. If None, StorageAnalyzer inputs are written as CSV and reports as Excel
+        update_progress_text_func : Callable[[str | ProgressSnapshot], None]  
+            optional, gets ProgressSnapshots (rows downloaded, rows/sec, and for DownloadDataOptions.ALL percent complete + ETA)
+        cancel_token : CancellationToken | None  
+            optional, checked between fetched chunks. A cancelled download returns an unsuccessful response with cancelled=True
+        '''
+        
         if not self.get_project_exists():
             raise ValueError('Project does not yet exist')
         
@@ -142,43 +180,119 @@ class DataProfiler:
         download_directory = f'{target_directory}/{subfolder_name}'
         if not os.path.exists(download_directory):
             os.mkdir(download_directory)
+
+        tracker = ProgressTracker(on_update=update_progress_text_func, stage_weights=DOWNLOAD_STAGE_WEIGHTS)
+
+        if download_option == DownloadDataOptions.ALL:
+            return self._download_all(project_number=project_number, download_directory=download_directory, file_format=file_format, 
+                                      update_progress_text_func=tracker.update, cancel_token=cancel_token)
         
+        with OutputTablesService(dev=self.dev, cancel_token=cancel_token, update_progress_func=tracker.update) as service:
+            response = self._download_option(service=service, download_option=download_option, project_number=project_number, 
+                                             download_directory=download_directory, file_format=file_format)
+
+        return response
+
+    def _download_all(self, project_number: str, download_directory: str, file_format: DownloadFileFormat | None = None, 
+                      update_progress_text_func: Callable[[str | ProgressEvent], None] = None, cancel_token: CancellationToken | None = None) -> DBDownloadResponse:
+        '''
+        Download every report and the StorageAnalyzer inputs. Each option runs on its own worker thread (query + file export) 
+        with a connection checked out of one shared pool, so the connection string is decrypted once and connections are reused
+        '''
+
+        download_options = [option for option in DownloadDataOptions if option != DownloadDataOptions.ALL]
+        max_workers = min(DOWNLOAD_ALL_MAX_WORKERS, len(download_options))
+
+        response = DBDownloadResponse(project_number=project_number, download_path=download_directory, success=True)
+        errors = []
+
+        if update_progress_text_func: 
+            for option in download_options:
+                update_progress_text_func(ProgressEvent(stage=ProgressStage.DOWNLOAD, table=option.value, unit='reports', rows_total=1, 
+                                                        message=f'Downloading {len(download_options)} reports...'))
+        st = time()
+
+        with DatabaseConnectionPool(dev=self.dev, max_size=max_workers) as pool:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._download_option, OutputTablesService(dev=self.dev, connection_pool=pool, cancel_token=cancel_token, update_progress_func=update_progress_text_func), 
+                                    option, project_number, download_directory, file_format): option
+                    for option in download_options
+                }
+
+                # Progress is reported from this (the calling) thread as each report finishes
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    option = futures[future]
+
+                    # Don't start reports that are still queued
+                    if cancel_token and cancel_token.is_cancelled():
+                        for pending in futures:
+                            pending.cancel()
+
+                    try:
+                        option_response = future.result()
+                    except CancelledError:
+                        continue
+                    except Exception as e:
+                        print(e)
+                        option_response = DBDownloadResponse(project_number=project_number, message=f'Something unknown went wrong. {e}')
+
+                    response.rows_affected += option_response.rows_affected
+                    if not option_response.success:
+                        errors.append(f'{option.value}: {option_response.message}')
+
+                    print(f'Downloaded {completed} of {len(download_options)} - {option.value} ({"success" if option_response.success else "failed"})')
+                    if update_progress_text_func: 
+                        update_progress_text_func(ProgressEvent(stage=ProgressStage.DOWNLOAD, table=option.value, unit='reports', rows_done=1, rows_total=1, elapsed=time() - st, 
+                                                                message=f'Downloaded {completed} of {len(download_options)} reports...\n\n{option.value}'))
+
+        print(f'Downloaded all reports in {timedelta(seconds=time()-st)}')
+
+        if cancel_token and cancel_token.is_cancelled():
+            response.success = False
+            response.cancelled = True
+            response.message = 'Download cancelled.'
+        elif errors:
+            response.success = False
+            response.message = '\n'.join(errors)
+
+        return response
+
+    def _download_option(self, service: OutputTablesService, download_option: DownloadDataOptions, project_number: str, download_directory: str, 
+                         file_format: DownloadFileFormat | None = None) -> DBDownloadResponse:
+        ''' Run the service download for a single (non-ALL) download option '''
+
+        inputs_format = file_format if file_format else DownloadFileFormat.CSV
+        reports_format = file_format if file_format else DownloadFileFormat.EXCEL
+
         response = None
         if download_option == DownloadDataOptions.STORAGE_ANALYZER_INPUTS:
             # Create another subfolder for CSV files
             subfolder = find_new_file_path(f'{download_directory}/StorageAnalyzer Inputs')
             os.mkdir(subfolder)
 
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_storage_analyzer_inputs(project_number=project_number, download_folder=subfolder)
+            response = service.download_storage_analyzer_inputs(project_number=project_number, download_folder=subfolder, file_format=inputs_format)
                 
         elif download_option == DownloadDataOptions.INVENTORY_STRATIFICATION_REPORT:
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_inventory_stratification_report(project_number=project_number, download_folder=download_directory)
+            response = service.download_inventory_stratification_report(project_number=project_number, download_folder=download_directory, file_format=reports_format)
 
         elif download_option == DownloadDataOptions.SUBWAREHOUSE_MATERIAL_FLOW_REPORT_CARTONS:
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_subwarehouse_material_flow_report(uom=UnitOfMeasure.CARTON, project_number=project_number, download_folder=download_directory)
+            response = service.download_subwarehouse_material_flow_report(uom=UnitOfMeasure.CARTON, project_number=project_number, download_folder=download_directory, file_format=reports_format)
 
         elif download_option == DownloadDataOptions.SUBWAREHOUSE_MATERIAL_FLOW_REPORT_PALLETS:
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_subwarehouse_material_flow_report(uom=UnitOfMeasure.PALLET, project_number=project_number, download_folder=download_directory)
+            response = service.download_subwarehouse_material_flow_report(uom=UnitOfMeasure.PALLET, project_number=project_number, download_folder=download_directory, file_format=reports_format)
 
         elif download_option == DownloadDataOptions.ITEMS_MATERIAL_FLOW_REPORT_EACHES:
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_items_material_flow_report(uom=UnitOfMeasure.EACH, project_number=project_number, download_folder=download_directory)
+            response = service.download_items_material_flow_report(uom=UnitOfMeasure.EACH, project_number=project_number, download_folder=download_directory, file_format=reports_format)
 
         elif download_option == DownloadDataOptions.ITEMS_MATERIAL_FLOW_REPORT_CARTONS:
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_items_material_flow_report(uom=UnitOfMeasure.CARTON, project_number=project_number, download_folder=download_directory)
+            response = service.download_items_material_flow_report(uom=UnitOfMeasure.CARTON, project_number=project_number, download_folder=download_directory, file_format=reports_format)
 
         elif download_option == DownloadDataOptions.ITEMS_MATERIAL_FLOW_REPORT_PALLETS:
-            with OutputTablesService(dev=self.dev) as service:
-                response = service.download_items_material_flow_report(uom=UnitOfMeasure.PALLET, project_number=project_number, download_folder=download_directory)
+            response = service.download_items_material_flow_report(uom=UnitOfMeasure.PALLET, project_number=project_number, download_folder=download_directory, file_format=reports_format)
 
         else:
             response = DBDownloadResponse(project_number=project_number)
-        
 
         return response
 
@@ -265,7 +379,7 @@ class DataProfiler:
             # NOTE: read_and_cleanse_uploaded_data_file return dfs with all item master columns and NaNs filled for columns not given
             df = df[validation_obj.given_columns]
         
-        print(df.head())
+        logger.debug('%s', df.head())
 
         # Persist
         try:
@@ -299,7 +413,28 @@ class DataProfiler:
 
         return response
         
-    def transform_and_upload_data(self, data_directory: str, transform_options: TransformOptions, update_progress_text_func: Callable[[str], None] = None) -> TransformResponse:
+    def transform_and_upload_data(self, data_directory: str, transform_options: TransformOptions, update_progress_text_func: Callable[[str | ProgressSnapshot], None] = None, 
+                                  cancel_token: CancellationToken | None = None, profile_run: bool = False, dry_run: bool = False) -> TransformResponse:
+        '''
+        Validate, read and transform a data directory, then insert it into the project's output tables
+
+        A dry run stops before the inserts - it returns a TransformDryRunResponse with each table's rows, bytes, batches and predicted
+        insert time, and spills the output tables (see TransformSpill). A later upload of the same, unchanged files skips the read +
+        transform and inserts the spilled tables
+
+        Params
+        ------
+        update_progress_text_func : Callable[[str | ProgressSnapshot], None]
+            optional, gets ProgressSnapshots (percent complete, rows/sec, ETA) as files are read, tables transformed and batches inserted
+        cancel_token : CancellationToken | None
+            optional, checked between file reads, transform stages and insert batches. If the upload is cancelled, any rows 
+            already inserted are deleted and an unsuccessful response with cancelled=True is returned
+        profile_run : bool
+            if True, profile the whole run and save the profile next to the log file (see RunProfiler)
+        dry_run : bool
+            if True, transform but don't insert anything
+        '''
+
         if not self.get_project_exists():
             raise ValueError('Project does not yet exist.')
         
@@ -308,94 +443,285 @@ class DataProfiler:
         if project_info.data_uploaded:
             raise ValueError('Project already has data uploaded. If you would like to update project data, delete it and re-upload.')
 
+        # Everything below reports through the tracker, which adds overall percent complete + ETA
+        tracker = ProgressTracker(on_update=update_progress_text_func, stage_weights=UPLOAD_STAGE_WEIGHTS)
+        update_progress_text_func = tracker.update
+
         # Create log file
-        log_file_path = f'{self.get_outputs_dir()}/{project_info.project_number}-{datetime.now().strftime(format="%Y%m%d-%H.%M.%S")}_transform.txt'
-        log_file = open(log_file_path, 'w+')
+        log_file_path = f'{self.get_outputs_dir()}/{project_info.project_number}-{datetime.now().strftime(format="%Y%m%d-%H.%M.%S")}_{"dry_run" if dry_run else "transform"}.txt'
+        log_file = RunLogFile(log_file_path)
 
         log_file.write(f'PROJECT NUMBER: {project_info.project_number}\n\n')
-        log_file.flush()
-
-        # Create response object
-        transform_response = TransformResponse(project_number=project_info.project_number, log_file_path=log_file_path)
-
-        # Create DataDirectory object
-        DataDirectoryObj = DataDirectory(path=data_directory, transform_options=transform_options, update_progress_text_func=update_progress_text_func)
-
-        ## Validate data directory ##
-        if update_progress_text_func: update_progress_text_func('Validating file uploads...')
+        if dry_run:
+            log_file.write('DRY RUN - output tables are built and spilled, but nothing is inserted.\n\n')
+
+        # Profile only if asked - saved next to the log file
+        log_file_base = os.path.splitext(log_file_path)[0]
+        profiler = RunProfiler(log_file_base if profile_run else None)
+        if profiler.enabled:
+            log_file.write(f'PROFILING - profile will be saved to {profiler.output_path}\n\n')
+
+        # Time every stage. The JSON report is written next to the log file when the run ends, however it ends
+        run = RunInstrumentation(name='dry_run' if dry_run else 'transform', report_path=f'{log_file_base}_report.json', project_number=project_info.project_number, 
+                                 transform_options=transform_options.model_dump(mode='json'), profile_path=profiler.output_path)
+        # The log is closed however the run ends (close() is idempotent - the paths below also close it themselves)
+        with log_file, run, profiler:
+            # Create response object
+            transform_response = TransformResponse(project_number=project_info.project_number, log_file_path=log_file_path)
+
+            # Create DataDirectory object
+            DataDirectoryObj = DataDirectory(path=data_directory, transform_options=transform_options, update_progress_text_func=update_progress_text_func, 
+                                             cancel_token=cancel_token)
+
+            ## Validate data directory ##
+            if update_progress_text_func: update_progress_text_func('Validating file uploads...')
+
+            with span('validate_directory'):
+                dir_validation_obj = DataDirectoryObj.validate_directory()
+            if not dir_validation_obj.is_valid:
+                errors_str = '\n\n'.join(dir_validation_obj.errors_list)
+                message = f'Invalid data directory:\n\n{errors_str}'
+
+                transform_response.success = False
+                transform_response.message = message
+                return transform_response
+
+            # NOTE: not updated with dp-92-create-header-tables. Not worth updating database, these aren't used anywhere
+            uploaded_files = UploadedFilePaths(
+                item_master = dir_validation_obj.item_master.file_path,
+                inbound_header = dir_validation_obj.inbound_header.file_path if transform_options.process_inbound_data else '',
+                inbound_details = dir_validation_obj.inbound_details.file_path if transform_options.process_inbound_data else '',
+                inventory = dir_validation_obj.inventory.file_path if transform_options.process_inventory_data else '',
+                order_header = dir_validation_obj.order_header.file_path if transform_options.process_outbound_data else '',
+                order_details = dir_validation_obj.order_details.file_path if transform_options.process_outbound_data else ''
+            )
 
-        dir_validation_obj = DataDirectoryObj.validate_directory()
-        if not dir_validation_obj.is_valid:
-            errors_str = '\n\n'.join(dir_validation_obj.errors_list)
-            message = f'Invalid data directory:\n\n{errors_str}'
 
-            transform_response.success = False
-            transform_response.message = message
-            return transform_response
+            ## Output tables a dry run already built from these same files are reused ##
+            files_to_read = DataDirectoryObj.files_to_read()
+            spill = TransformSpill(transform_fingerprint(files_to_read, project_number=project_info.project_number, transform_options=transform_options, dev=self.dev))
+            reuse_spill = not dry_run and spill.exists()
 
-        # NOTE: not updated with dp-92-create-header-tables. Not worth updating database, these aren't used anywhere
-        uploaded_files = UploadedFilePaths(
-            item_master = dir_validation_obj.item_master.file_path,
-            inbound_header = dir_validation_obj.inbound_header.file_path if transform_options.process_inbound_data else '',
-            inbound_details = dir_validation_obj.inbound_details.file_path if transform_options.process_inbound_data else '',
-            inventory = dir_validation_obj.inventory.file_path if transform_options.process_inventory_data else '',
-            order_header = dir_validation_obj.order_header.file_path if transform_options.process_outbound_data else '',
-            order_details = dir_validation_obj.order_details.file_path if transform_options.process_outbound_data else ''
-        )
+            if reuse_spill:
+                execution_mode = spill.execution_mode
+                run.attrs['reused_spill'] = spill.path
+                log_file.info(f'REUSING the output tables spilled by a dry run ({spill.path}) - skipping read + transform.', spill_path=spill.path)
+            else:
+                ## Check the upload fits in memory, before reading anything ##
+                with span('estimate_memory'):
+                    memory_estimate = MemoryGovernor().estimate(files_to_read)
+                run.attrs['memory_estimate'] = memory_estimate.model_dump(mode='json')
+                log_file.info(memory_estimate.message, **memory_estimate.model_dump(mode='json', exclude={'files', 'message'}))
+                logger.debug('%s', memory_estimate.message)
+
+                if memory_estimate.mode is None:
+                    transform_response.success = False
+                    transform_response.message = memory_estimate.message
+                    return transform_response
+                execution_mode = memory_estimate.mode
+
+
+                ## Read files and validate contents
+                try:
+                    with span('read_and_validate_file_contents'):
+                        success, message = DataDirectoryObj.read_and_validate_file_contents(log_file=log_file)
+                except OperationCancelled:
+                    return self._cancelled_transform_response(transform_response, log_file)
+
+                if not success:
+                    transform_response.success = False
+                    transform_response.message = message
+                    return transform_response
+
+
+            ## Transform and persist data ##
+        
+            transform_st = time()
+            print('Transforming...')
+    
+            transform_response = None
+            try:
+                with TransformService(
+                        project_number=project_info.project_number, 
+                        DataDirectoryObj=DataDirectoryObj,
+                        transform_options=transform_options, 
+                        update_progress_text_func=update_progress_text_func, 
+                        cancel_token=cancel_token,
+                        execution_mode=execution_mode,
+                        dev=self.dev) as service, span('transform_and_persist_dataframes'):
+                    if reuse_spill:
+                        with span('load_spilled_output_tables'):
+                            output_tables = spill.load()
+                        transform_response = service.insert_output_tables(output_tables=output_tables, log_file=log_file)
+                    else:
+                        transform_response = service.transform_and_persist_dataframes(log_file=log_file, dry_run=dry_run, spill=spill if dry_run else None)
+            except OperationCancelled:
+                # Cancelled while building the output tables - nothing has been inserted yet
+                return self._cancelled_transform_response(TransformResponse(project_number=project_info.project_number, log_file_path=log_file_path), log_file)
+
+            transform_response.log_file_path = log_file_path
+
+            transform_et = time()
+            print(f'Total transform time: {timedelta(seconds=transform_et-transform_st)}')
+
+            if dry_run:
+                # Nothing was inserted, so there's nothing to delete or record on the project
+                transform_response.message = f'Dry run complete. Predicted insert time: {timedelta(seconds=round(transform_response.estimated_insert_seconds))}.'
+            # If unsuccessful, delete any rows that were inserted
+            elif not transform_response.success:
+                if transform_response.cancelled:
+                    if update_progress_text_func: update_progress_text_func('Upload cancelled. Deleting any uploaded data...')
+                    transform_response.message = 'Upload cancelled. Any rows that were already inserted have been deleted.'
+                else:
+                    if update_progress_text_func: update_progress_text_func('Something happened. Deleting data...\n\n(You may need to re-connect to VPN)')
+
+                log_file.write('ERROR - Unsuccessful transform/insertion. Deleting any inserted data from DB.\n')
+                with span('delete_project_data'):
+                    self.delete_project_data(log_file=log_file)
+            else:
+                # Update row in Project
+                new_project_info = project_info.model_copy()
+                new_project_info.transform_options = transform_options
+                new_project_info.data_uploaded = transform_response.success
+                new_project_info.upload_date = datetime.strftime(datetime.today(), format='%Y-%m-%d')
+                new_project_info.uploaded_file_paths = uploaded_files
 
+                self.update_project_info(new_project_info=new_project_info)
 
-        ## Read files and validate contents
-        success, message = DataDirectoryObj.read_and_validate_file_contents(log_file=log_file)
-        if not success:
-            transform_response.success = False
-            transform_response.message = message
-            return transform_response
+                # The spilled tables are in the database now
+                spill.delete()
 
+            log_file.write('\n4. TIMINGS\n' + '\n'.join(run.summary_lines()) + '\n')
+            log_file.write('\nDatabase calls (slowest first):\n' + '\n'.join(run.db_stats.summary_lines()) + '\n')
+            log_file.close()
 
-        ## Transform and persist data ##
-        
-        transform_st = time()
-        print('Transforming...')
+        logger.debug('%s', self.get_project_info())
+        return transform_response
     
-        transform_response = None
-        with TransformService(
-                project_number=project_info.project_number, 
-                DataDirectoryObj=DataDirectoryObj,
-                transform_options=transform_options, 
-                update_progress_text_func=update_progress_text_func, 
-                dev=self.dev) as service:
-            transform_response = service.transform_and_persist_dataframes(log_file=log_file)
-
-        transform_response.log_file_path = log_file_path
-
-        transform_et = time()
-        print(f'Total transform time: {timedelta(seconds=transform_et-transform_st)}')
-
-        # If unsuccessful, delete any rows that were inserted
-        if not transform_response.success:
-            if update_progress_text_func: update_progress_text_func('Something happened. Deleting data...\n\n(You may need to re-connect to VPN)')
-
-            log_file.write('ERROR - Unsuccessful transform/insertion. Deleting any inserted data from DB.\n')
-            self.delete_project_data(log_file=log_file)
-        else:
-            # Update row in Project
-            new_project_info = project_info.model_copy()
-            new_project_info.transform_options = transform_options
-            new_project_info.data_uploaded = transform_response.success
-            new_project_info.upload_date = datetime.strftime(datetime.today(), format='%Y-%m-%d')
-            new_project_info.uploaded_file_paths = uploaded_files
 
-            self.update_project_info(new_project_info=new_project_info)
+    def _cancelled_transform_response(self, transform_response: TransformResponse, log_file: TextIOWrapper) -> TransformResponse:
+        ''' Wrap up an upload that was cancelled before anything was inserted '''
 
+        log_file.write('\nCANCELLED - upload cancelled before any data was inserted.\n')
         log_file.close()
 
-        print(self.get_project_info())
+        transform_response.success = False
+        transform_response.cancelled = True
+        transform_response.message = 'Upload cancelled. No data was uploaded.'
+
         return transform_response
+
+    def preview_transform(self, data_directory: str, transform_options: TransformOptions, update_progress_text_func: Callable[[str], None] = None, 
+                          cancel_token: CancellationToken | None = None) -> TransformPreviewResponse:
+        '''
+        Preview an upload. Validates the data directory, then reads, validates and transforms a sample of it (see PreviewSampler) and
+        estimates each output table's rows, the velocity distribution, and how long the full upload would take. Nothing is inserted.
+
+        The sample's contents are validated like a real upload's, so most data problems show up here - but only in the sampled rows
+
+        Params
+        ------
+        update_progress_text_func : Callable[[str], None]
+            optional, gets a message as each step starts
+        cancel_token : CancellationToken | None
+            optional, checked between file reads and transform stages
+
+        Return
+        ------
+        TransformPreviewResponse
+        '''
+
+        preview_st = time()
+
+        log_file_path = f'{self.get_outputs_dir()}/{self.project_number}-{datetime.now().strftime(format="%Y%m%d-%H.%M.%S")}_preview.txt'
+        log_file = RunLogFile(log_file_path)
+        response = TransformPreviewResponse(project_number=self.project_number, log_file_path=log_file_path)
+
+        with log_file, tempfile.TemporaryDirectory(prefix='data-profiler-preview-') as sample_dir:
+            log_file.write(f'PROJECT NUMBER: {self.project_number}\n\nPREVIEW - transforming a sample of {data_directory}. Nothing is inserted.\n\n')
+
+            ## Validate data directory ##
+            if update_progress_text_func: update_progress_text_func('Validating file uploads...')
+
+            DataDirectoryObj = DataDirectory(path=data_directory, transform_options=transform_options)
+            dir_validation_obj = DataDirectoryObj.validate_directory()
+            if not dir_validation_obj.is_valid:
+                errors_str = '\n\n'.join(dir_validation_obj.errors_list)
+                response.message = f'Invalid data directory:\n\n{errors_str}'
+                return response
+
+            ## Sample it ##
+            if update_progress_text_func: update_progress_text_func('Sampling data...')
+
+            sampler = PreviewSampler(DataDirectoryObj)
+            sampler.write(sample_dir)
+
+            response.files = list(sampler.files.values())
+            response.sample_fraction = round(sampler.sample_fraction, 4)
+            response.warnings = sampler.warnings
+            for file_sample in response.files:
+                log_file.write(f'{file_sample.file_type}: sampled {file_sample.sampled_rows:,} of ~{file_sample.estimated_rows:,} rows\n')
+            log_file.write('\n')
+
+            ## Read + transform the sample, same as an upload ##
+            SampleDirectoryObj = DataDirectory(path=sample_dir, transform_options=transform_options, cancel_token=cancel_token)
+            SampleDirectoryObj.validate_directory()
+
+            try:
+                if update_progress_text_func: update_progress_text_func('Reading sample...')
+                sample_st = time()
+                success, message = SampleDirectoryObj.read_and_validate_file_contents(log_file=log_file)
+                if not success:
+                    response.message = message
+                    return response
+
+                if update_progress_text_func: update_progress_text_func('Transforming sample...')
+                with TransformService(project_number=self.project_number, DataDirectoryObj=SampleDirectoryObj, transform_options=transform_options, 
+                                      cancel_token=cancel_token, dev=self.dev) as service:
+                    output_tables = service.create_output_tables(log_file=log_file)
+                sample_seconds = time() - sample_st
+            except OperationCancelled:
+                log_file.write('\nCANCELLED - preview cancelled.\n')
+                response.cancelled = True
+                response.message = 'Preview cancelled.'
+                return response
+
+            ## Scale up to the full upload ##
+            response.tables = estimate_output_tables(output_tables, sampler)
+            response.velocity_distribution = velocity_distribution(output_tables['VelocityLadder'], project_number=self.project_number)
+            response.estimated_total_rows = sum(table.estimated_rows for table in response.tables)
+            response.estimated_transform_seconds = round(sample_seconds / response.sample_fraction if response.sample_fraction else sample_seconds, 1)
+            throughput_history = ThroughputHistory()
+            response.estimated_upload_seconds = round(sum(throughput_history.predict_seconds(table.table, table.estimated_rows) for table in response.tables), 1)
+            response.preview_seconds = round(time() - preview_st, 1)
+            response.success = True
+
+            log_file.write('\nESTIMATED OUTPUT TABLES\n')
+            for table in response.tables:
+                log_file.write(f'{table.table}: ~{table.estimated_rows:,} rows ({table.sampled_rows:,} in sample)\n')
+            log_file.write(f'\nEstimated read + transform time: {timedelta(seconds=response.estimated_transform_seconds)}\n')
+            log_file.write(f'Estimated upload time: {timedelta(seconds=response.estimated_upload_seconds)}\n')
+            for warning in response.warnings:
+                log_file.write(f'WARNING - {warning}\n')
+
+        return response
     
 
     ## Delete ##
 
-    def delete_project_data(self, log_file: TextIOWrapper | None = None, update_progress_text_func: Callable[[str], None] = None) -> BaseDBResponse:
+    def delete_project_data(self, log_file: TextIOWrapper | None = None, update_progress_text_func: Callable[[str | ProgressSnapshot], None] = None, 
+                            cancel_token: CancellationToken | None = None) -> BaseDBResponse:
+        '''
+        Delete all of the project's data from the output tables
+
+        Params
+        ------
+        update_progress_text_func : Callable[[str | ProgressSnapshot], None]
+            optional, gets ProgressSnapshots (tables cleared, percent complete, ETA)
+        cancel_token : CancellationToken | None
+            optional, checked between tables. Not passed when cleaning up after a failed/cancelled upload, so cleanup always finishes
+        '''
+
         if not self.get_project_exists():
             raise ValueError('Project does not yet exist')
         
@@ -407,13 +733,15 @@ class DataProfiler:
         if not log_file_given:
             log_file_path = f'{self.get_outputs_dir()}/{project_info.project_number}-{datetime.now().strftime(format="%Y%m%d-%H.%M.%S")}_delete_from_output_tables.txt'
 
-            log_file = open(log_file_path, 'w+')
+            log_file = RunLogFile(log_file_path)
             log_file.write(f'PROJECT NUMBER: {project_info.project_number}\n\n')
-            log_file.flush()
+
+        tracker = ProgressTracker(on_update=update_progress_text_func, stage_weights=DELETE_STAGE_WEIGHTS)
+        update_progress_text_func = tracker.update
 
         # Try delete
         response: BaseDBResponse = None
-        with OutputTablesService(dev=self.dev) as service:
+        with OutputTablesService(dev=self.dev, cancel_token=cancel_token) as service:
             response = service.delete_project_data(project_number=project_info.project_number, log_file=log_file, update_progress_text_func=update_progress_text_func)
             response.log_file_path = log_file_path
 
@@ -459,7 +787,8 @@ class DataProfiler:
 
     ''' Main Functions - Other Analysis '''
 
-    def describe_data_frame(self, file_path: str, columns: str, file_type: Literal['csv', 'xslx'] = 'csv', sheet_name: str = None, group_col: str = None) -> str:
+    def describe_data_frame(self, file_path: str, columns: str, file_type: Literal['csv', 'xslx'] = 'csv', sheet_name: str = None, group_col: str = None, 
+                            streaming: bool | None = None, profile_run: bool = False) -> str:
         '''
         A function that describes a data frame. Its goal is to summarize the range of values found in every column and to alert the user to any flaws or errors in the data.
 
@@ -469,6 +798,11 @@ class DataProfiler:
             a pandas dataframe
         group_col : str
             a *categorical* column in df by which the data is usefully grouped / aggregated
+        streaming : bool | None
+            if True, read the file in chunks and describe it with bounded memory (approximate quartiles/outliers/unique). 
+            If None, streaming is used for files bigger than DESCRIBE_STREAMING_MIN_FILE_SIZE
+        profile_run : bool
+            if True, profile the description and save the profile in the exports folder (see RunProfiler)
 
         Returns
         -------
@@ -476,6 +810,7 @@ class DataProfiler:
 
         1. an XLSX book with the original df and a sheet that describes its columns  
         2. an HTML file with distribution charts of the numeric df columns
+        3. if profile_run, the profile of the run
         '''
     
         ## Create subfolder
@@ -486,119 +821,82 @@ class DataProfiler:
         if not os.path.exists(OUTPUT_DIR):
             os.mkdir(OUTPUT_DIR)
 
+        with RunProfiler(f'{OUTPUT_DIR}/description' if profile_run else None):
+            self._describe_data_frame(file_path=file_path, columns=columns, file_type=file_type, sheet_name=sheet_name, group_col=group_col, streaming=streaming, 
+                                      output_dir=OUTPUT_DIR, project_info=project_info)
+
+        return OUTPUT_DIR
+
+    def _describe_data_frame(self, file_path: str, columns: str, file_type: Literal['csv', 'xslx'], sheet_name: str | None, group_col: str | None, 
+                             streaming: bool | None, output_dir: str, project_info: ExistingProjectProjectInfo):
+        ''' describe_data_frame, minus the output folder setup. Writes the exports to output_dir '''
+
+        OUTPUT_DIR = output_dir
+
         ## Start
-        df: pd.DataFrame = None
-        
-        if file_type == 'csv':
-            df = pd.read_csv(file_path, usecols=columns)
-        else:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=columns)
+        if streaming is None:
+            streaming = os.path.getsize(file_path) > DESCRIBE_STREAMING_MIN_FILE_SIZE
 
-        df = df.replace('', pd.NA)
+        summary_strs: list[str] = []
+        chart_specs: list[ColumnChartSpec] = []
 
-        df_length = df.shape[0]
-        print(f'Data frame # rows: {df_length}')
+        if streaming:
+            # Too big to load - read in chunks and describe from sketches
+            print(f'Describing {file_path} in streaming mode')
+            description = describe_file_streaming(file_path=file_path, columns=columns, file_type=file_type, sheet_name=sheet_name, group_col=group_col)
 
-        ## Create Describe table
-        df_val = df.describe(include='all').transpose()
+            df = description.original
+            df_val = description.df_val
+            print(f'Data frame # rows: {description.rows}')
 
-        df_val['IQR'] = df_val['75%'] - df_val['25%']
-        df_val['Lower Fence'] = df_val['25%'] - (1.5 * df_val['IQR'])
-        df_val['Upper Fence'] = df_val['75%'] + (1.5 * df_val['IQR'])
-        df_val['Extreme Upper Fence'] = df_val['75%'] + (3 * df_val['IQR'])
+            for col in description.numeric_cols:
+                summary_strs.append(summarize_numeric_column(col, df_val.loc[col]))
 
-        df_val['Missing Values'] = df_length - df_val['count']
+                base_title = f'Distribution: {col}'
+                box_plot_title = f'{base_title}<br><sup>By {group_col}</sup>' if group_col else base_title
+                box_stats = description.group_stats.get(col) or {col: description.numeric_stats[col]}
 
-        ## Explore numeric columns
-        df_val['Negative Values'] = 0
-        df_val['Zero Values'] = 0
-        df_val['Lower Outliers'] = 0
-        df_val['Upper Outliers'] = 0
-        df_val['Extreme Upper Outliers'] = 0
+                edges, counts = streaming_histogram_bins(description.numeric_stats[col].histogram)
+                chart_specs.append(ColumnChartSpec(col, edges, counts, streaming_box_plot_stats(box_stats), None, base_title, box_plot_title))
 
-        summary_strs: list[str] = []
-        histograms: list[Figure] = []
-        box_plots: list[Figure] = []
+        else:
+            df: pd.DataFrame = None
+            
+            if file_type == 'csv':
+                df = pd.read_csv(file_path, usecols=columns)
+            else:
+                # Usually already parsed when the GUI listed the sheets / read the header
+                df = read_excel_sheet(file_path, sheet_name=sheet_name, usecols=columns)
+                clear_excel_cache()
 
-        numeric_cols = df.select_dtypes(include='number').columns
-        for col in numeric_cols:
-            print('-'*50)
-            print(f'|{col.center(48)}|')
-            print('-'*50)
+            df = df.replace('', pd.NA)
 
-            ## Min / Avg / Max
-            mini = df_val.loc[col, 'min']
-            avg = df_val.loc[col, 'mean']
-            maxi = df_val.loc[col, 'max']
+            df_length = df.shape[0]
+            print(f'Data frame # rows: {df_length}')
 
-            print(f'Min: {mini:,}')
-            print(f'Avg: {avg:,.3f}')
-            print(f'Max: {maxi:,}')
+            ## Create Describe table
+            df_val = df.describe(include='all').transpose()
 
-            ## Missing / Negatives / Zeros
-            missing_values = df_val.loc[col, 'Missing Values']
+            df_val = add_fences(df_val)
 
-            negative_values = len(df.loc[df[col] < 0, :])
-            df_val.loc[col, 'Negative Values'] = negative_values
+            df_val['Missing Values'] = df_length - df_val['count']
 
-            zero_values = len(df.loc[df[col] == 0, :])
-            df_val.loc[col, 'Zero Values'] = zero_values
+            ## Explore numeric columns - negatives/zeros/outliers counted for all columns at once
+            numeric_cols = df.select_dtypes(include='number').columns
+            numeric_counts = count_numeric_flags(df, df_val, numeric_cols)
+            df_val[DESCRIBE_COUNT_COLS] = numeric_counts.reindex(df_val.index, fill_value=0)
 
-            print(f'\nMissing: {missing_values:,.0f}')
-            print(f'Negatives: {negative_values:,.0f}')
-            print(f'Zeros: {zero_values:,.0f}')
+            for col in numeric_cols:
+                summary_strs.append(summarize_numeric_column(col, df_val.loc[col]))
 
-            ## Outliers
-            lower_fence = df_val.loc[col, 'Lower Fence']
-            upper_fence = df_val.loc[col, 'Upper Fence']
-            extreme_upper_fence = df_val.loc[col, 'Extreme Upper Fence']
+                ## Charts - only bin counts / box stats go into the figures, never the raw rows
+                base_title = f'Distribution: {col}'
+                box_plot_title = f'{base_title}<br><sup>By {group_col}</sup>' if group_col else base_title
 
-            lower_outliers = len(df.loc[df[col] < lower_fence, :])
-            upper_outliers = len(df.loc[df[col] > upper_fence, :])
-            extreme_upper_outliers = len(df.loc[df[col] > extreme_upper_fence, :])
-            
-            df_val.loc[col, 'Lower Outliers'] = lower_outliers
-            df_val.loc[col, 'Upper Outliers'] = upper_outliers
-            df_val.loc[col, 'Extreme Upper Outliers'] = extreme_upper_outliers
-            
-            print(f'\nLower Fence: {lower_fence:,.3f}')
-            print(f'   Outliers: {lower_outliers:,.0f}')
-            print(f'Upper Fence: {upper_fence:,.3f}')
-            print(f'   Outliers: {upper_outliers:,.0f}')
-            print(f'Extreme Upper Fence: {extreme_upper_fence:,.3f}')
-            print(f'   Outliers: {extreme_upper_outliers:,.0f}')
-
-            ## Summary
-            header = f"<h2>{col}</h2>"
-            avgs = f"Min: {mini:,}<br>Avg: {avg:,.3f}<br>Max: {maxi:,}<br>"
-            bad_vals = f"<br>Missing: {missing_values:,.0f}<br>Negatives: {negative_values:,.0f}<br>Zeros: {zero_values:,.0f}<br>"
-            outliers = f"<br>Lower Fence: {lower_fence:,.3f}<br>   Outliers: {lower_outliers:,.0f}<br>Upper Fence: {upper_fence:,.3f}<br>   Outliers: {upper_outliers:,.0f}<br>Extreme Upper Fence: {extreme_upper_fence:,.3f}<br>   Outliers: {extreme_upper_outliers:,.0f}<br>"
-
-            summary_str = header + avgs + bad_vals + outliers
-
-            ## Charts
-
-            base_title = f'Distribution: {col}'
-            histogram = px.histogram(
-                data_frame=df,
-                x=col,
-                title=base_title,
-                template='apex_template'
-            )
-            histogram.update_layout(yaxis_title='# SKUs')
-
-            box_plot_title = f'{base_title}<br><sup>By {group_col}</sup>' if group_col else base_title
-            box_plot = px.box(
-                data_frame=df,
-                x=group_col,
-                y=col,
-                title=box_plot_title,
-                template='apex_template'
-            )
+                edges, counts = histogram_bins(df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+                box_stats, outliers = box_plot_stats(df, col, group_col=group_col)
 
-            summary_strs.append(summary_str)
-            histograms.append(histogram)
-            box_plots.append(box_plot)
+                chart_specs.append(ColumnChartSpec(col, edges, counts, box_stats, outliers, base_title, box_plot_title))
 
 
         ## Export
@@ -610,40 +908,15 @@ class DataProfiler:
         df_val = df_val.reindex(columns=df_val_col_order)
         
         with pd.ExcelWriter(f'{OUTPUT_DIR}/description.xlsx') as writer:
-            df_size = df.shape[0] * df.shape[1]
+            df_size = df.shape[0] * df.shape[1] if df is not None else math.inf
             if df_size < 100000:
                 df.to_excel(writer, index=False, sheet_name='Original')
             df_val.to_excel(writer, index=True, sheet_name='Description Sheet')
 
-        with open(f'{OUTPUT_DIR}/distribution charts.html', 'w+') as f:
-            f.write(f'''<!DOCTYPE html>
-                        <html>
-                        <head>
-                        <meta charset="utf-8" />   <!--It is necessary to use the UTF-8 encoding with plotly graphics to get e.g. negative signs to render correctly -->
-                        <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-                        </head>
-
-                        <body>
-                        <h1>{self.project_number} - {project_info.company_name} - {project_info.company_location}</h1>
-                        <p>{file_path}</p>
-                        <br><br>
-                    ''')
-            
-            for i in range(len(summary_strs)):
-                summary_str = summary_strs[i]
-                histogram = histograms[i]
-                box_plot = box_plots[i]
-
-                hist_html = histogram.to_html(full_html=False, include_plotlyjs='cdn')
-                box_html = box_plot.to_html(full_html=False, include_plotlyjs='cdn')
-                
-                f.write(summary_str)
-                f.write(hist_html)
-                f.write(box_html)
-
-            f.write('</body></html>')
-
-        return OUTPUT_DIR
+        # Figures are built + serialized in parallel, then written into one self-contained page
+        charts_json = build_charts_json(chart_specs)
+        header_html = f'<h1>{self.project_number} - {project_info.company_name} - {project_info.company_location}</h1>\n<p>{file_path}</p>'
+        write_charts_html(f'{OUTPUT_DIR}/distribution charts.html', header_html=header_html, summaries=summary_strs, charts_json=charts_json)
 
 
     ''' Getters/Setters '''
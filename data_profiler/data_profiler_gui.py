@@ -8,19 +8,25 @@ GUI for data profiler app. Creates an instance of DataProfiler as backend logic
 
 # Python
 from pprint import pprint
+from typing import Any, Callable
 import customtkinter
-from customtkinter import CTkLabel, StringVar, CTkFrame, CTkImage
+from customtkinter import CTkLabel, StringVar, CTkFrame, CTkImage, CTkProgressBar
 from PIL import Image
 import pandas as pd
 
 # DataProfiler
 from .helpers.models.ProjectInfo import BaseProjectInfo, ExistingProjectProjectInfo
 from .helpers.models.TransformOptions import DateForAnalysis, WeekendDateRules, TransformOptions
-from .helpers.models.Responses import TransformRowsInserted
-from .helpers.models.GeneralModels import DownloadDataOptions
+from .helpers.models.Responses import TransformRowsInserted, TransformResponse, BaseDBResponse, DBDownloadResponse
+from .helpers.models.GeneralModels import DownloadDataOptions, DownloadFileFormat
 from .helpers.models.DataFiles import DataDirectoryType
 from .helpers.constants.app_constants import RESOURCES_DIR, RESOURCES_DIR_DEV
-from .frames.custom_widgets import ProjectInfoFrame, DataDescriberColumnSelector
+from .helpers.excel_reader import get_sheet_names, read_excel_header
+from .helpers.task_runner import BackgroundTaskRunner
+from .helpers.cancellation import CancellationToken
+from .helpers.progress_tracker import format_progress
+from .helpers.models.Progress import ProgressSnapshot
+from .frames.custom_widgets import ProjectInfoFrame, ProjectDataInfoFrame, DataDescriberColumnSelector
 
 from .services.output_tables_service import OutputTablesService
 from .data_profiler import DataProfiler
@@ -29,7 +35,7 @@ from .data_profiler import DataProfiler
 from apex_gui.apex_app import ApexApp
 from apex_gui.frames.notification_dialogs import NotificationDialog, ResultsDialog, ResultsDialogWithLogFile, ConfirmDeleteDialog
 from apex_gui.frames.styled_widgets import Page, Section, SectionWithScrollbar, Frame, NeutralButton, TransparentIconButton, PositiveIconButton, NeutralIconButton, DangerIconButton
-from apex_gui.frames.custom_widgets import Toggle, StaticValueWithLabel, DropdownWithLabel, CheckbuttonWithLabel, FileBrowser
+from apex_gui.frames.custom_widgets import Toggle, DropdownWithLabel, CheckbuttonWithLabel, FileBrowser
 from apex_gui.styles.fonts import AppSubtitleFont, SectionHeaderFont, SectionSubheaderFont
 from apex_gui.styles.colors import *
 
@@ -65,22 +71,28 @@ class DataProfilerGUI(ApexApp):
         self.DataProfiler: DataProfiler = None
         self.project_info: ExistingProjectProjectInfo = None
 
+        # Long actions (upload, downloads, deletes, describer) run on a worker thread so the loading frame stays responsive
+        self.task_runner = BackgroundTaskRunner(self)
+        self.cancel_token: CancellationToken | None = None
+
         ''' Icons '''
-        self.back_icon = CTkImage(light_image=Image.open(f'{self.resources_dir}/back-icon-win-10.png'), size=(26, 26))
-        self.trash_icon = CTkImage(light_image=Image.open(f'{self.resources_dir}/trash-icon-win-10.png'), size=(26, 26))
-        self.save_icon = CTkImage(light_image=Image.open(f'{self.resources_dir}/save-icon-win-10.png'), size=(26, 26))
-        self.check_icon = CTkImage(light_image=Image.open(f'{self.resources_dir}/check-icon-win-10.png'), size=(26, 26))
-        self.upload_icon = CTkImage(light_image=Image.open(f'{self.resources_dir}/upload-icon-win-10.png'), size=(26, 26))
-        self.add_new_icon = CTkImage(light_image=Image.open(f'{self.resources_dir}/add-new-icon-win-10.png'), size=(26, 26))
+
+        # Decoded on first use - see _get_icon()
+        self._icons: dict[str, CTkImage] = {}
 
         ''' Create self '''
 
         # https://stackoverflow.com/questions/34276663/tkinter-gui-layout-using-frames-and-grid
-        self._create_start_frame()
-        self._create_new_project_frame()
-        self._create_loading_frame()
-        self._create_upload_data_frame()
-        self._create_more_actions_frame()
+        # Frames are built the first time they're navigated to, then cached - see _get_frame()
+        self._frames: dict[str, Page] = {}
+        self._frame_builders = {
+            'start': self._create_start_frame,
+            'new_project': self._create_new_project_frame,
+            'loading': self._create_loading_frame,
+            'home': self._create_home_frame,
+            'upload': self._create_upload_data_frame,
+            'more_actions': self._create_more_actions_frame,
+        }
 
         ''' Startup '''
 
@@ -90,7 +102,7 @@ class DataProfilerGUI(ApexApp):
 
     ''' Create frames '''
 
-    def _create_start_frame(self):
+    def _create_start_frame(self) -> Page:
         self.start_frame = Page(self)
 
         # TOPLEVEL - start_frame
@@ -116,7 +128,9 @@ class DataProfilerGUI(ApexApp):
         # Grid
         self._grid_start_frame()
 
-    def _create_new_project_frame(self):
+        return self.start_frame
+
+    def _create_new_project_frame(self) -> Page:
         self.new_project_frame = Page(self)
 
         # TOPLEVEL - new_project_frame
@@ -135,7 +149,9 @@ class DataProfilerGUI(ApexApp):
         # Grid
         self._grid_new_project_frame()
 
-    def _create_home_frame(self):
+        return self.new_project_frame
+
+    def _create_home_frame(self) -> Page:
         self.home_frame = Page(self)
 
         # TOPLEVEL - Parent = home_frame
@@ -160,32 +176,21 @@ class DataProfilerGUI(ApexApp):
         self.home_frame_project_info_section = ProjectInfoFrame(self.home_frame_project_info_frame)
         self.home_frame_save_changes_button = NeutralIconButton(self.home_frame_project_info_frame, image=self.save_icon, command=self._save_project_info_changes_action)
 
-        # LEVEL 3 - home_frame_data_info_section
-        # Within ProjectInfoFrame
-        self.home_frame_project_info_section.set_project_info(self._get_project_info())
-
         # LEVEL 2 - Parent = home_frame_data_info_frame
         self.home_frame_data_info_title = CTkLabel(self.home_frame_data_info_frame, text='Project Data Info', font=SectionHeaderFont())
-        self.home_frame_data_info_section = SectionWithScrollbar(self.home_frame_data_info_frame, width=350, height=250)
+        self.home_frame_data_info_section = ProjectDataInfoFrame(self.home_frame_data_info_frame, width=350, height=250)
         self.delete_project_data_button = DangerIconButton(self.home_frame_data_info_frame, image=self.trash_icon, command=self._delete_project_data_action)
         self.home_frame_upload_data_button = PositiveIconButton(self.home_frame_data_info_frame, image=self.upload_icon, command=self.navigate_to_upload_data_frame_action)
 
-        # LEVEL 3 - Parent = home_frame_data_info_section
-        date_for_analysis = self.project_info.transform_options.date_for_analysis.value if self.project_info.transform_options.date_for_analysis else ''
-        weekend_date_rule = self.project_info.transform_options.weekend_date_rule.value if self.project_info.transform_options.weekend_date_rule else ''
-
-        self.home_frame_data_uploaded = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Data Uploaded', value=str(self.project_info.data_uploaded))#, alignment='vertical')
-        self.home_frame_upload_date = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Upload Date', value=str(self.project_info.upload_date))#, alignment='vertical')
-        self.home_frame_date_for_analysis = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Date for Analysis', value=date_for_analysis)#, alignment='vertical')
-        self.home_frame_weekend_date_rule = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Weekend Date Rule', value=weekend_date_rule)#, alignment='vertical')
-        self.home_frame_inbound_processed = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Inbound Processed', value=self.project_info.transform_options.process_inbound_data)#, alignment='vertical')
-        self.home_frame_inventory_processed = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Inventory Processed', value=self.project_info.transform_options.process_inventory_data)#, alignment='vertical')
-        self.home_frame_outbound_processed = StaticValueWithLabel(self.home_frame_data_info_section, label_text='Outbound Processed', value=self.project_info.transform_options.process_outbound_data)#, alignment='vertical')
+        # LEVEL 3 - home_frame_project_info_section / home_frame_data_info_section
+        # Within ProjectInfoFrame / ProjectDataInfoFrame. Values are filled in by _refresh_home_frame()
 
         # Grid
         self._grid_home_frame()
 
-    def _create_upload_data_frame(self):
+        return self.home_frame
+
+    def _create_upload_data_frame(self) -> Page:
         self.upload_frame = Page(self)
 
         # TOP LEVEL - upload_frame
@@ -218,7 +223,9 @@ class DataProfilerGUI(ApexApp):
         # Grid
         self._grid_upload_frame()
 
-    def _create_more_actions_frame(self):
+        return self.upload_frame
+
+    def _create_more_actions_frame(self) -> Page:
         self.more_actions_frame = Page(self)
 
         # TOPLEVEL - Parent = more_actions_frame
@@ -251,6 +258,10 @@ class DataProfilerGUI(ApexApp):
                                                                 label_text='Select a download option',
                                                                 dropdown_values=[option.value for option in DownloadDataOptions],
                                                                 default_val='')
+        self.more_actions_frame_download_data_format_dropdown = DropdownWithLabel(self.more_actions_frame_download_data_section, 
+                                                                label_text='File format (optional)',
+                                                                dropdown_values=[file_format.value for file_format in DownloadFileFormat],
+                                                                default_val='')
         self.more_actions_frame_download_data_folder_browse = FileBrowser(self.more_actions_frame_download_data_section, label_text='Select a download folder', path_type='folder')
         self.more_actions_frame_download_data_submit_btn = PositiveIconButton(self.more_actions_frame_download_data_section, image=self.check_icon, command=self._download_data_submit_action)
 
@@ -263,8 +274,10 @@ class DataProfilerGUI(ApexApp):
         # Grid
         self._grid_more_actions_frame()
 
+        return self.more_actions_frame
+
 
-    def _create_loading_frame(self):
+    def _create_loading_frame(self) -> Page:
         self.loading_frame = Page(self)
 
         # TOPLEVEL - loading_frame
@@ -273,10 +286,14 @@ class DataProfilerGUI(ApexApp):
         # LEVEL 1 - loading_frame_content_frame
         self.loading_frame_text_var = StringVar(self.loading_frame_content_frame, 'Loading...')
         self.loading_frame_label = CTkLabel(self.loading_frame_content_frame, textvariable=self.loading_frame_text_var, wraplength=450)
+        self.loading_frame_progress_bar = CTkProgressBar(self.loading_frame_content_frame, orientation='horizontal', mode='determinate', width=350)
+        self.loading_frame_cancel_btn = NeutralButton(self.loading_frame_content_frame, text='Cancel', command=self._cancel_background_task_action)
 
         # Grid
         self._grid_loading_frame()
 
+        return self.loading_frame
+
 
     ''' Grid frames '''
 
@@ -380,25 +397,15 @@ class DataProfilerGUI(ApexApp):
 
         self.home_frame_data_info_title.grid(row=0, column=0, sticky='ew', padx=50, pady=(20, 0))
         self.home_frame_data_info_section.grid(row=1, column=0, sticky='ns', padx=5, pady=20)
-        if self.project_info.data_uploaded:
-            self.delete_project_data_button.grid(row=2, column=0, padx=50, pady=(0, 20))
-        else:
-            self.home_frame_upload_data_button.grid(row=2, column=0, padx=50, pady=(0, 20))
 
-        # LEVEL 3 - home_frame_project_info_section
-        # Within ProjectInfoFrame
+        # Only one of these is shown at a time, depending on whether the project has data (see _refresh_home_frame)
+        self.delete_project_data_button.grid(row=2, column=0, padx=50, pady=(0, 20))
+        self.home_frame_upload_data_button.grid(row=2, column=0, padx=50, pady=(0, 20))
+        self.delete_project_data_button.grid_remove()
+        self.home_frame_upload_data_button.grid_remove()
 
-        # LEVEL 3 - home_frame_data_info_section
-        self.home_frame_data_info_section.grid_columnconfigure(0, weight=1)
-        
-        self.home_frame_data_uploaded.grid(row=0, column=0, sticky='ew', padx=20, pady=(5, 0))
-        if self._get_project_info().data_uploaded:
-            self.home_frame_upload_date.grid(row=1, column=0, sticky='ew', padx=20, pady=(20, 0))
-            self.home_frame_date_for_analysis.grid(row=2, column=0, sticky='ew', padx=20, pady=(20, 0))
-            self.home_frame_weekend_date_rule.grid(row=3, column=0, sticky='ew', padx=20, pady=(20, 0))
-            self.home_frame_inbound_processed.grid(row=4, column=0, sticky='ew', padx=20, pady=(20, 0))
-            self.home_frame_inventory_processed.grid(row=5, column=0, sticky='ew', padx=20, pady=(20, 0))
-            self.home_frame_outbound_processed.grid(row=6, column=0, sticky='ew', padx=20, pady=(20, 5))
+        # LEVEL 3 - home_frame_project_info_section / home_frame_data_info_section
+        # Within ProjectInfoFrame / ProjectDataInfoFrame
 
     def _grid_upload_frame(self):
         # Parent = self
@@ -482,13 +489,14 @@ class DataProfilerGUI(ApexApp):
         self.more_actions_frame_update_item_master_submit_btn.grid(row=2, column=0, padx=10, pady=(0, 20))
 
          # LEVEL 2 - more_actions_frame_download_data_section
-        self.more_actions_frame_download_data_section.grid_rowconfigure([1,2], weight=1)
+        self.more_actions_frame_download_data_section.grid_rowconfigure([1,2,3], weight=1)
         self.more_actions_frame_download_data_section.grid_columnconfigure(0, weight=1)
 
         self.more_actions_frame_download_data_title.grid(row=0, column=0, sticky='ew', padx=10, pady=(10, 0))
         self.more_actions_frame_download_data_options_dropdown.grid(row=1, column=0, padx=10, pady=(20, 0))
-        self.more_actions_frame_download_data_folder_browse.grid(row=2, column=0, sticky='ew', padx=10, pady=(0,20))
-        self.more_actions_frame_download_data_submit_btn.grid(row=3, column=0, padx=10, pady=(0, 20))
+        self.more_actions_frame_download_data_format_dropdown.grid(row=2, column=0, padx=10, pady=(10, 0))
+        self.more_actions_frame_download_data_folder_browse.grid(row=3, column=0, sticky='ew', padx=10, pady=(0,20))
+        self.more_actions_frame_download_data_submit_btn.grid(row=4, column=0, padx=10, pady=(0, 20))
 
         # LEVEL 2 - more_actions_data_describer_section
         self.more_actions_data_describer_section.grid_rowconfigure(1, weight=1)
@@ -515,6 +523,14 @@ class DataProfilerGUI(ApexApp):
 
         self.loading_frame_label.grid(row=0, column=0, padx=50, pady=50)
 
+        # Progress bar is only shown once a task reports a percent complete
+        self.loading_frame_progress_bar.grid(row=1, column=0, padx=50, pady=(0, 30))
+        self.loading_frame_progress_bar.grid_remove()
+
+        # Cancel button is only shown while a cancellable task is running
+        self.loading_frame_cancel_btn.grid(row=2, column=0, padx=50, pady=(0, 50))
+        self.loading_frame_cancel_btn.grid_remove()
+
 
     ''' Toggle grid '''
 
@@ -578,7 +594,7 @@ class DataProfilerGUI(ApexApp):
             # Create home page with project info
             self._refresh_project_numbers()
             self._refresh_project_info()
-            self._create_home_frame()
+            self._refresh_home_frame()
 
             # Clear new project form
             self.new_project_frame_project_info_section.clear_frame()
@@ -617,9 +633,19 @@ class DataProfilerGUI(ApexApp):
         # Show loading frame while executing
         self.show_loading_frame_action('Transforming and uploading data...')
 
-        # Transform and upload
-        results = self.DataProfiler.transform_and_upload_data(data_directory=data_dir, transform_options=transform_options, update_progress_text_func=self._update_progess_text)
+        # Transform and upload on the worker
+        cancel_token = CancellationToken()
+        def task(report_progress: Callable[[str], None]):
+            results = self.DataProfiler.transform_and_upload_data(data_directory=data_dir, transform_options=transform_options, update_progress_text_func=report_progress, 
+                                                                  cancel_token=cancel_token)
+            if results.success:
+                report_progress('Refreshing project info...')
+                self._refresh_project_info()
+            return results
+
+        self._run_in_background(task, on_complete=self._upload_data_complete, return_action=self.navigate_to_upload_data_frame_action, cancel_token=cancel_token)
 
+    def _upload_data_complete(self, results: TransformResponse):
         # Navigate appropriately based on success
         message = ''
         if not results.success:
@@ -627,14 +653,13 @@ class DataProfilerGUI(ApexApp):
             self.navigate_to_upload_data_frame_action()
 
             # Display notification of results
-            message = f'Trouble with the data upload:\n\n{results.message}'
+            message = results.message if results.cancelled else f'Trouble with the data upload:\n\n{results.message}'
         else:
-            # Reset upload page
-            self._create_upload_data_frame()
+            # Reset upload page (rebuilt next time it's opened)
+            self._discard_frame('upload')
             
-            # Navigate to home
-            self._refresh_project_info()
-            self._create_home_frame()
+            # Navigate to home (project info was refreshed on the worker)
+            self._refresh_home_frame()
             self.navigate_to_home_action()
 
             # Display notification of results
@@ -700,7 +725,7 @@ class DataProfilerGUI(ApexApp):
         if response.success:
             # Update home page
             self._refresh_project_info()
-            self._create_home_frame()
+            self._refresh_home_frame()
 
             # Notify of success
             notification_dialog = NotificationDialog(self, title='Success!', text='Saved project info changes to database.')
@@ -739,9 +764,13 @@ class DataProfilerGUI(ApexApp):
         # Show loading frame while executing
         self.show_loading_frame_action('Loading...')
 
-        # Delete project
-        response = self.DataProfiler.update_item_master(file_path=file_path, update_progress_text_func=self._update_progess_text)
+        # Update item master on the worker
+        def task(report_progress: Callable[[str], None]):
+            return self.DataProfiler.update_item_master(file_path=file_path, update_progress_text_func=report_progress)
+
+        self._run_in_background(task, on_complete=self._update_item_master_complete, return_action=self.navigate_to_more_actions_action)
 
+    def _update_item_master_complete(self, response: BaseDBResponse):
         # Back to more actions
         self.navigate_to_more_actions_action()
 
@@ -802,16 +831,27 @@ class DataProfilerGUI(ApexApp):
         # Show loading frame while executing
         self.show_loading_frame_action('Deleting project data...')
 
-        results = self.DataProfiler.delete_project_data(update_progress_text_func=self._update_progess_text)
+        # Delete on the worker
+        cancel_token = CancellationToken()
+        def task(report_progress: Callable[[str], None]):
+            results = self.DataProfiler.delete_project_data(update_progress_text_func=report_progress, cancel_token=cancel_token)
+            if results.success:
+                report_progress('Refreshing project info...')
+                self._refresh_project_info()
+            return results
+
+        self._run_in_background(task, on_complete=self._delete_project_data_complete, return_action=self.navigate_to_home_action, cancel_token=cancel_token)
 
+    def _delete_project_data_complete(self, results: BaseDBResponse):
         message = ''
         if results.success:
-            self._refresh_project_info()
-            self._create_home_frame()
+            self._refresh_home_frame()
 
             message = 'Deleted project data successfully.'
             if results.message:
                 message += f'\n\n{results.message}'
+        elif results.cancelled:
+            message = results.message
         else:
             message = f'Trouble deleting data. Check log.\n\n{results.message}'
 
@@ -845,8 +885,8 @@ class DataProfilerGUI(ApexApp):
         # Does the project number exist?
         # NOTE - as of 10-10-24, it should always exist, as it pulls project #s for dropdown from DB
         if self.DataProfiler.get_project_exists():
-            # Create home frame
-            self._create_home_frame()
+            # Fill in home frame
+            self._refresh_home_frame()
 
             # Navigate to home
             self.navigate_to_home_action()
@@ -927,6 +967,7 @@ class DataProfilerGUI(ApexApp):
     def _download_data_submit_action(self):
         download_path = self.more_actions_frame_download_data_folder_browse.get_path()
         download_option_input = self.more_actions_frame_download_data_options_dropdown.get_variable_value()
+        file_format_input = self.more_actions_frame_download_data_format_dropdown.get_variable_value()
 
         # Make sure project has data exists
         message = None
@@ -950,13 +991,26 @@ class DataProfilerGUI(ApexApp):
 
         # Make the request to DataProfiler
         download_option = DownloadDataOptions(download_option_input)
-        download_response = self.DataProfiler.download_data(download_option=download_option, target_directory=download_path)
+        file_format = DownloadFileFormat(file_format_input) if file_format_input else None
+
+        cancel_token = CancellationToken()
+        def task(report_progress: Callable[[str], None]):
+            return self.DataProfiler.download_data(download_option=download_option, target_directory=download_path, file_format=file_format, 
+                                                   update_progress_text_func=report_progress, cancel_token=cancel_token)
 
+        self._run_in_background(task, 
+                                on_complete=lambda download_response: self._download_data_complete(download_option, download_response), 
+                                return_action=self.navigate_to_more_actions_action,
+                                cancel_token=cancel_token)
+
+    def _download_data_complete(self, download_option: DownloadDataOptions, download_response: DBDownloadResponse):
         # Notify of results
         notification_dialog = None
         if download_response.success:
             # Display notification of results
             notification_dialog = ResultsDialog(self, title='Success!', text=f'Downloaded "{download_option.value}" for {download_response.project_number}.', results_dir=download_response.download_path)        
+        elif download_response.cancelled:
+            notification_dialog = NotificationDialog(self, title='Data Profiler', text=f'Cancelled downloading "{download_option.value}".')
         else:
             # Display notification of results
             notification_dialog = NotificationDialog(self, title='Error', text=f'Trouble downloading "{download_option.value}" :\n\n{download_response.message}') 
@@ -974,9 +1028,7 @@ class DataProfilerGUI(ApexApp):
 
         if file_suffix == 'xlsx':
             # Populate dropdown with sheet names from that book
-            sheets: list[str] = []
-            with pd.ExcelFile(file_path) as file:
-                sheets = file.sheet_names
+            sheets = get_sheet_names(file_path)
             self.more_actions_data_describer_sheet_name.set_variable_value(val=sheets[0])
             self.more_actions_data_describer_sheet_name.set_dropdown_values(values=sheets)
         else:
@@ -1002,8 +1054,7 @@ class DataProfilerGUI(ApexApp):
             else:
                 if not sheet_name:
                     raise ValueError(f'XLSX file uploaded, but no sheet name given!')
-                df = pd.read_excel(file, sheet_name=sheet_name, nrows=1)
-                given_cols = df.columns.tolist()
+                given_cols = read_excel_header(file, sheet_name=sheet_name)
 
         except Exception as e:
             # Display dialog
@@ -1035,15 +1086,19 @@ class DataProfilerGUI(ApexApp):
             grouping_col = column_selector.get_grouping_col()
             selected_columns = column_selector.get_selected_columns()
 
-            # Call data_describer
-            output_dir = self.DataProfiler.describe_data_frame(file_path=file, columns=selected_columns, file_type=file_suffix, sheet_name=sheet_name, group_col=grouping_col)
+            # Call data_describer on the worker
+            def task(report_progress: Callable[[str], None]):
+                return self.DataProfiler.describe_data_frame(file_path=file, columns=selected_columns, file_type=file_suffix, sheet_name=sheet_name, group_col=grouping_col)
 
-            # Navigate back to more actions
-            self.navigate_to_more_actions_action()
+            self._run_in_background(task, on_complete=self._data_describer_complete, return_action=self.navigate_to_more_actions_action)
 
-            notification_dialog = ResultsDialog(self, title='Success!', text=f'Described data.', results_dir=output_dir)
-            notification_dialog.attributes('-topmost', True)
-            notification_dialog.mainloop()
+    def _data_describer_complete(self, output_dir: str):
+        # Navigate back to more actions
+        self.navigate_to_more_actions_action()
+
+        notification_dialog = ResultsDialog(self, title='Success!', text=f'Described data.', results_dir=output_dir)
+        notification_dialog.attributes('-topmost', True)
+        notification_dialog.mainloop()
         
 
     ## Navigations ##
@@ -1058,47 +1113,48 @@ class DataProfilerGUI(ApexApp):
 
         # Clear project number
         self._set_project_number('')
-        self.select_project_number_dropdown.set_variable_value('')       
 
         # Ungrid everything
-        if hasattr(self, 'home_frame'):
-            self._toggle_frame_grid(frame=self.home_frame, grid=False)
-        self._toggle_frame_grid(frame=self.upload_frame, grid=False)
-        self._toggle_frame_grid(frame=self.more_actions_frame, grid=False)
-        self._toggle_frame_grid(frame=self.new_project_frame, grid=False)
-        self._toggle_frame_grid(frame=self.loading_frame, grid=False)
+        for frame in self._frames.values():
+            self._toggle_frame_grid(frame=frame, grid=False)
         self._toggle_project_number_frame_grid(grid=False)
-        self._toggle_frame_grid(frame=self.start_frame, grid=False)
 
         # Show loading screen while fetching project numbers
+        loading_frame = self._get_frame('loading')
         self._set_loading_frame_text('Fetching projects...')
-        self._toggle_frame_grid(frame=self.loading_frame, grid=True)
+        self._toggle_frame_grid(frame=loading_frame, grid=True)
         self.update()
 
+        # Build the start frame (first time only) while the loading screen is up
+        start_frame = self._get_frame('start')
+        self._toggle_frame_grid(frame=start_frame, grid=False)
+        self.select_project_number_dropdown.set_variable_value('')
+
         self._refresh_project_numbers()
 
         # Once projects are loaded, nav to start
-        self._toggle_frame_grid(frame=self.loading_frame, grid=False)
-        self._toggle_frame_grid(frame=self.start_frame, grid=True)
+        self._toggle_frame_grid(frame=loading_frame, grid=False)
+        self._toggle_frame_grid(frame=start_frame, grid=True)
         self.update()
 
     def show_loading_frame_action(self, text: str):
         self._set_loading_frame_text(text)
-        self._navigate(self.loading_frame)
+        self._set_loading_frame_percent(None)
+        self._navigate(self._get_frame('loading'))
 
     def navigate_to_new_project_frame_action(self):
-        self._navigate(self.new_project_frame)
+        self._navigate(self._get_frame('new_project'))
 
     def navigate_to_upload_data_frame_action(self):
-        self._navigate(self.upload_frame)
+        self._navigate(self._get_frame('upload'))
         self._toggle_project_number_frame_grid(grid=True)
 
     def navigate_to_home_action(self):
-        self._navigate(to_frame=self.home_frame)
+        self._navigate(to_frame=self._get_frame('home'))
         self._toggle_project_number_frame_grid(grid=True)
 
     def navigate_to_more_actions_action(self):
-        self._navigate(to_frame=self.more_actions_frame)
+        self._navigate(to_frame=self._get_frame('more_actions'))
         self._toggle_project_number_frame_grid(grid=True)
 
 
@@ -1112,19 +1168,44 @@ class DataProfilerGUI(ApexApp):
         self.DataProfiler = None
         self.project_info = None
 
+    def _get_frame(self, name: str) -> Page:
+        ''' Return a page by name, building (and caching) it the first time it's needed '''
+
+        if name not in self._frames:
+            self._frames[name] = self._frame_builders[name]()
+            self._toggle_frame_grid(frame=self._frames[name], grid=False)
+
+        return self._frames[name]
+
+    def _discard_frame(self, name: str):
+        ''' Destroy a cached page, so it's rebuilt fresh the next time it's navigated to '''
+
+        frame = self._frames.pop(name, None)
+        if frame is not None:
+            frame.destroy()
+
+    def _refresh_home_frame(self):
+        ''' Update the home frame's widgets in place from the current project info (the frame is only built once) '''
+
+        self._get_frame('home')
+        project_info = self._get_project_info()
+
+        self.home_frame_project_info_section.set_project_info(project_info)
+        self.home_frame_data_info_section.set_project_info(project_info)
+
+        if project_info.data_uploaded:
+            self.home_frame_upload_data_button.grid_remove()
+            self.delete_project_data_button.grid()
+        else:
+            self.delete_project_data_button.grid_remove()
+            self.home_frame_upload_data_button.grid()
+
     def _navigate(self, to_frame: CTkFrame):
         
-        # Ungrid everything
-        self._toggle_frame_grid(frame=self.start_frame, grid=False)
-        self._toggle_frame_grid(frame=self.new_project_frame, grid=False)
-        self._toggle_frame_grid(frame=self.upload_frame, grid=False)
-        self._toggle_frame_grid(frame=self.more_actions_frame, grid=False)
+        # Ungrid everything that's been built
+        for frame in self._frames.values():
+            self._toggle_frame_grid(frame=frame, grid=False)
         self._toggle_project_number_frame_grid(grid=False)
-        self._toggle_frame_grid(frame=self.loading_frame, grid=False)
-
-        # Home frame isn't created right away, so check it if exists before ungridding
-        if hasattr(self, 'home_frame'):
-            self._toggle_frame_grid(frame=self.home_frame, grid=False)
 
         # Grid the to frame
         self._toggle_frame_grid(frame=to_frame, grid=True)
@@ -1135,6 +1216,48 @@ class DataProfilerGUI(ApexApp):
 
     def void(self):
         return
+
+    def _run_in_background(self, task: Callable[[Callable[[str], None]], Any], on_complete: Callable[[Any], None], return_action: Callable[[], None], 
+                           cancel_token: CancellationToken | None = None):
+        '''
+        Run a long action on the task runner's worker thread while the loading frame is up. Progress text posted by the task
+        is shown on the loading frame; on_complete gets the task's result on the main thread.
+
+        Params
+        ------
+        task : Callable
+            task(report_progress) -> result. Runs on the worker - must not touch widgets
+        on_complete : Callable
+            on_complete(result), run on the main thread
+        return_action : Callable
+            navigation to go back to if the task raises
+        cancel_token : CancellationToken | None
+            if given, the loading frame shows a Cancel button that cancels this token
+        '''
+
+        self._set_cancel_token(cancel_token)
+
+        def on_success(result: Any):
+            self._set_cancel_token(None)
+            on_complete(result)
+
+        def on_error(e: BaseException):
+            self._set_cancel_token(None)
+            return_action()
+
+            notification_dialog = NotificationDialog(self, title='Error', text=f'Something went wrong:\n\n{e}')
+            notification_dialog.attributes('-topmost', True)
+            notification_dialog.mainloop()
+
+        self.task_runner.run(task, on_complete=on_success, on_progress=self._update_loading_frame_progress, on_error=on_error)
+
+    def _cancel_background_task_action(self):
+        if self.cancel_token is None:
+            return
+
+        self.cancel_token.cancel()
+        self.loading_frame_cancel_btn.configure(state='disabled')
+        self._set_loading_frame_text('Cancelling...')
     
     def pretty_print_rows_inserted(self, rows: TransformRowsInserted):
         return_str = ''
@@ -1152,6 +1275,37 @@ class DataProfilerGUI(ApexApp):
 
     ''' Getters/Setters '''
 
+    def _get_icon(self, name: str) -> CTkImage:
+        ''' Load resources/<name>-icon-win-10.png the first time it's used '''
+
+        if name not in self._icons:
+            self._icons[name] = CTkImage(light_image=Image.open(f'{self.resources_dir}/{name}-icon-win-10.png'), size=(26, 26))
+        return self._icons[name]
+
+    @property
+    def back_icon(self) -> CTkImage:
+        return self._get_icon('back')
+
+    @property
+    def trash_icon(self) -> CTkImage:
+        return self._get_icon('trash')
+
+    @property
+    def save_icon(self) -> CTkImage:
+        return self._get_icon('save')
+
+    @property
+    def check_icon(self) -> CTkImage:
+        return self._get_icon('check')
+
+    @property
+    def upload_icon(self) -> CTkImage:
+        return self._get_icon('upload')
+
+    @property
+    def add_new_icon(self) -> CTkImage:
+        return self._get_icon('add-new')
+
     def _get_project_number(self):
         return self.project_number
 
@@ -1164,6 +1318,28 @@ class DataProfilerGUI(ApexApp):
     def _set_loading_frame_text(self, text: str):
         self.loading_frame_text_var.set(text)
 
-    def _update_progess_text(self, text: str):
-        self._set_loading_frame_text(text)
-        self.update()
\ No newline at end of file
+    def _set_loading_frame_percent(self, percent: float | None):
+        if percent is None:
+            self.loading_frame_progress_bar.grid_remove()
+        else:
+            self.loading_frame_progress_bar.set(percent)
+            self.loading_frame_progress_bar.grid()
+
+    def _update_loading_frame_progress(self, progress: str | ProgressSnapshot):
+        ''' Show a task's progress - plain text, or a ProgressSnapshot (text + percent, rate and ETA) '''
+
+        self._set_loading_frame_text(format_progress(progress))
+
+        if isinstance(progress, ProgressSnapshot):
+            self._set_loading_frame_percent(progress.percent)
+
+    def _set_cancel_token(self, cancel_token: CancellationToken | None):
+        ''' Track the running task's cancel token, and show the loading frame's Cancel button only while there is one '''
+
+        self.cancel_token = cancel_token
+
+        if cancel_token is None:
+            self.loading_frame_cancel_btn.grid_remove()
+        else:
+            self.loading_frame_cancel_btn.configure(state='normal')
+            self.loading_frame_cancel_btn.grid()
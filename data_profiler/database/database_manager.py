@@ -4,29 +4,47 @@ Apex Companies
 June 2024
 '''
 
+from contextlib import contextmanager
+import random
+import re
+from threading import Condition, current_thread, main_thread
+from time import perf_counter
+from typing import Iterator
+
 import pyodbc
 from pyodbc import Connection
 from cryptography.fernet import Fernet
 
 from apex_gui.frames.notification_dialogs import CriticalErrorDialog
 
+from .local_backend import use_local_backend, connect_local
+from .sql_registry import load_sql_registry
+from ..helpers.instrumentation import DatabaseCallStats, current_run
+from ..helpers.constants.app_constants import SQL_DIR, SQL_DIR_DEV, PARAM_BYTES_SAMPLE_ROWS
+
+# First [Schema].[Table] a statement reads from / writes to
+_STATEMENT_TABLE_RGX = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+\[?\w+\]?\.\[?(\w+)\]?', flags=re.IGNORECASE)
+_STATEMENT_VERB_RGX = re.compile(r'\b(SELECT|INSERT|UPDATE|DELETE|WITH)\b', flags=re.IGNORECASE)
+
 
 class DatabaseConnection():
     '''
-    Manages connection with aasdevfree Azure SQL database. Use in "with" block to receive a pyodbc Connection object
+    Manages connection with aasdevfree Azure SQL database. Use in "with" block to receive a pyodbc Connection object.
+    With DATA_PROFILER_DB_BACKEND=local, hands out a LocalConnection (local SQLite files, same API) instead - see local_backend.py
     '''
     
     def __init__(self, dev: bool = False) -> Connection:
         self.dev = dev
 
     def __enter__(self) -> Connection:
-        self.connection_string = self._get_connection_string()
-        
         try:
-            self.connection = self._create_server_connection()
+            run = current_run()
+            self.connection = self._open_connection(run.db_stats if run else None)
         except pyodbc.InterfaceError as e:
-            error_dialog = CriticalErrorDialog(title='Data Profiler', text=f'CRITICAL:\n\nCould not connect to database. Please quit the application and try again.')
-            error_dialog.mainloop()
+            # Tk widgets can only be made on the main thread - from a background task, just raise and let the GUI report it
+            if current_thread() is main_thread():
+                error_dialog = CriticalErrorDialog(title='Data Profiler', text=f'CRITICAL:\n\nCould not connect to database. Please quit the application and try again.')
+                error_dialog.mainloop()
             raise e
         else:
             return self.connection
@@ -39,6 +57,24 @@ class DatabaseConnection():
             self.connection.close()
             raise exception_value
         
+    def _open_connection(self, db_stats: DatabaseCallStats | None = None) -> Connection:
+        '''
+        Open a connection to the configured backend. If db_stats is given (there's an instrumented run going), the connect
+        time is recorded and the connection is wrapped so every statement on it is counted too
+        '''
+
+        if getattr(self, 'connection_string', None) is None and not use_local_backend():
+            self.connection_string = self._get_connection_string()
+
+        st = perf_counter()
+        connection = connect_local() if use_local_backend() else self._create_server_connection()
+
+        if db_stats is None:
+            return connection
+
+        db_stats.record_connect(perf_counter() - st)
+        return InstrumentedConnection(connection, db_stats, dev=self.dev)
+
     # Use Fernet cipher to decrypt connection string
     # https://cryptography.io/en/latest/
     def _get_connection_string(self):
@@ -72,4 +108,259 @@ class DatabaseConnection():
             raise pyodbc.InterfaceError('Could not connect to database.')
         
         return connection
-    
\ No newline at end of file
+
+
+class DatabaseConnectionPool(DatabaseConnection):
+    '''
+    Thread-safe pool of connections to the aasdevfree Azure SQL database. The connection string is decrypted once and up to 
+    max_size connections are opened lazily, then reused. pyodbc connections can't be shared between threads, so each 
+    worker checks one out with "with pool.connection() as db_conn:" and gets it back when the block exits.
+
+    Connections are opened outside the pool's lock, so workers connect (seconds each, over VPN) in parallel. A connection 
+    that breaks while checked out is closed and dropped, and the next worker that needs one opens a new one
+
+    Use in "with" block (or call close()) so that every pooled connection is closed at the end of the job
+    '''
+
+    def __init__(self, dev: bool = False, max_size: int = 4):
+        super().__init__(dev=dev)
+        self.max_size = max_size
+        self.connection_string = None
+
+        # Workers run on other threads, where the run's contextvar isn't set - so grab its stats now
+        run = current_run()
+        self._db_stats = run.db_stats if run else None
+
+        self._idle_connections: list[Connection] = []
+        self._all_connections: list[Connection] = []
+        self._opening = 0                       # slots reserved by workers that are still connecting
+        self._condition = Condition()
+
+    def __enter__(self) -> 'DatabaseConnectionPool':
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.close()
+        if exception_type is not None:
+            print(f'{exception_type = }\n{exception_value = }\n{exception_traceback = }\n')
+            raise exception_value
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        ''' Check out a connection for the duration of a "with" block '''
+
+        connection = self._acquire()
+        broken = False
+        try:
+            yield connection
+        except Exception as e:
+            # Lost connection (e.g. communication link failure) - don't hand it to the next worker
+            broken = isinstance(e, (pyodbc.InterfaceError, pyodbc.OperationalError))
+
+            # Don't hand a connection with an open transaction to the next worker either
+            if not broken:
+                try:
+                    connection.rollback()
+                except pyodbc.Error:
+                    broken = True
+            raise
+        finally:
+            self._release(connection, broken=broken)
+
+    def close(self):
+        ''' Close every connection the pool has opened '''
+
+        with self._condition:
+            for connection in self._all_connections:
+                _close_quietly(connection)
+            self._all_connections = []
+            self._idle_connections = []
+
+    def _acquire(self) -> Connection:
+        with self._condition:
+            while True:
+                # Reuse an idle connection if there is one
+                if self._idle_connections:
+                    return self._idle_connections.pop()
+
+                # Otherwise reserve a slot for a new one, as long as we're under the cap
+                if len(self._all_connections) + self._opening < self.max_size:
+                    self._opening += 1
+                    break
+
+                # Pool is full - wait for another worker to give one back (or drop a broken one)
+                self._condition.wait()
+
+        # Connect outside the lock, so other workers can check connections out + in meanwhile
+        try:
+            connection = self._open_connection(self._db_stats)
+        except BaseException:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._opening -= 1
+            self._all_connections.append(connection)
+        return connection
+
+    def _release(self, connection: Connection, broken: bool = False):
+        with self._condition:
+            if broken or connection not in self._all_connections:
+                # Broken, or the pool was closed while it was checked out
+                if connection in self._all_connections:
+                    self._all_connections.remove(connection)
+                _close_quietly(connection)
+            else:
+                self._idle_connections.append(connection)
+
+            self._condition.notify()
+
+
+class InstrumentedCursor():
+    '''
+    Wraps a pyodbc Cursor and records, per statement (sql/ template path, or verb + table for other queries), executions,
+    rows, parameter bytes and execute/fetch times into a DatabaseCallStats. Anything not timed is passed straight through
+    '''
+
+    def __init__(self, cursor, db_stats: DatabaseCallStats, dev: bool = False):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_db_stats', db_stats)
+        object.__setattr__(self, '_dev', dev)
+        object.__setattr__(self, '_last_statement', ('unknown', None))
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value):
+        # fast_executemany, arraysize, ... belong on the real cursor
+        setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def execute(self, query: str, *params):
+        statement = _statement_key(query, dev=self._dev)
+        object.__setattr__(self, '_last_statement', statement)
+
+        st = perf_counter()
+        self._cursor.execute(query, *params)
+        seconds = perf_counter() - st
+
+        values = params[0] if len(params) == 1 and isinstance(params[0], (list, tuple)) else params
+        rows = max(self._cursor.rowcount, 0) if self._cursor.description is None else 0
+        self._db_stats.record(*statement, execute_seconds=seconds, executions=1, rows=rows, param_bytes=_param_bytes(values))
+        return self
+
+    def executemany(self, query: str, params_seq):
+        statement = _statement_key(query, dev=self._dev)
+        object.__setattr__(self, '_last_statement', statement)
+
+        st = perf_counter()
+        self._cursor.executemany(query, params_seq)
+        seconds = perf_counter() - st
+
+        self._db_stats.record(*statement, execute_seconds=seconds, executions=len(params_seq), rows=len(params_seq),
+                              param_bytes=_estimate_param_bytes(params_seq))
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone, lambda row: 0 if row is None else 1)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(lambda: self._cursor.fetchmany(*args), len)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall, len)
+
+    def _timed_fetch(self, fetch, count_rows):
+        st = perf_counter()
+        result = fetch()
+        self._db_stats.record(*self._last_statement, fetch_seconds=perf_counter() - st, rows=count_rows(result))
+        return result
+
+
+class InstrumentedConnection():
+    ''' Wraps a pyodbc Connection so its cursors are InstrumentedCursors and commits are timed against the last statement '''
+
+    def __init__(self, connection: Connection, db_stats: DatabaseCallStats, dev: bool = False):
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_db_stats', db_stats)
+        object.__setattr__(self, '_dev', dev)
+        object.__setattr__(self, '_last_cursor', None)
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name: str, value):
+        # autocommit belongs on the real connection
+        setattr(self._connection, name, value)
+
+    def cursor(self) -> InstrumentedCursor:
+        cursor = InstrumentedCursor(self._connection.cursor(), self._db_stats, dev=self._dev)
+        object.__setattr__(self, '_last_cursor', cursor)
+        return cursor
+
+    def commit(self):
+        st = perf_counter()
+        self._connection.commit()
+        seconds = perf_counter() - st
+
+        statement = self._last_cursor._last_statement if self._last_cursor else ('unknown', None)
+        self._db_stats.record(*statement, commit_seconds=seconds)
+
+    def close(self):
+        object.__setattr__(self, '_last_cursor', None)
+        self._connection.close()
+
+
+def _statement_key(query: str, dev: bool = False) -> tuple[str, str | None]:
+    '''
+    (statement, table) to file a query under - its sql/ template path if it is one (from the dev templates for a dev connection,
+    like the services use), otherwise its verb + table
+    '''
+
+    table_match = _STATEMENT_TABLE_RGX.search(query)
+    table = table_match.group(1) if table_match else None
+
+    name = load_sql_registry(SQL_DIR_DEV if dev else SQL_DIR).name_for(query)
+    if name is None:
+        verb_match = _STATEMENT_VERB_RGX.search(query)
+        name = f'{verb_match.group(1).upper() if verb_match else "SQL"} {table or ""}'.strip()
+
+    return name, table
+
+
+def _close_quietly(connection: Connection):
+    try:
+        connection.close()
+    except pyodbc.Error:
+        pass
+
+
+def _estimate_param_bytes(params_seq, sample_rows: int = PARAM_BYTES_SAMPLE_ROWS) -> int:
+    '''
+    Rough size of an executemany's parameters - sized from up to sample_rows rows, scaled to the whole batch. Rows are picked at
+    random (seeded, so the same batch always gets the same estimate) rather than every nth, which can line up with a pattern in the data
+    '''
+
+    if len(params_seq) <= sample_rows:
+        return sum(_param_bytes(row) for row in params_seq)
+
+    sample = random.Random(0).sample(range(len(params_seq)), sample_rows)
+    return round(sum(_param_bytes(params_seq[i]) for i in sample) * len(params_seq) / sample_rows)
+
+
+def _param_bytes(values) -> int:
+    ''' Rough size of a row of parameters as sent to the server '''
+
+    total = 0
+    for value in values:
+        if isinstance(value, str):
+            total += 2 * len(value)     # NVARCHAR - 2 bytes per character
+        elif isinstance(value, bytes):
+            total += len(value)
+        elif value is not None:
+            total += 8                  # numbers, dates, bits - close enough
+
+    return total
@@ -6,28 +6,150 @@ December 2024
 Common helper functions for interacting with database 
 '''
 
+from typing import Callable
 from io import TextIOWrapper
-from datetime import timedelta
+import logging
+from datetime import timedelta, datetime
 from time import time
 import math
 
 from pyodbc import Connection
+import numpy as np
 import pandas as pd
 
+from ...helpers.cancellation import CancellationToken, OperationCancelled
+from ...helpers.models.Progress import ProgressStage, ProgressEvent
+from ...helpers.constants.app_constants import INSERT_BATCH_SIZE
 
 
-def download_table_from_query(connection: Connection, query: str) -> pd.DataFrame:
+FETCH_CHUNK_SIZE = 50000
+
+logger = logging.getLogger(__name__)
+
+
+def _column_kind(type_code: type) -> str:
+    '''
+    Map a pyodbc cursor.description type code (a python type) to the kind of buffer used to hold that column  
+
+    Params
+    ------
+    type_code : type  
+        python type reported by pyodbc for the column  
+
+    Return
+    ------
+    one of 'int', 'float', 'bool', 'datetime', or 'object'
+    '''
+
+    # bool is a subclass of int, so check it first
+    if type_code is bool:
+        return 'bool'
+    if type_code is int:
+        return 'int'
+    if type_code is float:
+        return 'float'
+    if type_code is datetime:
+        return 'datetime'
+    # Everything else keeps its python objects, like DataFrame.from_records did - incl. Decimal (DECIMAL/NUMERIC/MONEY, which 
+    # would lose precision as floats) and date (DATE columns stay dates, not timestamps)
+    return 'object'
+
+
+def _values_to_buffer(values: tuple, kind: str) -> tuple[np.ndarray, np.ndarray | None]:
+    '''
+    Copy one column of a fetched chunk into a typed NumPy buffer  
+
+    Params
+    ------
+    values : tuple  
+        the column's values for the chunk (may contain None)  
+    kind : str  
+        buffer kind returned by _column_kind  
+
+    Return
+    ------
+    (buffer, null mask). null mask is only returned for int/bool columns that actually contain NULLs
+    '''
+
+    n = len(values)
+
+    if kind == 'float':
+        # NumPy converts None -> NaN on the way in
+        return np.array(values, dtype=np.float64), None
+    if kind == 'datetime':
+        # None -> NaT
+        return np.array(values, dtype='datetime64[us]'), None
+    if kind in ('int', 'bool'):
+        dtype = np.int64 if kind == 'int' else np.bool_
+        mask = np.fromiter((v is None for v in values), dtype=np.bool_, count=n)
+        if mask.any():
+            fill = 0 if kind == 'int' else False
+            buffer = np.fromiter((fill if v is None else v for v in values), dtype=dtype, count=n)
+            return buffer, mask
+        return np.fromiter(values, dtype=dtype, count=n), None
+
+    buffer = np.empty(n, dtype=object)
+    buffer[:] = values
+    return buffer, None
+
+
+def _buffers_to_series(buffers: list[np.ndarray], masks: list[np.ndarray | None], kind: str, name: str) -> pd.Series:
+    '''
+    Concatenate a column's chunk buffers into a single pandas Series, using a nullable dtype for int/bool columns with NULLs  
+    '''
+
+    if kind == 'int':
+        empty = np.empty(0, dtype=np.int64)
+    elif kind == 'bool':
+        empty = np.empty(0, dtype=np.bool_)
+    elif kind == 'float':
+        empty = np.empty(0, dtype=np.float64)
+    elif kind == 'datetime':
+        empty = np.empty(0, dtype='datetime64[us]')
+    else:
+        empty = np.empty(0, dtype=object)
+
+    data = np.concatenate(buffers) if len(buffers) > 1 else (buffers[0] if buffers else empty)
+
+    if kind in ('int', 'bool') and any(mask is not None for mask in masks):
+        mask = np.concatenate([mask if mask is not None else np.zeros(len(buffer), dtype=np.bool_) for buffer, mask in zip(buffers, masks)])
+        array_type = pd.arrays.IntegerArray if kind == 'int' else pd.arrays.BooleanArray
+        return pd.Series(array_type(data, mask), name=name, copy=False)
+
+    return pd.Series(data, name=name, copy=False)
+
+
+def download_table_from_query(connection: Connection, query: str, params: tuple = (), chunk_size: int = FETCH_CHUNK_SIZE, 
+                              cancel_token: CancellationToken | None = None, update_progress_func: Callable[[ProgressEvent], None] | None = None, 
+                              table_name: str = '') -> pd.DataFrame:
     '''
     Run a SQL query and load the results as a pandas DataFrame  
 
+    Rows are fetched in chunks with fetchmany and each chunk is copied straight into typed, per-column NumPy buffers 
+    (types mapped from cursor.description), so the full result set is never held as a matrix of pyodbc Row objects 
+    and pandas doesn't have to infer dtypes afterwards. Column dtypes:
+        int         int64, or nullable Int64 if it has NULLs (from_records made those float64)
+        bit         bool, or nullable boolean if it has NULLs
+        float       float64, NULL -> NaN
+        datetime    datetime64[us], NULL -> NaT (microseconds, so DATETIME2 values up to 9999-12-31 fit)
+        the rest    object - str, Decimal (kept exact), date, time, bytes, with NULL -> None
+
     Params
     ------
     connection : pyodbc.Connection  
         some pyodbc connection object  
     query : str  
         some SQL query  
-    dev : bool  
-        if dev == True, use dev schema. Otherwise, use production schema  
+    params : tuple  
+        values for the query's "?" parameter markers (see SqlTemplate.bind)  
+    chunk_size : int  
+        number of rows to fetch per round trip  
+    cancel_token : CancellationToken | None  
+        optional, checked between chunks. Raises OperationCancelled if cancelled  
+    update_progress_func : Callable[[ProgressEvent], None] | None  
+        optional, gets a DOWNLOAD ProgressEvent (rows so far, rows/sec) after each chunk  
+    table_name : str  
+        what's being downloaded, for progress events  
 
     Return
     ------
@@ -35,21 +157,65 @@ def download_table_from_query(connection: Connection, query: str) -> pd.DataFram
     '''
     
     cursor = connection.cursor()
+    cursor.arraysize = chunk_size
+    fetch_st = time()
+    rows_fetched = 0
 
     # Execute the query
-    cursor.execute(query)
+    if params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+    # Skip over any statements that don't return rows (e.g. DECLARE / SET / temp table inserts)
+    while cursor.description is None and cursor.nextset():
+        pass
+
+    if cursor.description is None:
+        cursor.close()
+        return pd.DataFrame()
 
-    # Grab the results
-    data = cursor.fetchall()
     columns = [column[0] for column in cursor.description]
+    kinds = [_column_kind(column[1]) for column in cursor.description]
+    buffers: list[list[np.ndarray]] = [[] for _ in columns]
+    masks: list[list[np.ndarray | None]] = [[] for _ in columns]
+
+    # Grab the results chunk by chunk
+    while True:
+        if cancel_token and cancel_token.is_cancelled():
+            cursor.close()
+            raise OperationCancelled()
+
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+
+        for idx, values in enumerate(zip(*rows)):
+            buffer, mask = _values_to_buffer(values, kinds[idx])
+            buffers[idx].append(buffer)
+            masks[idx].append(mask)
+
+        rows_fetched += len(rows)
+        if update_progress_func:
+            elapsed = time() - fetch_st
+            update_progress_func(ProgressEvent(stage=ProgressStage.DOWNLOAD, table=table_name, rows_done=rows_fetched, 
+                                               elapsed=elapsed, rate=rows_fetched / elapsed if elapsed > 0 else 0))
+
+        # Release the Row objects before fetching the next chunk
+        del rows
+
+    cursor.close()
 
     # Put it all together as a dataframe
-    df = pd.DataFrame.from_records(columns=columns, data=data)
+    df = pd.concat([_buffers_to_series(buffers[idx], masks[idx], kinds[idx], columns[idx]) for idx in range(len(columns))], axis=1, copy=False)
+    df.columns = columns
 
     return df
 
 
-def insert_table_to_db(connection: Connection, table_name: str, data_frame: pd.DataFrame, sql_file_path: str, log_file: TextIOWrapper) -> int:
+def insert_table_to_db(connection: Connection, table_name: str, data_frame: pd.DataFrame, insert_query: str, log_file: TextIOWrapper, 
+                       cancel_token: CancellationToken | None = None, update_progress_func: Callable[[ProgressEvent], None] | None = None, 
+                       batch_size: int = INSERT_BATCH_SIZE) -> int:
     '''
     Inserts a dataframe into the database. Uses fast_executemany to insert data all in one transaction, thus speeding up process greatly
 
@@ -67,10 +233,17 @@ def insert_table_to_db(connection: Connection, table_name: str, data_frame: pd.D
         the name of a table in the OutputTables schema. Only used for logging purposes
     data_frame : pd.DataFrame
         the data to insert
-    sql_file_path : str
-        the path to the insert sql file for the table
+    insert_query : str
+        the parameterized insert query for the table (from the SQL registry)
     log_file : TextIOWrapper
-        a file-like object used for logging            
+        a file-like object used for logging (usually a RunLogFile)
+    cancel_token : CancellationToken | None
+        optional, checked before each batch. If cancelled, the open transaction is rolled back and OperationCancelled is raised.
+        Batches that were already committed stay in the table - the caller is responsible for deleting them
+    update_progress_func : Callable[[ProgressEvent], None] | None
+        optional, gets an INSERT ProgressEvent (rows inserted / total, rows/sec) after each batch
+    batch_size : int
+        rows per executemany. Each batch is converted to python lists just before it's sent, so this also caps that memory
 
     Return
     ------
@@ -89,33 +262,35 @@ def insert_table_to_db(connection: Connection, table_name: str, data_frame: pd.D
     connection.autocommit = False                   # autocommit = True could force a DB transaction for each query, which would defeat the point
     cursor.fast_executemany = True
 
-    # Get sql query
-    # fd = open(f'{self.sql_dir}/{sql_file_path}')
-    fd = open(sql_file_path)
-    insert_query = fd.read()
-    fd.close()
-    
-    # Get data to insert in form of 2d list
-    data_lst = data_frame.to_dict('split')['data']
-    print(data_lst[0])
-    log_file.write(f'{data_lst[0]}\n')
-
     ## Batch insert ##
     rows_inserted: int = 0
-    batch_size = 100000
+    total_rows = len(data_frame)
     batch_num = 1
     error_encountered = False
     insert_st = time()
 
-    batches = int(math.ceil(len(data_lst) / batch_size))
-    for i in range(0, len(data_lst), batch_size):
+    batches = int(math.ceil(total_rows / batch_size))
+    for i in range(0, total_rows, batch_size):
+        # Stop between batches if the job was cancelled
+        if cancel_token and cancel_token.is_cancelled():
+            connection.rollback()
+            connection.autocommit = True
+            cursor.close()
+
+            print(f'Cancelled inserting into {table_name} after {rows_inserted} rows')
+            log_file.write(f'CANCELLED - stopped inserting into {table_name} after {rows_inserted} rows\n\n')
+            log_file.flush()
+            raise OperationCancelled()
+
         # Only proceed if no errors have been found
         if not error_encountered:
             start_idx = i
             end_idx = i + batch_size
 
-            # Partition data into batch
-            batch_data = data_lst[start_idx:end_idx]
+            # Partition data into batch, as a 2d list. The first row is client data - only shown in dev, never written to the run log
+            batch_data = data_frame.iloc[start_idx:end_idx].to_dict('split')['data']
+            if batch_num == 1:
+                logger.debug('%s', batch_data[0])
         
             # Insert using excutemany
             st = time()
@@ -131,6 +306,11 @@ def insert_table_to_db(connection: Connection, table_name: str, data_frame: pd.D
             log_file.write(f'Inserted {len(batch_data)} rows into {table_name} in {timedelta(seconds=et-st)} seconds\n')
             rows_inserted += len(batch_data)
 
+            if update_progress_func:
+                elapsed = et - insert_st
+                update_progress_func(ProgressEvent(stage=ProgressStage.INSERT, table=table_name, rows_done=rows_inserted, rows_total=total_rows, 
+                                                   elapsed=elapsed, rate=rows_inserted / elapsed if elapsed > 0 else 0))
+
         batch_num += 1
 
     insert_et = time()
@@ -0,0 +1,384 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Local, file-based stand-in for the Azure SQL database, so uploads/downloads/deletes can be run and timed off-network.
+Set DATA_PROFILER_DB_BACKEND=local and DatabaseConnection hands out one of these instead of a pyodbc connection.
+
+Each schema (OutputTables_Dev, OutputTables_Prod) is its own SQLite file, ATTACHed under the schema's name, so the
+[OutputTables_Dev].[Table] names in the sql/ templates resolve as they are. Tables are created from SCHEMAS, with columns
+from OUTPUT_TABLES_COLS_MAPPER (or the table's insert template, for Project and the retired tables).
+
+SQLite understands most of the templates already. translate_tsql handles the T-SQL-only parts:
+    DECLARE @var TYPE = expr    -> inlined wherever @var is used (parameters become numbered ?N so they can repeat)
+    SELECT TOP (n)              -> LIMIT n on the outer query, dropped inside (scalar) subqueries
+    APPROX_COUNT_DISTINCT(x)    -> COUNT(DISTINCT x)
+    CONCAT(a, b)                -> (a || b)
+    DELETE alias FROM t alias JOIN ...  -> DELETE FROM t WHERE rowid IN (SELECT alias.rowid FROM t alias JOIN ...)
+and batches of statements (delete_from_tables_by_project_number.sql) are split up and run one at a time.
+
+LocalConnection/LocalCursor mimic the parts of the pyodbc API the app uses (execute with a params sequence or varargs,
+executemany, fetchmany, autocommit, fast_executemany, nextset), and sqlite errors are re-raised as the matching pyodbc error
+'''
+
+from datetime import date, datetime, time
+from functools import lru_cache
+import os
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyodbc
+except ImportError:
+    pyodbc = None
+
+from .helpers.constants import SCHEMAS, OUTPUT_TABLES_COLS_MAPPER
+from .sql_registry import SqlRegistry
+from ..helpers.constants.app_constants import DB_BACKEND_ENV_VAR, LOCAL_DB_BACKEND, LOCAL_DB_DIR_ENV_VAR, LOCAL_DB_DEFAULT_DIR, SQL_DIR
+
+
+# Declared types for the columns that aren't plain text/numbers. SQLite keeps whatever type is inserted for the rest
+LOCAL_COLUMN_TYPES = {
+    'StartDate': 'DATE', 'UploadDate': 'DATE', 'ReceivedDate': 'DATE', 'PickDate': 'DATE', 'ShipDate': 'DATE', 'Date': 'DATE',
+    'Week': 'DATE', 'Period': 'DATE', 'ArrivalDate': 'DATE', 'ExpectedDate': 'DATE', 'Month': 'DATE',
+    'ArrivalTime': 'TIME', 'ExpectedTime': 'TIME',
+    'DataUploaded': 'BIT', 'ProcessInboundData': 'BIT', 'ProcessInventoryData': 'BIT', 'ProcessOutboundData': 'BIT', 'ExistsInInbound': 'BIT',
+}
+
+_INSERT_COLUMNS_RGX = re.compile(r'INSERT\s+INTO\s+\[?(\w+)\]?\.\[?(\w+)\]?\s*\((.*?)\)', flags=re.IGNORECASE | re.DOTALL)
+
+# Things a "?" / "--" inside of doesn't count - string literals and [bracketed] identifiers
+_SQL_TOKENS_RGX = re.compile(r"'(?:[^']|'')*'|\[[^\]]*\]|--[^\n]*|/\*.*?\*/|\?", flags=re.DOTALL)
+_NON_PARAMETER_RGX = re.compile(r"'(?:[^']|'')*'|\[[^\]]*\]")
+_DECLARE_RGX = re.compile(r'\bDECLARE\s+(.*?);', flags=re.IGNORECASE | re.DOTALL)
+_DECLARE_VARIABLE_RGX = re.compile(r'^\s*@(\w+)\s+\w+(?:\s*\([^)]*\))?\s*=\s*(.*?)\s*$', flags=re.DOTALL)
+_TOP_RGX = re.compile(r'\bSELECT\s+TOP\s*\(?\s*(\d+)\s*\)?', flags=re.IGNORECASE)
+_CONCAT_RGX = re.compile(r'\bCONCAT\s*\(([^()]*)\)', flags=re.IGNORECASE)
+_DELETE_JOIN_RGX = re.compile(r'^\s*DELETE\s+(\w+)\s+FROM\s+(\S+)\s+\1\b(.*)$', flags=re.IGNORECASE | re.DOTALL)
+
+
+def use_local_backend() -> bool:
+    ''' True if DATA_PROFILER_DB_BACKEND says to use the local database instead of the Azure SQL server '''
+
+    return os.environ.get(DB_BACKEND_ENV_VAR, '').strip().lower() == LOCAL_DB_BACKEND
+
+
+''' Translation '''
+
+@lru_cache(maxsize=256)
+def translate_tsql(query: str) -> tuple[str, ...]:
+    '''
+    Rewrite a T-SQL query from the sql/ templates so SQLite can run it (see module docstring for what's handled)
+
+    Params
+    ------
+    query : str
+        T-SQL with "?" parameter markers
+
+    Return
+    ------
+    SQLite statements, in order. The i-th "?" of the original query is "?i" in the result, so every statement binds
+    from the same params
+    '''
+
+    # Drop comments and number the parameter markers, leaving string literals + [identifiers] alone
+    counter = iter(range(1, 10_000))
+
+    def replace_token(match: re.Match) -> str:
+        token = match.group(0)
+        if token == '?':
+            return f'?{next(counter)}'
+        if token.startswith('--') or token.startswith('/*'):
+            return ' '
+        return token
+
+    sql = _SQL_TOKENS_RGX.sub(replace_token, query)
+
+    # Inline DECLAREd variables, in order (a variable can use the ones before it)
+    variables: dict[str, str] = {}
+    for declare in _DECLARE_RGX.finditer(sql):
+        for part in _split_top_level(declare.group(1)):
+            match = _DECLARE_VARIABLE_RGX.match(part)
+            if match is None:
+                raise ValueError(f'Can\'t translate DECLARE for the local database: {part.strip()}')
+            name, expression = match.groups()
+            variables[name] = _replace_variables(expression, variables)
+
+    sql = _replace_variables(_DECLARE_RGX.sub('', sql), variables)
+
+    return tuple(_translate_statement(statement.strip()) for statement in _split_top_level(sql, separator=';') if statement.strip())
+
+
+def _translate_statement(sql: str) -> str:
+    sql = re.sub(r'\bAPPROX_COUNT_DISTINCT\s*\(', 'COUNT(DISTINCT ', sql, flags=re.IGNORECASE)
+    sql = _CONCAT_RGX.sub(lambda match: '(' + ' || '.join(arg.strip() for arg in _split_top_level(match.group(1))) + ')', sql)
+    sql = _translate_top(sql)
+
+    match = _DELETE_JOIN_RGX.match(sql)
+    if match:
+        alias, table, rest = match.groups()
+        sql = f'DELETE FROM {table} WHERE rowid IN (SELECT {alias}.rowid FROM {table} {alias}{rest})'
+
+    return sql
+
+
+def _split_top_level(text: str, separator: str = ',') -> list[str]:
+    ''' Split on separators that aren't inside parentheses or string literals '''
+
+    parts, depth, start, in_string = [], 0, 0, False
+    for i, char in enumerate(text):
+        if char == "'":
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+
+    return parts
+
+
+def _replace_variables(sql: str, variables: dict[str, str]) -> str:
+    # Longest names first, so @Days doesn't eat the start of @DaysActive
+    for name in sorted(variables, key=len, reverse=True):
+        sql = re.sub(rf'@{name}\b', lambda _: f'({variables[name]})', sql)
+    return sql
+
+
+def _translate_top(sql: str) -> str:
+    limit = None
+
+    def replace(match: re.Match) -> str:
+        nonlocal limit
+        depth = sql[:match.start()].count('(') - sql[:match.start()].count(')')
+        if depth == 0:
+            limit = match.group(1)
+        return 'SELECT'
+
+    sql = _TOP_RGX.sub(replace, sql)
+    return f'{sql} LIMIT {limit}' if limit is not None else sql
+
+
+def _max_parameter(statement: str) -> int:
+    # sqlite wants exactly as many params as the highest ?N a statement uses
+    return max((int(n) for n in re.findall(r'\?(\d+)', _NON_PARAMETER_RGX.sub('', statement))), default=0)
+
+
+''' Connection '''
+
+class LocalCursor():
+    ''' sqlite3 cursor with the pyodbc cursor calls the app uses '''
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+        self.fast_executemany = False   # No-op - accepted so insert code can set it
+        self.arraysize = 1
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def execute(self, query: str, *params) -> 'LocalCursor':
+        # pyodbc takes the params either as one sequence or as separate arguments
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+
+        params = tuple(params)
+        with _as_pyodbc_errors():
+            for statement in translate_tsql(query):
+                self._cursor.execute(statement, params[:_max_parameter(statement)])
+        return self
+
+    def executemany(self, query: str, params_seq) -> 'LocalCursor':
+        statements = translate_tsql(query)
+        if len(statements) != 1:
+            raise ValueError('executemany only takes a single statement')
+
+        with _as_pyodbc_errors():
+            self._cursor.executemany(statements[0], params_seq)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size: int | None = None) -> list:
+        return self._cursor.fetchmany(size or self.arraysize)
+
+    def fetchall(self) -> list:
+        return self._cursor.fetchall()
+
+    def nextset(self) -> bool:
+        # Translated queries are always a single statement
+        return False
+
+    def close(self):
+        self._cursor.close()
+
+
+class LocalConnection():
+    ''' sqlite3 connection with the schemas ATTACHed, plus the pyodbc connection calls the app uses '''
+
+    def __init__(self, db_dir: str):
+        self.db_dir = db_dir
+        self._connection = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False, timeout=30)
+
+        for schema in SCHEMAS:
+            self._connection.execute('ATTACH DATABASE ? AS ' + schema, (os.path.join(db_dir, f'{schema}.sqlite'),))
+            self._connection.execute(f'PRAGMA {schema}.journal_mode=WAL')
+
+        # pyodbc connections start with autocommit off
+        self._autocommit = False
+
+    @property
+    def autocommit(self) -> bool:
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value: bool):
+        if value and not self._autocommit:
+            self._connection.commit()
+        self._connection.isolation_level = None if value else ''
+        self._autocommit = value
+
+    def cursor(self) -> LocalCursor:
+        return LocalCursor(self._connection.cursor())
+
+    def execute(self, query: str, *params) -> LocalCursor:
+        return self.cursor().execute(query, *params)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+
+def local_db_dir() -> str:
+    return os.environ.get(LOCAL_DB_DIR_ENV_VAR) or LOCAL_DB_DEFAULT_DIR
+
+
+def connect_local(db_dir: str | None = None) -> LocalConnection:
+    '''
+    Open the local database, creating its files + tables on first use
+
+    Params
+    ------
+    db_dir : str | None
+        folder holding one .sqlite file per schema. If None, DATA_PROFILER_LOCAL_DB_DIR (or LOCAL_DB_DEFAULT_DIR)
+
+    Return
+    ------
+    LocalConnection
+    '''
+
+    db_dir = db_dir or local_db_dir()
+    os.makedirs(db_dir, exist_ok=True)
+
+    connection = LocalConnection(db_dir)
+    create_local_schema(connection)
+
+    return connection
+
+
+def create_local_schema(connection: LocalConnection):
+    ''' CREATE TABLE IF NOT EXISTS every table in SCHEMAS, plus an index on each ProjectNumber* column (what deletes/joins filter on) '''
+
+    for schema, schema_info in SCHEMAS.items():
+        table_columns = local_table_columns(schema)
+
+        for table in schema_info['tables']:
+            columns = table_columns.get(table)
+            if not columns:
+                print(f'No columns known for {schema}.{table} - not creating it in the local database')
+                continue
+
+            column_defs = ', '.join(f'[{col}] {LOCAL_COLUMN_TYPES.get(col, "")}'.strip() for col in columns)
+            connection._connection.execute(f'CREATE TABLE IF NOT EXISTS {schema}.[{table}] ({column_defs})')
+
+            for col in columns:
+                if col.lower().startswith('projectnumber'):
+                    connection._connection.execute(f'CREATE INDEX IF NOT EXISTS {schema}.[IX_{table}_{col}] ON [{table}] ([{col}])')
+
+    connection.commit()
+
+
+@lru_cache(maxsize=None)
+def local_table_columns(schema: str, sql_dir: str = SQL_DIR) -> dict[str, tuple[str, ...]]:
+    '''
+    {table: columns} for a schema - OUTPUT_TABLES_COLS_MAPPER's columns, plus any others the table's insert template writes
+    (the mapper only has the tables the transform builds dataframes for, and lags the templates in places)
+    '''
+
+    columns = {table: list(cols) for table, cols in OUTPUT_TABLES_COLS_MAPPER.items()}
+    for template in SqlRegistry(sql_dir).templates.values():
+        match = _INSERT_COLUMNS_RGX.search(template.text)
+        if match and match.group(1) == schema:
+            table_columns = columns.setdefault(match.group(2), [])
+            for col in match.group(3).split(','):
+                col = col.strip().strip('[]')
+                # Column names are case-insensitive, same as on SQL Server
+                if col.lower() not in {existing.lower() for existing in table_columns}:
+                    table_columns.append(col)
+
+    return {table: tuple(cols) for table, cols in columns.items()}
+
+
+''' Type adapters '''
+
+class _as_pyodbc_errors():
+    ''' Re-raise sqlite errors as the pyodbc error the app's except blocks expect '''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        if pyodbc is None or exception_type is None or not issubclass(exception_type, sqlite3.Error):
+            return False
+
+        if issubclass(exception_type, sqlite3.IntegrityError):
+            raise pyodbc.IntegrityError(str(exception_value)) from exception_value
+        if issubclass(exception_type, sqlite3.OperationalError):
+            raise pyodbc.OperationalError(str(exception_value)) from exception_value
+        raise pyodbc.DatabaseError(str(exception_value)) from exception_value
+
+
+def _convert_datetime(value: bytes):
+    text = value.decode()
+    return datetime.fromisoformat(text) if text else None
+
+
+def _convert_time(value: bytes):
+    text = value.decode()
+    if not text:
+        return None
+    return datetime.fromisoformat(text).time() if ' ' in text or 'T' in text else time.fromisoformat(text)
+
+
+sqlite3.register_adapter(pd.Timestamp, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(time, lambda value: value.isoformat())
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.int32, int)
+sqlite3.register_adapter(np.float64, float)
+sqlite3.register_adapter(np.bool_, bool)
+
+sqlite3.register_converter('DATE', _convert_datetime)
+sqlite3.register_converter('TIME', _convert_time)
+sqlite3.register_converter('BIT', lambda value: bool(int(value)) if value else None)
@@ -0,0 +1,184 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Registry of the SQL templates under the sql/ directory. Every .sql file is read and validated once, then handed out as a
+SqlTemplate that binds its "?" parameters properly instead of string-replacing them into the query text. Keeping the
+query text constant lets SQL Server reuse the cached plan across projects
+'''
+
+import os
+import re
+from functools import lru_cache
+
+from .helpers import constants as db_constants
+
+
+# Strip out anything a "?" inside of shouldn't count as a parameter marker - comments, string literals, [bracketed] identifiers
+_NON_PARAMETER_SQL_RGX = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\[[^\]]*\]", flags=re.DOTALL)
+_SQL_COMMENTS_RGX = re.compile(r"--[^\n]*|/\*.*?\*/", flags=re.DOTALL)
+
+# Schemas each environment's templates are allowed to touch
+_ENVIRONMENT_SCHEMAS = {
+    'DEV': ('OutputTables_Dev', 'OutputTables_Prod'),
+    'PROD': ('OutputTables_Prod', 'OutputTables_Dev'),
+}
+
+
+def count_sql_parameters(query: str) -> int:
+    '''
+    Count the "?" parameter markers in a SQL query, ignoring any inside comments, string literals, or [bracketed] identifiers
+
+    Params
+    ------
+    query : str
+        some SQL query
+
+    Return
+    ------
+    number of parameter markers
+    '''
+
+    return _NON_PARAMETER_SQL_RGX.sub('', query).count('?')
+
+
+class SqlTemplate:
+    '''
+    A single SQL file, loaded once. Use bind() to pair the query text with its parameters for cursor.execute
+    '''
+
+    def __init__(self, relative_path: str, text: str):
+        self.relative_path = relative_path
+        self.text = text
+        self.param_count = count_sql_parameters(text)
+
+    def __repr__(self) -> str:
+        return f'SqlTemplate({self.relative_path!r}, param_count={self.param_count})'
+
+    def bind(self, *params) -> tuple[str, tuple]:
+        '''
+        Pair the query text with its parameters
+
+        Params
+        ------
+        params
+            one value per "?" in the query, in order
+
+        Return
+        ------
+        (query, params) - ready for cursor.execute(query, params)
+        '''
+
+        if len(params) != self.param_count:
+            raise ValueError(f'{self.relative_path} expects {self.param_count} parameter(s), got {len(params)}')
+
+        return self.text, tuple(params)
+
+
+class SqlRegistry:
+    '''
+    All SQL templates under a sql/ directory, keyed by their path relative to it (the same paths used in database/helpers/constants.py)
+    '''
+
+    def __init__(self, sql_dir: str):
+        self.sql_dir = sql_dir
+        self.templates: dict[str, SqlTemplate] = {}
+
+        for root, _, files in os.walk(sql_dir):
+            for file in files:
+                # Skip non-sql files and retired "OLD" templates
+                if not file.endswith('.sql') or file.upper().startswith('OLD'):
+                    continue
+
+                path = os.path.join(root, file)
+                relative_path = os.path.relpath(path, sql_dir).replace(os.sep, '/')
+
+                with open(path) as f:
+                    self.templates[relative_path] = SqlTemplate(relative_path=relative_path, text=f.read())
+
+        self._paths_by_text = {template.text: relative_path for relative_path, template in self.templates.items()}
+
+    def __contains__(self, relative_path: str) -> bool:
+        return relative_path in self.templates
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def get(self, relative_path: str) -> SqlTemplate:
+        ''' Returns the template at relative_path (e.g. "PROD/select/get_sku_list.sql") '''
+
+        if relative_path not in self.templates:
+            raise KeyError(f'No SQL template "{relative_path}" under {self.sql_dir}')
+
+        return self.templates[relative_path]
+
+    def name_for(self, query: str) -> str | None:
+        ''' The relative path of the template whose text is exactly query, or None if it isn't one of ours '''
+
+        return self._paths_by_text.get(query)
+
+    def validate(self) -> list[str]:
+        '''
+        Sanity check the templates
+
+        1) every sql file referenced in database/helpers/constants.py exists
+        2) DEV templates only touch the dev schema and PROD templates only touch the prod schema
+
+        Return
+        ------
+        list of problems found (empty if everything is good)
+        '''
+
+        problems = []
+
+        for relative_path in referenced_sql_files():
+            if relative_path not in self.templates:
+                problems.append(f'Missing SQL file: {relative_path}')
+
+        for relative_path, template in self.templates.items():
+            environment = relative_path.split('/')[0]
+            if environment not in _ENVIRONMENT_SCHEMAS:
+                continue
+
+            _, forbidden_schema = _ENVIRONMENT_SCHEMAS[environment]
+            if forbidden_schema in _SQL_COMMENTS_RGX.sub('', template.text):
+                problems.append(f'{relative_path} references {forbidden_schema}')
+
+        return problems
+
+
+def referenced_sql_files() -> set[str]:
+    ''' Every sql file path in database/helpers/constants.py, including those inside the *_MAPPER dicts '''
+
+    paths = set()
+    for name, value in vars(db_constants).items():
+        if name.startswith('_'):
+            continue
+
+        values = value.values() if isinstance(value, dict) else [value]
+        for v in values:
+            if isinstance(v, str) and v.endswith('.sql'):
+                paths.add(v)
+
+    return paths
+
+
+@lru_cache(maxsize=None)
+def load_sql_registry(sql_dir: str) -> SqlRegistry:
+    '''
+    Load (once per sql_dir) and validate the SQL templates. Later calls with the same sql_dir return the same registry
+
+    Raise
+    ------
+    ValueError if any template fails validation
+    '''
+
+    registry = SqlRegistry(sql_dir=sql_dir)
+
+    problems = registry.validate()
+    if problems:
+        raise ValueError(f'Invalid SQL templates in {sql_dir}:\n' + '\n'.join(problems))
+
+    print(f'Loaded {len(registry)} SQL templates from {sql_dir}')
+    return registry
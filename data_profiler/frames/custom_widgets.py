@@ -6,10 +6,10 @@ Oct 2024
 Custom ctk frames for DataProfiler
 '''
 
-from customtkinter import CTkToplevel, CTkLabel
+from customtkinter import CTkToplevel, CTkLabel, StringVar
 
 # Data Profiler
-from ..helpers.models.ProjectInfo import BaseProjectInfo
+from ..helpers.models.ProjectInfo import BaseProjectInfo, ExistingProjectProjectInfo
 
 # Apex GUI
 from apex_gui.frames.custom_widgets import EntryWithLabel, TextboxWithLabel, CheckbuttonWithLabel, DropdownWithLabel
@@ -108,6 +108,59 @@ class ProjectInfoFrame(SectionWithScrollbar):
         self.notes.clear_input()
 
 
+class ProjectDataInfoFrame(SectionWithScrollbar):
+    '''
+    Read-only summary of a project's uploaded data (upload date, transform options). Values are held in StringVars, so
+    `set_project_info()` updates the frame in place rather than it having to be rebuilt
+    '''
+
+    FIELDS = ['Data Uploaded', 'Upload Date', 'Date for Analysis', 'Weekend Date Rule', 'Inbound Processed', 'Inventory Processed', 'Outbound Processed']
+
+    def __init__(self, master, width: int = 350, height: int = 250):
+        super().__init__(master, width=width, height=height)
+
+        ''' Create '''
+
+        self.values: dict[str, StringVar] = {}
+        self.rows: dict[str, Frame] = {}
+        for field in self.FIELDS:
+            row = Frame(self)
+            self.values[field] = StringVar(row, '')
+
+            CTkLabel(row, text=field, font=SectionSubheaderFont()).grid(row=0, column=0, sticky='w')
+            CTkLabel(row, textvariable=self.values[field]).grid(row=0, column=1, sticky='e')
+            row.grid_columnconfigure(1, weight=1)
+
+            self.rows[field] = row
+
+        ''' Grid '''
+
+        self.grid_columnconfigure(0, weight=1)
+
+        for idx, field in enumerate(self.FIELDS):
+            top_pad = 5 if idx == 0 else 20
+            bottom_pad = 5 if idx == len(self.FIELDS) - 1 else 0
+            self.rows[field].grid(row=idx, column=0, sticky='ew', padx=20, pady=(top_pad, bottom_pad))
+
+    def set_project_info(self, project_info: ExistingProjectProjectInfo):
+        transform_options = project_info.transform_options
+
+        self.values['Data Uploaded'].set(str(project_info.data_uploaded))
+        self.values['Upload Date'].set(str(project_info.upload_date))
+        self.values['Date for Analysis'].set(transform_options.date_for_analysis.value if transform_options.date_for_analysis else '')
+        self.values['Weekend Date Rule'].set(transform_options.weekend_date_rule.value if transform_options.weekend_date_rule else '')
+        self.values['Inbound Processed'].set(str(transform_options.process_inbound_data))
+        self.values['Inventory Processed'].set(str(transform_options.process_inventory_data))
+        self.values['Outbound Processed'].set(str(transform_options.process_outbound_data))
+
+        # Only "Data Uploaded" means anything until there's data
+        for field in self.FIELDS[1:]:
+            if project_info.data_uploaded:
+                self.rows[field].grid()
+            else:
+                self.rows[field].grid_remove()
+
+
 class DataDescriberColumnSelector(CTkToplevel):
     '''
     Poo
@@ -0,0 +1,39 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Cooperative cancellation for long jobs (uploads, downloads, deletes). The GUI holds a CancellationToken and calls cancel();
+the worker checks it between chunks/batches/stages and stops by raising OperationCancelled, so whoever owns the DB work can
+roll back or clean up
+'''
+
+from threading import Event
+
+
+class OperationCancelled(Exception):
+    ''' Raised from inside a job once its CancellationToken has been cancelled '''
+
+    def __init__(self, message: str = 'Operation cancelled.'):
+        super().__init__(message)
+
+
+class CancellationToken():
+    '''
+    Thread-safe cancel flag shared between the thread that requests cancellation and the worker doing the job
+    '''
+
+    def __init__(self):
+        self._event = Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        ''' Call between units of work - raises OperationCancelled if cancel() has been called '''
+
+        if self._event.is_set():
+            raise OperationCancelled()
@@ -6,6 +6,9 @@ Oct 2024
 General Python constants for DataProfiler app
 '''
 
+import os
+import tempfile
+
 
 ''' General '''
 
@@ -17,3 +20,127 @@ RESOURCES_DIR_DEV = './resources'
 SQL_DIR = f'{RESOURCES_DIR}/sql'
 SQL_DIR_DEV = f'{RESOURCES_DIR_DEV}/sql'
 
+
+''' Downloads '''
+
+# Columnar download formats. zstd gives a much better ratio than snappy at a similar read speed
+PARQUET_COMPRESSION = 'zstd'
+FEATHER_COMPRESSION = 'zstd'
+
+# Excel can't hold more rows than this in a single sheet (minus the header row)
+EXCEL_MAX_ROWS = 1048575
+
+# "Download all" runs each report on its own thread with its own pooled DB connection
+DOWNLOAD_ALL_MAX_WORKERS = 4
+
+
+''' Project Metadata '''
+
+# Project numbers + project info are cached between calls. This app's own creates/updates/deletes update the cache directly,
+# so this only bounds how stale a change made from another machine can be
+PROJECT_METADATA_CACHE_TTL_SECONDS = 300
+
+
+''' Database Backend '''
+
+# Set DATA_PROFILER_DB_BACKEND=local to run against local SQLite files instead of the Azure SQL database (offline runs + benchmarks)
+DB_BACKEND_ENV_VAR = 'DATA_PROFILER_DB_BACKEND'
+LOCAL_DB_BACKEND = 'local'
+
+# Folder the local database files live in. Override with DATA_PROFILER_LOCAL_DB_DIR
+LOCAL_DB_DIR_ENV_VAR = 'DATA_PROFILER_LOCAL_DB_DIR'
+LOCAL_DB_DEFAULT_DIR = './local_db'
+
+
+''' Memory '''
+
+# Uploads are planned against this share of the memory available when they start. Set DATA_PROFILER_MEMORY_BUDGET_MB to use a fixed budget
+MEMORY_BUDGET_FRACTION = 0.7
+MEMORY_BUDGET_ENV_VAR = 'DATA_PROFILER_MEMORY_BUDGET_MB'
+
+# Rough sizing of dataframes from CSV samples. Strings are python objects (~49 bytes + 1 per character, + an 8 byte pointer),
+# numbers/dates are 8 bytes. Output tables come to about 1.5x the inputs, and a fillna/reindex/merge copies one table at a time
+MEMORY_SAMPLE_BYTES = 1024 * 1024
+MEMORY_STRING_CELL_BYTES = 57
+MEMORY_NUMERIC_CELL_BYTES = 8
+MEMORY_OUTPUT_TO_INPUT_RATIO = 1.5
+MEMORY_COPIES_OF_LARGEST_TABLE = 2
+
+# Rows per executemany batch. Each batch is converted to python lists just before it's sent, so smaller batches use less memory
+INSERT_BATCH_SIZE = 100000
+CHUNKED_INSERT_BATCH_SIZE = 20000
+
+
+''' Preview '''
+
+# A preview reads at most this much of each big file, as evenly spaced blocks (so the sample spans the whole date range).
+# Files smaller than that are used whole
+PREVIEW_SAMPLE_BYTES = 8 * 1024 * 1024
+PREVIEW_SAMPLE_BLOCKS = 64
+
+# Header rows for the sampled orders/POs are looked for in windows of the header file at the same relative positions, this many
+# times wider than the details blocks (proportionally). If fewer than PREVIEW_MIN_HEADER_MATCH_RATE are found that way (the
+# files aren't sorted alike), the whole header file is scanned
+PREVIEW_HEADER_WINDOW_MARGIN = 4
+PREVIEW_MIN_HEADER_MATCH_RATE = 0.5
+
+# Item Masters up to this size are used whole. Bigger ones are cut down to the sampled SKUs
+PREVIEW_FULL_ITEM_MASTER_BYTES = 64 * 1024 * 1024
+
+
+''' Dry Runs '''
+
+# Each upload records every table's insert throughput (rows/s) here, and upload times are predicted from the median of a table's
+# last THROUGHPUT_HISTORY_MAX_RECORDS inserts. Inserts of fewer than THROUGHPUT_HISTORY_MIN_ROWS rows are mostly round trips, so
+# they're not recorded. Before there's any history, DEFAULT_INSERT_ROWS_PER_SECOND is used
+THROUGHPUT_HISTORY_ENV_VAR = 'DATA_PROFILER_THROUGHPUT_HISTORY'
+THROUGHPUT_HISTORY_DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.data_profiler', 'insert_throughput.json')
+THROUGHPUT_HISTORY_MAX_RECORDS = 20
+THROUGHPUT_HISTORY_MIN_ROWS = 1000
+DEFAULT_INSERT_ROWS_PER_SECOND = 20000
+
+# Output tables built by a dry run are spilled here (one folder per set of inputs), so the real upload can skip straight to the
+# inserts. Spills older than TRANSFORM_SPILL_MAX_AGE_HOURS are removed whenever a new one is saved
+TRANSFORM_SPILL_DIR_ENV_VAR = 'DATA_PROFILER_SPILL_DIR'
+TRANSFORM_SPILL_DEFAULT_DIR = os.path.join(tempfile.gettempdir(), 'data-profiler-spill')
+TRANSFORM_SPILL_MAX_AGE_HOURS = 72
+
+
+''' Logging '''
+
+# Run logs (upload/delete) are written by a background thread, which only flushes this often (and when the run ends).
+# The Downloads folder is often network-mapped, so flushing after every line was slow
+RUN_LOG_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+''' Profiling '''
+
+# Sampling interval when a run is profiled (profile_run=True) with pyinstrument. 1 ms keeps overhead low for multi-minute uploads
+PROFILE_SAMPLE_INTERVAL_SECONDS = 0.001
+
+# Instrumented executemany calls size their parameters from this many randomly picked rows, scaled up to the whole batch.
+# Sizing every cell of a 100k-row insert cost a noticeable share of the insert itself
+PARAM_BYTES_SAMPLE_ROWS = 1000
+
+
+''' Data Describer '''
+
+# Files bigger than this are described in streaming mode (read in chunks, approximate quantiles) instead of loaded whole
+DESCRIBE_STREAMING_MIN_FILE_SIZE = 250 * 1024 * 1024
+DESCRIBE_CHUNK_ROWS = 200000
+
+# Sketch sizes for streaming mode. Bigger = more accurate + more memory
+DESCRIBE_QUANTILE_SKETCH_K = 2000
+DESCRIBE_HISTOGRAM_BINS = 2048
+DESCRIBE_TOP_VALUES_CAPACITY = 10000
+DESCRIBE_DISTINCT_SKETCH_K = 4096
+
+# Charts are drawn from aggregates, so the HTML size doesn't depend on the row count. 
+# Box plots are drawn for at most DESCRIBE_MAX_GROUPS groups (the rest are lumped into "Other"), with a sample of outliers per group
+DESCRIBE_CHART_BINS = 100
+DESCRIBE_MAX_GROUPS = 50
+DESCRIBE_MAX_BOX_OUTLIERS = 200
+
+# Chart figures are built/serialized on a process pool once there are enough columns to pay for starting it
+DESCRIBE_PARALLEL_CHARTS_MIN_COLUMNS = 6
+DESCRIBE_MAX_CHART_WORKERS = 4
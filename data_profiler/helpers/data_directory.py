@@ -5,7 +5,9 @@ Sep 2025
 '''
 
 from typing import Callable
+import logging
 import os
+from time import time
 from io import TextIOWrapper
 import pandas as pd
 
@@ -15,19 +17,26 @@ from ..helpers.constants.data_file_constants import *
 
 from .models.DataFiles import DataDirectoryType, DataDirectoryValidation, UploadFileType, FileValidation
 from .models.TransformOptions import TransformOptions
+from .cancellation import CancellationToken
+from .models.Progress import ProgressStage, ProgressEvent
 
 
+logger = logging.getLogger(__name__)
+
 
 class DataDirectory:
     '''
     Used to track the contents and validity of a data directory for data uploads
     '''
 
-    def __init__(self, path: str, transform_options: TransformOptions, update_progress_text_func: Callable[[str], None] = None):
+    def __init__(self, path: str, transform_options: TransformOptions, update_progress_text_func: Callable[[str | ProgressEvent], None] = None, 
+                 cancel_token: CancellationToken | None = None):
         self.path = path
         self.directory_type = transform_options.data_directory_type
         self.transform_options = transform_options
         self.update_progress_text_func = update_progress_text_func
+        self.cancel_token = cancel_token
+        self._read_st = None
 
         self.validation_obj = DataDirectoryValidation(file_path=self.path)
 
@@ -175,11 +184,18 @@ class DataDirectory:
     
     def read_and_validate_file_contents(self, log_file: TextIOWrapper) -> tuple[bool, str]:
         '''
-        Read files
+        Read files. If a cancel token was given, it's checked before each file is read and before validation (raises OperationCancelled)
         '''
         
         if self.update_progress_text_func: self.update_progress_text_func('Reading data...')
 
+        # Plan the read stage by file size, so progress can be reported as a share of bytes read
+        self._read_st = time()
+        if self.update_progress_text_func:
+            for file_type, file_path in self.files_to_read():
+                self.update_progress_text_func(ProgressEvent(stage=ProgressStage.READ, table=file_type.value, unit='bytes', 
+                                                             rows_total=os.path.getsize(file_path), message='Reading data...'))
+
         ## Start
         
         log_file.write(f'1. READ IN UPLOADED FILES\n')
@@ -211,8 +227,10 @@ class DataDirectory:
         ## Read files (and cleanse along the way)
         
         # If item master isn't present, error will already have come up
+        self._check_cancelled()
         item_master, item_master_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.ITEM_MASTER, file_path=self.validation_obj.item_master.file_path, log_file=log_file)
-        print(item_master.head())
+        self._report_read(file_type=UploadFileType.ITEM_MASTER, file_path=self.validation_obj.item_master.file_path, df=item_master)
+        logger.debug('%s', item_master.head())
         print(f'Errors reading item master: {", ".join(item_master_errors_list)}')
         if (len(item_master_errors_list) > 0):
             valid_data = False
@@ -221,8 +239,10 @@ class DataDirectory:
 
         if self.transform_options.process_inbound_data:
             if self.directory_type == DataDirectoryType.REGULAR:
+                self._check_cancelled()
                 inbound, inbound_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.INBOUND, file_path=self.validation_obj.inbound.file_path, log_file=log_file)
-                print(inbound.head())
+                self._report_read(file_type=UploadFileType.INBOUND, file_path=self.validation_obj.inbound.file_path, df=inbound)
+                logger.debug('%s', inbound.head())
                 print(f'Errors reading inbound: {", ".join(inbound_errors_list)}')
                 if len(inbound_errors_list) > 0:
                     valid_data = False
@@ -231,15 +251,19 @@ class DataDirectory:
                 IB_SKUS = inbound['SKU'].unique().tolist()
 
             else:
+                self._check_cancelled()
                 inbound_header, inbound_header_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.INBOUND_HEADER, file_path=self.validation_obj.inbound_header.file_path, log_file=log_file)
-                print(inbound_header.head())
+                self._report_read(file_type=UploadFileType.INBOUND_HEADER, file_path=self.validation_obj.inbound_header.file_path, df=inbound_header)
+                logger.debug('%s', inbound_header.head())
                 print(f'Errors reading inbound header: {", ".join(inbound_header_errors_list)}')
                 if len(inbound_header_errors_list) > 0:
                     valid_data = False
                     master_errors_dict[UploadFileType.INBOUND_HEADER.value] = inbound_header_errors_list
 
+                self._check_cancelled()
                 inbound_details, inbound_details_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.INBOUND_DETAILS, file_path=self.validation_obj.inbound_details.file_path, log_file=log_file)
-                print(inbound_details.head())
+                self._report_read(file_type=UploadFileType.INBOUND_DETAILS, file_path=self.validation_obj.inbound_details.file_path, df=inbound_details)
+                logger.debug('%s', inbound_details.head())
                 print(f'Errors reading inbound details: {", ".join(inbound_details_errors_list)}')
                 if len(inbound_details_errors_list) > 0:
                     valid_data = False
@@ -250,8 +274,10 @@ class DataDirectory:
                 IBD_RECEIPTS = inbound_details['PO_Number'].unique().tolist()
 
         if self.transform_options.process_inventory_data:
+            self._check_cancelled()
             inventory, inventory_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.INVENTORY, file_path=self.validation_obj.inventory.file_path, log_file=log_file)
-            print(inventory.head())
+            self._report_read(file_type=UploadFileType.INVENTORY, file_path=self.validation_obj.inventory.file_path, df=inventory)
+            logger.debug('%s', inventory.head())
             print(f'Errors reading inventory: {", ".join(inventory_errors_list)}')
             if len(inventory_errors_list) > 0:
                 valid_data = False
@@ -261,8 +287,10 @@ class DataDirectory:
 
         if self.transform_options.process_outbound_data:
             if self.directory_type == DataDirectoryType.REGULAR:
+                self._check_cancelled()
                 outbound, outbound_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.OUTBOUND, file_path=self.validation_obj.outbound.file_path, log_file=log_file)
-                print(outbound.head())
+                self._report_read(file_type=UploadFileType.OUTBOUND, file_path=self.validation_obj.outbound.file_path, df=outbound)
+                logger.debug('%s', outbound.head())
                 print(f'Errors reading outbound: {", ".join(outbound_errors_list)}')
                 if len(outbound_errors_list) > 0:
                     valid_data = False
@@ -271,15 +299,19 @@ class DataDirectory:
                 OB_SKUS = outbound['SKU'].unique().tolist()
 
             else:
+                self._check_cancelled()
                 order_header, order_header_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.ORDER_HEADER, file_path=self.validation_obj.order_header.file_path, log_file=log_file)
-                print(order_header.head())
+                self._report_read(file_type=UploadFileType.ORDER_HEADER, file_path=self.validation_obj.order_header.file_path, df=order_header)
+                logger.debug('%s', order_header.head())
                 print(f'Errors reading order header: {", ".join(order_header_errors_list)}')
                 if len(order_header_errors_list) > 0:
                     valid_data = False
                     master_errors_dict[UploadFileType.ORDER_HEADER.value] = order_header_errors_list
 
+                self._check_cancelled()
                 order_details, order_details_errors_list = read_and_cleanse_uploaded_data_file(file_type=UploadFileType.ORDER_DETAILS, file_path=self.validation_obj.order_details.file_path, log_file=log_file)
-                print(order_details.head())
+                self._report_read(file_type=UploadFileType.ORDER_DETAILS, file_path=self.validation_obj.order_details.file_path, df=order_details)
+                logger.debug('%s', order_details.head())
                 print(f'Errors reading order details: {", ".join(order_details_errors_list)}')
                 if len(order_details_errors_list) > 0:
                     valid_data = False
@@ -298,6 +330,7 @@ class DataDirectory:
 
         ## Validate files once they're read ##
 
+        self._check_cancelled()
         if self.update_progress_text_func: self.update_progress_text_func('Validating file contents...')
 
         # SKU Checks
@@ -391,6 +424,23 @@ class DataDirectory:
 
         return True, ''
 
+    def release(self, file_type: UploadFileType):
+        ''' Drop a dataframe once it's no longer needed, so its memory can be freed (chunked uploads - see MemoryGovernor) '''
+
+        match file_type:
+            case UploadFileType.ITEM_MASTER:
+                self.item_master = None
+            case UploadFileType.INBOUND_HEADER:
+                self.inbound_header = None
+            case UploadFileType.INBOUND_DETAILS:
+                self.inbound_details = None
+            case UploadFileType.INVENTORY:
+                self.inventory = None
+            case UploadFileType.ORDER_HEADER:
+                self.order_header = None
+            case UploadFileType.ORDER_DETAILS:
+                self.order_details = None
+
     def get_df(self, file_type: UploadFileType):
         match file_type:
             case UploadFileType.ITEM_MASTER:
@@ -406,13 +456,49 @@ class DataDirectory:
             case UploadFileType.ORDER_DETAILS:
                 return self.order_details
 
+    def files_to_read(self) -> list[tuple[UploadFileType, str]]:
+        ''' The (file type, path) of each file read_and_validate_file_contents will read, given the transform options '''
+
+        files = [(UploadFileType.ITEM_MASTER, self.validation_obj.item_master.file_path)]
+
+        if self.transform_options.process_inbound_data:
+            if self.directory_type == DataDirectoryType.REGULAR:
+                files.append((UploadFileType.INBOUND, self.validation_obj.inbound.file_path))
+            else:
+                files.append((UploadFileType.INBOUND_HEADER, self.validation_obj.inbound_header.file_path))
+                files.append((UploadFileType.INBOUND_DETAILS, self.validation_obj.inbound_details.file_path))
+
+        if self.transform_options.process_inventory_data:
+            files.append((UploadFileType.INVENTORY, self.validation_obj.inventory.file_path))
+
+        if self.transform_options.process_outbound_data:
+            if self.directory_type == DataDirectoryType.REGULAR:
+                files.append((UploadFileType.OUTBOUND, self.validation_obj.outbound.file_path))
+            else:
+                files.append((UploadFileType.ORDER_HEADER, self.validation_obj.order_header.file_path))
+                files.append((UploadFileType.ORDER_DETAILS, self.validation_obj.order_details.file_path))
+
+        return files
+
 
     ''' Helper Functions '''
 
+    def _check_cancelled(self):
+        if self.cancel_token: self.cancel_token.raise_if_cancelled()
+
+    def _report_read(self, file_type: UploadFileType, file_path: str, df: pd.DataFrame):
+        if not self.update_progress_text_func:
+            return
+
+        file_size = os.path.getsize(file_path)
+        elapsed = time() - self._read_st
+        self.update_progress_text_func(ProgressEvent(stage=ProgressStage.READ, table=file_type.value, unit='bytes', rows_done=file_size, rows_total=file_size, 
+                                                     bytes_done=file_size, elapsed=elapsed, message=f'Read {file_type.value} ({len(df):,} rows)...'))
+
     def _validate_file_structure(self, file_type: UploadFileType) -> FileValidation:
         file_path = f'{self.path}/{file_type.value}.csv'
         required_columns = FILE_TYPES_COLUMNS_MAPPER[file_type.value]
-        print(required_columns)
+        logger.debug('%s', required_columns)
         
         return validate_file_structure(file_type=file_type, file_path=file_path, required_columns=required_columns)
 
@@ -0,0 +1,138 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Excel reading for the data describer. Opening a big client XLSX is slow, and the describer used to open the same book three
+times (list sheets, peek at the header, full load). Here the workbook handle and each parsed sheet are cached per file path +
+modification time, so all three reuse one parse. Uses the Rust-backed calamine engine when python-calamine is installed,
+otherwise falls back to openpyxl
+'''
+
+import os
+from importlib.util import find_spec
+from threading import Lock
+
+import pandas as pd
+
+
+# Only checks the engine is installed - pandas imports it on the first read
+EXCEL_ENGINE = 'calamine' if find_spec('python_calamine') is not None else 'openpyxl'
+
+
+# Only the most recently used workbook is kept - these can be big
+_cache_lock = Lock()
+_cached_key: tuple | None = None
+_cached_book: pd.ExcelFile | None = None
+_cached_sheets: dict[str, pd.DataFrame] = {}
+
+
+def _file_key(file_path: str) -> tuple:
+    ''' Identifies a version of a file on disk - a changed/saved-over file gets a new key '''
+
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _get_workbook(file_path: str) -> pd.ExcelFile:
+    global _cached_key, _cached_book, _cached_sheets
+
+    key = _file_key(file_path)
+    if key != _cached_key:
+        if _cached_book is not None:
+            _cached_book.close()
+
+        print(f'Opening {file_path} ({EXCEL_ENGINE})...')
+        _cached_book = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
+        _cached_key = key
+        _cached_sheets = {}
+
+    return _cached_book
+
+
+def _get_sheet(file_path: str, sheet_name: str) -> pd.DataFrame:
+    workbook = _get_workbook(file_path)
+
+    if sheet_name not in _cached_sheets:
+        print(f'Reading sheet "{sheet_name}"...')
+        _cached_sheets[sheet_name] = pd.read_excel(workbook, sheet_name=sheet_name)
+
+    return _cached_sheets[sheet_name]
+
+
+def get_sheet_names(file_path: str) -> list[str]:
+    '''
+    List a workbook's sheets
+
+    Params
+    ------
+    file_path : str
+        path to an xlsx file
+
+    Return
+    ------
+    sheet names, in workbook order
+    '''
+
+    with _cache_lock:
+        return list(_get_workbook(file_path).sheet_names)
+
+
+def read_excel_header(file_path: str, sheet_name: str) -> list[str]:
+    '''
+    Column names of a sheet. Parses (and caches) the whole sheet, so the full load that usually follows is free
+
+    Params
+    ------
+    file_path : str
+    sheet_name : str
+
+    Return
+    ------
+    list of column names
+    '''
+
+    with _cache_lock:
+        return _get_sheet(file_path, sheet_name).columns.tolist()
+
+
+def read_excel_sheet(file_path: str, sheet_name: str, usecols: list[str] | None = None) -> pd.DataFrame:
+    '''
+    Load a sheet as a DataFrame, reusing the cached parse if there is one
+
+    Params
+    ------
+    file_path : str
+    sheet_name : str
+    usecols : list[str] | None
+        columns to keep. If None, all of them
+
+    Return
+    ------
+    a copy of the sheet's data (safe to modify)
+    '''
+
+    with _cache_lock:
+        df = _get_sheet(file_path, sheet_name)
+
+    if usecols is not None:
+        missing = [col for col in usecols if col not in df.columns]
+        if missing:
+            raise ValueError(f'Columns not found in sheet "{sheet_name}": {missing}')
+        return df.loc[:, list(usecols)].copy()
+
+    return df.copy()
+
+
+def clear_excel_cache():
+    ''' Drop the cached workbook + sheets (e.g. once the describer is done with them) '''
+
+    global _cached_key, _cached_book, _cached_sheets
+
+    with _cache_lock:
+        if _cached_book is not None:
+            _cached_book.close()
+
+        _cached_key = None
+        _cached_book = None
+        _cached_sheets = {}
@@ -13,6 +13,7 @@ from .functions import csv_given_columns, missing_column_names, invalid_column_n
 
 from ..constants.data_file_constants import FILE_TYPES_DTYPES_MAPPER, DTYPES_DEFAULT_VALUES
 from ..models.DataFiles import UploadFileType, FileValidation
+from ..instrumentation import span
 
 
 
@@ -70,54 +71,56 @@ def read_and_cleanse_uploaded_data_file(file_type: UploadFileType, file_path: st
     pd.DataFrame
     '''
 
-    if log_file: log_file.write(f'Reading {file_type.value}\n')
+    with span(f'read {file_type.value}', file_path=file_path) as record:
+        if log_file: log_file.write(f'Reading {file_type.value}\n')
 
-    dtypes = FILE_TYPES_DTYPES_MAPPER[file_type.value]
+        dtypes = FILE_TYPES_DTYPES_MAPPER[file_type.value]
 
-    df = pd.read_csv(file_path)
-    if log_file: log_file.write(f'Shape: {df.shape}\n')
+        df = pd.read_csv(file_path)
+        if log_file: log_file.write(f'Shape: {df.shape}\n')
 
-    errors_encountered = 0
-    errors_list = []
-    for col, dtype in dtypes.items():
-        if not col in df.columns:
-            continue
+        errors_encountered = 0
+        errors_list = []
+        for col, dtype in dtypes.items():
+            if not col in df.columns:
+                continue
 
-        try:
-            rows_to_fill = 0
-            default_val = DTYPES_DEFAULT_VALUES[dtype]
+            try:
+                rows_to_fill = 0
+                default_val = DTYPES_DEFAULT_VALUES[dtype]
 
-            if dtype == 'date':
-                df[col] = pd.to_datetime(df[col], format='%Y-%m-%d', errors='raise')                # Be strict with dates... want to get these right
-            elif dtype == 'time':
-                df[col] = pd.to_datetime(df[col], format='%H:%M:%S', errors='coerce')
-            elif dtype == 'float64' or dtype == 'int64':
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            elif dtype == 'object':
-                df[col] = df[col].astype("string")
+                if dtype == 'date':
+                    df[col] = pd.to_datetime(df[col], format='%Y-%m-%d', errors='raise')                # Be strict with dates... want to get these right
+                elif dtype == 'time':
+                    df[col] = pd.to_datetime(df[col], format='%H:%M:%S', errors='coerce')
+                elif dtype == 'float64' or dtype == 'int64':
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+                elif dtype == 'object':
+                    df[col] = df[col].astype("string")
             
-            rows_to_fill = len(df.loc[df[col].isna(), :])
-            df[col] = df[col].replace(to_replace=math.nan, value=default_val)
+                rows_to_fill = len(df.loc[df[col].isna(), :])
+                df[col] = df[col].replace(to_replace=math.nan, value=default_val)
             
-            if rows_to_fill > 0:
-                if log_file: log_file.write(f'{col} - replacing erroneous cells with default value "{default_val}" to {rows_to_fill} rows\n')
-
-        except Exception as e:
-            if log_file: log_file.write(f'ERROR - Could not convert field "{col}" to correct type {dtype}: {e}\n')
-            print(f'ERROR converting field "{col}" to correct type: {e}\n')
-            errors_list.append(e)
-            errors_encountered += 1
-
-    if errors_encountered > 0:
-        if log_file: log_file.write(f'{errors_encountered} error(s) encountered converting to correct dtypes.\n\n')
-        print(f'{errors_encountered} error(s) encountered converting to correct dtypes. Quitting before DB insertion.')
-    else:
-        if log_file: log_file.write(f'Dtype conversions successful.\n\n')
-        print(f'Dtype conversions successful.')
+                if rows_to_fill > 0:
+                    if log_file: log_file.write(f'{col} - replacing erroneous cells with default value "{default_val}" to {rows_to_fill} rows\n')
 
-    # Reindex for consistent column order
-    df = df.reindex(columns=dtypes.keys())
+            except Exception as e:
+                if log_file: log_file.write(f'ERROR - Could not convert field "{col}" to correct type {dtype}: {e}\n')
+                print(f'ERROR converting field "{col}" to correct type: {e}\n')
+                errors_list.append(e)
+                errors_encountered += 1
+
+        if errors_encountered > 0:
+            if log_file: log_file.write(f'{errors_encountered} error(s) encountered converting to correct dtypes.\n\n')
+            print(f'{errors_encountered} error(s) encountered converting to correct dtypes. Quitting before DB insertion.')
+        else:
+            if log_file: log_file.write(f'Dtype conversions successful.\n\n')
+            print(f'Dtype conversions successful.')
+
+        # Reindex for consistent column order
+        df = df.reindex(columns=dtypes.keys())
+
+        if log_file: log_file.flush()
+        record.rows = len(df)
 
-    if log_file: log_file.flush()
-    
     return df, errors_list
\ No newline at end of file
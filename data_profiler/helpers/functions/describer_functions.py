@@ -0,0 +1,381 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Helper functions for the data describer (DataProfiler.describe_data_frame).
+
+plotly (and the Apex theme, which builds a plotly template) are imported inside the chart functions - importing plotly
+costs more than the rest of the app's startup, and most sessions never open the describer
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from ..constants.app_constants import DESCRIBE_CHART_BINS, DESCRIBE_MAX_GROUPS, DESCRIBE_MAX_BOX_OUTLIERS, DESCRIBE_PARALLEL_CHARTS_MIN_COLUMNS, \
+    DESCRIBE_MAX_CHART_WORKERS
+
+if TYPE_CHECKING:
+    from plotly.graph_objects import Figure
+
+
+DESCRIBE_COUNT_COLS = ['Negative Values', 'Zero Values', 'Lower Outliers', 'Upper Outliers', 'Extreme Upper Outliers']
+BOX_STATS_COLS = ['q1', 'median', 'q3', 'lowerfence', 'upperfence']
+OTHER_GROUP = 'Other'
+
+
+def add_fences(df_val: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Add IQR and Tukey fence columns to a df.describe() table (columns as rows)
+
+    Params
+    ------
+    df_val : pd.DataFrame
+        output of df.describe(include='all').transpose()
+
+    Return
+    ------
+    df_val with 'IQR', 'Lower Fence', 'Upper Fence', and 'Extreme Upper Fence' columns
+    '''
+
+    df_val['IQR'] = df_val['75%'] - df_val['25%']
+    df_val['Lower Fence'] = df_val['25%'] - (1.5 * df_val['IQR'])
+    df_val['Upper Fence'] = df_val['75%'] + (1.5 * df_val['IQR'])
+    df_val['Extreme Upper Fence'] = df_val['75%'] + (3 * df_val['IQR'])
+
+    return df_val
+
+
+def count_numeric_flags(df: pd.DataFrame, df_val: pd.DataFrame, numeric_cols: list[str]) -> pd.DataFrame:
+    '''
+    Count negatives, zeros, and outliers for every numeric column at once. The numeric columns are pulled into one 2D float array
+    and each comparison is broadcast against a per-column threshold row and counted down the columns - no row subsets are copied
+
+    Params
+    ------
+    df : pd.DataFrame
+        the data being described
+    df_val : pd.DataFrame
+        describe table for df, with fences (see add_fences)
+    numeric_cols : list[str]
+        numeric columns of df
+
+    Return
+    ------
+    pd.DataFrame indexed by column name, with the DESCRIBE_COUNT_COLS columns
+    '''
+
+    numeric_cols = list(numeric_cols)
+    if not numeric_cols:
+        return pd.DataFrame(columns=DESCRIBE_COUNT_COLS, dtype='int64')
+
+    # Missing values become NaN, which compares False against everything and so is never counted
+    values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    fences = df_val.loc[numeric_cols, ['Lower Fence', 'Upper Fence', 'Extreme Upper Fence']].to_numpy(dtype=np.float64)
+    lower_fence, upper_fence, extreme_upper_fence = fences[:, 0], fences[:, 1], fences[:, 2]
+
+    counts = {
+        'Negative Values': np.count_nonzero(values < 0, axis=0),
+        'Zero Values': np.count_nonzero(values == 0, axis=0),
+        'Lower Outliers': np.count_nonzero(values < lower_fence, axis=0),
+        'Upper Outliers': np.count_nonzero(values > upper_fence, axis=0),
+        'Extreme Upper Outliers': np.count_nonzero(values > extreme_upper_fence, axis=0),
+    }
+
+    return pd.DataFrame(counts, index=pd.Index(numeric_cols), columns=DESCRIBE_COUNT_COLS)
+
+
+def summarize_numeric_column(col: str, stats: pd.Series) -> str:
+    '''
+    Print a numeric column's describe stats and return them as an HTML summary for the distribution charts page
+
+    Params
+    ------
+    col : str
+        column name
+    stats : pd.Series
+        the column's row of the describe table (with fences and counts)
+
+    Return
+    ------
+    HTML string
+    '''
+
+    print('-'*50)
+    print(f'|{col.center(48)}|')
+    print('-'*50)
+
+    ## Min / Avg / Max
+    mini = stats['min']
+    avg = stats['mean']
+    maxi = stats['max']
+
+    print(f'Min: {mini:,}')
+    print(f'Avg: {avg:,.3f}')
+    print(f'Max: {maxi:,}')
+
+    ## Missing / Negatives / Zeros
+    missing_values = stats['Missing Values']
+    negative_values = stats['Negative Values']
+    zero_values = stats['Zero Values']
+
+    print(f'\nMissing: {missing_values:,.0f}')
+    print(f'Negatives: {negative_values:,.0f}')
+    print(f'Zeros: {zero_values:,.0f}')
+
+    ## Outliers
+    lower_fence = stats['Lower Fence']
+    upper_fence = stats['Upper Fence']
+    extreme_upper_fence = stats['Extreme Upper Fence']
+
+    lower_outliers = stats['Lower Outliers']
+    upper_outliers = stats['Upper Outliers']
+    extreme_upper_outliers = stats['Extreme Upper Outliers']
+
+    print(f'\nLower Fence: {lower_fence:,.3f}')
+    print(f'   Outliers: {lower_outliers:,.0f}')
+    print(f'Upper Fence: {upper_fence:,.3f}')
+    print(f'   Outliers: {upper_outliers:,.0f}')
+    print(f'Extreme Upper Fence: {extreme_upper_fence:,.3f}')
+    print(f'   Outliers: {extreme_upper_outliers:,.0f}')
+
+    ## Summary
+    header = f"<h2>{col}</h2>"
+    avgs = f"Min: {mini:,}<br>Avg: {avg:,.3f}<br>Max: {maxi:,}<br>"
+    bad_vals = f"<br>Missing: {missing_values:,.0f}<br>Negatives: {negative_values:,.0f}<br>Zeros: {zero_values:,.0f}<br>"
+    outliers = f"<br>Lower Fence: {lower_fence:,.3f}<br>   Outliers: {lower_outliers:,.0f}<br>Upper Fence: {upper_fence:,.3f}<br>   Outliers: {upper_outliers:,.0f}<br>Extreme Upper Fence: {extreme_upper_fence:,.3f}<br>   Outliers: {extreme_upper_outliers:,.0f}<br>"
+
+    return header + avgs + bad_vals + outliers
+
+
+''' Charts '''
+
+def histogram_bins(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Bin a column for its histogram chart. Uses numpy's 'auto' bin edges, capped at DESCRIBE_CHART_BINS bins
+
+    Params
+    ------
+    values : np.ndarray
+        float values (NaN = missing)
+
+    Return
+    ------
+    (bin edges, counts)
+    '''
+
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+
+    edges = np.histogram_bin_edges(values, bins='auto')
+    if len(edges) - 1 > DESCRIBE_CHART_BINS:
+        edges = np.histogram_bin_edges(values, bins=DESCRIBE_CHART_BINS)
+
+    counts, edges = np.histogram(values, bins=edges)
+    return edges, counts
+
+
+def box_plot_stats(df: pd.DataFrame, col: str, group_col: str = None, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''
+    Box plot summary stats of a numeric column, per group. Only the DESCRIBE_MAX_GROUPS biggest groups get their own box - the 
+    rest are lumped into "Other". Whiskers are the most extreme values within 1.5 IQR of the box, like plotly draws them
+
+    Params
+    ------
+    df : pd.DataFrame
+    col : str
+        numeric column
+    group_col : str
+        optional *categorical* column to group by. If None, one box for the whole column (named col)
+    seed : int
+        seed for sampling outliers
+
+    Return
+    ------
+    (box stats indexed by group with BOX_STATS_COLS columns, 
+     up to DESCRIBE_MAX_BOX_OUTLIERS sampled outliers per group with 'group' and 'value' columns)
+    '''
+
+    values = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    if group_col:
+        groups = df[group_col].astype(str)
+        top_groups = groups.value_counts().index[:DESCRIBE_MAX_GROUPS]
+        groups = groups.where(groups.isin(top_groups), OTHER_GROUP)
+    else:
+        groups = pd.Series(col, index=df.index)
+
+    data = pd.DataFrame({'group': groups, 'value': values}).dropna(subset=['value'])
+
+    # Nothing numeric in the column - no boxes to draw
+    if data.empty:
+        return pd.DataFrame(columns=BOX_STATS_COLS, dtype='float64'), pd.DataFrame({'group': pd.Series(dtype=object), 'value': pd.Series(dtype='float64')})
+
+    grouped = data.groupby('group', sort=False)['value']
+
+    box_stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    box_stats.columns = ['q1', 'median', 'q3']
+    iqr = box_stats['q3'] - box_stats['q1']
+
+    # Whiskers - most extreme values still inside the fences
+    fences = pd.DataFrame({'lower': box_stats['q1'] - 1.5 * iqr, 'upper': box_stats['q3'] + 1.5 * iqr})
+    row_fences = fences.reindex(data['group']).to_numpy()
+    inside = (data['value'].to_numpy() >= row_fences[:, 0]) & (data['value'].to_numpy() <= row_fences[:, 1])
+
+    inside_values = data.loc[inside].groupby('group', sort=False)['value']
+    box_stats['lowerfence'] = inside_values.min()
+    box_stats['upperfence'] = inside_values.max()
+
+    # Only a sample of the outliers goes into the chart
+    outliers = data.loc[~inside].sample(frac=1, random_state=seed).groupby('group', sort=False).head(DESCRIBE_MAX_BOX_OUTLIERS)
+
+    return box_stats.reindex(columns=BOX_STATS_COLS), outliers.reset_index(drop=True)
+
+
+def histogram_figure(col: str, edges: np.ndarray, counts: np.ndarray, title: str) -> 'Figure':
+    ''' Histogram chart drawn from pre-binned counts (see histogram_bins) '''
+
+    import plotly.graph_objects as go
+    from ..constants.plotly_theme import apex_template
+
+    figure = go.Figure(layout=dict(title=title, template=apex_template, xaxis_title=col, yaxis_title='# SKUs', bargap=0))
+    if len(counts) == 0:
+        return figure
+
+    widths = np.diff(edges)
+    figure.add_trace(go.Bar(x=edges[:-1] + widths / 2, y=counts, width=widths, name=col))
+    return figure
+
+
+def box_figure(col: str, box_stats: pd.DataFrame, title: str, outliers: pd.DataFrame | None = None) -> 'Figure':
+    ''' Box plot drawn from precomputed stats (see box_plot_stats) plus the sampled outliers as points '''
+
+    import plotly.graph_objects as go
+    from ..constants.plotly_theme import apex_template
+
+    figure = go.Figure(layout=dict(title=title, template=apex_template, yaxis_title=col, showlegend=False))
+
+    groups = box_stats.index.astype(str).tolist()
+    figure.add_trace(go.Box(
+        x=groups, 
+        q1=box_stats['q1'].tolist(), 
+        median=box_stats['median'].tolist(), 
+        q3=box_stats['q3'].tolist(), 
+        lowerfence=box_stats['lowerfence'].tolist(), 
+        upperfence=box_stats['upperfence'].tolist(), 
+        name=col
+    ))
+
+    if outliers is not None and len(outliers) > 0:
+        figure.add_trace(go.Scatter(x=outliers['group'].astype(str), y=outliers['value'], mode='markers', name='Outliers', marker=dict(size=4)))
+
+    return figure
+
+
+class ColumnChartSpec:
+    '''
+    Everything needed to draw one numeric column's histogram + box plot. Only aggregates, so it's cheap to send to a worker process
+    '''
+
+    def __init__(self, col: str, edges: np.ndarray, counts: np.ndarray, box_stats: pd.DataFrame, outliers: pd.DataFrame | None,
+                 histogram_title: str, box_plot_title: str):
+        self.col = col
+        self.edges = edges
+        self.counts = counts
+        self.box_stats = box_stats
+        self.outliers = outliers
+        self.histogram_title = histogram_title
+        self.box_plot_title = box_plot_title
+
+
+def build_chart_json(spec: ColumnChartSpec) -> tuple[str, str]:
+    ''' Build a column's histogram and box plot and serialize them to plotly JSON. Runs in worker processes '''
+
+    histogram = histogram_figure(spec.col, spec.edges, spec.counts, title=spec.histogram_title)
+    box_plot = box_figure(spec.col, spec.box_stats, title=spec.box_plot_title, outliers=spec.outliers)
+
+    return histogram.to_json(), box_plot.to_json()
+
+
+def build_charts_json(specs: list[ColumnChartSpec]) -> list[tuple[str, str]]:
+    '''
+    Build + serialize the charts for every column. Spread across a process pool when there are at least 
+    DESCRIBE_PARALLEL_CHARTS_MIN_COLUMNS columns, otherwise done in this process (starting workers isn't free)
+
+    Return
+    ------
+    list of (histogram JSON, box plot JSON), in the same order as specs
+    '''
+
+    max_workers = min(DESCRIBE_MAX_CHART_WORKERS, max((os.cpu_count() or 1) - 1, 1), len(specs))
+    if len(specs) < DESCRIBE_PARALLEL_CHARTS_MIN_COLUMNS or max_workers < 2:
+        return [build_chart_json(spec) for spec in specs]
+
+    print(f'Building {len(specs)} column charts on {max_workers} processes...')
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(build_chart_json, specs))
+
+
+def write_charts_html(file_path: str, header_html: str, summaries: list[str], charts_json: list[tuple[str, str]]):
+    '''
+    Write the distribution charts page as one self-contained HTML file. plotly.js is embedded once (works offline) and each chart's 
+    JSON sits in the page until the chart scrolls into view, when it's drawn - so the page opens fast no matter how many columns
+
+    Params
+    ------
+    file_path : str
+    header_html : str
+        HTML at the top of the page
+    summaries : list[str]
+        summary HTML per column
+    charts_json : list[tuple[str, str]]
+        (histogram JSON, box plot JSON) per column
+    '''
+
+    from plotly.offline import get_plotlyjs
+
+    with open(file_path, 'w+', encoding='utf-8') as f:
+        f.write(f'''<!DOCTYPE html>
+                    <html>
+                    <head>
+                    <meta charset="utf-8" />   <!--It is necessary to use the UTF-8 encoding with plotly graphics to get e.g. negative signs to render correctly -->
+                    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+                    <style>div.chart {{ min-height: 450px; }}</style>
+                    <script type="text/javascript">{get_plotlyjs()}</script>
+                    </head>
+
+                    <body>
+                    {header_html}
+                    <br><br>
+                ''')
+
+        for i, (summary, chart_json) in enumerate(zip(summaries, charts_json)):
+            f.write(summary)
+            for j, figure_json in enumerate(chart_json):
+                figure_id = f'figure-{i}-{j}'
+                # "</" can't appear inside a script tag - "<\/" is the same thing to JSON.parse
+                figure_json = figure_json.replace('</', '<\\/')
+
+                f.write(f'<div class="chart" data-figure="{figure_id}"></div>\n')
+                f.write(f'<script type="application/json" id="{figure_id}">{figure_json}</script>\n')
+
+        f.write('''
+                    <script type="text/javascript">
+                    const observer = new IntersectionObserver((entries) => {
+                        entries.forEach((entry) => {
+                            if (!entry.isIntersecting) return;
+                            const div = entry.target;
+                            observer.unobserve(div);
+                            const figure = JSON.parse(document.getElementById(div.dataset.figure).textContent);
+                            Plotly.newPlot(div, figure.data, figure.layout, {responsive: true});
+                        });
+                    }, {rootMargin: '400px'});
+                    document.querySelectorAll('div.chart').forEach((div) => observer.observe(div));
+                    </script>
+                    </body></html>
+                ''')
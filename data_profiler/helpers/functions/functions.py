@@ -9,6 +9,9 @@ Module containing various helper functions used throughout the codebase
 import pandas as pd
 import os
 
+from ..models.GeneralModels import DownloadFileFormat
+from ..constants.app_constants import PARQUET_COMPRESSION, FEATHER_COMPRESSION, EXCEL_MAX_ROWS
+
 # Checks if the given file_path can be opened as a pandas dataframe
 def file_path_is_valid_data_frame(file_path: str) -> bool:
 
@@ -95,3 +98,48 @@ def find_new_file_path(file_path: str):
 
     # If suffixes didn't work, just return original
     return file_path
+
+
+# File extension for each download file format
+def file_format_extension(file_format: DownloadFileFormat) -> str:
+    match file_format:
+        case DownloadFileFormat.CSV:
+            return 'csv'
+        case DownloadFileFormat.EXCEL:
+            return 'xlsx'
+        case DownloadFileFormat.PARQUET:
+            return 'parquet'
+        case DownloadFileFormat.FEATHER:
+            return 'feather'
+
+# Writes one or more dataframes to disk in the given file format. Returns the list of file paths written
+#   file_path has no extension. Excel puts each dataframe on its own sheet of one book, every other format
+#   writes one file per dataframe, suffixed with the sheet name when there's more than one
+def export_data_frames(data_frames: dict[str, pd.DataFrame], file_path: str, file_format: DownloadFileFormat) -> list[str]:
+    extension = file_format_extension(file_format)
+
+    if file_format == DownloadFileFormat.EXCEL:
+        for sheet_name, df in data_frames.items():
+            if len(df) > EXCEL_MAX_ROWS:
+                raise ValueError(f'"{sheet_name}" has {len(df):,} rows, which is too many for Excel. Choose CSV, Parquet or Feather instead.')
+
+        with pd.ExcelWriter(f'{file_path}.{extension}') as writer:
+            for sheet_name, df in data_frames.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        return [f'{file_path}.{extension}']
+    
+    file_paths = []
+    for sheet_name, df in data_frames.items():
+        path = f'{file_path}.{extension}' if len(data_frames) == 1 else f'{file_path} - {sheet_name}.{extension}'
+
+        if file_format == DownloadFileFormat.CSV:
+            df.to_csv(path, index=False)
+        elif file_format == DownloadFileFormat.PARQUET:
+            df.to_parquet(path, index=False, compression=PARQUET_COMPRESSION)
+        elif file_format == DownloadFileFormat.FEATHER:
+            df.reset_index(drop=True).to_feather(path, compression=FEATHER_COMPRESSION)
+
+        file_paths.append(path)
+
+    return file_paths
@@ -0,0 +1,404 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Per-stage timing + memory instrumentation for uploads. A RunInstrumentation collects spans - wall time, CPU time, memory and
+row counts - for whatever runs inside it, and writes them to a JSON report next to the run's log file, so runs can be compared
+over time and it's clear where each client's upload spent its time.
+
+    with RunInstrumentation(name='transform', report_path='..._transform_report.json'):
+        with span('create_item_master') as s:
+            df = ...
+            s.rows = len(df)
+
+The active run is held in a contextvar, so code deep in the pipeline can open spans without having the run passed down to it.
+Outside a run, span() is a no-op (besides timing), so the services can be used without one (benchmarks, notebooks)
+
+Memory: RSS (process memory, via psutil if installed, else the peak from resource on macOS/Linux) and, when the run is started
+with track_memory=True, the tracemalloc peak inside the span. tracemalloc slows pandas-heavy code down noticeably, so it's off
+by default
+
+Database calls made on connections opened during a run are also counted (see InstrumentedConnection in database_manager.py),
+per statement + table, into run.db_stats - connect/execute/fetch latency histograms, rows and parameter bytes
+'''
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from functools import wraps
+from importlib.util import find_spec
+import bisect
+import json
+import sys
+from threading import Lock
+from time import perf_counter, process_time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+
+_current_run: ContextVar['RunInstrumentation | None'] = ContextVar('data_profiler_run', default=None)
+_current_span: ContextVar['SpanRecord | None'] = ContextVar('data_profiler_span', default=None)
+
+
+@dataclass
+class SpanRecord:
+    ''' One timed stage of a run. Set rows (and anything in attrs) from inside the span '''
+
+    name: str
+    parent: str | None = None
+    depth: int = 0
+    started_at: float = 0.0             # seconds since the run started
+    wall_seconds: float | None = None
+    cpu_seconds: float | None = None
+    rss_mb: float | None = None         # process memory when the span ended
+    rss_delta_mb: float | None = None
+    tracemalloc_peak_mb: float | None = None
+    rows: int | None = None
+    error: str | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class RunInstrumentation():
+    '''
+    Collects the spans of one run (upload, delete, ...). Use in "with" block - spans opened anywhere inside it (same thread or
+    task) are recorded, and the JSON report is written to report_path when the block exits, whether or not it succeeded
+    '''
+
+    def __init__(self, name: str, report_path: str | None = None, track_memory: bool = False, **attrs):
+        '''
+        Params
+        ------
+        name : str
+            what the run is, e.g. "transform"
+        report_path : str | None
+            where to write the JSON report on exit. None to not write one (call report() instead)
+        track_memory : bool
+            also record the tracemalloc peak of each span. Slower
+        attrs
+            anything else worth keeping with the report (project number, options, ...)
+        '''
+
+        self.name = name
+        self.report_path = report_path
+        self.track_memory = track_memory
+        self.attrs = attrs
+        self.spans: list[SpanRecord] = []
+        self.db_stats = DatabaseCallStats()
+
+        self.started_at: datetime | None = None
+        self.wall_seconds: float | None = None
+        self.cpu_seconds: float | None = None
+        self.error: str | None = None
+
+        self._st = 0.0
+        self._cpu_st = 0.0
+        self._started_tracemalloc = False
+        self._tokens = None
+
+    def __enter__(self) -> 'RunInstrumentation':
+        self.started_at = datetime.now()
+        self._st = perf_counter()
+        self._cpu_st = process_time()
+
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        self._tokens = (_current_run.set(self), _current_span.set(None))
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.wall_seconds = round(perf_counter() - self._st, 3)
+        self.cpu_seconds = round(process_time() - self._cpu_st, 3)
+        if exception_type is not None:
+            self.error = f'{exception_type.__name__}: {exception_value}'
+
+        run_token, span_token = self._tokens
+        _current_span.reset(span_token)
+        _current_run.reset(run_token)
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        if self.report_path:
+            try:
+                self.write_report(self.report_path)
+            except OSError as e:
+                # Never lose a run over its report
+                print(f'Could not write run report to {self.report_path}: {e}')
+
+    def report(self) -> dict:
+        ''' The run + its spans, as a JSON-able dict '''
+
+        return {
+            'run': self.name,
+            'started_at': self.started_at.isoformat(timespec='seconds') if self.started_at else None,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'peak_rss_mb': max((s.rss_mb for s in self.spans if s.rss_mb is not None), default=None),
+            'error': self.error,
+            'python': sys.version.split()[0],
+            **self.attrs,
+            'spans': [asdict(s) for s in self.spans],
+            'database': self.db_stats.report(),
+        }
+
+    def write_report(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, default=str)
+
+    def summary_lines(self, max_depth: int = 1) -> list[str]:
+        ''' One line per span (indented by depth, down to max_depth), for the text log '''
+
+        lines = []
+        for s in self.spans:
+            if s.depth > max_depth or s.wall_seconds is None:
+                continue
+            rows = '' if s.rows is None else f'  {s.rows:>12,} rows'
+            lines.append(f'{"  " * s.depth}{s.name:<{44 - 2 * s.depth}} {s.wall_seconds:>9.2f} s{rows}')
+
+        return lines
+
+
+class LatencyHistogram():
+    ''' Counts of durations in fixed, roughly log-spaced millisecond buckets, plus count/total/min/max '''
+
+    # Upper bounds (ms) - the last bucket is everything slower
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.min_seconds: float | None = None
+        self.max_seconds: float | None = None
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.min_seconds = seconds if self.min_seconds is None else min(self.min_seconds, seconds)
+        self.max_seconds = seconds if self.max_seconds is None else max(self.max_seconds, seconds)
+
+    def quantile_ms(self, q: float) -> float | None:
+        ''' Upper bound of the bucket the q-th quantile falls in (the max, if it's in the last bucket) '''
+
+        if self.count == 0:
+            return None
+
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else round(self.max_seconds * 1000, 1)
+
+        return round(self.max_seconds * 1000, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total_seconds, 4),
+            'min_ms': None if self.min_seconds is None else round(self.min_seconds * 1000, 2),
+            'max_ms': None if self.max_seconds is None else round(self.max_seconds * 1000, 2),
+            'p50_ms': self.quantile_ms(0.5),
+            'p95_ms': self.quantile_ms(0.95),
+            'buckets_ms': {(f'<={b}' if i < len(self.BUCKETS_MS) else f'>{self.BUCKETS_MS[-1]}'): n
+                           for i, (b, n) in enumerate(zip(self.BUCKETS_MS + (self.BUCKETS_MS[-1],), self.counts)) if n},
+        }
+
+
+@dataclass
+class StatementStats:
+    ''' Everything recorded for one (statement, table) pair '''
+
+    statement: str
+    table: str | None
+    executions: int = 0
+    rows: int = 0
+    param_bytes: int = 0
+    execute: LatencyHistogram = field(default_factory=LatencyHistogram)
+    fetch: LatencyHistogram = field(default_factory=LatencyHistogram)
+    commit: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict:
+        return {
+            'statement': self.statement, 'table': self.table, 'executions': self.executions, 'rows': self.rows, 'param_bytes': self.param_bytes,
+            'execute': self.execute.to_dict(), 'fetch': self.fetch.to_dict(), 'commit': self.commit.to_dict(),
+        }
+
+
+class DatabaseCallStats():
+    '''
+    Per (statement, table) database call stats for a run, plus connect times. Thread-safe - pooled connections record into
+    the same run from worker threads
+    '''
+
+    def __init__(self):
+        self.connect = LatencyHistogram()
+        self.statements: dict[tuple[str, str | None], StatementStats] = {}
+        self._lock = Lock()
+
+    def record_connect(self, seconds: float):
+        with self._lock:
+            self.connect.add(seconds)
+
+    def record(self, statement: str, table: str | None, execute_seconds: float | None = None, fetch_seconds: float | None = None,
+               commit_seconds: float | None = None, executions: int = 0, rows: int = 0, param_bytes: int = 0):
+        ''' Add one call's numbers to its statement's totals. Each *_seconds that's given is one sample for that histogram '''
+
+        with self._lock:
+            stats = self.statements.get((statement, table))
+            if stats is None:
+                stats = self.statements[(statement, table)] = StatementStats(statement=statement, table=table)
+
+            stats.executions += executions
+            stats.rows += rows
+            stats.param_bytes += param_bytes
+            if execute_seconds is not None:
+                stats.execute.add(execute_seconds)
+            if fetch_seconds is not None:
+                stats.fetch.add(fetch_seconds)
+            if commit_seconds is not None:
+                stats.commit.add(commit_seconds)
+
+    def report(self) -> dict:
+        ''' Statements sorted by total time spent on them, slowest first '''
+
+        with self._lock:
+            statements = sorted(self.statements.values(), key=_statement_seconds, reverse=True)
+            return {'connect': self.connect.to_dict(), 'statements': [stats.to_dict() for stats in statements]}
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        ''' The top statements by total time, for the text log '''
+
+        with self._lock:
+            statements = sorted(self.statements.values(), key=_statement_seconds, reverse=True)[:top]
+
+        lines = [f'{"connect":<60} {self.connect.total_seconds:>9.2f} s  {self.connect.count:>7,} connections']
+        for stats in statements:
+            lines.append(f'{stats.statement[:60]:<60} {_statement_seconds(stats):>9.2f} s  {stats.executions:>7,} executions  {stats.rows:>12,} rows  '
+                         f'(execute {stats.execute.total_seconds:.2f} s, fetch {stats.fetch.total_seconds:.2f} s, commit {stats.commit.total_seconds:.2f} s)')
+
+        return lines
+
+
+def current_run() -> RunInstrumentation | None:
+    return _current_run.get()
+
+
+def current_span_name() -> str | None:
+    ''' Name of the innermost open span, if any (tags log records with the stage they came from) '''
+
+    record = _current_span.get()
+    return record.name if record else None
+
+
+@contextmanager
+def span(name: str, rows: int | None = None, **attrs) -> Iterator[SpanRecord]:
+    '''
+    Time a stage. Recorded on the active RunInstrumentation, if there is one - otherwise only timed (the record is still
+    yielded, so callers can read wall_seconds either way)
+
+    Params
+    ------
+    name : str
+        stage name, e.g. "create_item_master" or "insert ItemMaster"
+    rows : int | None
+        row count, if known up front. Otherwise set record.rows inside the block
+    attrs
+        anything else to keep on the span
+    '''
+
+    run = _current_run.get()
+    parent = _current_span.get()
+
+    record = SpanRecord(name=name, parent=parent.name if parent else None, depth=parent.depth + 1 if parent else 0, rows=rows, attrs=attrs)
+    if run is not None:
+        record.started_at = round(perf_counter() - run._st, 3)
+        run.spans.append(record)   # Appended on entry, so spans are listed in the order they started
+
+    track_memory = run is not None and run.track_memory and tracemalloc.is_tracing()
+    if track_memory:
+        # reset_peak is global - nested spans share it, so a parent's peak is only exact when it has no children
+        tracemalloc.reset_peak()
+        traced_st = tracemalloc.get_traced_memory()[0]
+
+    rss_st = _rss_mb()
+    st = perf_counter()
+    cpu_st = process_time()
+    token = _current_span.set(record)
+
+    try:
+        yield record
+    except BaseException as e:
+        record.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        _current_span.reset(token)
+        record.wall_seconds = round(perf_counter() - st, 4)
+        record.cpu_seconds = round(process_time() - cpu_st, 4)
+
+        record.rss_mb = _rss_mb()
+        if record.rss_mb is not None and rss_st is not None:
+            record.rss_delta_mb = round(record.rss_mb - rss_st, 1)
+        if track_memory:
+            record.tracemalloc_peak_mb = round((tracemalloc.get_traced_memory()[1] - traced_st) / 2**20, 1)
+
+
+def instrumented(name: str | None = None) -> Callable:
+    '''
+    Decorator - run the function inside a span (named after the function unless given). If it returns a dataframe (or a
+    tuple starting with one), its length is recorded as the span's rows
+    '''
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name) as record:
+                result = func(*args, **kwargs)
+                record.rows = _result_rows(result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+''' Helpers '''
+
+def _statement_seconds(stats: StatementStats) -> float:
+    return stats.execute.total_seconds + stats.fetch.total_seconds + stats.commit.total_seconds
+
+
+def _result_rows(result) -> int | None:
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    return len(result) if hasattr(result, 'shape') and hasattr(result, '__len__') else None
+
+
+if find_spec('psutil') is not None:
+    import psutil
+
+    _PROCESS = psutil.Process()
+
+    def _rss_mb() -> float | None:
+        return round(_PROCESS.memory_info().rss / 2**20, 1)
+
+else:
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    def _rss_mb() -> float | None:
+        # No psutil - fall back to the process's peak RSS (KB on Linux, bytes on macOS). Not available on Windows
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
@@ -0,0 +1,182 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Memory governor for uploads. Before any file is read, estimates how much memory the upload will need (from each file's size,
+a sampled row count and the column dtypes it will be cast to) and compares it to the memory budget:
+
+    fits in memory          -> ExecutionMode.IN_MEMORY, the normal pipeline
+    fits if run chunked     -> ExecutionMode.CHUNKED - inputs are released as soon as their output tables are built, output
+                               tables as soon as they're inserted, and inserts use smaller batches
+    doesn't fit either way  -> mode None, so the upload fails straight away with the estimate, instead of hitting a
+                               MemoryError an hour in
+
+The estimate is deliberately rough (see the MEMORY_* constants) - it's there to catch uploads that are off by multiples
+'''
+
+import ctypes
+from importlib.util import find_spec
+import os
+import sys
+
+from .constants.app_constants import MEMORY_BUDGET_FRACTION, MEMORY_BUDGET_ENV_VAR, MEMORY_SAMPLE_BYTES, MEMORY_STRING_CELL_BYTES, MEMORY_NUMERIC_CELL_BYTES, \
+    MEMORY_OUTPUT_TO_INPUT_RATIO, MEMORY_COPIES_OF_LARGEST_TABLE, INSERT_BATCH_SIZE, CHUNKED_INSERT_BATCH_SIZE
+from .constants.data_file_constants import FILE_TYPES_DTYPES_MAPPER
+from .models.DataFiles import UploadFileType
+from .models.Memory import ExecutionMode, FileMemoryEstimate, MemoryEstimate
+
+
+class MemoryGovernor():
+    '''
+    Plans an upload against a memory budget. See estimate()
+    '''
+
+    def __init__(self, budget_mb: float | None = None):
+        '''
+        Params
+        ------
+        budget_mb : float | None
+            memory the upload may use. If None, DATA_PROFILER_MEMORY_BUDGET_MB, or else MEMORY_BUDGET_FRACTION of the memory
+            available right now (no limit if that can't be determined)
+        '''
+
+        self.available_mb = available_memory_mb()
+
+        if budget_mb is None and os.environ.get(MEMORY_BUDGET_ENV_VAR):
+            budget_mb = float(os.environ[MEMORY_BUDGET_ENV_VAR])
+        if budget_mb is None and self.available_mb is not None:
+            budget_mb = self.available_mb * MEMORY_BUDGET_FRACTION
+
+        self.budget_mb = budget_mb
+
+    def estimate(self, files: list[tuple[UploadFileType, str]]) -> MemoryEstimate:
+        '''
+        Estimate the peak memory of uploading these files, and pick the execution mode
+
+        Params
+        ------
+        files : list[tuple[UploadFileType, str]]
+            (file type, path) of every file that will be read - DataDirectory.files_to_read()
+
+        Return
+        ------
+        MemoryEstimate
+        '''
+
+        file_estimates = [estimate_file_memory(file_type, file_path) for file_type, file_path in files]
+        largest = max(file_estimates, key=lambda f: f.memory_mb, default=None)
+
+        input_mb = sum(f.memory_mb for f in file_estimates)
+        output_mb = input_mb * MEMORY_OUTPUT_TO_INPUT_RATIO
+        largest_mb = largest.memory_mb if largest else 0
+
+        # One insert batch, as python lists - about twice the dataframe's size per row
+        def insert_batch_mb(batch_size: int) -> float:
+            if not largest or largest.rows == 0:
+                return 0
+            return 2 * largest_mb * min(batch_size, largest.rows) / largest.rows
+
+        # In memory, every input + output frame is alive at once. Chunked, inputs are dropped as outputs are built (and outputs
+        # as they're inserted), so only the bigger of the two sets is alive at a time
+        in_memory_peak_mb = input_mb + output_mb + MEMORY_COPIES_OF_LARGEST_TABLE * largest_mb + insert_batch_mb(INSERT_BATCH_SIZE)
+        chunked_peak_mb = max(input_mb, output_mb) + largest_mb + insert_batch_mb(CHUNKED_INSERT_BATCH_SIZE)
+
+        estimate = MemoryEstimate(files=file_estimates, input_mb=round(input_mb, 1), output_mb=round(output_mb, 1), in_memory_peak_mb=round(in_memory_peak_mb, 1),
+                                  chunked_peak_mb=round(chunked_peak_mb, 1), available_mb=self.available_mb, budget_mb=self.budget_mb)
+
+        if self.budget_mb is None:
+            estimate.mode = ExecutionMode.IN_MEMORY
+            estimate.message = f'MEMORY - estimated peak {_gb(in_memory_peak_mb)}. Available memory unknown - running in memory.'
+        elif in_memory_peak_mb <= self.budget_mb:
+            estimate.mode = ExecutionMode.IN_MEMORY
+            estimate.message = f'MEMORY - estimated peak {_gb(in_memory_peak_mb)} of a {_gb(self.budget_mb)} budget. Running in memory.'
+        elif chunked_peak_mb <= self.budget_mb:
+            estimate.mode = ExecutionMode.CHUNKED
+            estimate.message = (f'MEMORY - estimated peak {_gb(in_memory_peak_mb)} is over the {_gb(self.budget_mb)} budget. '
+                                f'Running chunked (estimated peak {_gb(chunked_peak_mb)}).')
+        else:
+            estimate.mode = None
+            estimate.message = (f'Not enough memory for this upload. It needs an estimated {_gb(chunked_peak_mb)} even when run in chunks, but only '
+                                f'{_gb(self.budget_mb)} is available to it. Close other programs and try again, or split the data into smaller uploads.')
+
+        return estimate
+
+
+def estimate_file_memory(file_type: UploadFileType, file_path: str) -> FileMemoryEstimate:
+    '''
+    Estimate a CSV's size once read into a dataframe. Rows and average cell length are taken from the first
+    MEMORY_SAMPLE_BYTES of the file and scaled up to its full size. Columns are every column the file type is cast to
+    (read_and_cleanse_uploaded_data_file reindexes to all of them)
+    '''
+
+    file_size = os.path.getsize(file_path)
+
+    with open(file_path, 'rb') as f:
+        sample = f.read(MEMORY_SAMPLE_BYTES)
+
+    # Drop the header and any partial last line
+    lines = sample.split(b'\n')
+    header = lines[0]
+    body = [line for line in (lines[1:] if len(sample) == file_size else lines[1:-1]) if line.strip()]
+
+    if not body:
+        return FileMemoryEstimate(file_type=file_type.value, file_size_mb=round(file_size / 2**20, 1))
+
+    body_bytes = sum(len(line) + 1 for line in body)
+    rows = round(len(body) * (file_size - len(header) - 1) / body_bytes)
+
+    given_columns = max(header.count(b',') + 1, 1)
+    avg_cell_chars = body_bytes / len(body) / given_columns
+
+    row_bytes = 0
+    for dtype in FILE_TYPES_DTYPES_MAPPER[file_type.value].values():
+        row_bytes += MEMORY_STRING_CELL_BYTES + avg_cell_chars if dtype == 'object' else MEMORY_NUMERIC_CELL_BYTES
+
+    return FileMemoryEstimate(file_type=file_type.value, file_size_mb=round(file_size / 2**20, 1), rows=rows, memory_mb=round(rows * row_bytes / 2**20, 1))
+
+
+def available_memory_mb() -> float | None:
+    '''
+    Physical memory available right now, in MB - psutil if installed, else the OS's own figure (GlobalMemoryStatusEx on Windows,
+    MemAvailable on Linux - both count reclaimable cache as available). None if it can't be determined, which means no limit
+    '''
+
+    if find_spec('psutil') is not None:
+        import psutil
+        return round(psutil.virtual_memory().available / 2**20, 1)
+
+    if sys.platform == 'win32':
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong), ('ullTotalPhys', ctypes.c_ulonglong),
+                        ('ullAvailPhys', ctypes.c_ulonglong), ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong), ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return round(status.ullAvailPhys / 2**20, 1)
+        return None
+
+    # Not free memory (SC_AVPHYS_PAGES) - that leaves out the page cache, so it's often a fraction of what an upload can really use
+    return _meminfo_available_mb()
+
+
+def _meminfo_available_mb(path: str = '/proc/meminfo') -> float | None:
+    ''' MemAvailable from /proc/meminfo, in MB. None if there isn't one (not Linux, or a kernel older than 3.14) '''
+
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return round(int(line.split()[1]) / 1024, 1)      # kB
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return None
+
+
+''' Helpers '''
+
+def _gb(mb: float) -> str:
+    return f'{mb / 1024:,.1f} GB'
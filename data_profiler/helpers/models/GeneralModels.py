@@ -21,4 +21,11 @@ class DownloadDataOptions(str, Enum):
     SUBWAREHOUSE_MATERIAL_FLOW_REPORT_PALLETS = 'Subwarehouse Material Flow Report - Pallets'
     ITEMS_MATERIAL_FLOW_REPORT_EACHES = 'Items Material Flow Report - Eaches'
     ITEMS_MATERIAL_FLOW_REPORT_CARTONS = 'Items Material Flow Report - Cartons'
-    ITEMS_MATERIAL_FLOW_REPORT_PALLETS = 'Items Material Flow Report - Pallets'
\ No newline at end of file
+    ITEMS_MATERIAL_FLOW_REPORT_PALLETS = 'Items Material Flow Report - Pallets'
+    ALL = 'All Reports and Inputs'
+
+class DownloadFileFormat(str, Enum):
+    CSV = 'CSV'
+    EXCEL = 'Excel'
+    PARQUET = 'Parquet'
+    FEATHER = 'Feather'
@@ -0,0 +1,40 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Pydantic models for the memory governor - how much memory an upload is expected to need, and how it will be run
+'''
+
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ExecutionMode(str, Enum):
+    IN_MEMORY = 'In memory'         # everything held at once - fastest
+    CHUNKED = 'Chunked'             # inputs released as soon as they're used, smaller insert batches
+
+class FileMemoryEstimate(BaseModel):
+    file_type: str
+    file_size_mb: float = 0
+    rows: int = 0                   # estimated from a sample of the file
+    memory_mb: float = 0            # once read + cleansed into a dataframe
+
+class MemoryEstimate(BaseModel):
+    '''
+    Expected peak memory of an upload in each execution mode, against the memory budget. mode is None if it won't fit either way
+    '''
+
+    files: list[FileMemoryEstimate] = []
+
+    input_mb: float = 0
+    output_mb: float = 0
+    in_memory_peak_mb: float = 0
+    chunked_peak_mb: float = 0
+
+    available_mb: float | None = None
+    budget_mb: float | None = None  # None if available memory couldn't be determined - no limit is enforced
+
+    mode: ExecutionMode | None = ExecutionMode.IN_MEMORY
+    message: str = ''
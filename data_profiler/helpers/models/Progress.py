@@ -0,0 +1,51 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Pydantic models for structured progress reporting from long jobs (reads, transforms, inserts, downloads, deletes)
+'''
+
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ProgressStage(str, Enum):
+    READ = 'Reading'
+    TRANSFORM = 'Transforming'
+    INSERT = 'Uploading'
+    DOWNLOAD = 'Downloading'
+    DELETE = 'Deleting'
+
+class ProgressEvent(BaseModel):
+    '''
+    One progress update for one unit of work (usually a table or file) within a stage. rows_total = 0 means the total isn't known
+    '''
+
+    stage: ProgressStage
+    table: str = ''
+    unit: str = 'rows'
+
+    rows_done: int = 0
+    rows_total: int = 0
+    bytes_done: int = 0
+
+    elapsed: float = 0                  # seconds spent on this unit of work so far
+    rate: float = 0                     # rows (units) per second
+
+    message: str = ''
+
+class ProgressSnapshot(BaseModel):
+    '''
+    Overall progress of a job, as computed by a ProgressTracker. percent/eta_seconds are None until they can be estimated
+    '''
+
+    message: str = ''
+    stage: ProgressStage | None = None
+
+    percent: float | None = None        # 0 - 1
+    eta_seconds: float | None = None
+    rate: float = 0
+    unit: str = 'rows'
+    elapsed: float = 0
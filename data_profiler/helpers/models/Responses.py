@@ -15,6 +15,7 @@ class BaseResponse(BaseModel):
     project_number: str
 
     success: bool = False
+    cancelled: bool = False
     message: str = ''
     log_file_path: str = ''
 
@@ -41,3 +42,62 @@ class TransformRowsInserted(BaseModel):
 
 class TransformResponse(BaseResponse):
     rows_inserted: TransformRowsInserted = TransformRowsInserted()
+
+
+''' Transform Dry Run '''
+
+class TableInsertEstimate(BaseModel):
+    table: str
+    rows: int = 0
+    bytes: int = 0                          # in memory
+    batches: int = 0                        # executemany calls
+    rows_per_second: float = 0
+    history_records: int = 0                # past inserts rows_per_second is based on. 0 = the default
+    estimated_seconds: float = 0
+
+class TransformDryRunResponse(TransformResponse):
+    '''
+    What inserting a transformed data directory would take. The output tables were built, but nothing was inserted
+    (rows_inserted stays 0)
+    '''
+
+    tables: list[TableInsertEstimate] = []
+    total_rows: int = 0
+    total_bytes: int = 0
+    estimated_insert_seconds: float = 0
+    spill_path: str = ''                    # where the tables were spilled, for the real upload to reuse
+
+
+''' Transform Preview '''
+
+class FileSample(BaseModel):
+    file_type: str
+    file_size_mb: float = 0
+    estimated_rows: int = 0                 # in the whole file
+    sampled_rows: int = 0
+
+class OutputTableEstimate(BaseModel):
+    table: str
+    sampled_rows: int = 0
+    estimated_rows: int = 0                 # for the full upload
+
+class VelocityShare(BaseModel):
+    velocity: str
+    pct_skus: float = 0                     # of SKUs with order lines
+    pct_lines: float = 0
+
+class TransformPreviewResponse(BaseResponse):
+    '''
+    What a full upload of a data directory is expected to produce, from transforming a sample of it. Nothing is inserted
+    '''
+
+    sample_fraction: float = 0              # share of the order/receipt lines that were sampled
+    files: list[FileSample] = []
+    tables: list[OutputTableEstimate] = []
+    velocity_distribution: list[VelocityShare] = []
+
+    preview_seconds: float = 0
+    estimated_total_rows: int = 0
+    estimated_transform_seconds: float = 0
+    estimated_upload_seconds: float = 0
+    warnings: list[str] = []
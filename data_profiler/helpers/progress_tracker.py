@@ -0,0 +1,179 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Aggregates ProgressEvents from one job into an overall percent complete + ETA. Thread-safe, so parallel workers (e.g. the
+download-all reports) can report into the same tracker
+'''
+
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from .models.Progress import ProgressStage, ProgressEvent, ProgressSnapshot
+
+
+# Rough share of total run time spent in each stage of a job. Stages run in this order
+UPLOAD_STAGE_WEIGHTS = {ProgressStage.READ: 0.15, ProgressStage.TRANSFORM: 0.15, ProgressStage.INSERT: 0.70}
+DOWNLOAD_STAGE_WEIGHTS = {ProgressStage.DOWNLOAD: 1.0}
+DELETE_STAGE_WEIGHTS = {ProgressStage.DELETE: 1.0}
+
+# Don't guess an ETA off the first sliver of work
+MIN_PERCENT_FOR_ETA = 0.02
+
+
+class ProgressTracker():
+    '''
+    Collects the latest ProgressEvent for each (stage, table) and computes overall progress.
+
+    Stage progress = rows done / planned rows for that stage (only units with a known total count). Overall percent weights
+    each stage by stage_weights; stages before the current one count as done. Percent is None while nothing is known yet -
+    the current stage has no total and no earlier stage is done. ETA = elapsed * (1 - percent) / percent.
+
+    update() is a drop-in update_progress_text_func: pass it strings (message only) or ProgressEvents. Each call forwards
+    a ProgressSnapshot to on_update
+    '''
+
+    def __init__(self, on_update: Callable[[ProgressSnapshot], None] | None = None, stage_weights: dict[ProgressStage, float] | None = None):
+        '''
+        Params
+        ------
+        on_update : Callable[[ProgressSnapshot], None] | None
+            called (on the reporting thread) with a new snapshot after every update
+        stage_weights : dict[ProgressStage, float] | None
+            share of the job each stage accounts for, in the order stages run. If None, every stage is weighted equally
+        '''
+
+        self.on_update = on_update
+        self.stage_weights = stage_weights or {}
+
+        self._lock = Lock()
+        self._start = monotonic()
+        self._events: dict[tuple[ProgressStage, str], ProgressEvent] = {}
+        self._current_stage: ProgressStage | None = None
+        self._last_snapshot = ProgressSnapshot()
+
+    def plan(self, stage: ProgressStage, table: str, rows_total: int, unit: str = 'rows'):
+        ''' Register a unit of work up front, so the stage's total is known before it starts '''
+
+        with self._lock:
+            key = (stage, table)
+            if key not in self._events:
+                self._events[key] = ProgressEvent(stage=stage, table=table, unit=unit, rows_total=rows_total)
+            else:
+                self._events[key].rows_total = rows_total
+
+    def update(self, progress: str | ProgressEvent):
+        '''
+        Report progress
+
+        Params
+        ------
+        progress : str | ProgressEvent
+            a plain message, or a structured event for one unit of work
+        '''
+
+        with self._lock:
+            if isinstance(progress, ProgressEvent):
+                self._events[(progress.stage, progress.table)] = progress
+                self._current_stage = progress.stage
+                message = progress.message or self._default_message(progress)
+            else:
+                message = progress
+
+            snapshot = self._snapshot(message, progress if isinstance(progress, ProgressEvent) else None)
+            self._last_snapshot = snapshot
+
+        if self.on_update:
+            self.on_update(snapshot)
+
+    def snapshot(self) -> ProgressSnapshot:
+        with self._lock:
+            return self._last_snapshot.model_copy()
+
+    def _stage_fraction(self, stage: ProgressStage) -> float | None:
+        events = [event for (event_stage, _), event in self._events.items() if event_stage == stage and event.rows_total > 0]
+        if not events:
+            return None
+
+        done = sum(min(event.rows_done, event.rows_total) for event in events)
+        total = sum(event.rows_total for event in events)
+        return done / total
+
+    def _overall_percent(self) -> float | None:
+        if self._current_stage is None:
+            return None
+
+        stages = list(self.stage_weights) if self.stage_weights else list(dict.fromkeys(stage for stage, _ in self._events))
+        if self._current_stage not in stages:
+            return self._stage_fraction(self._current_stage)
+
+        weights = self.stage_weights or {stage: 1 / len(stages) for stage in stages}
+        current_idx = stages.index(self._current_stage)
+
+        done_weight = sum(weights[stage] for stage in stages[:current_idx])
+
+        # No known total in this stage (e.g. a download of unknown size) - nothing to show unless earlier stages are done
+        current_fraction = self._stage_fraction(self._current_stage)
+        if current_fraction is None:
+            if done_weight <= 0:
+                return None
+            current_fraction = 0
+
+        percent = done_weight + weights[self._current_stage] * current_fraction
+        return min(percent / sum(weights.values()), 1)
+
+    def _snapshot(self, message: str, event: ProgressEvent | None) -> ProgressSnapshot:
+        elapsed = monotonic() - self._start
+        percent = self._overall_percent()
+
+        eta_seconds = None
+        if percent is not None and percent >= MIN_PERCENT_FOR_ETA:
+            eta_seconds = elapsed * (1 - percent) / percent
+
+        return ProgressSnapshot(
+            message=message,
+            stage=self._current_stage,
+            percent=percent,
+            eta_seconds=eta_seconds,
+            rate=event.rate if event else self._last_snapshot.rate,
+            unit=event.unit if event else self._last_snapshot.unit,
+            elapsed=elapsed
+        )
+
+    def _default_message(self, event: ProgressEvent) -> str:
+        table = f' {event.table}' if event.table else ''
+        if event.rows_total > 0:
+            return f'{event.stage.value}{table} ({event.rows_done:,} / {event.rows_total:,} {event.unit})...'
+        return f'{event.stage.value}{table} ({event.rows_done:,} {event.unit})...'
+
+
+def format_progress(progress: str | ProgressSnapshot) -> str:
+    '''
+    Text for the loading screen - the message, plus percent, rate and ETA when they're known
+
+    Params
+    ------
+    progress : str | ProgressSnapshot
+
+    Return
+    ------
+    display string
+    '''
+
+    if isinstance(progress, str):
+        return progress
+
+    details = []
+    if progress.percent is not None:
+        details.append(f'{progress.percent * 100:,.0f}%')
+    if progress.rate > 0:
+        details.append(f'{progress.rate:,.0f} {progress.unit}/sec')
+    if progress.eta_seconds is not None:
+        minutes, seconds = divmod(int(round(progress.eta_seconds)), 60)
+        details.append(f'about {minutes}:{seconds:02d} left')
+
+    if not details:
+        return progress.message
+    return f'{progress.message}\n\n{"  |  ".join(details)}'
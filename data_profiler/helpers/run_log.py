@@ -0,0 +1,195 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Structured, asynchronous run logging. An upload/delete log used to be a plain file that every stage wrote to and flushed after
+nearly every line - on network-mapped Downloads folders each of those flushes is a round trip.
+
+RunLogFile keeps the same write()/flush() interface the services already use (so it can be passed anywhere a log file was),
+plus leveled log calls with structured fields. Everything is handed to a background thread, which writes in batches and only
+flushes every RUN_LOG_FLUSH_INTERVAL_SECONDS (and on close). Each run gets two files:
+    <name>.txt      the human-readable log, as before - a rendered view of the INFO+ records
+    <name>.jsonl    one JSON record per line (time, level, span, message, fields), including DEBUG records
+
+Console output goes through the "data_profiler" logger - see configure_console_logging. Debug dumps (dataframe heads, the
+first row of each insert) are logged at DEBUG, which is only shown for dev
+'''
+
+from datetime import datetime
+import json
+import logging
+import os
+from queue import Queue, Empty
+import sys
+from threading import Thread
+from time import monotonic
+
+from .constants.app_constants import RUN_LOG_FLUSH_INTERVAL_SECONDS
+from .instrumentation import current_span_name
+
+
+_CLOSE = object()
+
+
+class RunLogFile():
+    '''
+    Log file for a single run, written by a background thread. Use in "with" block, or call close() - close() waits for
+    everything queued to be written
+    '''
+
+    def __init__(self, path: str, flush_interval: float = RUN_LOG_FLUSH_INTERVAL_SECONDS, text_level: int = logging.INFO):
+        '''
+        Params
+        ------
+        path : str
+            path of the human-readable log (.txt). The JSON-lines log is written next to it, with a .jsonl extension
+        flush_interval : float
+            most seconds a record can sit in the writer's buffer before it's flushed to disk
+        text_level : int
+            lowest level (logging.DEBUG, logging.INFO, ...) rendered into the .txt log. The .jsonl log gets every record
+        '''
+
+        self.path = path
+        self.jsonl_path = f'{os.path.splitext(path)[0]}.jsonl'
+        self.flush_interval = flush_interval
+        self.text_level = text_level
+
+        self._text_file = open(path, 'w', encoding='utf-8')
+        self._jsonl_file = open(self.jsonl_path, 'w', encoding='utf-8')
+        self._partial_line = ''
+        self._closed = False
+
+        self._queue: Queue = Queue()
+        self._writer = Thread(target=self._write_loop, name='run-log-writer', daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> 'RunLogFile':
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    ''' File-like interface '''
+
+    def write(self, text: str) -> int:
+        '''
+        Same as a text file's write - text is rendered into the .txt log as-is. Each completed line also becomes an INFO
+        record in the .jsonl log
+        '''
+
+        if self._closed:
+            raise ValueError('I/O operation on closed run log.')
+
+        lines = (self._partial_line + text).split('\n')
+        self._partial_line = lines.pop()
+
+        self._queue.put((text, [_record(logging.INFO, line) for line in lines if line.strip()]))
+        return len(text)
+
+    def flush(self):
+        ''' No-op - the writer thread flushes on its own schedule. Kept so this can stand in for a file '''
+
+    ''' Structured logging '''
+
+    def log(self, level: int, message: str, **fields):
+        '''
+        Log a message with structured fields (rows=..., table=..., etc.) - rendered as "message" in the .txt log if level is at
+        least text_level, and kept whole in the .jsonl log
+        '''
+
+        if self._closed:
+            raise ValueError('I/O operation on closed run log.')
+
+        text = f'{message}\n' if level >= self.text_level else ''
+        self._queue.put((text, [_record(level, message, **fields)]))
+
+    def debug(self, message: str, **fields):
+        self.log(logging.DEBUG, message, **fields)
+
+    def info(self, message: str, **fields):
+        self.log(logging.INFO, message, **fields)
+
+    def warning(self, message: str, **fields):
+        self.log(logging.WARNING, message, **fields)
+
+    def error(self, message: str, **fields):
+        self.log(logging.ERROR, message, **fields)
+
+    def close(self):
+        if self._closed:
+            return
+
+        if self._partial_line.strip():
+            self._queue.put(('', [_record(logging.INFO, self._partial_line)]))
+        self._closed = True
+
+        self._queue.put(_CLOSE)
+        self._writer.join()
+
+        self._text_file.close()
+        self._jsonl_file.close()
+
+    ''' Writer thread '''
+
+    def _write_loop(self):
+        last_flush = monotonic()
+        closing = False
+
+        while not closing:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except Empty:
+                items = []
+
+            # Take everything else that's waiting, so it goes out in one batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            for item in items:
+                if item is _CLOSE:
+                    closing = True
+                    continue
+
+                text, records = item
+                if text:
+                    self._text_file.write(text)
+                for record in records:
+                    self._jsonl_file.write(json.dumps(record, default=str) + '\n')
+
+            if closing or monotonic() - last_flush >= self.flush_interval:
+                self._text_file.flush()
+                self._jsonl_file.flush()
+                last_flush = monotonic()
+
+
+def configure_console_logging(dev: bool = False):
+    '''
+    Send the "data_profiler" logger to stdout - DEBUG and up for dev, INFO and up otherwise (debug dumps are suppressed in
+    production). Safe to call more than once
+    '''
+
+    logger = logging.getLogger('data_profiler')
+    logger.setLevel(logging.DEBUG if dev else logging.INFO)
+
+    if not any(getattr(handler, '_data_profiler_console', False) for handler in logger.handlers):
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler._data_profiler_console = True
+        logger.addHandler(handler)
+
+
+''' Helpers '''
+
+def _record(level: int, message: str, **fields) -> dict:
+    record = {'time': datetime.now().isoformat(timespec='milliseconds'), 'level': logging.getLevelName(level), 'span': current_span_name(), 'message': message}
+    if fields:
+        record['fields'] = fields
+    return record
@@ -0,0 +1,80 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Opt-in profiler capture for a single run (an upload, a data description). When a client's upload is unexpectedly slow, run it
+with profile_run=True and send back the profile saved next to its log, instead of reproducing the client's data locally.
+
+Uses pyinstrument (sampling, saves an interactive HTML flame/call tree) when it's installed, otherwise cProfile (saves a .pstats
+file - open with snakeviz or pstats). Only the thread that starts the profiler is profiled, which is the thread the job runs on.
+When disabled nothing is imported or started
+'''
+
+import cProfile
+from importlib.util import find_spec
+
+from .constants.app_constants import PROFILE_SAMPLE_INTERVAL_SECONDS
+
+
+# Only checks pyinstrument is installed - it's imported when a profile is actually started
+PROFILER_BACKEND = 'pyinstrument' if find_spec('pyinstrument') is not None else 'cprofile'
+
+
+class RunProfiler():
+    '''
+    Profiles whatever runs inside its "with" block and saves the result to output_path when the block exits.
+    If output_path_base is None, does nothing
+    '''
+
+    def __init__(self, output_path_base: str | None, interval: float = PROFILE_SAMPLE_INTERVAL_SECONDS):
+        '''
+        Params
+        ------
+        output_path_base : str | None
+            path of the profile without its extension (e.g. the log file path minus ".txt"). None to disable
+        interval : float
+            pyinstrument sampling interval, in seconds
+        '''
+
+        self.enabled = output_path_base is not None
+        self.interval = interval
+        self.output_path = None
+        if self.enabled:
+            self.output_path = f'{output_path_base}_profile' + ('.html' if PROFILER_BACKEND == 'pyinstrument' else '.pstats')
+
+        self._profiler = None
+
+    def __enter__(self) -> 'RunProfiler':
+        if not self.enabled:
+            return self
+
+        if PROFILER_BACKEND == 'pyinstrument':
+            from pyinstrument import Profiler
+            self._profiler = Profiler(interval=self.interval)
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        if self._profiler is None:
+            return
+
+        try:
+            if PROFILER_BACKEND == 'pyinstrument':
+                self._profiler.stop()
+                with open(self.output_path, 'w', encoding='utf-8') as f:
+                    f.write(self._profiler.output_html())
+            else:
+                self._profiler.disable()
+                self._profiler.dump_stats(self.output_path)
+
+            print(f'Saved profile to {self.output_path}')
+        except OSError as e:
+            # A profile is never worth failing the run over
+            print(f'Could not save profile to {self.output_path}: {e}')
+        finally:
+            self._profiler = None
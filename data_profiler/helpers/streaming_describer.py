@@ -0,0 +1,534 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Streaming (out-of-core) version of the data describer. The file is read in chunks and each column's statistics are accumulated
+in fixed-size sketches, so memory stays bounded no matter how big the client extract is:
+
+- count / mean / variance: merged chunk by chunk (Chan et al. parallel update)
+- min / max / negatives / zeros: exact
+- quartiles: KLL-style compactor sketch (exact until it fills up)
+- outlier counts + histogram chart: histogram whose bin width doubles whenever a value falls outside its range
+- top / freq: bounded frequency table. unique: K-minimum-values distinct count estimate
+
+The resulting describe table has the same layout as the in-memory describer
+'''
+
+import math
+from typing import Iterator, Hashable
+
+import numpy as np
+import pandas as pd
+
+from .constants.app_constants import DESCRIBE_CHUNK_ROWS, DESCRIBE_QUANTILE_SKETCH_K, DESCRIBE_HISTOGRAM_BINS, DESCRIBE_TOP_VALUES_CAPACITY, \
+    DESCRIBE_DISTINCT_SKETCH_K, DESCRIBE_MAX_GROUPS, DESCRIBE_CHART_BINS
+from .functions.describer_functions import add_fences, DESCRIBE_COUNT_COLS, BOX_STATS_COLS, OTHER_GROUP
+
+
+
+''' Sketches '''
+
+class QuantileSketch:
+    '''
+    KLL-style quantile sketch. Values land in level 0; whenever a level outgrows its capacity it is sorted and every other
+    value (random offset) is promoted to the next level, where each value stands for twice as many. Capacities shrink
+    geometrically towards the bottom levels, so total size is O(k). Exact while fewer than k values have been seen
+    '''
+
+    def __init__(self, k: int = DESCRIBE_QUANTILE_SKETCH_K, seed: int | None = 0):
+        self.k = k
+        self.count = 0
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def quantiles(self, qs: list[float]) -> list[float]:
+        if self.count == 0:
+            return [np.nan for _ in qs]
+
+        # Nothing compacted yet -> exact, with the same interpolation as pandas
+        if len(self.levels) == 1:
+            return list(np.quantile(self.levels[0], qs))
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.float64) for h, level in enumerate(self.levels)])
+
+        order = np.argsort(items, kind='stable')
+        items, weights = items[order], weights[order]
+        cum_weights = np.cumsum(weights)
+
+        idxs = np.searchsorted(cum_weights, np.asarray(qs) * cum_weights[-1], side='left')
+        return list(items[np.clip(idxs, 0, len(items) - 1)])
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                buffer = np.sort(self.levels[level])
+
+                # An odd one out stays behind so the promoted pairs line up
+                keep = buffer[-1:] if len(buffer) % 2 else buffer[:0]
+                buffer = buffer[:len(buffer) - len(keep)]
+
+                offset = self._rng.integers(2)
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], buffer[offset::2]])
+                self.levels[level] = keep
+            level += 1
+
+
+class AdaptiveHistogram:
+    '''
+    Fixed number of equal-width bins. The range starts at the first chunk's [min, max]; when a value falls outside it,
+    adjacent bin pairs are merged (width doubles) and the range is extended on that side, so nothing is ever dropped
+    '''
+
+    def __init__(self, n_bins: int = DESCRIBE_HISTOGRAM_BINS):
+        self.n_bins = n_bins + (n_bins % 2)
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.lo: float | None = None
+        self.width: float = 1.0
+
+    @property
+    def hi(self) -> float:
+        return self.lo + self.width * self.n_bins
+
+    def update(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+
+        v_min, v_max = values.min(), values.max()
+        if self.lo is None:
+            self.lo = float(v_min)
+            span = float(v_max - v_min)
+            self.width = span / (self.n_bins - 1) if span > 0 else 1.0
+
+        while v_min < self.lo:
+            self._grow(extend_left=True)
+        while v_max >= self.hi:
+            self._grow(extend_left=False)
+
+        idxs = ((values - self.lo) / self.width).astype(np.int64)
+        self.counts += np.bincount(np.clip(idxs, 0, self.n_bins - 1), minlength=self.n_bins)
+
+    def edges(self) -> np.ndarray:
+        return self.lo + self.width * np.arange(self.n_bins + 1)
+
+    def count_below(self, x: float) -> int:
+        ''' Estimated number of values < x (linear interpolation inside the bin containing x) '''
+
+        if self.lo is None or x <= self.lo:
+            return 0
+        if x >= self.hi:
+            return int(self.counts.sum())
+
+        position = (x - self.lo) / self.width
+        idx = int(position)
+        return int(round(self.counts[:idx].sum() + self.counts[idx] * (position - idx)))
+
+    def count_above(self, x: float) -> int:
+        ''' Estimated number of values > x '''
+
+        return int(self.counts.sum()) - self.count_below(x)
+
+    def _grow(self, extend_left: bool):
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        counts = np.zeros(self.n_bins, dtype=np.int64)
+        half = self.n_bins // 2
+
+        if extend_left:
+            counts[half:] = merged
+            self.lo -= self.width * self.n_bins
+        else:
+            counts[:half] = merged
+
+        self.counts = counts
+        self.width *= 2
+
+
+class FrequentValues:
+    '''
+    Bounded frequency table for top/freq. Chunk value counts are added in; once there are more than capacity distinct
+    values, only the most frequent are kept (so freq is a lower bound for very high-cardinality columns)
+    '''
+
+    def __init__(self, capacity: int = DESCRIBE_TOP_VALUES_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, series: pd.Series):
+        value_counts = series.value_counts(dropna=True)
+        self.counts = value_counts if self.counts.empty else self.counts.add(value_counts, fill_value=0)
+        if len(self.counts) > self.capacity:
+            self.counts = self.counts.nlargest(self.capacity)
+
+    def top(self) -> tuple[Hashable, int]:
+        if self.counts.empty:
+            return np.nan, np.nan
+        return self.counts.idxmax(), int(self.counts.max())
+
+
+class DistinctCounter:
+    '''
+    K-minimum-values distinct count. Keeps the k smallest 64 bit value hashes; exact while fewer than k distinct values are seen
+    '''
+
+    def __init__(self, k: int = DESCRIBE_DISTINCT_SKETCH_K):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, series: pd.Series):
+        hashes = pd.util.hash_pandas_object(series.dropna().astype(str), index=False).to_numpy()
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[:self.k]
+
+    def estimate(self) -> int:
+        if len(self.hashes) < self.k:
+            return len(self.hashes)
+        return int(round((self.k - 1) / (float(self.hashes[self.k - 1]) / 2 ** 64)))
+
+
+''' Column accumulators '''
+
+class NumericColumnStats:
+    ''' Streaming stats for one numeric column '''
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.negatives = 0
+        self.zeros = 0
+        self.sketch = QuantileSketch()
+        self.histogram = AdaptiveHistogram()
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return
+
+        # Chan et al. - merge this chunk's mean/M2 into the running totals
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        delta = chunk_mean - self.mean
+        total = self.count + n
+
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+        self.min = np.nanmin([self.min, values.min()])
+        self.max = np.nanmax([self.max, values.max()])
+        self.negatives += int(np.count_nonzero(values < 0))
+        self.zeros += int(np.count_nonzero(values == 0))
+
+        self.sketch.update(values)
+        self.histogram.update(values)
+
+    def describe(self) -> dict:
+        q1, median, q3 = self.sketch.quantiles([0.25, 0.5, 0.75])
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else np.nan,
+            'std': math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan,
+            'min': self.min,
+            '25%': q1,
+            '50%': median,
+            '75%': q3,
+            'max': self.max,
+        }
+
+
+class CategoricalColumnStats:
+    ''' Streaming stats for one non-numeric column '''
+
+    def __init__(self):
+        self.count = 0
+        self.frequent_values = FrequentValues()
+        self.distinct = DistinctCounter()
+
+    def update(self, series: pd.Series):
+        self.count += int(series.count())
+        self.frequent_values.update(series)
+        self.distinct.update(series)
+
+    def describe(self) -> dict:
+        top, freq = self.frequent_values.top()
+        return {
+            'count': self.count,
+            'unique': self.distinct.estimate(),
+            'top': top,
+            'freq': freq,
+        }
+
+
+class GroupStats:
+    ''' Quartiles + min/max of one numeric column within one group, for box plots '''
+
+    def __init__(self):
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.sketch = QuantileSketch(k=DESCRIBE_QUANTILE_SKETCH_K // 2)
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self.min = np.nanmin([self.min, values.min()])
+        self.max = np.nanmax([self.max, values.max()])
+        self.sketch.update(values)
+
+
+''' Result '''
+
+class StreamingDescription:
+    '''
+    Everything the describer exports, accumulated from a chunked read
+
+    Attributes
+    ------
+    df_val : pd.DataFrame
+        describe table (columns as rows), same layout as the in-memory describer
+    numeric_cols : list[str]
+    numeric_stats : dict[str, NumericColumnStats]
+        whole-column stats (histogram, quartile sketch) per numeric column
+    group_stats : dict[str, dict[str, GroupStats]]
+        numeric column -> group -> stats
+    original : pd.DataFrame | None
+        the whole file, only kept if it fit in the first chunk
+    rows : int
+    '''
+
+    def __init__(self, df_val: pd.DataFrame, numeric_cols: list[str], numeric_stats: dict[str, NumericColumnStats],
+                 group_stats: dict[str, dict[str, GroupStats]], original: pd.DataFrame | None, rows: int):
+        self.df_val = df_val
+        self.numeric_cols = numeric_cols
+        self.numeric_stats = numeric_stats
+        self.group_stats = group_stats
+        self.original = original
+        self.rows = rows
+
+
+''' Reading '''
+
+def iter_file_chunks(file_path: str, columns: list[str], file_type: str = 'csv', sheet_name: str = None,
+                     chunk_size: int = DESCRIBE_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    '''
+    Yield a CSV or XLSX file as DataFrame chunks of at most chunk_size rows
+
+    Params
+    ------
+    file_path : str
+    columns : list[str]
+        columns to read
+    file_type : str
+        'csv' or anything else for Excel
+    sheet_name : str
+        Excel sheet to read. If None, the first sheet
+    chunk_size : int
+    '''
+
+    if file_type == 'csv':
+        yield from pd.read_csv(file_path, usecols=columns, chunksize=chunk_size)
+        return
+
+    # pandas can't chunk Excel, so page through the sheet with openpyxl's read-only (streaming) mode
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+
+        col_idxs = [i for i, col in enumerate(header) if col in set(columns)]
+        col_names = [header[i] for i in col_idxs]
+
+        buffer = []
+        for row in rows:
+            buffer.append([row[i] if i < len(row) else None for i in col_idxs])
+            if len(buffer) == chunk_size:
+                yield pd.DataFrame(buffer, columns=col_names).infer_objects()
+                buffer = []
+
+        if buffer:
+            yield pd.DataFrame(buffer, columns=col_names).infer_objects()
+    finally:
+        workbook.close()
+
+
+''' Describe '''
+
+def describe_file_streaming(file_path: str, columns: list[str], file_type: str = 'csv', sheet_name: str = None, group_col: str = None,
+                            chunk_size: int = DESCRIBE_CHUNK_ROWS) -> StreamingDescription:
+    '''
+    Describe a CSV/XLSX file without loading it into memory
+
+    Which columns are numeric is decided from the first chunk. In later chunks those columns are coerced to numbers,
+    so stray text in a numeric column counts as missing
+
+    Params
+    ------
+    file_path : str
+    columns : list[str]
+        columns to describe
+    file_type : str
+        'csv' or 'xlsx'
+    sheet_name : str
+        Excel sheet name
+    group_col : str
+        a *categorical* column by which box plot stats are grouped
+    chunk_size : int
+        rows per chunk
+
+    Return
+    ------
+    StreamingDescription
+    '''
+
+    numeric_stats: dict[str, NumericColumnStats] = {}
+    categorical_stats: dict[str, CategoricalColumnStats] = {}
+    group_stats: dict[str, dict[str, GroupStats]] = {}
+    col_order: list[str] = []
+    numeric_cols: list[str] = []
+
+    original: pd.DataFrame | None = None
+    rows = 0
+    chunk_num = 0
+
+    for chunk in iter_file_chunks(file_path=file_path, columns=columns, file_type=file_type, sheet_name=sheet_name, chunk_size=chunk_size):
+        chunk = chunk.replace('', pd.NA)
+        chunk_num += 1
+        rows += len(chunk)
+        print(f'Describing chunk {chunk_num} ({rows:,} rows so far)...')
+
+        if chunk_num == 1:
+            original = chunk
+            col_order = chunk.columns.tolist()
+            numeric_cols = chunk.select_dtypes(include='number').columns.tolist()
+            numeric_stats = {col: NumericColumnStats() for col in numeric_cols}
+            categorical_stats = {col: CategoricalColumnStats() for col in col_order if col not in numeric_stats}
+            group_stats = {col: {} for col in numeric_cols}
+
+        # Only keep the data for the "Original" sheet if the whole file fits in the first chunk
+        else:
+            original = None
+
+        numeric_values = {col: pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan) for col in numeric_cols}
+
+        for col, stats in numeric_stats.items():
+            stats.update(numeric_values[col])
+        for col, stats in categorical_stats.items():
+            stats.update(chunk[col])
+
+        if group_col and group_col in chunk.columns:
+            _update_group_stats(group_stats, chunk[group_col], numeric_values)
+
+    # Assemble the describe table in the same shape as df.describe(include='all').transpose()
+    describe_rows = {}
+    for col in col_order:
+        describe_rows[col] = numeric_stats[col].describe() if col in numeric_stats else categorical_stats[col].describe()
+
+    df_val = pd.DataFrame.from_dict(describe_rows, orient='index')
+    df_val = df_val.reindex(columns=['count', 'unique', 'top', 'freq', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+    df_val = add_fences(df_val.astype({col: 'float64' for col in ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']}))
+
+    df_val['Missing Values'] = rows - df_val['count']
+
+    # Negatives/zeros are exact, outliers are counted off the histogram
+    for count_col in DESCRIBE_COUNT_COLS:
+        df_val[count_col] = 0
+    for col, stats in numeric_stats.items():
+        df_val.loc[col, 'Negative Values'] = stats.negatives
+        df_val.loc[col, 'Zero Values'] = stats.zeros
+        df_val.loc[col, 'Lower Outliers'] = stats.histogram.count_below(df_val.loc[col, 'Lower Fence'])
+        df_val.loc[col, 'Upper Outliers'] = stats.histogram.count_above(df_val.loc[col, 'Upper Fence'])
+        df_val.loc[col, 'Extreme Upper Outliers'] = stats.histogram.count_above(df_val.loc[col, 'Extreme Upper Fence'])
+
+    return StreamingDescription(
+        df_val=df_val,
+        numeric_cols=numeric_cols,
+        numeric_stats=numeric_stats,
+        group_stats=group_stats if group_col else {},
+        original=original,
+        rows=rows
+    )
+
+
+def _update_group_stats(group_stats: dict[str, dict[str, GroupStats]], groups: pd.Series, numeric_values: dict[str, np.ndarray]):
+    ''' Fold one chunk into the per-group stats. Once DESCRIBE_MAX_GROUPS groups exist, new groups go to "Other" '''
+
+    for group, idxs in groups.groupby(groups.astype(str), dropna=False, sort=False).indices.items():
+        for col, values in numeric_values.items():
+            col_groups = group_stats[col]
+
+            key = group if group in col_groups or len(col_groups) < DESCRIBE_MAX_GROUPS else OTHER_GROUP
+            if key not in col_groups:
+                col_groups[key] = GroupStats()
+
+            col_groups[key].update(values[idxs])
+
+
+''' Charts '''
+
+def histogram_bins(histogram: AdaptiveHistogram) -> tuple[np.ndarray, np.ndarray]:
+    ''' Bin edges/counts of an AdaptiveHistogram for charting - trimmed to its non-empty range and merged down to about DESCRIBE_CHART_BINS bins '''
+
+    if histogram.lo is None:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+
+    non_empty = np.flatnonzero(histogram.counts)
+    first, last = non_empty[0], non_empty[-1] + 1
+    counts = histogram.counts[first:last]
+
+    factor = max(int(math.ceil(len(counts) / DESCRIBE_CHART_BINS)), 1)
+    counts = np.pad(counts, (0, (-len(counts)) % factor)).reshape(-1, factor).sum(axis=1)
+
+    width = histogram.width * factor
+    edges = histogram.lo + histogram.width * first + width * np.arange(len(counts) + 1)
+    return edges, counts
+
+
+def box_plot_stats(group_stats: dict[str, GroupStats | NumericColumnStats]) -> pd.DataFrame:
+    ''' Box plot stats (one row per group) from quartile sketches. Whiskers are the 1.5 IQR fences clipped to min/max '''
+
+    rows = {}
+    for group, stats in group_stats.items():
+        if stats.count == 0:
+            continue
+
+        q1, median, q3 = stats.sketch.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        rows[group] = {
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': max(stats.min, q1 - 1.5 * iqr),
+            'upperfence': min(stats.max, q3 + 1.5 * iqr),
+        }
+
+    return pd.DataFrame.from_dict(rows, orient='index', columns=BOX_STATS_COLS)
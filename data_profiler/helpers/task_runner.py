@@ -0,0 +1,134 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Runs long GUI actions (uploads, downloads, deletes, describer) on a worker thread so the Tk main loop keeps repainting.
+Tkinter isn't thread-safe, so the worker never touches a widget - progress text, the result and any exception are put on
+a queue, and the main thread drains it with after()
+'''
+
+from dataclasses import dataclass
+from queue import Queue, Empty
+from threading import Thread
+import traceback
+from typing import Any, Callable
+
+
+POLL_INTERVAL_MS = 50
+
+
+@dataclass
+class _TaskMessage:
+    kind: str  # 'progress' | 'done' | 'error'
+    payload: Any = None
+
+
+class BackgroundTaskRunner():
+    '''
+    Runs one task at a time on a daemon thread and marshals its progress/result back onto the Tk main thread.
+
+    The task is called as task(report_progress), where report_progress(text: str) is safe to call from the worker.
+    on_progress, on_complete and on_error are always called on the main thread, so they can update widgets and show dialogs
+    '''
+
+    def __init__(self, widget, poll_interval_ms: int = POLL_INTERVAL_MS):
+        '''
+        Params
+        ------
+        widget : tkinter widget
+            any widget of the app - only used for after()
+        poll_interval_ms : int
+            how often the main thread checks the queue while a task is running
+        '''
+
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+
+        self._queue: Queue[_TaskMessage] = Queue()
+        self._thread: Thread | None = None
+        self._on_progress: Callable[[str], None] | None = None
+        self._on_complete: Callable[[Any], None] | None = None
+        self._on_error: Callable[[BaseException], None] | None = None
+
+    def is_busy(self) -> bool:
+        return self._thread is not None
+
+    def run(self, task: Callable[[Callable[[str], None]], Any], on_complete: Callable[[Any], None],
+            on_progress: Callable[[str], None] | None = None, on_error: Callable[[BaseException], None] | None = None) -> bool:
+        '''
+        Start a task on the worker thread
+
+        Params
+        ------
+        task : Callable
+            task(report_progress) -> result. Runs on the worker - must not touch widgets
+        on_complete : Callable
+            on_complete(result), called on the main thread once the task returns
+        on_progress : Callable | None
+            on_progress(text), called on the main thread for each report_progress() call
+        on_error : Callable | None
+            on_error(exception), called on the main thread if the task raises. If None, the exception is re-raised there
+
+        Return
+        ------
+        False if another task is still running (nothing is started), else True
+        '''
+
+        if self.is_busy():
+            print('A background task is already running - ignoring request')
+            return False
+
+        self._on_progress = on_progress
+        self._on_complete = on_complete
+        self._on_error = on_error
+
+        self._thread = Thread(target=self._work, args=(task,), daemon=True)
+        self._thread.start()
+
+        self.widget.after(self.poll_interval_ms, self._poll)
+        return True
+
+    def _report_progress(self, text: str):
+        self._queue.put(_TaskMessage('progress', text))
+
+    def _work(self, task: Callable[[Callable[[str], None]], Any]):
+        try:
+            result = task(self._report_progress)
+        except BaseException as e:
+            traceback.print_exc()
+            self._queue.put(_TaskMessage('error', e))
+        else:
+            self._queue.put(_TaskMessage('done', result))
+
+    def _poll(self):
+        # Drain everything the worker has posted since the last poll
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except Empty:
+                break
+
+            if message.kind == 'progress':
+                if self._on_progress is not None:
+                    self._on_progress(message.payload)
+                continue
+
+            self._finish(message)
+            return
+
+        self.widget.after(self.poll_interval_ms, self._poll)
+
+    def _finish(self, message: _TaskMessage):
+        on_complete, on_error = self._on_complete, self._on_error
+
+        # Free the runner before calling back, so the callback can start the next task
+        self._thread = None
+        self._on_progress = self._on_complete = self._on_error = None
+
+        if message.kind == 'done':
+            on_complete(message.payload)
+        elif on_error is not None:
+            on_error(message.payload)
+        else:
+            raise message.payload
@@ -0,0 +1,104 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Insert throughput history. Every upload records how fast each output table went in (rows/s, including the connection), and
+dry runs + previews predict upload times from it - so the predictions reflect the server, network and VPN people actually upload
+over, rather than a guess. Kept as a small JSON file in the user's home folder (see THROUGHPUT_HISTORY_DEFAULT_PATH):
+
+    {"tables": {"OrderDetails": [{"rows": 1250000, "seconds": 61.2, "recorded_at": "2026-10-19T14:02:11"}, ...], ...}}
+
+A table with no history of its own is predicted from every table's history, and with no history at all, from
+DEFAULT_INSERT_ROWS_PER_SECOND
+'''
+
+from datetime import datetime
+import json
+import logging
+import os
+from statistics import median
+
+from .constants.app_constants import THROUGHPUT_HISTORY_ENV_VAR, THROUGHPUT_HISTORY_DEFAULT_PATH, THROUGHPUT_HISTORY_MAX_RECORDS, \
+    THROUGHPUT_HISTORY_MIN_ROWS, DEFAULT_INSERT_ROWS_PER_SECOND
+
+
+logger = logging.getLogger(__name__)
+
+
+class ThroughputHistory():
+    '''
+    Per-table insert throughput of past uploads. record() each insert, then save()
+    '''
+
+    def __init__(self, path: str | None = None, max_records: int = THROUGHPUT_HISTORY_MAX_RECORDS):
+        '''
+        Params
+        ------
+        path : str | None
+            the history file. If None, DATA_PROFILER_THROUGHPUT_HISTORY, or else THROUGHPUT_HISTORY_DEFAULT_PATH
+        max_records : int
+            inserts kept per table (the most recent)
+        '''
+
+        self.path = path or os.environ.get(THROUGHPUT_HISTORY_ENV_VAR) or THROUGHPUT_HISTORY_DEFAULT_PATH
+        self.max_records = max_records
+        self.tables: dict[str, list[dict]] = self._load()
+
+    def record(self, table: str, rows: int, seconds: float):
+        ''' Add one table's insert. Ignored if it was too small to say anything about throughput '''
+
+        if rows < THROUGHPUT_HISTORY_MIN_ROWS or seconds <= 0:
+            return
+
+        records = self.tables.setdefault(table, [])
+        records.append({'rows': int(rows), 'seconds': round(seconds, 3), 'recorded_at': datetime.now().isoformat(timespec='seconds')})
+        del records[:-self.max_records]
+
+    def save(self):
+        ''' Write the history file. Written to a temp file first, so a crash never leaves it half-written '''
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'tables': self.tables}, f, indent=1)
+        os.replace(temp_path, self.path)
+
+    def rows_per_second(self, table: str) -> tuple[float, int]:
+        '''
+        Expected insert throughput for a table - the median of its recorded inserts, or of every table's if it has none
+
+        Return
+        ------
+        (rows per second, number of recorded inserts that's based on - 0 means DEFAULT_INSERT_ROWS_PER_SECOND)
+        '''
+
+        records = self.tables.get(table) or [record for table_records in self.tables.values() for record in table_records]
+        if not records:
+            return float(DEFAULT_INSERT_ROWS_PER_SECOND), 0
+
+        return median(record['rows'] / record['seconds'] for record in records), len(records)
+
+    def predict_seconds(self, table: str, rows: int) -> float:
+        ''' Expected seconds to insert this many rows into the table '''
+
+        rows_per_second, _ = self.rows_per_second(table)
+        return rows / rows_per_second
+
+
+    ''' Helper Functions '''
+
+    def _load(self) -> dict[str, list[dict]]:
+        if not os.path.isfile(self.path):
+            return {}
+
+        # A history that can't be read just means predictions fall back to the defaults - it's never worth failing a run over
+        try:
+            with open(self.path) as f:
+                tables = json.load(f)['tables']
+            return {table: [record for record in records if record.get('rows', 0) > 0 and record.get('seconds', 0) > 0]
+                    for table, records in tables.items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning('Could not read insert throughput history %s: %s', self.path, e)
+            return {}
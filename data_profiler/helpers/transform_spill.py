@@ -0,0 +1,152 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Spilled output tables. A dry run builds every output table without inserting anything, and saves them here, so the real upload
+that follows can go straight to the inserts instead of reading + transforming the same files again.
+
+Spills are keyed by a fingerprint of what the output tables are built from - each input file's path, size and modified time,
+the project number, the transform options and the pandas version. Change any of those and the upload transforms from scratch.
+Each spill is a folder of pickles (one per table) plus a manifest.json:
+
+    <spill dir>/<fingerprint>/manifest.json
+    <spill dir>/<fingerprint>/OrderDetails.pkl ...
+
+Pickle rather than parquet because the tables are exactly what gets inserted - after fillna(''), a numeric column with blanks is
+a mix of floats and strings, which Arrow can't store. Spills are only ever read back from the folder this app wrote them to
+'''
+
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import pandas as pd
+
+from .constants.app_constants import TRANSFORM_SPILL_DIR_ENV_VAR, TRANSFORM_SPILL_DEFAULT_DIR, TRANSFORM_SPILL_MAX_AGE_HOURS
+from .models.DataFiles import UploadFileType
+from .models.Memory import ExecutionMode
+from .models.TransformOptions import TransformOptions
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def transform_fingerprint(files: list[tuple[UploadFileType, str]], project_number: str, transform_options: TransformOptions, dev: bool = False) -> str:
+    '''
+    Fingerprint of everything the output tables depend on
+
+    Params
+    ------
+    files : list[tuple[UploadFileType, str]]
+        (file type, path) of every file the upload reads - DataDirectory.files_to_read()
+    '''
+
+    key = {
+        'project_number': project_number,
+        'transform_options': transform_options.model_dump(mode='json'),
+        'dev': dev,
+        'pandas': pd.__version__,
+        'files': [],
+    }
+    for file_type, path in files:
+        stat = os.stat(path)
+        key['files'].append([file_type.value, os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:32]
+
+
+class TransformSpill():
+    '''
+    One set of spilled output tables. save() after building them, exists() + load() before an upload, delete() once it's inserted
+    '''
+
+    def __init__(self, fingerprint: str, spill_dir: str | None = None):
+        '''
+        Params
+        ------
+        fingerprint : str
+            from transform_fingerprint
+        spill_dir : str | None
+            where spills are kept. If None, DATA_PROFILER_SPILL_DIR, or else TRANSFORM_SPILL_DEFAULT_DIR
+        '''
+
+        self.spill_dir = spill_dir or os.environ.get(TRANSFORM_SPILL_DIR_ENV_VAR) or TRANSFORM_SPILL_DEFAULT_DIR
+        self.fingerprint = fingerprint
+        self.path = os.path.join(self.spill_dir, fingerprint)
+
+    def exists(self) -> bool:
+        return os.path.isfile(os.path.join(self.path, MANIFEST_FILE))
+
+    def manifest(self) -> dict:
+        with open(os.path.join(self.path, MANIFEST_FILE)) as f:
+            return json.load(f)
+
+    @property
+    def execution_mode(self) -> ExecutionMode:
+        ''' The execution mode the spilled tables were built in (their upload should use the same) '''
+        return ExecutionMode(self.manifest()['execution_mode'])
+
+    def save(self, output_tables: dict[str, pd.DataFrame], execution_mode: ExecutionMode = ExecutionMode.IN_MEMORY):
+        '''
+        Spill the output tables, replacing any spill with the same fingerprint. Written to a temp folder that's renamed once
+        complete, so a spill that exists is always whole. Old spills are removed first
+        '''
+
+        self.prune()
+
+        temp_path = f'{self.path}.partial'
+        shutil.rmtree(temp_path, ignore_errors=True)
+        os.makedirs(temp_path)
+
+        for table, df in output_tables.items():
+            df.to_pickle(os.path.join(temp_path, f'{table}.pkl'))
+
+        manifest = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'execution_mode': execution_mode.value,
+            'tables': {table: len(df) for table, df in output_tables.items()},  # in insert order
+        }
+        with open(os.path.join(temp_path, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=1)
+
+        self.delete()
+        os.replace(temp_path, self.path)
+
+    def load(self) -> dict[str, pd.DataFrame]:
+        ''' The spilled output tables, in the order they were saved (the insert order) '''
+
+        tables = self.manifest()['tables']
+        output_tables = {table: pd.read_pickle(os.path.join(self.path, f'{table}.pkl')) for table in tables}
+
+        for table, rows in tables.items():
+            if len(output_tables[table]) != rows:
+                raise ValueError(f'Spilled {table} has {len(output_tables[table]):,} rows, expected {rows:,}. Delete {self.path} and transform again.')
+
+        return output_tables
+
+    def delete(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def prune(self, max_age_hours: float = TRANSFORM_SPILL_MAX_AGE_HOURS):
+        ''' Remove every spill (in the spill dir) older than max_age_hours, incl. any left half-written '''
+
+        if not os.path.isdir(self.spill_dir):
+            return
+
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).timestamp()
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            if not os.path.isdir(path):
+                continue
+
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path)
+            except OSError as e:
+                logger.warning('Could not remove old spill %s: %s', path, e)
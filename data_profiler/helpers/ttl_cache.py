@@ -0,0 +1,77 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Small thread-safe cache whose entries expire after a fixed time. Used for Project table metadata (project numbers, project
+info), which the GUI reads over and over but only changes when this app writes it - so writes update/drop entries directly
+and the TTL only has to cover changes made from other machines
+'''
+
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+
+_MISSING = object()
+
+
+class TTLCache():
+    '''
+    Key -> value store where every entry expires ttl_seconds after it was set
+    '''
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = monotonic):
+        '''
+        Params
+        ------
+        ttl_seconds : float
+            how long an entry is served before it has to be fetched again
+        clock : Callable[[], float]
+            returns the current time in seconds. Only swapped out in tests
+        '''
+
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        ''' The cached value, or default if there isn't one or it has expired '''
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return default
+
+            return value
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        '''
+        The cached value if there is a live one, otherwise load(), which is cached and returned.
+        load() runs outside the lock, so a slow DB query doesn't block other keys
+        '''
+
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = load()
+            self.set(key, value)
+
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,381 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Upload previews - transform a small sample of a data directory (nothing is inserted) to see what a full upload would produce, in
+seconds instead of a full upload + delete.
+
+PreviewSampler writes the sample as a data directory of its own, so it goes through the same validation and TransformService code
+as a real upload:
+    details files (Order Details/Outbound, Inbound Details/Inbound, Inventory)
+        evenly spaced blocks of the file, PREVIEW_SAMPLE_BYTES in total, so the sample spans the whole date range. Orders/POs
+        cut off at the edge of a block are dropped, so each sampled order/PO has all its lines
+    header files (Order Header, Inbound Header)
+        the header rows of the sampled orders/POs. Looked for in the same relative positions of the header file first, or the
+        whole file if it isn't sorted like the details
+    Item Master
+        whole, or cut down to the sampled SKUs if it's big
+
+Output tables are then scaled back up by each input file's estimated rows / sampled rows (see estimate_output_tables)
+'''
+
+import csv
+import os
+import shutil
+
+import pandas as pd
+
+from .constants.app_constants import PREVIEW_SAMPLE_BYTES, PREVIEW_SAMPLE_BLOCKS, PREVIEW_HEADER_WINDOW_MARGIN, PREVIEW_MIN_HEADER_MATCH_RATE, \
+    PREVIEW_FULL_ITEM_MASTER_BYTES
+from .data_directory import DataDirectory
+from .models.DataFiles import UploadFileType
+from .models.Responses import FileSample, OutputTableEstimate, VelocityShare
+
+
+# Column each file is sampled by
+KEY_COLUMNS = {
+    UploadFileType.ORDER_DETAILS: 'OrderNumber',
+    UploadFileType.ORDER_HEADER: 'OrderNumber',
+    UploadFileType.OUTBOUND: 'OrderNumber',
+    UploadFileType.INBOUND_DETAILS: 'PO_Number',
+    UploadFileType.INBOUND_HEADER: 'PO_Number',
+    UploadFileType.INBOUND: 'PO_Number',
+    UploadFileType.INVENTORY: 'SKU',
+    UploadFileType.ITEM_MASTER: 'SKU',
+}
+
+# (details file, its header file) - details files drive the sample
+SAMPLED_FILES = [
+    (UploadFileType.ORDER_DETAILS, UploadFileType.ORDER_HEADER),
+    (UploadFileType.OUTBOUND, None),
+    (UploadFileType.INBOUND_DETAILS, UploadFileType.INBOUND_HEADER),
+    (UploadFileType.INBOUND, None),
+    (UploadFileType.INVENTORY, None),
+]
+
+# Input file each output table is scaled up by. Tables not listed (one row per velocity) are used as sampled
+OUTPUT_TABLE_SCALE_FILES = {
+    'ItemMaster': [UploadFileType.ITEM_MASTER],
+    'OrderDetails': [UploadFileType.ORDER_DETAILS, UploadFileType.OUTBOUND],
+    'OrderHeader': [UploadFileType.ORDER_HEADER, UploadFileType.OUTBOUND],
+    'InboundDetails': [UploadFileType.INBOUND_DETAILS, UploadFileType.INBOUND],
+    'InboundHeader': [UploadFileType.INBOUND_HEADER, UploadFileType.INBOUND],
+    'InventoryData': [UploadFileType.INVENTORY],
+    'VelocityByMonth': [UploadFileType.ORDER_DETAILS, UploadFileType.OUTBOUND],
+}
+
+
+class _Block():
+    ''' Complete lines read from one block of a file '''
+
+    def __init__(self, lines: list[bytes], at_start: bool, at_end: bool):
+        self.lines = lines
+        self.at_start = at_start        # block starts right after the column headers - its first order/PO is complete
+        self.at_end = at_end            # block runs to the end of the file - its last order/PO is complete
+
+
+class PreviewSampler():
+    '''
+    Writes a sample of a (validated) data directory to another folder. See module docstring
+    '''
+
+    def __init__(self, data_directory: DataDirectory, sample_bytes: int = PREVIEW_SAMPLE_BYTES, blocks: int = PREVIEW_SAMPLE_BLOCKS):
+        '''
+        Params
+        ------
+        data_directory : DataDirectory
+            the data directory to sample. validate_directory() must have been run
+        sample_bytes : int
+            most bytes read from each details file
+        blocks : int
+            number of evenly spaced blocks sample_bytes is split into
+        '''
+
+        self.data_directory = data_directory
+        self.sample_bytes = sample_bytes
+        self.blocks = blocks
+
+        self.files: dict[UploadFileType, FileSample] = {}
+        self.warnings: list[str] = []
+
+    def write(self, sample_dir: str):
+        '''
+        Write the sample to sample_dir, with the same file names as the data directory. Fills in self.files + self.warnings
+        '''
+
+        os.makedirs(sample_dir, exist_ok=True)
+        files = dict(self.data_directory.files_to_read())
+        sampled_skus: set[bytes] = set()
+
+        for details_type, header_type in SAMPLED_FILES:
+            if details_type not in files:
+                continue
+
+            details_path = files[details_type]
+            header, blocks, estimated_rows = _read_blocks(details_path, self.sample_bytes, self.blocks)
+            key_idx = _column_index(header, KEY_COLUMNS[details_type])
+
+            if details_type != UploadFileType.INVENTORY:
+                blocks = [_trim_block_edges(block, key_idx) for block in blocks]
+            lines = [line for block in blocks for line in block.lines]
+
+            if header_type is not None:
+                keys = {_normalize_key(_field(line, key_idx)) for line in lines}
+                header_lines, found_keys = self._sample_header_file(header_type, files[header_type], keys, details_path)
+                lines = [line for line in lines if _normalize_key(_field(line, key_idx)) in found_keys]
+                _write_lines(f'{sample_dir}/{header_type.value}.csv', self._header_line(files[header_type]), header_lines)
+
+            _write_lines(f'{sample_dir}/{details_type.value}.csv', header, lines)
+            self.files[details_type] = FileSample(file_type=details_type.value, file_size_mb=_mb(details_path), estimated_rows=estimated_rows, sampled_rows=len(lines))
+
+            sku_idx = _column_index(header, 'SKU')
+            sampled_skus.update(_normalize_key(_field(line, sku_idx)) for line in lines)
+
+        self._sample_item_master(files[UploadFileType.ITEM_MASTER], f'{sample_dir}/{UploadFileType.ITEM_MASTER.value}.csv', sampled_skus)
+
+    @property
+    def sample_fraction(self) -> float:
+        ''' Share of the order lines sampled (or receipt lines, or inventory rows, whichever is processed first) '''
+
+        for details_type, _ in SAMPLED_FILES:
+            if details_type in self.files:
+                return _ratio(self.files[details_type].sampled_rows, self.files[details_type].estimated_rows)
+        return 1
+
+    def scale(self, file_type: UploadFileType) -> float | None:
+        ''' Estimated rows / sampled rows of an input file. None if it wasn't sampled '''
+
+        file_sample = self.files.get(file_type)
+        if file_sample is None:
+            return None
+        return _ratio(file_sample.estimated_rows, file_sample.sampled_rows)
+
+    ''' Helpers '''
+
+    def _sample_header_file(self, file_type: UploadFileType, file_path: str, keys: set[bytes], details_path: str) -> tuple[list[bytes], set[bytes]]:
+        ''' Header rows for the sampled keys (first row per key), and the keys found '''
+
+        header = self._header_line(file_path)
+        key_idx = _column_index(header, KEY_COLUMNS[file_type])
+        file_size = os.path.getsize(file_path)
+        data_start = len(header)
+        span = file_size - data_start
+
+        # Small enough to read whole
+        if span <= self.sample_bytes * PREVIEW_HEADER_WINDOW_MARGIN:
+            lines, found_keys, total_rows = _scan_for_keys(file_path, key_idx, keys)
+            self.files[file_type] = FileSample(file_type=file_type.value, file_size_mb=_mb(file_path), estimated_rows=total_rows, sampled_rows=len(lines))
+            return lines, found_keys
+
+        # Windows at the same relative positions as the details blocks, proportionally wider
+        details_span = os.path.getsize(details_path) - len(self._header_line(details_path))
+        block_fraction = (self.sample_bytes / self.blocks) / details_span
+        window_bytes = int(span * block_fraction * PREVIEW_HEADER_WINDOW_MARGIN)
+
+        windows = []
+        for i in range(self.blocks):
+            center = data_start + int(span * (i / max(self.blocks - 1, 1) * (1 - block_fraction) + block_fraction / 2))
+            start, end = max(center - window_bytes // 2, data_start), min(center + window_bytes // 2, file_size)
+            if windows and start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], end)
+            else:
+                windows.append((start, end))
+
+        lines, found_keys = [], set()
+        window_lines = window_line_bytes = 0
+        with open(file_path, 'rb') as f:
+            for start, end in windows:
+                block = _read_block(f, start, end - start, data_start, file_size)
+                window_lines += len(block.lines)
+                window_line_bytes += sum(len(line) for line in block.lines)
+                for line in block.lines:
+                    key = _normalize_key(_field(line, key_idx))
+                    if key in keys and key not in found_keys:
+                        found_keys.add(key)
+                        lines.append(line)
+
+        estimated_rows = round(span / (window_line_bytes / window_lines)) if window_lines else 0
+
+        # Not sorted like the details - scan the whole file instead
+        if _ratio(len(found_keys), len(keys)) < PREVIEW_MIN_HEADER_MATCH_RATE:
+            self.warnings.append(f'{file_type.value} is not sorted like its details file, so all of it was scanned for the sampled rows.')
+            lines, found_keys, estimated_rows = _scan_for_keys(file_path, key_idx, keys)
+
+        self.files[file_type] = FileSample(file_type=file_type.value, file_size_mb=_mb(file_path), estimated_rows=estimated_rows, sampled_rows=len(lines))
+        return lines, found_keys
+
+    def _sample_item_master(self, file_path: str, sample_path: str, sampled_skus: set[bytes]):
+        file_type = UploadFileType.ITEM_MASTER
+
+        if os.path.getsize(file_path) <= PREVIEW_FULL_ITEM_MASTER_BYTES:
+            shutil.copyfile(file_path, sample_path)
+            with open(file_path, 'rb') as f:
+                rows = sum(1 for line in f if line.strip()) - 1
+            self.files[file_type] = FileSample(file_type=file_type.value, file_size_mb=_mb(file_path), estimated_rows=rows, sampled_rows=rows)
+            return
+
+        header = self._header_line(file_path)
+        lines, _, total_rows = _scan_for_keys(file_path, _column_index(header, KEY_COLUMNS[file_type]), sampled_skus, first_only=False)
+        _write_lines(sample_path, header, lines)
+        self.files[file_type] = FileSample(file_type=file_type.value, file_size_mb=_mb(file_path), estimated_rows=total_rows, sampled_rows=len(lines))
+        self.warnings.append('Item Master is big, so only the SKUs in the sample were used - SKUs without activity are under-represented.')
+
+    def _header_line(self, file_path: str) -> bytes:
+        with open(file_path, 'rb') as f:
+            return f.readline()
+
+
+def estimate_output_tables(output_tables: dict[str, pd.DataFrame], sampler: PreviewSampler) -> list[OutputTableEstimate]:
+    '''
+    Scale each sampled output table up to the full upload, by its input file's estimated rows / sampled rows (see OUTPUT_TABLE_SCALE_FILES).
+    Velocity By Month is capped at SKUs x months, since SKU/month pairs stop growing once every SKU is ordered every month
+    '''
+
+    estimates = []
+    for table, df in output_tables.items():
+        scale = next((sampler.scale(file_type) for file_type in OUTPUT_TABLE_SCALE_FILES.get(table, []) if sampler.scale(file_type) is not None), 1)
+        estimated_rows = round(len(df) * scale)
+
+        if table == 'VelocityByMonth' and len(df) > 0:
+            item_master_rows = sampler.files[UploadFileType.ITEM_MASTER].estimated_rows
+            estimated_rows = min(estimated_rows, item_master_rows * df['Month'].nunique())
+
+        estimates.append(OutputTableEstimate(table=table, sampled_rows=len(df), estimated_rows=estimated_rows))
+
+    return estimates
+
+
+def velocity_distribution(velocity_ladder: pd.DataFrame, project_number: str) -> list[VelocityShare]:
+    ''' Share of SKUs (with order lines) and of lines in each velocity, from the (sampled) Velocity Ladder output table '''
+
+    if len(velocity_ladder) == 0:
+        return []
+
+    ladder = velocity_ladder.assign(Velocity=velocity_ladder['ProjectNumber_Velocity'].str.removeprefix(f'{project_number}-'))
+    totals = ladder.groupby('Velocity', sort=True)[['SKUs', 'Lines']].sum()
+
+    return [VelocityShare(velocity=velocity, pct_skus=round(row['SKUs'] / totals['SKUs'].sum(), 4), pct_lines=round(row['Lines'] / totals['Lines'].sum(), 4))
+            for velocity, row in totals.iterrows()]
+
+
+''' Helpers '''
+
+def _read_blocks(file_path: str, sample_bytes: int, blocks: int) -> tuple[bytes, list[_Block], int]:
+    '''
+    Column headers, evenly spaced blocks of complete lines (sample_bytes in total), and the estimated number of rows in the file.
+    If the file is no bigger than sample_bytes, it's read whole as one block
+    '''
+
+    file_size = os.path.getsize(file_path)
+
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        span = file_size - data_start
+
+        if span <= sample_bytes:
+            lines = [line if line.endswith(b'\n') else line + b'\n' for line in f if line.strip()]
+            return header, [_Block(lines, at_start=True, at_end=True)], len(lines)
+
+        block_bytes = sample_bytes // blocks
+        read_blocks = [_read_block(f, data_start + (span - block_bytes) * i // max(blocks - 1, 1), block_bytes, data_start, file_size) for i in range(blocks)]
+
+    lines = sum(len(block.lines) for block in read_blocks)
+    line_bytes = sum(len(line) for block in read_blocks for line in block.lines)
+    estimated_rows = round(span / (line_bytes / lines)) if lines else 0
+
+    return header, read_blocks, estimated_rows
+
+
+def _read_block(f, offset: int, size: int, data_start: int, file_size: int) -> _Block:
+    ''' Complete, non-empty lines between offset and offset + size (partial lines at either end are dropped) '''
+
+    f.seek(offset)
+    data = f.read(size)
+
+    lines = data.split(b'\n')
+    at_start = offset <= data_start
+    at_end = offset + len(data) >= file_size
+
+    if not at_start:
+        lines = lines[1:]
+    if not at_end:
+        lines = lines[:-1]
+
+    return _Block([line + b'\n' for line in lines if line.strip()], at_start=at_start, at_end=at_end)
+
+
+def _trim_block_edges(block: _Block, key_idx: int) -> _Block:
+    ''' Drop the first/last order (or PO) of a block unless the block starts/ends the file - they may be missing lines '''
+
+    if not block.lines:
+        return block
+
+    edge_keys = set()
+    if not block.at_start:
+        edge_keys.add(_field(block.lines[0], key_idx))
+    if not block.at_end:
+        edge_keys.add(_field(block.lines[-1], key_idx))
+
+    return _Block([line for line in block.lines if _field(line, key_idx) not in edge_keys], block.at_start, block.at_end)
+
+
+def _scan_for_keys(file_path: str, key_idx: int, keys: set[bytes], first_only: bool = True) -> tuple[list[bytes], set[bytes], int]:
+    ''' Every line (or the first per key) of a whole file whose key is in keys, the keys found, and the file's row count '''
+
+    lines, found_keys = [], set()
+    total_rows = 0
+
+    with open(file_path, 'rb') as f:
+        f.readline()
+        for line in f:
+            if not line.strip():
+                continue
+            total_rows += 1
+
+            key = _normalize_key(_field(line, key_idx))
+            if key in keys and not (first_only and key in found_keys):
+                found_keys.add(key)
+                lines.append(line if line.endswith(b'\n') else line + b'\n')
+
+    return lines, found_keys, total_rows
+
+
+def _column_index(header: bytes, column: str) -> int:
+    columns = next(csv.reader([header.decode('utf-8-sig').strip()]))
+    return columns.index(column)
+
+
+def _field(line: bytes, idx: int) -> bytes:
+    ''' One field of a CSV line. Only lines with quotes go through the csv module '''
+
+    if b'"' not in line:
+        fields = line.rstrip(b'\r\n').split(b',', idx + 1)
+        return fields[idx] if len(fields) > idx else b''
+
+    fields = next(csv.reader([line.decode('utf-8', errors='replace').rstrip('\r\n')]), [])
+    return fields[idx].encode('utf-8') if len(fields) > idx else b''
+
+
+def _normalize_key(key: bytes) -> bytes:
+    ''' Keys are compared the way pandas will read them - whitespace/quotes stripped, and numbers without leading zeros '''
+
+    key = key.strip().strip(b'"').strip()
+    if key.isdigit():
+        key = key.lstrip(b'0') or b'0'
+    return key
+
+
+def _write_lines(file_path: str, header: bytes, lines: list[bytes]):
+    with open(file_path, 'wb') as f:
+        f.write(header)
+        f.writelines(lines)
+
+
+def _mb(file_path: str) -> float:
+    return round(os.path.getsize(file_path) / 2**20, 1)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else 1
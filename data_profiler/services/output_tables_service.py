@@ -11,6 +11,7 @@ from typing import Callable
 from datetime import datetime, timedelta
 from time import time
 from io import TextIOWrapper
+import logging
 import math
 
 import pyodbc
@@ -18,23 +19,56 @@ from pyodbc import DatabaseError
 import pandas as pd
 
 # Data Profiler
-from ..helpers.functions.functions import find_new_file_path
+from ..helpers.functions.functions import find_new_file_path, export_data_frames
 
 from ..helpers.models.ProjectInfo import UploadedFilePaths, BaseProjectInfo, ExistingProjectProjectInfo
 from ..helpers.models.TransformOptions import TransformOptions
 from ..helpers.models.Responses import BaseDBResponse, DBDownloadResponse
-from ..helpers.models.GeneralModels import UnitOfMeasure
-from ..helpers.constants.app_constants import SQL_DIR, SQL_DIR_DEV
+from ..helpers.models.GeneralModels import UnitOfMeasure, DownloadFileFormat
+from ..helpers.constants.app_constants import SQL_DIR, SQL_DIR_DEV, PROJECT_METADATA_CACHE_TTL_SECONDS
+from ..helpers.cancellation import CancellationToken, OperationCancelled
+from ..helpers.models.Progress import ProgressStage, ProgressEvent
+from ..helpers.ttl_cache import TTLCache
 
-from ..database.database_manager import DatabaseConnection
+from ..database.database_manager import DatabaseConnection, DatabaseConnectionPool
 from ..database.helpers.constants import *
 from ..database.helpers.functions import download_table_from_query
+from ..database.sql_registry import load_sql_registry
+
+
+logger = logging.getLogger(__name__)
+
+# Shared by every service instance (a new one is made per call). Keys are (dev, 'project_numbers') and (dev, 'project_info', project_number)
+_project_metadata_cache = TTLCache(ttl_seconds=PROJECT_METADATA_CACHE_TTL_SECONDS)
+
+
+def clear_project_metadata_cache():
+    ''' Forget all cached project numbers + project info, so the next reads go to the database '''
+
+    _project_metadata_cache.clear()
+
 
 class OutputTablesService:
 
-    def __init__(self, dev: bool = False):
+    def __init__(self, dev: bool = False, connection_pool: DatabaseConnectionPool | None = None, cancel_token: CancellationToken | None = None, 
+                 update_progress_func: Callable[[ProgressEvent], None] | None = None):
+        '''
+        Params
+        ------
+        connection_pool : DatabaseConnectionPool | None
+            optional, connections are checked out of this pool instead of opening a new one per call
+        cancel_token : CancellationToken | None
+            optional, lets downloads (between fetched chunks) and delete_project_data (between tables) be cancelled
+        update_progress_func : Callable[[ProgressEvent], None] | None
+            optional, gets ProgressEvents from downloads (per fetched chunk)
+        '''
+
         self.dev = dev
         self.sql_dir = SQL_DIR_DEV if self.dev else SQL_DIR
+        self.sql = load_sql_registry(self.sql_dir)
+        self.connection_pool = connection_pool
+        self.cancel_token = cancel_token
+        self.update_progress_func = update_progress_func
 
     def __enter__(self):
         return self
@@ -49,76 +83,17 @@ class OutputTablesService:
     ''' Main Functions '''
 
     def get_output_tables_project_numbers(self) -> list[str]:
-        ''' Returns list of project numbers '''
-
-        schema = 'OutputTables_Dev' if self.dev else 'OutputTables_Prod'
-        query = f'''SELECT ProjectNumber FROM {schema}.Project'''
-        results = []
-
-        with DatabaseConnection(dev=self.dev) as db_conn:
-            cursor = db_conn.cursor()
-
-            cursor.execute(query)
-            results = [result[0] for result in cursor.fetchall()]
-            
-            cursor.close()
+        ''' Returns list of project numbers. Cached - see PROJECT_METADATA_CACHE_TTL_SECONDS '''
 
-        return results
+        return list(_project_metadata_cache.get_or_load(self._project_numbers_key(), self._select_project_numbers))
 
     def get_project_info(self, project_number: str) -> ExistingProjectProjectInfo:
-        ''' Returns Project table row for given project number'''
-        
-        results = []
+        ''' Returns Project table row for given project number. Cached - see PROJECT_METADATA_CACHE_TTL_SECONDS '''
 
-        # Get query from sql file
-        sql_file = DEV_OUTPUT_TABLES_SQL_FILE_SELECT_ALL_FROM_PROJECT if self.dev else OUTPUT_TABLES_SQL_FILE_SELECT_ALL_FROM_PROJECT
+        project_info = _project_metadata_cache.get_or_load(self._project_info_key(project_number), lambda: self._select_project_info(project_number))
 
-        f = open(f'{self.sql_dir}/{sql_file}')
-        select_query = f.read()
-        f.close()
-
-        # Connect and run query    
-        with DatabaseConnection(dev=self.dev) as db_conn:
-            cursor = db_conn.cursor()
-
-            print(select_query)
-            cursor.execute(select_query, project_number)
-            results = cursor.fetchall()[0]
-
-        # Create ProjectInfoExistingProject object and return
-        transform_options = TransformOptions(
-            date_for_analysis=results[7] if results[7] else None,
-            weekend_date_rule=results[8] if results[8] else None,
-            process_inbound_data=results[18] if results[18] else False,
-            process_inventory_data=results[19] if results[19] else False,
-            process_outbound_data=results[20] if results[20] else False
-        )
-
-        upload_paths = UploadedFilePaths(
-            item_master=results[12] if results[12] else '',
-            inbound_header=results[13] if results[13] else '',
-            inbound_details=results[14] if results[14] else '',
-            inventory=results[15] if results[15] else '',
-            order_header=results[16] if results[16] else '',
-            order_details=results[17] if results[17] else '',
-        )
-
-        project_info = ExistingProjectProjectInfo(
-            project_number=results[0],
-            company_name=results[1],
-            salesperson=results[2],
-            company_location=results[3],
-            project_name=results[4],
-            email=results[5],
-            start_date=datetime.strftime(results[6], format='%Y-%m-%d'),
-            transform_options=transform_options,
-            notes=results[9] if results[9] else '',
-            data_uploaded=results[10],
-            upload_date=datetime.strftime(results[11], format='%Y-%m-%d') if results[11] else '',
-            uploaded_file_paths=upload_paths
-        )
-
-        return project_info
+        # Callers edit the project info they get back, so never hand out the cached object itself
+        return project_info.model_copy(deep=True)
 
     def get_sku_list(self, project_number: str) -> list[str]:
         ''' Returns list of SKUs for given project number'''
@@ -128,12 +103,10 @@ class OutputTablesService:
         # Get query from sql file
         sql_file = DEV_OUTPUT_TABLES_SQL_FILE_GET_SKU_LIST if self.dev else OUTPUT_TABLES_SQL_FILE_GET_SKU_LIST
 
-        f = open(f'{self.sql_dir}/{sql_file}')
-        select_query = f.read()
-        f.close()
+        select_query = self.sql.get(sql_file).text
 
         # Connect and run query    
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             cursor = db_conn.cursor()
 
             cursor.execute(select_query, project_number)
@@ -141,7 +114,7 @@ class OutputTablesService:
 
         return sku_list
 
-    def download_storage_analyzer_inputs(self, project_number: str, download_folder: str) -> DBDownloadResponse:
+    def download_storage_analyzer_inputs(self, project_number: str, download_folder: str, file_format: DownloadFileFormat = DownloadFileFormat.CSV) -> DBDownloadResponse:
 
         # Init empty dataframes
         item_master_df: pd.DataFrame
@@ -153,34 +126,29 @@ class OutputTablesService:
         inv_sql_file = DEV_SQL_FILE_DOWNLOAD_STORAGE_ANALYZER_INPUTS_SELECT_FROM_INVENTORY if self.dev else SQL_FILE_DOWNLOAD_STORAGE_ANALYZER_INPUTS_SELECT_FROM_INVENTORY
         ob_sql_file = DEV_SQL_FILE_DOWNLOAD_STORAGE_ANALYZER_INPUTS_SELECT_FROM_OUTBOUND if self.dev else SQL_FILE_DOWNLOAD_STORAGE_ANALYZER_INPUTS_SELECT_FROM_OUTBOUND
         
-        # Read sql files
-        f = open(f'{self.sql_dir}/{im_sql_file}')
-        im_query = f.read()
-        im_query = im_query.replace('?', f"'{project_number}'")
-        f.close()
-
-        f = open(f'{self.sql_dir}/{inv_sql_file}')
-        inv_query = f.read()
-        inv_query = inv_query.replace('?', f"'{project_number}'")
-        f.close()
-
-        f = open(f'{self.sql_dir}/{ob_sql_file}')
-        ob_query = f.read()
-        ob_query = ob_query.replace('?', f"'{project_number}'")
-        f.close()
+        # Bind project number
+        im_query, im_params = self.sql.get(im_sql_file).bind(project_number)
+
+        inv_query, inv_params = self.sql.get(inv_sql_file).bind(project_number)
+
+        ob_query, ob_params = self.sql.get(ob_sql_file).bind(project_number)
         
         # Download datas
         download_response = DBDownloadResponse(project_number=project_number, download_path=download_folder)
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             try: 
                 print(f'Downloading Item Master...')
-                item_master_df = download_table_from_query(connection=db_conn, query=im_query)
+                item_master_df = self._download_table(db_conn, query=im_query, params=im_params, table_name='Item Master')
 
                 print(f'Downloading Inventory...')
-                inventory_df = download_table_from_query(connection=db_conn, query=inv_query)
+                inventory_df = self._download_table(db_conn, query=inv_query, params=inv_params, table_name='Inventory')
 
                 print(f'Downloading Outbound...')
-                outbound_data_df = download_table_from_query(connection=db_conn, query=ob_query)
+                outbound_data_df = self._download_table(db_conn, query=ob_query, params=ob_params, table_name='Outbound')
+            except OperationCancelled:
+                download_response.success = False
+                download_response.cancelled = True
+                download_response.message = 'Download cancelled.'
             except DatabaseError as e:
                 print(e)
                 download_response.success = False
@@ -195,13 +163,18 @@ class OutputTablesService:
 
         # Export
         if download_response.success:
-            item_master_df.to_csv(f'{download_folder}/ItemMaster.csv', index=False)
-            inventory_df.to_csv(f'{download_folder}/Inventory.csv', index=False)
-            outbound_data_df.to_csv(f'{download_folder}/OutboundData.csv', index=False)
+            try:
+                export_data_frames({'ItemMaster': item_master_df}, file_path=f'{download_folder}/ItemMaster', file_format=file_format)
+                export_data_frames({'Inventory': inventory_df}, file_path=f'{download_folder}/Inventory', file_format=file_format)
+                export_data_frames({'OutboundData': outbound_data_df}, file_path=f'{download_folder}/OutboundData', file_format=file_format)
+            except ValueError as e:
+                print(e)
+                download_response.success = False
+                download_response.message = f'Could not write files. {e}'
 
         return download_response
     
-    def download_inventory_stratification_report(self, project_number: str, download_folder: str) -> DBDownloadResponse:
+    def download_inventory_stratification_report(self, project_number: str, download_folder: str, file_format: DownloadFileFormat = DownloadFileFormat.EXCEL) -> DBDownloadResponse:
         
         # Init empty dataframes
         each_df: pd.DataFrame
@@ -212,33 +185,30 @@ class OutputTablesService:
         # Get sql file
         sql_file = DEV_SQL_FILE_DOWNLOAD_INVENTORY_STRATIFICATION_REPORT if self.dev else SQL_FILE_DOWNLOAD_INVENTORY_STRATIFICATION_REPORT
         
-        # Read sql files
-        f = open(f'{self.sql_dir}/{sql_file}')
-        query = f.read()
-        query = query.replace('?', f'\'{project_number}\'', 1)
-        f.close()
+        # Same query text for each UOM, only the parameters change
+        template = self.sql.get(sql_file)
 
         download_response = DBDownloadResponse(project_number=project_number, download_path=download_folder)
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             try: 
                 # NOTE - run once for each UOM?
                 print(f'Downloading Inventory Stratification Report...')
 
-                each_query = query.replace('?', '\'Each\'', 1)
-                print(each_query)
-                each_df = download_table_from_query(connection=db_conn, query=each_query)
+                each_query, each_params = template.bind(project_number, UnitOfMeasure.EACH.value)
+                each_df = self._download_table(db_conn, query=each_query, params=each_params, table_name='Inventory Stratification - Each')
 
-                inner_query = query.replace('?', '\'Inner\'', 1)
-                print(inner_query)
-                inner_df = download_table_from_query(connection=db_conn, query=inner_query)
+                inner_query, inner_params = template.bind(project_number, UnitOfMeasure.INNER.value)
+                inner_df = self._download_table(db_conn, query=inner_query, params=inner_params, table_name='Inventory Stratification - Inner')
 
-                carton_query = query.replace('?', '\'Carton\'', 1)
-                print(carton_query)
-                carton_df = download_table_from_query(connection=db_conn, query=carton_query)
+                carton_query, carton_params = template.bind(project_number, UnitOfMeasure.CARTON.value)
+                carton_df = self._download_table(db_conn, query=carton_query, params=carton_params, table_name='Inventory Stratification - Carton')
 
-                pallet_query = query.replace('?', '\'Pallet\'', 1)
-                print(pallet_query)
-                pallet_df = download_table_from_query(connection=db_conn, query=pallet_query)
+                pallet_query, pallet_params = template.bind(project_number, UnitOfMeasure.PALLET.value)
+                pallet_df = self._download_table(db_conn, query=pallet_query, params=pallet_params, table_name='Inventory Stratification - Pallet')
+            except OperationCancelled:
+                download_response.success = False
+                download_response.cancelled = True
+                download_response.message = 'Download cancelled.'
             except DatabaseError as e:
                 print(e)
                 download_response.success = False
@@ -255,16 +225,16 @@ class OutputTablesService:
         # Export
         if download_response.success:
             file_path = find_new_file_path(f'{download_folder}/Inventory Stratification')
-            with pd.ExcelWriter(f'{file_path}.xlsx') as writer:
-                each_df.to_excel(writer, sheet_name='Eaches', index=False)
-                inner_df.to_excel(writer, sheet_name='Inners', index=False)
-                carton_df.to_excel(writer, sheet_name='Cartons', index=False)
-                pallet_df.to_excel(writer, sheet_name='Pallets', index=False)
-            
+            try:
+                export_data_frames({'Eaches': each_df, 'Inners': inner_df, 'Cartons': carton_df, 'Pallets': pallet_df}, file_path=file_path, file_format=file_format)
+            except ValueError as e:
+                print(e)
+                download_response.success = False
+                download_response.message = f'Could not write files. {e}'
 
         return download_response
     
-    def download_subwarehouse_material_flow_report(self, uom: UnitOfMeasure, project_number: str, download_folder: str) -> DBDownloadResponse:
+    def download_subwarehouse_material_flow_report(self, uom: UnitOfMeasure, project_number: str, download_folder: str, file_format: DownloadFileFormat = DownloadFileFormat.EXCEL) -> DBDownloadResponse:
         
         # Init empty dataframes
         df: pd.DataFrame
@@ -272,22 +242,20 @@ class OutputTablesService:
         # Get sql file
         sql_file = DEV_SQL_FILE_DOWNLOAD_SUBWAREHOUSE_MATERIAL_FLOW_PALLETS_REPORT if self.dev else SQL_FILE_DOWNLOAD_SUBWAREHOUSE_MATERIAL_FLOW_PALLETS_REPORT
         
-        # Read sql files
-        f = open(f'{self.sql_dir}/{sql_file}')
-        query = f.read()
-        f.close()
-
-        # Plug in project # and uom
-        query = query.replace('?', f'\'{project_number}\'', 1)
-        query = query.replace('?', f'\'{uom.value}\'', 1)
+        # Bind project # and uom
+        query, params = self.sql.get(sql_file).bind(project_number, uom.value)
 
         download_response = DBDownloadResponse(project_number=project_number, download_path=download_folder)
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             try: 
                 # NOTE - run once for each UOM?
                 print(f'Downloading Subwarehouse Material Flow - {uom.value} Report...')
-                print(query)
-                df = download_table_from_query(connection=db_conn, query=query)
+                logger.debug('%s', query)
+                df = self._download_table(db_conn, query=query, params=params, table_name=f'Subwarehouse Material Flow - {uom.value}')
+            except OperationCancelled:
+                download_response.success = False
+                download_response.cancelled = True
+                download_response.message = 'Download cancelled.'
             except DatabaseError as e:
                 print(e)
                 download_response.success = False
@@ -304,12 +272,16 @@ class OutputTablesService:
         # Export
         if download_response.success:
             file_path = find_new_file_path(f'{download_folder}/Subwarehouse Material Flow - {uom.value}')
-            with pd.ExcelWriter(f'{file_path}.xlsx') as writer:
-                df.to_excel(writer, sheet_name='Material Flow Summary', index=False)
+            try:
+                export_data_frames({'Material Flow Summary': df}, file_path=file_path, file_format=file_format)
+            except ValueError as e:
+                print(e)
+                download_response.success = False
+                download_response.message = f'Could not write files. {e}'
 
         return download_response
     
-    def download_items_material_flow_report(self, uom: UnitOfMeasure, project_number: str, download_folder: str) -> DBDownloadResponse:
+    def download_items_material_flow_report(self, uom: UnitOfMeasure, project_number: str, download_folder: str, file_format: DownloadFileFormat = DownloadFileFormat.EXCEL) -> DBDownloadResponse:
         
         # Init empty dataframes
         df: pd.DataFrame
@@ -317,22 +289,20 @@ class OutputTablesService:
         # Get sql file
         sql_file = DEV_SQL_FILE_DOWNLOAD_ITEMS_MATERIAL_FLOW_REPORT if self.dev else SQL_FILE_DOWNLOAD_ITEMS_MATERIAL_FLOW_REPORT
         
-        # Read sql files
-        f = open(f'{self.sql_dir}/{sql_file}')
-        query = f.read()
-        f.close()
-        
-        # Plug in project # and uom
-        query = query.replace('?', f'\'{project_number}\'', 1)
-        query = query.replace('?', f'\'{uom.value}\'', 1)
+        # Bind project # and uom
+        query, params = self.sql.get(sql_file).bind(project_number, uom.value)
         
         download_response = DBDownloadResponse(project_number=project_number, download_path=download_folder)
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             try: 
                 # NOTE - run once for each UOM?
                 print(f'Downloading Items Material Flow - {uom.value} Report...')
-                print(query)
-                df = download_table_from_query(connection=db_conn, query=query)
+                logger.debug('%s', query)
+                df = self._download_table(db_conn, query=query, params=params, table_name=f'Items Material Flow - {uom.value}')
+            except OperationCancelled:
+                download_response.success = False
+                download_response.cancelled = True
+                download_response.message = 'Download cancelled.'
             except DatabaseError as e:
                 print(e)
                 download_response.success = False
@@ -349,8 +319,12 @@ class OutputTablesService:
         # Export
         if download_response.success:
             file_path = find_new_file_path(f'{download_folder}/Items Material Flow - {uom.value}')
-            with pd.ExcelWriter(f'{file_path}.xlsx') as writer:
-                df.to_excel(writer, sheet_name='Material Flow Summary', index=False)
+            try:
+                export_data_frames({'Material Flow Summary': df}, file_path=file_path, file_format=file_format)
+            except ValueError as e:
+                print(e)
+                download_response.success = False
+                download_response.message = f'Could not write files. {e}'
 
         return download_response
 
@@ -373,9 +347,7 @@ class OutputTablesService:
         # Get query from sql file
         sql_file = DEV_OUTPUT_TABLES_SQL_FILE_INSERT_INTO_PROJECT if self.dev else OUTPUT_TABLES_SQL_FILE_INSERT_INTO_PROJECT
 
-        f = open(f'{self.sql_dir}/{sql_file}')
-        insert_query = f.read()
-        f.close()
+        insert_query = self.sql.get(sql_file).text
 
         # Setup query arguments. IMPORTANT to be in same order as insert_into_project.sql query
         query_args = [project_info.project_number, project_info.company_name, project_info.salesperson, project_info.company_location, 
@@ -383,17 +355,23 @@ class OutputTablesService:
                       None, None, None, None, None, None, None, None, None, None]
 
         # Connect and run query    
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             cursor = db_conn.cursor()
 
-            print(insert_query)
-            print(query_args)
+            logger.debug('%s', insert_query)
+            logger.debug('%s', query_args)
             cursor.execute(insert_query, query_args)
             row_count += cursor.rowcount
             db_conn.commit()
 
             cursor.close()
 
+        # Write through - the new project is listed straight away, and its info is read on first use
+        project_numbers = _project_metadata_cache.get(self._project_numbers_key())
+        if project_numbers is not None and project_info.project_number not in project_numbers:
+            _project_metadata_cache.set(self._project_numbers_key(), project_numbers + [project_info.project_number])
+        _project_metadata_cache.invalidate(self._project_info_key(project_info.project_number))
+
         return row_count
     
     def update_project_in_project_table(self, new_project_info: ExistingProjectProjectInfo) -> int:
@@ -410,9 +388,7 @@ class OutputTablesService:
         # Get query from sql file
         sql_file = DEV_OUTPUT_TABLES_SQL_FILE_UPDATE_PROJECT if self.dev else OUTPUT_TABLES_SQL_FILE_UPDATE_PROJECT
 
-        f = open(f'{self.sql_dir}/{sql_file}')
-        update_query = f.read()
-        f.close()
+        update_query = self.sql.get(sql_file).text
 
         # Setup query arguments. IMPORTANT to be in same order as update_project.sql query
         query_args = [new_project_info.company_name, new_project_info.salesperson, new_project_info.company_location, 
@@ -425,17 +401,25 @@ class OutputTablesService:
                       new_project_info.project_number]
 
         # Connect and run query    
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             cursor = db_conn.cursor()
 
-            print(update_query)
-            print(query_args)
+            logger.debug('%s', update_query)
+            logger.debug('%s', query_args)
             cursor.execute(update_query, query_args)
             row_count += cursor.rowcount
             db_conn.commit()
 
             cursor.close()
 
+        # Write through - the row now holds new_project_info (NULL upload date reads back as '', see _select_project_info)
+        if row_count == 1:
+            cached_project_info = new_project_info.model_copy(deep=True)
+            cached_project_info.upload_date = cached_project_info.upload_date or ''
+            _project_metadata_cache.set(self._project_info_key(new_project_info.project_number), cached_project_info)
+        else:
+            _project_metadata_cache.invalidate(self._project_info_key(new_project_info.project_number))
+
         return row_count
 
     def update_item_master(self, project_number: str, data_frame: pd.DataFrame) -> int:
@@ -469,7 +453,7 @@ class OutputTablesService:
             SET {", ".join(set_column_strings)}
             WHERE [ProjectNumber] = ? AND [SKU] = ?
         '''
-        print(update_query)
+        logger.debug('%s', update_query)
 
         # Add ProjectNumber to data_frame and reorder columns to match update query
         data_frame['ProjectNumber'] = project_number
@@ -477,11 +461,11 @@ class OutputTablesService:
 
         # Get 2d list
         data_lst = data_frame.to_dict('split')['data']
-        print(data_lst[0])
+        logger.debug('First row: %s', data_lst[0])
 
         # Connect and run query    
         row_count = 0
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             cursor = db_conn.cursor()
 
             # Use fast execute many
@@ -521,10 +505,13 @@ class OutputTablesService:
 
         return row_count
 
-    def delete_project_data(self, project_number: str, log_file: TextIOWrapper, update_progress_text_func: Callable[[str], None] = None) -> BaseDBResponse:
+    def delete_project_data(self, project_number: str, log_file: TextIOWrapper, update_progress_text_func: Callable[[str | ProgressEvent], None] = None) -> BaseDBResponse:
         '''
         Delete from OutputTables schema. Removes records from all relevant DB tables belonging to the given project number
 
+        Each table's delete is committed on its own, so if the service's cancel token is cancelled, it stops before the next table
+        and returns a cancelled response. The project's data is then partially deleted - deleting again finishes the job
+
         Return
         ------
         DeleteResponse
@@ -532,6 +519,9 @@ class OutputTablesService:
 
         response = BaseDBResponse(project_number=project_number)
 
+        # Project info is updated after this (data_uploaded), but drop it now in case that never happens
+        _project_metadata_cache.invalidate(self._project_info_key(project_number))
+
         # Configure schema and sql file mapper
         tables = 'all'                          # NOTE - this is from old code, when RawData was still used. We no longer need to be able to delete one table at a time, but it could be a future requirement
         schema = ''
@@ -550,7 +540,7 @@ class OutputTablesService:
         errors_encountered = []
         response.success = True
 
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             cursor = db_conn.cursor()
 
             # We want to delete one table at a time so it's easier to tell where failure happens
@@ -563,17 +553,25 @@ class OutputTablesService:
 
                 if table == 'Project':
                     break
+
+                if self.cancel_token and self.cancel_token.is_cancelled():
+                    log_file.write(f'CANCELLED - stopped before deleting from {table}\n')
+                    log_file.flush()
+
+                    response.success = False
+                    response.cancelled = True
+                    break
                 
                 # Delete
-                if update_progress_text_func: update_progress_text_func(f'Deleting from {table} ({i} / {len(sql_file_mapper.keys()) - 1})...')
+                if update_progress_text_func: 
+                    update_progress_text_func(ProgressEvent(stage=ProgressStage.DELETE, table='OutputTables', unit='tables', rows_done=i - 1, rows_total=len(sql_file_mapper.keys()) - 1, 
+                                                            elapsed=time() - delete_st, message=f'Deleting from {table} ({i} / {len(sql_file_mapper.keys()) - 1})...'))
                 log_file.write(f'Deleting from {table} - ')
                 log_file.flush()
                 
                 # Get delete query
-                fd = open(f'{self.sql_dir}/{file}')
-                delete_query = fd.read()
-                fd.close()
-                print(f'{delete_query} \n')
+                delete_query = self.sql.get(file).text
+                logger.debug('%s', delete_query)
 
                 try:
                                        
@@ -606,6 +604,9 @@ class OutputTablesService:
 
         if response.success:
             log_file.write('\nSuccess!\n')
+        elif response.cancelled:
+            log_file.write(f'\nCancelled. Some tables were not cleared - delete project data again to finish.\n')
+            response.message = 'Delete cancelled. Some project data remains - delete project data again to finish.'
         else:
             log_file.write(f'\n{len(errors_encountered)} errors while deleting. Unsuccessful. Try again.\n') 
             errors_str = "\n".join(errors_encountered)
@@ -633,19 +634,112 @@ class OutputTablesService:
         # Get query from sql file
         sql_file = DEV_OUTPUT_TABLES_SQL_FILE_DELETE_FROM_PROJECT if self.dev else OUTPUT_TABLES_SQL_FILE_DELETE_FROM_PROJECT
 
-        f = open(f'{self.sql_dir}/{sql_file}')
-        delete_query = f.read()
-        f.close()
+        delete_query = self.sql.get(sql_file).text
 
         # Connect and run query    
-        with DatabaseConnection(dev=self.dev) as db_conn:
+        with self._get_db_connection() as db_conn:
             cursor = db_conn.cursor()
 
-            print(delete_query)
+            logger.debug('%s', delete_query)
             cursor.execute(delete_query, project_number)
             row_count = cursor.rowcount
             db_conn.commit()
 
             cursor.close()
 
-        return row_count
\ No newline at end of file
+        # Write through
+        project_numbers = _project_metadata_cache.get(self._project_numbers_key())
+        if project_numbers is not None:
+            _project_metadata_cache.set(self._project_numbers_key(), [number for number in project_numbers if number != project_number])
+        _project_metadata_cache.invalidate(self._project_info_key(project_number))
+
+        return row_count
+
+
+    ''' Helpers '''
+
+    def _select_project_numbers(self) -> list[str]:
+        schema = 'OutputTables_Dev' if self.dev else 'OutputTables_Prod'
+        query = f'''SELECT ProjectNumber FROM {schema}.Project'''
+        results = []
+
+        with self._get_db_connection() as db_conn:
+            cursor = db_conn.cursor()
+
+            cursor.execute(query)
+            results = [result[0] for result in cursor.fetchall()]
+            
+            cursor.close()
+
+        return results
+
+    def _select_project_info(self, project_number: str) -> ExistingProjectProjectInfo:
+        
+        results = []
+
+        # Get query from sql file
+        sql_file = DEV_OUTPUT_TABLES_SQL_FILE_SELECT_ALL_FROM_PROJECT if self.dev else OUTPUT_TABLES_SQL_FILE_SELECT_ALL_FROM_PROJECT
+
+        select_query = self.sql.get(sql_file).text
+
+        # Connect and run query    
+        with self._get_db_connection() as db_conn:
+            cursor = db_conn.cursor()
+
+            logger.debug('%s', select_query)
+            cursor.execute(select_query, project_number)
+            results = cursor.fetchall()[0]
+
+        # Create ProjectInfoExistingProject object and return
+        transform_options = TransformOptions(
+            date_for_analysis=results[7] if results[7] else None,
+            weekend_date_rule=results[8] if results[8] else None,
+            process_inbound_data=results[18] if results[18] else False,
+            process_inventory_data=results[19] if results[19] else False,
+            process_outbound_data=results[20] if results[20] else False
+        )
+
+        upload_paths = UploadedFilePaths(
+            item_master=results[12] if results[12] else '',
+            inbound_header=results[13] if results[13] else '',
+            inbound_details=results[14] if results[14] else '',
+            inventory=results[15] if results[15] else '',
+            order_header=results[16] if results[16] else '',
+            order_details=results[17] if results[17] else '',
+        )
+
+        project_info = ExistingProjectProjectInfo(
+            project_number=results[0],
+            company_name=results[1],
+            salesperson=results[2],
+            company_location=results[3],
+            project_name=results[4],
+            email=results[5],
+            start_date=datetime.strftime(results[6], format='%Y-%m-%d') if results[6] else '',
+            transform_options=transform_options,
+            notes=results[9] if results[9] else '',
+            data_uploaded=results[10],
+            upload_date=datetime.strftime(results[11], format='%Y-%m-%d') if results[11] else '',
+            uploaded_file_paths=upload_paths
+        )
+
+        return project_info
+
+    def _project_numbers_key(self) -> tuple:
+        return (self.dev, 'project_numbers')
+
+    def _project_info_key(self, project_number: str) -> tuple:
+        return (self.dev, 'project_info', project_number)
+
+    def _download_table(self, db_conn, query: str, params: tuple, table_name: str) -> pd.DataFrame:
+        ''' download_table_from_query with this service's cancel token and progress reporting '''
+
+        return download_table_from_query(connection=db_conn, query=query, params=params, cancel_token=self.cancel_token, 
+                                         update_progress_func=self.update_progress_func, table_name=table_name)
+
+    def _get_db_connection(self):
+        ''' Returns a context manager yielding a DB connection - checked out of the shared pool if there is one, otherwise a new connection '''
+
+        if self.connection_pool is not None:
+            return self.connection_pool.connection()
+        return DatabaseConnection(dev=self.dev)
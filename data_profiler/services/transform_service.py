@@ -8,6 +8,7 @@ Functions that create the different output tables
 
 # Python
 from typing import Callable
+import logging
 import re
 from datetime import timedelta
 from time import time
@@ -21,13 +22,23 @@ from pyodbc import InterfaceError, DatabaseError, OperationalError
 # Data Profiler
 from ..database.helpers.constants import OUTPUT_TABLES_COLS_MAPPER, OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER, DEV_OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER
 from ..database.helpers.functions import insert_table_to_db
+from ..database.sql_registry import load_sql_registry
 from ..database.database_manager import DatabaseConnection
 
 from ..helpers.models.TransformOptions import TransformOptions, DateForAnalysis, WeekendDateRules
-from ..helpers.models.Responses import TransformRowsInserted, TransformResponse
+from ..helpers.models.Responses import TransformRowsInserted, TransformResponse, TableInsertEstimate, TransformDryRunResponse
 from ..helpers.models.DataFiles import UploadFileType
 from ..helpers.data_directory import DataDirectory
-from ..helpers.constants.app_constants import SQL_DIR, SQL_DIR_DEV
+from ..helpers.cancellation import CancellationToken, OperationCancelled
+from ..helpers.models.Progress import ProgressStage, ProgressEvent
+from ..helpers.models.Memory import ExecutionMode
+from ..helpers.instrumentation import instrumented, span
+from ..helpers.throughput_history import ThroughputHistory
+from ..helpers.transform_spill import TransformSpill
+from ..helpers.constants.app_constants import SQL_DIR, SQL_DIR_DEV, INSERT_BATCH_SIZE, CHUNKED_INSERT_BATCH_SIZE
+
+
+logger = logging.getLogger(__name__)
 
 
 class TransformService:
@@ -35,15 +46,27 @@ class TransformService:
     Service that provides data transformation functionality. It is meant for one-time use - meaning, a single call to `transform_and_persist_dataframes` per instance.  
     
     The main function takes a set of dataframes and creates data in the form of the OutputTables schema, and then inserts the data into the database.
+    The two steps can also be run separately - create_output_tables, then insert_output_tables (a preview only runs the first).
+    A dry run (dry_run=True) builds the output tables and plans their inserts (plan_inserts) without connecting to the database.
+
+    With execution_mode=ExecutionMode.CHUNKED (picked by the MemoryGovernor when the upload won't fit in memory otherwise), each input
+    dataframe is released from the DataDirectory as soon as its output table is built, each output table as soon as it's inserted,
+    and inserts use smaller batches
     '''
 
-    def __init__(self, project_number: str, DataDirectoryObj: DataDirectory, transform_options: TransformOptions, dev: bool = False, update_progress_text_func: Callable[[str], None] = None):
+    def __init__(self, project_number: str, DataDirectoryObj: DataDirectory, transform_options: TransformOptions, dev: bool = False, update_progress_text_func: Callable[[str | ProgressEvent], None] = None, 
+                 cancel_token: CancellationToken | None = None, execution_mode: ExecutionMode = ExecutionMode.IN_MEMORY, 
+                 throughput_history: ThroughputHistory | None = None):
         self.project_number = project_number
         self.DataDirectoryObj = DataDirectoryObj
         self.transform_options = transform_options
         self.update_progress_text_func = update_progress_text_func
+        self.cancel_token = cancel_token
+        self.execution_mode = execution_mode
+        self.throughput_history = throughput_history or ThroughputHistory()
         self.dev = dev
         self.sql_dir = SQL_DIR_DEV if self.dev else SQL_DIR
+        self.sql = load_sql_registry(self.sql_dir)
 
     def __enter__(self):
         return self
@@ -57,26 +80,69 @@ class TransformService:
 
     ''' Main Functions '''
     
-    def transform_and_persist_dataframes(self, log_file: TextIOWrapper) -> TransformResponse:
+    def transform_and_persist_dataframes(self, log_file: TextIOWrapper, dry_run: bool = False, spill: TransformSpill | None = None) -> TransformResponse:
         '''
         Transforms the raw data dataframes and inserts into the OutputTables_Dev schema
 
+        If a cancel token was given, it is checked between create_* stages (raises OperationCancelled - nothing has been inserted yet)
+        and between insert batches (returns an unsuccessful, cancelled response - inserted rows need to be deleted by the caller)
+
+        Params
+        ------
+        dry_run : bool
+            if True, build the output tables but don't insert them - nothing connects to the database. Returns a 
+            TransformDryRunResponse with each table's rows, bytes, batches and predicted insert time instead (see plan_inserts)
+        spill : TransformSpill | None
+            optional, the output tables are saved to it once they're built, so a later upload of the same files can reuse them
+
         Return
         ------
-        TransformResponse
+        TransformResponse (TransformDryRunResponse for a dry run)
         '''
 
-        rows_inserted_obj = TransformRowsInserted()
-        transform_response = TransformResponse(project_number=self.project_number)
-        total_rows_of_data = 0
-        total_rows_inserted = 0
-        
+        output_tables = self.create_output_tables(log_file=log_file)
+
+        if spill is not None:
+            with span('spill_output_tables'):
+                spill.save(output_tables, execution_mode=self.execution_mode)
+
+        if dry_run:
+            response = self.plan_inserts(output_tables=output_tables, log_file=log_file)
+            response.spill_path = spill.path if spill is not None else ''
+            return response
+
+        return self.insert_output_tables(output_tables=output_tables, log_file=log_file)
+
+    def create_output_tables(self, log_file: TextIOWrapper) -> dict[str, pd.DataFrame]:
+        '''
+        STEP 1: Create every output table from the DataDirectory's dataframes. Nothing is inserted
+
+        If a cancel token was given, it is checked between create_* stages (raises OperationCancelled)
+
+        Return
+        ------
+        dict[str, pd.DataFrame]
+            output table name -> dataframe, in insert order, with columns reordered to match the insert queries. Tables for data
+            that isn't being processed are empty
+        '''
 
-        '''STEP 1: Create output tables '''
+        total_rows_of_data = 0
 
         if self.update_progress_text_func: self.update_progress_text_func('Transforming data...')
         
         st = time()
+
+        # Plan the transform stage as a count of output tables
+        transform_tables = ['ItemMaster']
+        if self.transform_options.process_outbound_data:
+            transform_tables += ['OrderDetails', 'OrderHeader', 'ProjectNumber_Velocity', 'VelocityByMonth', 'VelocityLadder']
+        if self.transform_options.process_inbound_data:
+            transform_tables += ['InboundHeader', 'InboundDetails']
+        if self.transform_options.process_inventory_data:
+            transform_tables += ['InventoryData']
+
+        for table in transform_tables:
+            self._report_progress(ProgressEvent(stage=ProgressStage.TRANSFORM, table=table, unit='tables', rows_total=1, message='Transforming data...'))
         log_file.write(f'2. CREATE OUTPUT TABLES\n')
         log_file.flush()
         
@@ -97,9 +163,13 @@ class TransformService:
         # Start with Item Master
         item_master_input = self.DataDirectoryObj.get_df(UploadFileType.ITEM_MASTER)
         
+        self._check_cancelled()
         item_master = self.create_item_master(project_num=self.project_number, item_master_df=item_master_input)
+        del item_master_input
+        self._release_input(UploadFileType.ITEM_MASTER)
         total_rows_of_data += len(item_master)
         log_file.write(f'Item Master rows: {len(item_master)}\n')
+        self._report_transformed('ItemMaster', item_master, st)
 
         # Create outbound so we can determine velocities
         if self.transform_options.process_outbound_data:
@@ -108,22 +178,32 @@ class TransformService:
             order_details_input = self.DataDirectoryObj.get_df(UploadFileType.ORDER_DETAILS)
 
             # Start with details
+            self._check_cancelled()
             order_details = self.create_order_details(project_num=self.project_number, order_details_df=order_details_input, item_master_df=item_master)
+            del order_details_input
+            self._release_input(UploadFileType.ORDER_DETAILS)
             
             # Run velocity analysis, and add velocity to Item Master
+            self._check_cancelled()
             velocity_analysis = self.run_velocity_analysis(outbound_df=order_details)
             item_master = item_master.merge(velocity_analysis[['SKU', 'Velocity']], on='SKU', how='left')
             item_master['Velocity'] = item_master['Velocity'].fillna('X')
-            print(item_master['Velocity'].value_counts())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('%s', item_master['Velocity'].value_counts())
             
             # Create order header
+            self._check_cancelled()
             order_header = self.create_order_header(project_num=self.project_number, order_header_df=order_header_input, order_details_df=order_details, item_master_df=item_master)
+            del order_header_input
+            self._release_input(UploadFileType.ORDER_HEADER)
 
             total_rows_of_data += len(order_header)
             total_rows_of_data += len(order_details)
 
             log_file.write(f'Orders: {len(order_header)}\n')
             log_file.write(f'Order Lines: {len(order_details)}\n')
+            self._report_transformed('OrderDetails', order_details, st)
+            self._report_transformed('OrderHeader', order_header, st)
         else:
             # Fill velocity in with X
             item_master['Velocity'] = 'X'
@@ -136,13 +216,20 @@ class TransformService:
             inbound_details_input = self.DataDirectoryObj.get_df(UploadFileType.INBOUND_DETAILS)
 
             # Form final tables
+            self._check_cancelled()
             inbound_header = self.create_inbound_header(project_num=self.project_number, inbound_header_df=inbound_header_input, inbound_details_df=inbound_details_input)
+            self._check_cancelled()
             inbound_details = self.create_inbound_details(project_num=self.project_number, inbound_details_df=inbound_details_input, item_master_df=item_master)
+            del inbound_header_input, inbound_details_input
+            self._release_input(UploadFileType.INBOUND_HEADER)
+            self._release_input(UploadFileType.INBOUND_DETAILS)
             
             total_rows_of_data += len(inbound_header)
             total_rows_of_data += len(inbound_details)
             log_file.write(f'Inbound Header rows: {len(inbound_header)}\n')
             log_file.write(f'Inbound Details rows: {len(inbound_details)}\n')
+            self._report_transformed('InboundHeader', inbound_header, st)
+            self._report_transformed('InboundDetails', inbound_details, st)
 
             inbound_skus = set(inbound_details['SKU'].unique().tolist())
 
@@ -152,15 +239,22 @@ class TransformService:
             inventory_input = self.DataDirectoryObj.get_df(UploadFileType.INVENTORY)
 
             # Form final table
+            self._check_cancelled()
             inventory_data = self.create_inventory_data(project_num=self.project_number, inventory_df=inventory_input, velocity_analysis=velocity_analysis, inbound_skus=inbound_skus, item_master_df=item_master)
+            del inventory_input
+            self._release_input(UploadFileType.INVENTORY)
             
             total_rows_of_data += len(inventory_data)
             log_file.write(f'Inventory Data rows: {len(inventory_data)}\n')
+            self._report_transformed('InventoryData', inventory_data, st)
 
         # The rest - mostly outbound related
         if self.transform_options.process_outbound_data:
+            self._check_cancelled()
             project_number_velocity = self.create_project_number_velocity(project_num=self.project_number)  
+            self._check_cancelled()
             velocity_by_month = self.create_velocity_by_month(project_num=self.project_number, order_header_df=order_header, order_details_df=order_details, velocity_analysis=velocity_analysis)
+            self._check_cancelled()
             velocity_ladder = self.create_velocity_ladder(project_num=self.project_number, velocity_analysis=velocity_analysis)
             
             total_rows_of_data += len(velocity_by_month)
@@ -169,6 +263,9 @@ class TransformService:
             log_file.write(f'Project Number - Velocity rows: {len(project_number_velocity)}\n')
             log_file.write(f'Velocity by Month rows: {len(velocity_by_month)}\n')
             log_file.write(f'Velocity Ladder rows: {len(velocity_ladder)}\n')
+            self._report_transformed('ProjectNumber_Velocity', project_number_velocity, st)
+            self._report_transformed('VelocityByMonth', velocity_by_month, st)
+            self._report_transformed('VelocityLadder', velocity_ladder, st)
 
         # Reorder columns to match sql queries
         # NOTE: at this point, we don't care if files are present (e.g., process_inbound_data = False)
@@ -187,18 +284,7 @@ class TransformService:
         log_file.write(f'Output table creation time: {timedelta(seconds=et-st)}\n\n')
         log_file.flush()
 
-        ''' STEP 2: Insert into database '''
-        if self.update_progress_text_func: self.update_progress_text_func('Uploading to database...')
-
-        log_file.write(f'3. INSERT TO DATABASE\n')
-        log_file.flush()
-
-        insert_st = time()
-
-        # Get SQL file mapper
-        SQL_FILE_MAPPER = DEV_OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER if self.dev else OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER
-
-        upload_df_mapper = {
+        return {
             'ItemMaster': item_master,
             'InboundHeader': inbound_header,
             'OrderHeader': order_header,
@@ -210,21 +296,67 @@ class TransformService:
             'VelocityByMonth': velocity_by_month,
         }
 
+    def insert_output_tables(self, output_tables: dict[str, pd.DataFrame], log_file: TextIOWrapper) -> TransformResponse:
+        '''
+        STEP 2: Insert the output tables (from create_output_tables) into the database, one table at a time
+
+        If a cancel token was given, it is checked between insert batches (returns an unsuccessful, cancelled response - inserted rows
+        need to be deleted by the caller). In chunked mode each table is dropped from output_tables once it's inserted
+
+        Return
+        ------
+        TransformResponse
+        '''
+
+        rows_inserted_obj = TransformRowsInserted()
+        transform_response = TransformResponse(project_number=self.project_number)
+        total_rows_inserted = 0
+        upload_df_mapper = output_tables
+
+        if self.update_progress_text_func: self.update_progress_text_func('Uploading to database...')
+
+        log_file.write(f'3. INSERT TO DATABASE\n')
+        log_file.flush()
+
+        insert_st = time()
+
+        # Get SQL file mapper
+        SQL_FILE_MAPPER = DEV_OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER if self.dev else OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER
+
+        table_rows = {table: len(df) for table,df in upload_df_mapper.items()}
+        insert_batch_size = self._insert_batch_size()
+
+        # Plan the insert stage, so percent complete / ETA cover every table from the start
+        for table,df in upload_df_mapper.items():
+            self._report_progress(ProgressEvent(stage=ProgressStage.INSERT, table=table, rows_total=len(df), message='Uploading to database...'))
+
         # IDEA - keep track, in data_profiler, of tables that have been inserted. so, if there's an error halfway thru, it could
         #   pick up where it left off. For now, just delete
         try:
-            for table,df in upload_df_mapper.items():
+            for table in list(upload_df_mapper.keys()):
+                df = upload_df_mapper[table]
+                table_st = time()
                 with DatabaseConnection(dev=self.dev) as db_conn:
-                    # Progress message str
-                    progress_str = f'Rows Inserted: {total_rows_inserted:,} / {total_rows_of_data:,} ({(total_rows_inserted / total_rows_of_data) * 100:,.0f}%)'
-                    current_str = f'Uploading {table} ({len(df):,} rows)...'
-                    message_str = f'{progress_str}\n\n{current_str}'
-                    if self.update_progress_text_func: self.update_progress_text_func(message_str)
+                    # Progress
+                    self._report_progress(ProgressEvent(stage=ProgressStage.INSERT, table=table, rows_total=len(df), 
+                                                        message=f'Uploading {table} ({len(df):,} rows)...'))
                     
                     # Insert
-                    rows = insert_table_to_db(log_file=log_file, connection=db_conn, table_name=table, data_frame=df, sql_file_path=f"{self.sql_dir}/{SQL_FILE_MAPPER[table]}")
+                    with span(f'insert {table}', rows=len(df)):
+                        rows = insert_table_to_db(log_file=log_file, connection=db_conn, table_name=table, data_frame=df, insert_query=self.sql.get(SQL_FILE_MAPPER[table]).text, 
+                                                  cancel_token=self.cancel_token, update_progress_func=self.update_progress_text_func, batch_size=insert_batch_size)
                     total_rows_inserted += rows
+
+                self.throughput_history.record(table, rows=rows, seconds=time() - table_st)
+
+                if self.execution_mode == ExecutionMode.CHUNKED:
+                    upload_df_mapper[table] = df = None
                 
+        except OperationCancelled:
+            log_file.write(f'CANCELLED - upload cancelled after {total_rows_inserted:,} rows.\n\n')
+            transform_response.success = False
+            transform_response.cancelled = True
+            transform_response.message = 'Upload cancelled.'
         # https://peps.python.org/pep-0249/#exceptions
         except InterfaceError as e:
             # Base error class for interfacing (e.g., connecting) to database
@@ -247,12 +379,12 @@ class TransformService:
         else:
             # Create TransformRowsInserted object            
             rows_inserted_obj.total_rows_inserted = total_rows_inserted
-            rows_inserted_obj.skus = len(item_master)
-            rows_inserted_obj.inbound_pos = len(inbound_header)
-            rows_inserted_obj.inbound_lines = len(inbound_details)
-            rows_inserted_obj.inventory_lines = len(inventory_data)
-            rows_inserted_obj.outbound_orders = len(order_header)
-            rows_inserted_obj.outbound_lines = len(order_details)
+            rows_inserted_obj.skus = table_rows['ItemMaster']
+            rows_inserted_obj.inbound_pos = table_rows['InboundHeader']
+            rows_inserted_obj.inbound_lines = table_rows['InboundDetails']
+            rows_inserted_obj.inventory_lines = table_rows['InventoryData']
+            rows_inserted_obj.outbound_orders = table_rows['OrderHeader']
+            rows_inserted_obj.outbound_lines = table_rows['OrderDetails']
 
             transform_response.success = True
             transform_response.rows_inserted = rows_inserted_obj
@@ -260,13 +392,52 @@ class TransformService:
             insert_et = time()
             log_file.write(f'Success! Inserted {total_rows_inserted} rows in {timedelta(seconds=insert_et-insert_st)}\n\n')
 
+        # Tables that went in before a failure/cancel still say something about throughput
+        self._save_throughput_history()
+
         log_file.flush()
         
         return transform_response
 
+    def plan_inserts(self, output_tables: dict[str, pd.DataFrame], log_file: TextIOWrapper) -> TransformDryRunResponse:
+        '''
+        STEP 2 of a dry run: what inserting the output tables would take - each table's rows, size in memory, executemany batches
+        and predicted insert time (from the throughput history of past uploads). Nothing connects to the database
+
+        Return
+        ------
+        TransformDryRunResponse
+        '''
+
+        response = TransformDryRunResponse(project_number=self.project_number)
+        insert_batch_size = self._insert_batch_size()
+
+        log_file.write(f'3. INSERT PLAN (DRY RUN - nothing is inserted)\n')
+
+        for table, df in output_tables.items():
+            rows_per_second, history_records = self.throughput_history.rows_per_second(table)
+            estimate = TableInsertEstimate(table=table, rows=len(df), bytes=int(df.memory_usage(deep=True).sum()), 
+                                           batches=math.ceil(len(df) / insert_batch_size), rows_per_second=round(rows_per_second, 1), 
+                                           history_records=history_records, estimated_seconds=round(len(df) / rows_per_second, 1))
+            response.tables.append(estimate)
+
+            log_file.write(f'{table}: {estimate.rows:,} rows, {estimate.bytes / 1024**2:,.1f} MB, {estimate.batches:,} batches, ~{timedelta(seconds=round(estimate.estimated_seconds))} '
+                           f'at {estimate.rows_per_second:,.0f} rows/s ({history_records} past inserts)\n')
+
+        response.total_rows = sum(estimate.rows for estimate in response.tables)
+        response.total_bytes = sum(estimate.bytes for estimate in response.tables)
+        response.estimated_insert_seconds = round(sum(estimate.estimated_seconds for estimate in response.tables), 1)
+        response.success = True
+
+        log_file.write(f'Predicted insert time for {response.total_rows:,} rows: {timedelta(seconds=round(response.estimated_insert_seconds))}\n\n')
+        log_file.flush()
+
+        return response
+
 
     ''' Create Table Functions '''
 
+    @instrumented()
     def create_item_master(self, project_num: str, item_master_df: pd.DataFrame) -> pd.DataFrame:
         print(f'creating item master...')
 
@@ -298,6 +469,7 @@ class TransformService:
 
         return item_master
 
+    @instrumented()
     def create_inbound_header(self, project_num: str, inbound_header_df: pd.DataFrame, inbound_details_df: pd.DataFrame) -> pd.DataFrame:
         if len(inbound_header_df) == 0:
             print(f'No inbound data. Skipping inbound header')
@@ -330,6 +502,7 @@ class TransformService:
 
         return inbound_header
 
+    @instrumented()
     def create_inbound_details(self, project_num: str, inbound_details_df: pd.DataFrame, item_master_df: pd.DataFrame) -> pd.DataFrame: # , transform_options: TransformOptions) -> pd.DataFrame:
         if len(inbound_details_df) == 0:
             print(f'No inbound data. Skipping inbound details')
@@ -358,6 +531,7 @@ class TransformService:
 
         return inbound_details
 
+    @instrumented()
     def create_order_header(self, project_num: str, order_header_df: pd.DataFrame, order_details_df: pd.DataFrame, item_master_df: pd.DataFrame) -> pd.DataFrame:
         if len(order_header_df) == 0:
             print(f'No order data. Skipping order header')
@@ -420,6 +594,7 @@ class TransformService:
         
         return order_header
 
+    @instrumented()
     def create_order_details(self, project_num: str, order_details_df: pd.DataFrame, item_master_df: pd.DataFrame) -> pd.DataFrame:
         if len(order_details_df) == 0:
             print(f'No order data. Skipping order details')
@@ -452,6 +627,7 @@ class TransformService:
 
         return order_details
 
+    @instrumented()
     def create_outbound_data(self, project_num: str, order_header_df: pd.DataFrame, order_details_df: pd.DataFrame, item_master_df: pd.DataFrame) -> pd.DataFrame: #, transform_options: TransformOptions)         
         ''' DEPRECATED '''
         
@@ -513,6 +689,7 @@ class TransformService:
 
         return outbound_data
 
+    @instrumented()
     def create_order_velocity_combinations(self, project_num: str, outbound_df: pd.DataFrame) -> pd.DataFrame:
         ''' DEPRECATED '''
 
@@ -533,6 +710,7 @@ class TransformService:
         
         return order_velocity_combos[['ProjectNumber_OrderNumber', 'OrderNumber', 'VelocityCombination']]
 
+    @instrumented()
     def create_inventory_data(self, project_num: str, inventory_df: pd.DataFrame, velocity_analysis: pd.DataFrame, inbound_skus: set, item_master_df: pd.DataFrame) -> pd.DataFrame:
         if len(inventory_df) == 0:
             print(f'No inventory data. Skipping inventory')
@@ -570,6 +748,7 @@ class TransformService:
 
         return inventory
 
+    @instrumented()
     def create_velocity_summary(self, project_num: str, velocity_analysis_df: pd.DataFrame, inventory_df: pd.DataFrame) -> pd.DataFrame:
         ''' DEPRECATED '''
         
@@ -595,6 +774,7 @@ class TransformService:
 
         return velocity_summary
 
+    @instrumented()
     def create_outbound_data_by_order(self, project_num: str, outbound_df: pd.DataFrame) -> pd.DataFrame:
         ''' DEPRECATED '''
         
@@ -629,6 +809,7 @@ class TransformService:
 
         return outbound_by_order
 
+    @instrumented()
     def create_daily_order_profile_by_velocity(self, project_num: str, outbound_df: pd.DataFrame, velocity_summary: pd.DataFrame) -> pd.DataFrame:
         ''' DEPRECATED '''
 
@@ -669,6 +850,7 @@ class TransformService:
         return daily_order_profile.round(decimals=2)
 
     # def create_velocity_by_month(self, project_num: str, outbound_df: pd.DataFrame, velocity_analysis: pd.DataFrame) -> pd.DataFrame:
+    @instrumented()
     def create_velocity_by_month(self, project_num: str, order_header_df: pd.DataFrame, order_details_df: pd.DataFrame, velocity_analysis: pd.DataFrame) -> pd.DataFrame:
         if len(order_header_df) == 0 or len(order_details_df) == 0:
             print(f'No order data. Skipping velocity by month')
@@ -730,6 +912,7 @@ class TransformService:
 
         return velocity_by_month
 
+    @instrumented()
     def create_project_number_velocity(self, project_num: str) -> pd.DataFrame:       
         print(f'creating project number velocity...')
 
@@ -746,6 +929,7 @@ class TransformService:
 
         return projectnum_velocity
 
+    @instrumented()
     def create_project_number_order_number(self, project_num: str, order_numbers: list) -> pd.DataFrame:
         ''' DEPRECATED '''
 
@@ -765,6 +949,7 @@ class TransformService:
 
         return projectnum_ordernum
 
+    @instrumented()
     def create_velocity_ladder(self, project_num: str, velocity_analysis: pd.DataFrame) -> pd.DataFrame:
         if len(velocity_analysis) == 0:
             print(f'No order data. Skipping velocity ladder')
@@ -840,6 +1025,7 @@ class TransformService:
     #       outbound_df: pd.DataFrame    required columns: SKU, Quantity
     # @Return: 
     #       pd.DataFrame, columns: SKU, Velocity
+    @instrumented()
     def run_velocity_analysis(self, outbound_df: pd.DataFrame) -> pd.DataFrame:
 
         velocity_analysis = outbound_df.groupby('SKU').agg(Lines=('SKU', 'size'), Units=('Quantity', 'sum')).sort_values(by='Lines', ascending=False).reset_index()
@@ -849,6 +1035,32 @@ class TransformService:
         
         return velocity_analysis
 
+    def _release_input(self, file_type: UploadFileType):
+        ''' Chunked mode only - drop an input dataframe from the DataDirectory once its output table is built '''
+
+        if self.execution_mode == ExecutionMode.CHUNKED:
+            self.DataDirectoryObj.release(file_type)
+
+    def _insert_batch_size(self) -> int:
+        return CHUNKED_INSERT_BATCH_SIZE if self.execution_mode == ExecutionMode.CHUNKED else INSERT_BATCH_SIZE
+
+    def _save_throughput_history(self):
+        # Only feeds predictions - never worth failing an upload over
+        try:
+            self.throughput_history.save()
+        except OSError as e:
+            logger.warning('Could not save insert throughput history: %s', e)
+
+    def _check_cancelled(self):
+        if self.cancel_token: self.cancel_token.raise_if_cancelled()
+
+    def _report_progress(self, event: ProgressEvent):
+        if self.update_progress_text_func: self.update_progress_text_func(event)
+
+    def _report_transformed(self, table: str, df: pd.DataFrame, st: float):
+        self._report_progress(ProgressEvent(stage=ProgressStage.TRANSFORM, table=table, unit='tables', rows_done=1, rows_total=1, elapsed=time() - st, 
+                                            message=f'Transformed {table} ({len(df):,} rows)...'))
+
     # Returns dataframe with indices for weekdays
     def get_weekday_sort_df(self) -> pd.DataFrame:
         return pd.DataFrame({'Weekday': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
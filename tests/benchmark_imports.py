@@ -0,0 +1,108 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Startup benchmark - how long each of the app's modules takes to import. Runs every module in a fresh interpreter with
+python -X importtime, so nothing is already cached in sys.modules, and prints the slowest imports underneath it.
+
+Run from the repo root:
+    python -m tests.benchmark_imports
+'''
+
+import re
+import subprocess
+import sys
+
+
+# The modules loaded when the app starts, roughly in import order
+STARTUP_MODULES = [
+    'data_profiler.helpers.excel_reader',
+    'data_profiler.helpers.functions.describer_functions',
+    'data_profiler.helpers.streaming_describer',
+    'data_profiler.data_profiler',
+    'data_profiler.data_profiler_gui',
+]
+
+# Budget (ms, cumulative) per module. Generous on purpose - it's here to catch something heavy creeping back into startup
+# (e.g. a top-level plotly import), not to measure small changes
+IMPORT_BUDGETS_MS = {
+    'data_profiler.helpers.excel_reader': 1500,
+    'data_profiler.helpers.functions.describer_functions': 1500,
+    'data_profiler.helpers.streaming_describer': 1500,
+}
+
+# Imports only the describer needs - these shouldn't be loaded at startup
+DEFERRED_PACKAGES = ['plotly']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module: str) -> tuple[dict[str, tuple[int, int]], str]:
+    '''
+    Import a module in a fresh interpreter and collect the -X importtime report
+
+    Params
+    ------
+    module : str
+        dotted module name
+
+    Return
+    ------
+    ({imported module: (self us, cumulative us)}, error output if the import failed else '')
+    '''
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True)
+
+    timings: dict[str, tuple[int, int]] = {}
+    errors = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us))
+        elif not line.startswith('import time:'):
+            errors.append(line)
+
+    return timings, '\n'.join(errors) if result.returncode != 0 else ''
+
+
+def run_benchmark(modules: list[str] = STARTUP_MODULES, top_n: int = 10) -> bool:
+    '''
+    Print the import cost of each module and its slowest imports
+
+    Return
+    ------
+    True if every module imported within budget and without loading a deferred package
+    '''
+
+    ok = True
+    for module in modules:
+        timings, error = measure_import(module)
+        if error:
+            print(f'\n{module}: could not import (missing dependency?)\n    {error.splitlines()[-1]}')
+            continue
+
+        total_ms = timings[module][1] / 1000
+        budget_ms = IMPORT_BUDGETS_MS.get(module)
+        loaded_deferred = sorted({name.split('.')[0] for name in timings} & set(DEFERRED_PACKAGES))
+
+        status = ''
+        if budget_ms is not None and total_ms > budget_ms:
+            status += f'  OVER BUDGET ({budget_ms:,} ms)'
+            ok = False
+        if loaded_deferred:
+            status += f'  loads {", ".join(loaded_deferred)} at import'
+            ok = False
+
+        print(f'\n{module}: {total_ms:,.0f} ms{status}')
+
+        slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:top_n]
+        for name, (self_us, cumulative_us) in slowest:
+            print(f'    {self_us / 1000:8,.1f} ms self  {cumulative_us / 1000:8,.1f} ms cumulative  {name}')
+
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run_benchmark() else 1)
@@ -0,0 +1,194 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Insert benchmark - the client-side cost of uploading each output table (DataFrame -> parameter rows, batching, the fast_executemany
+setup) and of OutputTablesService.update_item_master, measured against a FakeConnection (see fake_pyodbc.py) instead of a server.
+Output tables are built from synthetic data the same way benchmark_transform does, at 100k, 1M, 10M and 50M order lines.
+
+    python -m tests.benchmark_insert --sizes 100k 1M
+    python -m tests.benchmark_insert --sizes 1M --batch-size 20000 --compare tests/benchmark_results/<older insert run>.json
+
+Per table: total seconds, the part of that spent in our code ("client", i.e. total minus the time inside the fake), rows, batches
+and commits. --latency / --rows-per-second simulate the server, to see how the client cost compares to a realistic round trip.
+Memory is the tracemalloc peak per table (pass --no-memory for clean timings)
+'''
+
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime
+import io
+import json
+import os
+import platform
+from time import perf_counter
+import tracemalloc
+
+import pandas as pd
+
+from data_profiler.database.helpers.constants import OUTPUT_TABLES_COLS_MAPPER, OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER
+from data_profiler.database.helpers.functions import insert_table_to_db
+from data_profiler.database.sql_registry import load_sql_registry
+from data_profiler.helpers.constants.app_constants import SQL_DIR, INSERT_BATCH_SIZE
+from data_profiler.helpers.models.DataFiles import DataDirectoryType
+from data_profiler.helpers.models.TransformOptions import TransformOptions, DateForAnalysis, WeekendDateRules
+from data_profiler.services.output_tables_service import OutputTablesService
+
+from tests.benchmark_transform import SIZES, RESULTS_DIR, DATA_DIR, BENCHMARK_PROJECT_NUMBER, StageTimer, run_transform_stages, save_results, _git_label, _change
+from tests.fake_pyodbc import FakeConnection, FakeConnectionPool
+from tests.synthetic_data import SyntheticDataSpec, write_data_directory
+
+
+# Item Master columns sent by the update benchmark (besides SKU)
+UPDATE_ITEM_MASTER_COLUMNS = ['SKUDescription', 'Velocity', 'Subwarehouse']
+
+
+def build_output_tables(data_dir: str, transform_options: TransformOptions) -> dict[str, pd.DataFrame]:
+    ''' Output tables for a data directory, in the shape TransformService inserts them (columns reordered, NaNs filled) '''
+
+    with redirect_stdout(io.StringIO()):
+        tables = run_transform_stages(data_dir, transform_options, StageTimer(track_memory=False))
+
+    return {table: df.reindex(columns=OUTPUT_TABLES_COLS_MAPPER[table]).fillna('') for table, df in tables.items()}
+
+
+def benchmark_inserts(tables: dict[str, pd.DataFrame], timer: StageTimer, batch_size: int = INSERT_BATCH_SIZE, latency: float = 0,
+                      rows_per_second: float | None = None):
+    ''' insert_table_to_db for every output table, each into a new FakeConnection '''
+
+    sql = load_sql_registry(SQL_DIR)
+
+    for table, df in tables.items():
+        connection = FakeConnection(latency=latency, rows_per_second=rows_per_second)
+        insert_query = sql.get(OUTPUT_TABLES_INSERT_SQL_FILES_MAPPER[table]).text
+
+        with timer.stage(f'insert {table}') as result:
+            with redirect_stdout(io.StringIO()):
+                st = perf_counter()
+                result['rows'] = insert_table_to_db(connection=connection, table_name=table, data_frame=df, insert_query=insert_query,
+                                                    log_file=io.StringIO(), batch_size=batch_size)
+                _add_connection_stats(result, connection, perf_counter() - st)
+
+
+def benchmark_update_item_master(item_master: pd.DataFrame, timer: StageTimer, latency: float = 0, rows_per_second: float | None = None):
+    ''' OutputTablesService.update_item_master for every SKU, into a FakeConnection '''
+
+    connection = FakeConnection(latency=latency, rows_per_second=rows_per_second)
+    data_frame = item_master[['SKU'] + UPDATE_ITEM_MASTER_COLUMNS].copy()
+
+    with timer.stage('update_item_master') as result:
+        with redirect_stdout(io.StringIO()):
+            service = OutputTablesService(connection_pool=FakeConnectionPool(connection))
+
+            st = perf_counter()
+            result['rows'] = service.update_item_master(project_number=BENCHMARK_PROJECT_NUMBER, data_frame=data_frame)
+            _add_connection_stats(result, connection, perf_counter() - st)
+
+
+def run_benchmark(sizes: list[str], directory_type: DataDirectoryType = DataDirectoryType.HEADERS, data_root: str = DATA_DIR,
+                  batch_size: int = INSERT_BATCH_SIZE, latency: float = 0, rows_per_second: float | None = None, track_memory: bool = True,
+                  seed: int = 0) -> dict:
+    '''
+    Benchmark every size
+
+    Return
+    ------
+    results dict (what gets saved as JSON)
+    '''
+
+    transform_options = TransformOptions(date_for_analysis=DateForAnalysis.SHIP_DATE, weekend_date_rule=WeekendDateRules.NEAREST_WEEKDAY,
+                                         data_directory_type=directory_type)
+    results = {
+        'label': _git_label(),
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'directory_type': directory_type.value,
+        'batch_size': batch_size,
+        'latency': latency,
+        'rows_per_second': rows_per_second,
+        'memory_tracked': track_memory,
+        'sizes': {},
+    }
+
+    for size in sizes:
+        spec = SyntheticDataSpec.for_order_lines(SIZES[size], seed=seed)
+        data_dir = os.path.join(data_root, f'{spec.name()}_{directory_type.value}')
+
+        if not os.path.isdir(data_dir):
+            print(f'\nGenerating {size} lines ({spec.skus:,} SKUs, {spec.orders:,} orders) in {data_dir}...')
+            write_data_directory(data_dir, spec, directory_type=directory_type)
+
+        print(f'\n{size} order lines - building output tables...')
+        tables = build_output_tables(data_dir, transform_options)
+
+        timer = StageTimer(track_memory=track_memory)
+        if track_memory:
+            tracemalloc.start()
+
+        try:
+            benchmark_inserts(tables, timer, batch_size=batch_size, latency=latency, rows_per_second=rows_per_second)
+            benchmark_update_item_master(tables['ItemMaster'], timer, latency=latency, rows_per_second=rows_per_second)
+        finally:
+            if track_memory:
+                tracemalloc.stop()
+
+        client_seconds = sum(stage['client_seconds'] for stage in timer.stages)
+        rows = sum(stage['rows'] for stage in timer.stages)
+        print(f'    {"client total":<30} {client_seconds:>9.2f} s  {rows / client_seconds if client_seconds else 0:>12,.0f} rows/s')
+
+        results['sizes'][size] = {'spec': spec.__dict__, 'client_seconds': round(client_seconds, 3), 'stages': timer.stages}
+
+    return results
+
+
+def compare_results(results: dict, baseline: dict):
+    ''' Print each table's client time next to a baseline run's '''
+
+    print(f'\nCompared to {baseline["label"]} ({baseline["run_at"]}):')
+
+    for size, size_results in results['sizes'].items():
+        baseline_stages = {stage['stage']: stage for stage in baseline['sizes'].get(size, {}).get('stages', [])}
+        if not baseline_stages:
+            continue
+
+        print(f'\n{size} order lines (client seconds):')
+        for stage in size_results['stages']:
+            old = baseline_stages.get(stage['stage'])
+            if old is None:
+                continue
+            print(f'    {stage["stage"]:<30} {_change(old["client_seconds"], stage["client_seconds"], " s"):>28}  {_change(old["peak_mb"], stage["peak_mb"], " MB"):>28}')
+
+
+''' Helpers '''
+
+def _add_connection_stats(result: dict, connection: FakeConnection, seconds: float):
+    result['batches'] = len(connection.statements)
+    result['commits'] = len(connection.commits)
+    result['server_seconds'] = round(connection.server_seconds, 3)
+    result['client_seconds'] = round(max(seconds - connection.fake_seconds, 0), 3)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the client side of the database inserts on synthetic data')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES.keys()), default=['100k', '1M'])
+    parser.add_argument('--directory-type', choices=[t.value for t in DataDirectoryType], default=DataDirectoryType.HEADERS.value)
+    parser.add_argument('--data-dir', default=DATA_DIR, help='where generated data directories are kept')
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--batch-size', type=int, default=INSERT_BATCH_SIZE)
+    parser.add_argument('--latency', type=float, default=0, help='simulated seconds per round trip')
+    parser.add_argument('--rows-per-second', type=float, default=None, help='simulated server throughput')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (cleaner timings)')
+    parser.add_argument('--compare', help='a previous insert results JSON to compare against')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, directory_type=DataDirectoryType(args.directory_type), data_root=args.data_dir, batch_size=args.batch_size,
+                            latency=args.latency, rows_per_second=args.rows_per_second, track_memory=not args.no_memory, seed=args.seed)
+    print(f'\nSaved results to {save_results(results, args.results_dir, prefix="insert")}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(results, json.load(f))
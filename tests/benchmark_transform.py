@@ -0,0 +1,257 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Transform benchmark - times + memory-profiles the DataDirectory read and every TransformService create_* stage on synthetic
+data (see synthetic_data.py), at 100k, 1M, 10M and 50M order lines. Nothing is inserted into the database.
+
+Results are saved as JSON (one file per run, labelled with the git commit) so runs can be compared across versions:
+    python -m tests.benchmark_transform --sizes 100k 1M
+    python -m tests.benchmark_transform --sizes 1M --compare tests/benchmark_results/<older run>.json
+
+Memory is the tracemalloc peak per stage (numpy + pandas allocations included). tracemalloc makes the row-by-row stages
+several times slower, so pass --no-memory for clean timings. Generated data directories are kept in --data-dir and reused between runs
+'''
+
+import argparse
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+import pandas as pd
+
+from data_profiler.helpers.data_directory import DataDirectory
+from data_profiler.helpers.models.DataFiles import DataDirectoryType, UploadFileType
+from data_profiler.helpers.models.TransformOptions import TransformOptions, DateForAnalysis, WeekendDateRules
+from data_profiler.services.transform_service import TransformService
+
+from tests.synthetic_data import SyntheticDataSpec, write_data_directory
+
+
+SIZES = {'100k': 100_000, '1M': 1_000_000, '10M': 10_000_000, '50M': 50_000_000}
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'benchmark_results')
+DATA_DIR = os.path.join(tempfile.gettempdir(), 'data-profiler-benchmark')
+
+BENCHMARK_PROJECT_NUMBER = 'BENCH'
+
+
+class StageTimer():
+    ''' Records seconds, peak memory and output rows for each named stage '''
+
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.stages: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        result = {'stage': name, 'seconds': None, 'peak_mb': None, 'rows': None}
+
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            start_mb = tracemalloc.get_traced_memory()[0] / 2**20
+
+        st = perf_counter()
+        yield result
+        result['seconds'] = round(perf_counter() - st, 3)
+
+        if self.track_memory:
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20 - start_mb, 1)
+
+        self.stages.append(result)
+        print(f'    {name:<30} {result["seconds"]:>9.2f} s  {_fmt(result["peak_mb"], " MB"):>12}  {_fmt(result["rows"], " rows"):>16}')
+
+
+def run_transform_stages(data_dir: str, transform_options: TransformOptions, timer: StageTimer) -> dict[str, pd.DataFrame]:
+    '''
+    Read a data directory and run each create_* stage in the same order as TransformService.transform_and_persist_dataframes,
+    minus the database inserts
+
+    Return
+    ------
+    the output tables, keyed by table name (as in OUTPUT_TABLES_COLS_MAPPER)
+    '''
+
+    log_file = io.StringIO()
+
+    # The pipeline prints a lot - keep the benchmark output readable
+    with redirect_stdout(io.StringIO()):
+        data_directory = DataDirectory(path=data_dir, transform_options=transform_options)
+
+    with timer.stage('read + validate files') as result:
+        with redirect_stdout(io.StringIO()):
+            data_directory.validate_directory()
+            is_valid, message = data_directory.read_and_validate_file_contents(log_file=log_file)
+        result['rows'] = sum(len(df) for df in [data_directory.item_master, data_directory.inbound_details, data_directory.inventory, data_directory.order_details]
+                             if df is not None)
+
+    if not is_valid:
+        raise RuntimeError(f'Synthetic data failed validation: {message}\n{log_file.getvalue()}')
+
+    with redirect_stdout(io.StringIO()):
+        service = TransformService(project_number=BENCHMARK_PROJECT_NUMBER, DataDirectoryObj=data_directory, transform_options=transform_options)
+    project_number = BENCHMARK_PROJECT_NUMBER
+
+    def run(name: str, func, **kwargs) -> pd.DataFrame:
+        with timer.stage(name) as result:
+            with redirect_stdout(io.StringIO()):
+                df = func(**kwargs)
+            result['rows'] = len(df)
+        return df
+
+    item_master = run('create_item_master', service.create_item_master, project_num=project_number, item_master_df=data_directory.get_df(UploadFileType.ITEM_MASTER))
+
+    order_details = run('create_order_details', service.create_order_details, project_num=project_number,
+                        order_details_df=data_directory.get_df(UploadFileType.ORDER_DETAILS), item_master_df=item_master)
+    velocity_analysis = run('run_velocity_analysis', service.run_velocity_analysis, outbound_df=order_details)
+    item_master = item_master.merge(velocity_analysis[['SKU', 'Velocity']], on='SKU', how='left')
+    item_master['Velocity'] = item_master['Velocity'].fillna('X')
+    order_header = run('create_order_header', service.create_order_header, project_num=project_number, order_header_df=data_directory.get_df(UploadFileType.ORDER_HEADER),
+                       order_details_df=order_details, item_master_df=item_master)
+
+    inbound_header = run('create_inbound_header', service.create_inbound_header, project_num=project_number, inbound_header_df=data_directory.get_df(UploadFileType.INBOUND_HEADER),
+        inbound_details_df=data_directory.get_df(UploadFileType.INBOUND_DETAILS))
+    inbound_details = run('create_inbound_details', service.create_inbound_details, project_num=project_number,
+                          inbound_details_df=data_directory.get_df(UploadFileType.INBOUND_DETAILS), item_master_df=item_master)
+
+    inventory_data = run('create_inventory_data', service.create_inventory_data, project_num=project_number, inventory_df=data_directory.get_df(UploadFileType.INVENTORY),
+        velocity_analysis=velocity_analysis, inbound_skus=set(inbound_details['SKU'].unique().tolist()), item_master_df=item_master)
+
+    project_number_velocity = run('create_project_number_velocity', service.create_project_number_velocity, project_num=project_number)
+    velocity_by_month = run('create_velocity_by_month', service.create_velocity_by_month, project_num=project_number, order_header_df=order_header,
+                            order_details_df=order_details, velocity_analysis=velocity_analysis)
+    velocity_ladder = run('create_velocity_ladder', service.create_velocity_ladder, project_num=project_number, velocity_analysis=velocity_analysis)
+
+    return {'ItemMaster': item_master, 'InboundHeader': inbound_header, 'InboundDetails': inbound_details, 'InventoryData': inventory_data,
+            'OrderHeader': order_header, 'OrderDetails': order_details, 'ProjectNumber_Velocity': project_number_velocity,
+            'VelocityByMonth': velocity_by_month, 'VelocityLadder': velocity_ladder}
+
+
+def run_benchmark(sizes: list[str], directory_type: DataDirectoryType = DataDirectoryType.HEADERS, data_root: str = DATA_DIR,
+                  track_memory: bool = True, seed: int = 0) -> dict:
+    '''
+    Benchmark every size
+
+    Return
+    ------
+    results dict (what gets saved as JSON)
+    '''
+
+    transform_options = TransformOptions(date_for_analysis=DateForAnalysis.SHIP_DATE, weekend_date_rule=WeekendDateRules.NEAREST_WEEKDAY,
+                                         data_directory_type=directory_type)
+    results = {
+        'label': _git_label(),
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'directory_type': directory_type.value,
+        'memory_tracked': track_memory,
+        'sizes': {},
+    }
+
+    for size in sizes:
+        spec = SyntheticDataSpec.for_order_lines(SIZES[size], seed=seed)
+        data_dir = os.path.join(data_root, f'{spec.name()}_{directory_type.value}')
+
+        if not os.path.isdir(data_dir):
+            print(f'\nGenerating {size} lines ({spec.skus:,} SKUs, {spec.orders:,} orders) in {data_dir}...')
+            st = perf_counter()
+            write_data_directory(data_dir, spec, directory_type=directory_type)
+            print(f'    generated in {perf_counter() - st:.1f} s')
+
+        print(f'\n{size} order lines:')
+        timer = StageTimer(track_memory=track_memory)
+        if track_memory:
+            tracemalloc.start()
+
+        try:
+            total_st = perf_counter()
+            run_transform_stages(data_dir, transform_options, timer)
+            total_seconds = round(perf_counter() - total_st, 3)
+        except MemoryError:
+            print('    ran out of memory')
+            total_seconds = None
+        finally:
+            if track_memory:
+                tracemalloc.stop()
+
+        results['sizes'][size] = {'spec': spec.__dict__, 'total_seconds': total_seconds, 'stages': timer.stages}
+
+    return results
+
+
+def save_results(results: dict, results_dir: str = RESULTS_DIR, prefix: str = 'transform') -> str:
+    os.makedirs(results_dir, exist_ok=True)
+
+    file_path = os.path.join(results_dir, f'{prefix}_{results["label"]}_{datetime.now().strftime("%Y%m%d-%H%M%S")}.json')
+    with open(file_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    return file_path
+
+
+def compare_results(results: dict, baseline: dict):
+    ''' Print each stage's time + memory next to a baseline run's '''
+
+    print(f'\nCompared to {baseline["label"]} ({baseline["run_at"]}):')
+
+    for size, size_results in results['sizes'].items():
+        baseline_stages = {stage['stage']: stage for stage in baseline['sizes'].get(size, {}).get('stages', [])}
+        if not baseline_stages:
+            continue
+
+        print(f'\n{size} order lines:')
+        for stage in size_results['stages']:
+            old = baseline_stages.get(stage['stage'])
+            if old is None:
+                continue
+            print(f'    {stage["stage"]:<30} {_change(old["seconds"], stage["seconds"], " s"):>28}  {_change(old["peak_mb"], stage["peak_mb"], " MB"):>28}')
+
+
+''' Helpers '''
+
+def _git_label() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def _fmt(value, unit: str) -> str:
+    return '' if value is None else f'{value:,}{unit}'
+
+
+def _change(old, new, unit: str) -> str:
+    if old is None or new is None:
+        return ''
+    pct = f' ({(new - old) / old:+.0%})' if old else ''
+    return f'{old:,} -> {new:,}{unit}{pct}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the transform stages on synthetic data')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES.keys()), default=['100k', '1M'])
+    parser.add_argument('--directory-type', choices=[t.value for t in DataDirectoryType], default=DataDirectoryType.HEADERS.value)
+    parser.add_argument('--data-dir', default=DATA_DIR, help='where generated data directories are kept')
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (cleaner timings)')
+    parser.add_argument('--compare', help='a previous results JSON to compare against')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, directory_type=DataDirectoryType(args.directory_type), data_root=args.data_dir,
+                            track_memory=not args.no_memory, seed=args.seed)
+    print(f'\nSaved results to {save_results(results, args.results_dir)}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(results, json.load(f))
@@ -0,0 +1,244 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Recording fake of the pyodbc Connection/Cursor calls the app makes, for benchmarking + testing the upload code without a server.
+Every execute/executemany is recorded (query, row count, and optionally the parameters themselves), as is every commit and
+rollback. Server time can be simulated - a fixed latency per round trip, plus a throughput for executemany rows - so a benchmark
+can show the client-side cost of an upload apart from the time spent waiting on the database.
+
+    connection = FakeConnection(latency=0.02, rows_per_second=50_000)
+    insert_table_to_db(connection=connection, ...)
+    connection.statements, connection.commits, connection.server_seconds
+
+Queries return no rows unless result sets are queued with add_results - the next execute returns them, one per nextset():
+
+    connection.add_results(FakeResultSet(columns=None), FakeResultSet(columns=[('SKU', str), ('Units', int)], rows=[('A', 1)]))
+    download_table_from_query(connection, query)
+
+FakeConnectionPool stands in for a DatabaseConnectionPool (OutputTablesService(connection_pool=...))
+'''
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter, sleep
+from typing import Iterator
+
+from data_profiler.database.sql_registry import count_sql_parameters
+
+
+@dataclass
+class RecordedStatement:
+    method: str                                 # 'execute' or 'executemany'
+    query: str
+    rows: int                                   # parameter rows sent - 1 for execute
+    fast_executemany: bool = False
+    autocommit: bool = False
+    params: list | None = None                  # only kept if the connection was made with record_params=True
+    seconds: float = 0                          # time spent in the fake, incl. simulated server time
+
+
+@dataclass
+class FakeResultSet:
+    columns: list[tuple[str, type]] | None      # (name, python type) like pyodbc's description. None for a statement with no rows
+    rows: list[tuple] = field(default_factory=list)
+
+
+class FakeCursor():
+    ''' Records execute/executemany on its connection. Returns the connection's queued result sets, if any '''
+
+    def __init__(self, connection: 'FakeConnection'):
+        self.connection = connection
+        self.fast_executemany = False
+        self.arraysize = 1
+        self.description = None
+        self.rowcount = -1
+        self.closed = False
+
+        self._result_sets: list[FakeResultSet] = []
+        self._rows: list[tuple] = []
+
+    def execute(self, query: str, *params) -> 'FakeCursor':
+        # pyodbc takes the params either as one sequence or as separate arguments
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+
+        st = perf_counter()
+        self._check_row(query, params)
+        self.connection._simulate_server(rows=1)
+        self.rowcount = 1
+        self._result_sets = self.connection._next_results()
+        self._load_result_set()
+
+        self.connection._record(RecordedStatement(method='execute', query=query, rows=1, autocommit=self.connection.autocommit,
+                                                  params=[tuple(params)] if self.connection.record_params else None, seconds=perf_counter() - st))
+        return self
+
+    def executemany(self, query: str, params_seq) -> 'FakeCursor':
+        st = perf_counter()
+
+        # Like pyodbc, the whole sequence is taken up front and every row has to match the query's parameter markers
+        rows = list(params_seq)
+        if not rows:
+            raise ValueError('executemany called with no parameter rows')
+        for row in rows:
+            self._check_row(query, row)
+
+        self.connection._simulate_server(rows=len(rows))
+        self.rowcount = -1                      # pyodbc doesn't report a rowcount for executemany
+
+        self.connection._record(RecordedStatement(method='executemany', query=query, rows=len(rows), fast_executemany=self.fast_executemany,
+                                                  autocommit=self.connection.autocommit, params=rows if self.connection.record_params else None,
+                                                  seconds=perf_counter() - st))
+        return self
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: int | None = None) -> list:
+        size = size or self.arraysize
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> list:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def nextset(self) -> bool:
+        if len(self._result_sets) <= 1:
+            self._result_sets = []
+            self._load_result_set()
+            return False
+
+        self._result_sets = self._result_sets[1:]
+        self._load_result_set()
+        return True
+
+    def close(self):
+        self.closed = True
+
+    def _load_result_set(self):
+        result_set = self._result_sets[0] if self._result_sets else None
+
+        if result_set is None or result_set.columns is None:
+            self.description = None
+            self._rows = []
+        else:
+            self.description = [(name, type_code, None, None, None, None, True) for name, type_code in result_set.columns]
+            self._rows = list(result_set.rows)
+
+    def _check_row(self, query: str, row):
+        expected = self.connection._param_count(query)
+        if len(row) != expected:
+            raise ValueError(f'The SQL contains {expected} parameter markers, but {len(row)} parameters were supplied')
+
+
+class FakeConnection():
+    ''' Records the statements, commits + rollbacks made on it '''
+
+    def __init__(self, latency: float = 0, rows_per_second: float | None = None, record_params: bool = False):
+        '''
+        Params
+        ------
+        latency : float
+            simulated seconds per round trip (each execute, executemany and commit)
+        rows_per_second : float | None
+            simulated server throughput for parameter rows. None for no limit
+        record_params : bool
+            keep every parameter row sent (for tests). Off by default - at benchmark sizes it would double the memory used
+        '''
+
+        self.latency = latency
+        self.rows_per_second = rows_per_second
+        self.record_params = record_params
+
+        self.autocommit = False                 # pyodbc connections start with autocommit off
+        self.closed = False
+
+        self.statements: list[RecordedStatement] = []
+        self.commits: list[int] = []            # number of statements recorded at each commit
+        self.rollbacks: int = 0
+        self.server_seconds: float = 0          # total simulated server time
+
+        self._param_counts: dict[str, int] = {}
+        self._queued_results: list[list[FakeResultSet]] = []
+
+    def __enter__(self) -> 'FakeConnection':
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        # Same as pyodbc - commit on a clean exit, unless autocommit is on
+        if exception_type is None and not self.autocommit:
+            self.commit()
+
+    @property
+    def rows_sent(self) -> int:
+        return sum(statement.rows for statement in self.statements)
+
+    @property
+    def fake_seconds(self) -> float:
+        ''' Total time spent inside the fake's calls, incl. simulated server time '''
+        return sum(statement.seconds for statement in self.statements) + self.latency * len(self.commits)
+
+    def cursor(self) -> FakeCursor:
+        if self.closed:
+            raise ValueError('Attempt to use a closed connection.')
+        return FakeCursor(self)
+
+    def execute(self, query: str, *params) -> FakeCursor:
+        return self.cursor().execute(query, *params)
+
+    def add_results(self, *result_sets: FakeResultSet):
+        ''' Queue the result sets the next execute returns (later calls queue for later executes) '''
+        self._queued_results.append(list(result_sets))
+
+    def commit(self):
+        self._simulate_server(rows=0)
+        self.commits.append(len(self.statements))
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+    def reset(self):
+        ''' Forget everything recorded so far '''
+
+        self.statements = []
+        self.commits = []
+        self.rollbacks = 0
+        self.server_seconds = 0
+
+    def _next_results(self) -> list[FakeResultSet]:
+        return self._queued_results.pop(0) if self._queued_results else []
+
+    def _record(self, statement: RecordedStatement):
+        self.statements.append(statement)
+
+    def _param_count(self, query: str) -> int:
+        if query not in self._param_counts:
+            self._param_counts[query] = count_sql_parameters(query)
+        return self._param_counts[query]
+
+    def _simulate_server(self, rows: int):
+        seconds = self.latency
+        if self.rows_per_second:
+            seconds += rows / self.rows_per_second
+
+        if seconds > 0:
+            sleep(seconds)
+            self.server_seconds += seconds
+
+
+class FakeConnectionPool():
+    ''' Stands in for a DatabaseConnectionPool - every connection() is the same FakeConnection '''
+
+    def __init__(self, connection: FakeConnection | None = None):
+        self.fake_connection = connection or FakeConnection()
+
+    @contextmanager
+    def connection(self) -> Iterator[FakeConnection]:
+        yield self.fake_connection
@@ -0,0 +1,337 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Seeded synthetic warehouse data for testing + benchmarking the upload pipeline without a client's folder. Writes a data
+directory the same way a user would give one to DataDirectory: REGULAR (ItemMaster, Inbound, Inventory, Outbound) or
+HEADERS (ItemMaster, InboundHeader/Details, Inventory, OrderHeader/Details), with the columns in FILE_TYPES_COLUMNS_MAPPER.
+
+Order lines are generated and written in chunks, so even the 50M line sizes only hold one chunk in memory at a time.
+The same spec + seed (+ chunk size) always gives the same files
+'''
+
+from dataclasses import dataclass, field
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_profiler.helpers.constants.data_file_constants import FILE_TYPES_COLUMNS_MAPPER
+from data_profiler.helpers.models.DataFiles import DataDirectoryType, UploadFileType
+
+
+CHUNK_LINES = 1_000_000
+
+UOMS = ['Each', 'Inner', 'Carton', 'Pallet']
+SKU_CLASSES = ['A', 'B', 'C', 'D']
+PRODUCT_LINES = ['Apparel', 'Footwear', 'Accessories', 'Equipment', 'Home']
+SUBWAREHOUSES = ['Ambient', 'Cooler', 'Freezer', 'Hazmat']
+CHANNELS = ['Retail', 'Ecom', 'Wholesale']
+BUSINESS_UNITS = ['North', 'South', 'East', 'West']
+SHIP_CONTAINERS = ['Box', 'Tote', 'Pallet', 'Polybag']
+HANDLING_CODES = ['', '', '', 'FRAGILE', 'HAZMAT']
+CARRIERS = ['UPS', 'FedEx', 'USPS', 'LTL', 'TL']
+INBOUND_MODES = ['TL', 'LTL', 'Parcel', 'Intermodal']
+UNLOAD_TYPES = ['Floor Loaded', 'Palletized', 'Slip Sheet']
+
+
+@dataclass
+class SyntheticDataSpec:
+    '''
+    Scale knobs for a synthetic data directory
+
+    skus : int
+        Item Master rows
+    orders : int
+        outbound orders
+    lines_per_order : float
+        mean order lines per order (at least 1 per order)
+    months : int
+        months of order/inbound history (and inventory snapshots, one per month end)
+    uom_mix : dict[str, float]
+        share of order/inbound lines by unit of measure (Each/Inner/Carton/Pallet)
+    inbound_pos_per_order : float
+        inbound POs as a share of orders
+    lines_per_po : float
+        mean lines per inbound PO
+    inventory_locations_per_sku : float
+        mean inventory rows per SKU per snapshot
+    sku_skew : float
+        Zipf-like exponent for how concentrated picks are on popular SKUs. 0 = uniform, ~1 = realistic ABC curve
+    start_date : str
+        first day of history (yyyy-mm-dd)
+    seed : int
+    '''
+
+    skus: int = 5_000
+    orders: int = 25_000
+    lines_per_order: float = 4.0
+    months: int = 12
+    uom_mix: dict[str, float] = field(default_factory=lambda: {'Each': 0.6, 'Inner': 0.1, 'Carton': 0.25, 'Pallet': 0.05})
+    inbound_pos_per_order: float = 0.05
+    lines_per_po: float = 8.0
+    inventory_locations_per_sku: float = 1.5
+    sku_skew: float = 1.0
+    start_date: str = '2025-01-01'
+    seed: int = 0
+
+    @classmethod
+    def for_order_lines(cls, order_lines: int, **overrides) -> 'SyntheticDataSpec':
+        '''
+        A spec sized by its number of order lines - SKUs grow with the square root of the order count, like a real DC
+
+        Params
+        ------
+        order_lines : int
+            approximate order lines to generate
+        overrides
+            any other SyntheticDataSpec field
+        '''
+
+        lines_per_order = overrides.pop('lines_per_order', cls.lines_per_order)
+        orders = max(int(order_lines / lines_per_order), 1)
+        skus = overrides.pop('skus', int(min(max(20 * np.sqrt(orders), 100), 500_000)))
+
+        return cls(skus=skus, orders=orders, lines_per_order=lines_per_order, **overrides)
+
+    def name(self) -> str:
+        ''' Short folder-friendly name, unique per spec '''
+
+        return f'{self.orders * self.lines_per_order / 1e6:g}M-lines_{self.skus}-skus_{self.months}-months_seed{self.seed}'
+
+
+''' Generators '''
+
+def generate_item_master(spec: SyntheticDataSpec, rng: np.random.Generator) -> pd.DataFrame:
+    n = spec.skus
+
+    each_dims = rng.uniform(1, 12, size=(n, 3)).round(1)
+    inner_qty = rng.choice([1, 2, 4, 6], size=n)
+    carton_qty = inner_qty * rng.choice([2, 3, 4, 6], size=n)
+    carton_dims = each_dims * np.cbrt(carton_qty)[:, None]
+    tie, high = rng.integers(4, 12, size=n), rng.integers(3, 7, size=n)
+    each_weight = rng.gamma(2.0, 1.0, size=n).round(2)
+
+    return pd.DataFrame({
+        'SKU': _ids('SKU', np.arange(n)),
+        'SKUDescription': [f'Synthetic item {i}' for i in range(n)],
+        'SKUClass': rng.choice(SKU_CLASSES, size=n),
+        'ProductLine': rng.choice(PRODUCT_LINES, size=n),
+        'UnitOfMeasure': 'Each',
+        'EachLength': each_dims[:, 0],
+        'EachWidth': each_dims[:, 1],
+        'EachHeight': each_dims[:, 2],
+        'EachWeight': each_weight,
+        'InnerQuantity': inner_qty,
+        'InnerLength': (each_dims[:, 0] * np.cbrt(inner_qty)).round(1),
+        'InnerWidth': (each_dims[:, 1] * np.cbrt(inner_qty)).round(1),
+        'InnerHeight': (each_dims[:, 2] * np.cbrt(inner_qty)).round(1),
+        'InnerWeight': (each_weight * inner_qty).round(2),
+        'CartonQuantity': carton_qty,
+        'CartonLength': carton_dims[:, 0].round(1),
+        'CartonWidth': carton_dims[:, 1].round(1),
+        'CartonHeight': carton_dims[:, 2].round(1),
+        'CartonWeight': (each_weight * carton_qty).round(2),
+        'CartonsPerPallet': tie * high,
+        'PalletTie': tie,
+        'PalletHigh': high,
+        'MaxPalletStack': rng.integers(1, 4, size=n),
+        'PalletLength': 48.0,
+        'PalletWidth': 40.0,
+        'PalletHeight': (carton_dims[:, 2] * high + 6).round(1),
+        'PalletWeight': (each_weight * carton_qty * tie * high + 50).round(2),
+        'Subwarehouse': rng.choice(SUBWAREHOUSES, size=n, p=[0.7, 0.15, 0.1, 0.05]),
+    })
+
+
+def iter_order_chunks(spec: SyntheticDataSpec, rng: np.random.Generator, chunk_lines: int = CHUNK_LINES):
+    '''
+    Generate orders a chunk at a time
+
+    Yield
+    -----
+    (order header df, order details df) per chunk of about chunk_lines lines
+    '''
+
+    dates = _date_range(spec)
+    sku_p = _sku_popularity(spec)
+    orders_per_chunk = max(int(chunk_lines / spec.lines_per_order), 1)
+
+    for first_order in range(0, spec.orders, orders_per_chunk):
+        n_orders = min(orders_per_chunk, spec.orders - first_order)
+        order_ids = _ids('ORD', np.arange(first_order, first_order + n_orders))
+
+        received = dates[rng.integers(0, len(dates), size=n_orders)]
+        picked = received + pd.to_timedelta(rng.choice([0, 0, 1], size=n_orders), unit='D')
+        shipped = picked + pd.to_timedelta(rng.choice([0, 1, 1, 2], size=n_orders), unit='D')
+
+        header = pd.DataFrame({
+            'OrderNumber': order_ids,
+            'ReceivedDate': received.strftime('%Y-%m-%d'),
+            'PickDate': picked.strftime('%Y-%m-%d'),
+            'ShipDate': shipped.strftime('%Y-%m-%d'),
+            'Channel': rng.choice(CHANNELS, size=n_orders),
+        })
+
+        lines_per_order = 1 + rng.poisson(spec.lines_per_order - 1, size=n_orders)
+        n_lines = int(lines_per_order.sum())
+        uoms = _choose_uoms(spec, rng, n_lines)
+
+        details = pd.DataFrame({
+            'OrderNumber': np.repeat(order_ids, lines_per_order),
+            'SKU': _ids('SKU', rng.choice(spec.skus, size=n_lines, p=sku_p)),
+            'UnitOfMeasure': uoms,
+            'PickType': np.where(uoms == 'Pallet', 'Full Pallet', np.where(uoms == 'Each', 'Each', 'Case')),
+            'Quantity': rng.geometric(0.35, size=n_lines).astype(float),
+            'BusinessUnit': rng.choice(BUSINESS_UNITS, size=n_lines),
+            'ShipContainerType': rng.choice(SHIP_CONTAINERS, size=n_lines),
+            'SpecialHandlingCodes': rng.choice(HANDLING_CODES, size=n_lines),
+            'Carrier': rng.choice(CARRIERS, size=n_lines),
+        })
+
+        yield header, details
+
+
+def generate_inbound(spec: SyntheticDataSpec, rng: np.random.Generator) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''
+    Return
+    ------
+    (inbound header df, inbound details df)
+    '''
+
+    dates = _date_range(spec)
+    n_pos = max(int(spec.orders * spec.inbound_pos_per_order), 1)
+    po_ids = _ids('PO', np.arange(n_pos))
+
+    arrival = dates[rng.integers(0, len(dates), size=n_pos)]
+    expected = arrival - pd.to_timedelta(rng.integers(-2, 3, size=n_pos), unit='D')
+    seconds = rng.integers(6 * 3600, 18 * 3600, size=(2, n_pos))
+
+    header = pd.DataFrame({
+        'PO_Number': po_ids,
+        'ArrivalDate': arrival.strftime('%Y-%m-%d'),
+        'ArrivalTime': _times(seconds[0]),
+        'ExpectedDate': expected.strftime('%Y-%m-%d'),
+        'ExpectedTime': _times(seconds[1]),
+        'Carrier': rng.choice(CARRIERS, size=n_pos),
+        'Mode': rng.choice(INBOUND_MODES, size=n_pos),
+        'ShipmentNumber': _ids('SHP', rng.integers(0, n_pos, size=n_pos)),
+        'UnloadType': rng.choice(UNLOAD_TYPES, size=n_pos),
+    })
+
+    lines_per_po = 1 + rng.poisson(spec.lines_per_po - 1, size=n_pos)
+    n_lines = int(lines_per_po.sum())
+
+    details = pd.DataFrame({
+        'PO_Number': np.repeat(po_ids, lines_per_po),
+        'SKU': _ids('SKU', rng.integers(0, spec.skus, size=n_lines)),
+        'UnitOfMeasure': _choose_uoms(spec, rng, n_lines),
+        'Quantity': rng.integers(1, 200, size=n_lines).astype(float),
+        'VendorID': _ids('VEN', rng.integers(0, 250, size=n_lines)),
+        'SourcePoint': rng.choice(['Domestic', 'Import'], size=n_lines, p=[0.8, 0.2]),
+    })
+
+    return header, details
+
+
+def generate_inventory(spec: SyntheticDataSpec, rng: np.random.Generator) -> pd.DataFrame:
+    ''' One snapshot per month end, ~inventory_locations_per_sku rows per SKU each '''
+
+    periods = pd.date_range(spec.start_date, periods=spec.months, freq='ME')
+    rows_per_period = max(int(spec.skus * spec.inventory_locations_per_sku), 1)
+    n = rows_per_period * len(periods)
+
+    return pd.DataFrame({
+        'Period': np.repeat(periods.strftime('%Y-%m-%d'), rows_per_period),
+        'SKU': _ids('SKU', rng.integers(0, spec.skus, size=n)),
+        'Quantity': rng.integers(1, 500, size=n).astype(float),
+        'UnitOfMeasure': _choose_uoms(spec, rng, n),
+        'Location': _ids('LOC', rng.integers(0, max(spec.skus * 2, 1), size=n)),
+        'Lot': _ids('LOT', rng.integers(0, 10_000, size=n)),
+        'LPN': _ids('LPN', np.arange(n)),
+        'Subwarehouse': rng.choice(SUBWAREHOUSES, size=n, p=[0.7, 0.15, 0.1, 0.05]),
+    })
+
+
+''' Writer '''
+
+def write_data_directory(path: str, spec: SyntheticDataSpec, directory_type: DataDirectoryType = DataDirectoryType.REGULAR,
+                         chunk_lines: int = CHUNK_LINES) -> str:
+    '''
+    Write a synthetic data directory (one CSV per file type, named like DataDirectory expects)
+
+    Params
+    ------
+    path : str
+        folder to write to (created if needed). Existing files of the same name are overwritten
+    spec : SyntheticDataSpec
+    directory_type : DataDirectoryType
+        REGULAR -> Inbound + Outbound files, HEADERS -> header/details files
+    chunk_lines : int
+        order lines generated + appended per chunk
+
+    Return
+    ------
+    path
+    '''
+
+    os.makedirs(path, exist_ok=True)
+
+    # Separate generators per file, so e.g. changing the order count doesn't change the item master
+    item_rng, inbound_rng, inventory_rng, order_rng = [np.random.default_rng([spec.seed, i]) for i in range(4)]
+
+    _write(generate_item_master(spec, item_rng), path, UploadFileType.ITEM_MASTER)
+    _write(generate_inventory(spec, inventory_rng), path, UploadFileType.INVENTORY)
+
+    inbound_header, inbound_details = generate_inbound(spec, inbound_rng)
+    if directory_type == DataDirectoryType.REGULAR:
+        _write(inbound_details.merge(inbound_header, on='PO_Number', how='left'), path, UploadFileType.INBOUND)
+    else:
+        _write(inbound_header, path, UploadFileType.INBOUND_HEADER)
+        _write(inbound_details, path, UploadFileType.INBOUND_DETAILS)
+
+    for i, (order_header, order_details) in enumerate(iter_order_chunks(spec, order_rng, chunk_lines=chunk_lines)):
+        append = i > 0
+        if directory_type == DataDirectoryType.REGULAR:
+            _write(order_details.merge(order_header, on='OrderNumber', how='left'), path, UploadFileType.OUTBOUND, append=append)
+        else:
+            _write(order_header, path, UploadFileType.ORDER_HEADER, append=append)
+            _write(order_details, path, UploadFileType.ORDER_DETAILS, append=append)
+
+    return path
+
+
+''' Helpers '''
+
+def _write(df: pd.DataFrame, path: str, file_type: UploadFileType, append: bool = False):
+    df = df.reindex(columns=FILE_TYPES_COLUMNS_MAPPER[file_type.value])
+    df.to_csv(f'{path}/{file_type.value}.csv', index=False, mode='a' if append else 'w', header=not append)
+
+
+def _ids(prefix: str, numbers: np.ndarray) -> np.ndarray:
+    return np.char.add(prefix, np.char.zfill(np.asarray(numbers).astype(str), 7))
+
+
+def _times(seconds: np.ndarray) -> np.ndarray:
+    return pd.to_datetime(seconds, unit='s').strftime('%H:%M:%S').to_numpy()
+
+
+def _date_range(spec: SyntheticDataSpec) -> pd.DatetimeIndex:
+    start = pd.Timestamp(spec.start_date)
+    return pd.date_range(start, start + pd.DateOffset(months=spec.months) - pd.Timedelta(days=1), freq='D')
+
+
+def _sku_popularity(spec: SyntheticDataSpec) -> np.ndarray:
+    weights = 1 / np.arange(1, spec.skus + 1) ** spec.sku_skew
+    return weights / weights.sum()
+
+
+def _choose_uoms(spec: SyntheticDataSpec, rng: np.random.Generator, n: int) -> np.ndarray:
+    uoms = list(spec.uom_mix.keys())
+    unknown = set(uoms) - set(UOMS)
+    if unknown:
+        raise ValueError(f'Unknown units of measure in uom_mix: {sorted(unknown)}')
+
+    p = np.array(list(spec.uom_mix.values()), dtype=float)
+    return rng.choice(uoms, size=n, p=p / p.sum())
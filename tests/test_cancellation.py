@@ -0,0 +1,26 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks a cancellation token set on one thread stops a worker on another
+'''
+
+import threading
+
+import pytest
+
+from data_profiler.helpers.cancellation import CancellationToken, OperationCancelled
+
+
+def test_token_cancelled_from_another_thread():
+    token = CancellationToken()
+    token.raise_if_cancelled()
+
+    thread = threading.Thread(target=token.cancel)
+    thread.start()
+    thread.join()
+
+    assert token.is_cancelled()
+    with pytest.raises(OperationCancelled):
+        token.raise_if_cancelled()
@@ -0,0 +1,170 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks DatabaseConnectionPool (reuse, the size cap, connecting in parallel, dropping broken connections) and "download all"
+over it, with FakeConnections instead of a server
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Lock
+from time import perf_counter, sleep
+
+import pyodbc
+import pytest
+
+from data_profiler import data_profiler as data_profiler_module
+from data_profiler.data_profiler import DataProfiler
+from data_profiler.database.database_manager import DatabaseConnectionPool
+from data_profiler.helpers.models.GeneralModels import DownloadDataOptions
+from data_profiler.helpers.models.Responses import DBDownloadResponse
+
+from tests.fake_pyodbc import FakeConnection
+
+
+class FakeServerPool(DatabaseConnectionPool):
+    ''' DatabaseConnectionPool that opens FakeConnections, each taking connect_seconds '''
+
+    def __init__(self, dev: bool = False, max_size: int = 4, connect_seconds: float = 0, fail_connects: int = 0):
+        super().__init__(dev=dev, max_size=max_size)
+        self.connect_seconds = connect_seconds
+        self.fail_connects = fail_connects
+        self.opened: list[FakeConnection] = []
+        self._opened_lock = Lock()
+
+    def _open_connection(self, db_stats=None) -> FakeConnection:
+        sleep(self.connect_seconds)
+        with self._opened_lock:
+            if self.fail_connects:
+                self.fail_connects -= 1
+                raise pyodbc.InterfaceError('Could not connect to database.')
+            connection = FakeConnection()
+            self.opened.append(connection)
+        return connection
+
+
+def test_connections_are_reused():
+    with FakeServerPool(max_size=4) as pool:
+        for _ in range(3):
+            with pool.connection() as connection:
+                connection.cursor().execute('SELECT 1')
+
+    assert len(pool.opened) == 1
+    assert len(pool.opened[0].statements) == 3
+    assert pool.opened[0].closed
+
+
+def test_max_size_is_respected():
+    pool = FakeServerPool(max_size=2, connect_seconds=0.01)
+    checked_out = []
+    lock = Lock()
+
+    def work(_):
+        with pool.connection() as connection:
+            with lock:
+                checked_out.append(connection)
+                assert len(set(map(id, checked_out))) <= 2
+            sleep(0.01)
+            with lock:
+                checked_out.remove(connection)
+
+    with pool, ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(work, range(12)))
+
+    assert len(pool.opened) == 2
+
+
+def test_connects_in_parallel():
+    workers = 4
+    pool = FakeServerPool(max_size=workers, connect_seconds=0.2)
+    barrier = Barrier(workers)
+
+    def work(_):
+        barrier.wait()
+        with pool.connection():
+            pass
+
+    st = perf_counter()
+    with pool, ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(work, range(workers)))
+
+    # One at a time would take 4 x 0.2 s
+    assert perf_counter() - st < 0.6
+    assert len(pool.opened) == workers
+
+
+def test_broken_connection_is_discarded():
+    with FakeServerPool(max_size=1) as pool:
+        with pytest.raises(pyodbc.OperationalError):
+            with pool.connection():
+                raise pyodbc.OperationalError('Communication link failure')
+
+        # The broken one was closed, and the next checkout opens a new one (instead of waiting forever on a full pool)
+        with pool.connection() as connection:
+            assert connection is pool.opened[1]
+
+    assert pool.opened[0].closed
+    assert pool.opened[0].rollbacks == 0
+
+
+def test_other_errors_roll_back_and_keep_the_connection():
+    with FakeServerPool(max_size=1) as pool:
+        with pytest.raises(ValueError):
+            with pool.connection():
+                raise ValueError('bad data')
+
+        with pool.connection() as connection:
+            assert connection is pool.opened[0]
+
+    assert pool.opened[0].rollbacks == 1
+
+
+def test_failed_connect_frees_its_slot():
+    with FakeServerPool(max_size=1, fail_connects=1) as pool:
+        with pytest.raises(pyodbc.InterfaceError):
+            with pool.connection():
+                pass
+
+        with pool.connection():
+            pass
+
+    assert len(pool.opened) == 1
+
+
+def test_download_all_reports_failed_options_only(tmp_path, monkeypatch):
+    pools = []
+
+    def make_pool(dev: bool = False, max_size: int = 4) -> FakeServerPool:
+        pools.append(FakeServerPool(dev=dev, max_size=max_size))
+        return pools[-1]
+
+    def download_option(self, service, download_option, project_number, download_directory, file_format=None):
+        with service.connection_pool.connection() as connection:
+            connection.cursor().execute('SELECT 1')
+
+            if download_option == DownloadDataOptions.INVENTORY_STRATIFICATION_REPORT:
+                raise RuntimeError('boom')
+            if download_option == DownloadDataOptions.ITEMS_MATERIAL_FLOW_REPORT_EACHES:
+                return DBDownloadResponse(project_number=project_number, message='Could not write files.')
+            return DBDownloadResponse(project_number=project_number, success=True, rows_affected=10)
+
+    monkeypatch.setattr(data_profiler_module, 'DatabaseConnectionPool', make_pool)
+    monkeypatch.setattr(DataProfiler, '_download_option', download_option)
+
+    profiler = DataProfiler.__new__(DataProfiler)
+    profiler.dev = False
+    response = profiler._download_all(project_number='AAS26-0001', download_directory=str(tmp_path))
+
+    options = [option for option in DownloadDataOptions if option != DownloadDataOptions.ALL]
+    errors = response.message.split('\n')
+
+    assert not response.success
+    assert sorted(errors) == sorted([f'{DownloadDataOptions.INVENTORY_STRATIFICATION_REPORT.value}: Something unknown went wrong. boom',
+                                     f'{DownloadDataOptions.ITEMS_MATERIAL_FLOW_REPORT_EACHES.value}: Could not write files.'])
+    assert response.rows_affected == 10 * (len(options) - 2)
+
+    # Every option ran, over at most max_size connections, all closed at the end
+    assert sum(len(connection.statements) for connection in pools[0].opened) == len(options)
+    assert len(pools[0].opened) <= pools[0].max_size
+    assert all(connection.closed for connection in pools[0].opened)
@@ -0,0 +1,137 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the vectorized describer counts match the straightforward per-column filters
+'''
+
+import numpy as np
+import pandas as pd
+
+from data_profiler.helpers.functions import describer_functions
+from data_profiler.helpers.functions.describer_functions import add_fences, count_numeric_flags, box_plot_stats, box_figure, histogram_bins, \
+    build_charts_json, write_charts_html, ColumnChartSpec, DESCRIBE_COUNT_COLS, BOX_STATS_COLS, DESCRIBE_PARALLEL_CHARTS_MIN_COLUMNS
+
+
+def test_count_numeric_flags_matches_row_filters():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Quantity': rng.normal(10, 5, 1000).round(),
+        'Weight': rng.exponential(2, 1000),
+        'Lines': pd.array(rng.integers(-3, 30, 1000), dtype='Int64'),
+        'SKU': [f'SKU{i}' for i in range(1000)],
+    })
+    df.loc[::50, 'Quantity'] = np.nan
+    df.loc[::70, 'Lines'] = pd.NA
+
+    df_val = add_fences(df.describe(include='all').transpose())
+    numeric_cols = df.select_dtypes(include='number').columns
+
+    counts = count_numeric_flags(df, df_val, numeric_cols)
+
+    assert list(counts.columns) == DESCRIBE_COUNT_COLS
+    for col in numeric_cols:
+        series = df[col].dropna()
+        assert counts.at[col, 'Negative Values'] == (series < 0).sum()
+        assert counts.at[col, 'Zero Values'] == (series == 0).sum()
+        assert counts.at[col, 'Lower Outliers'] == (series < df_val.at[col, 'Lower Fence']).sum()
+        assert counts.at[col, 'Upper Outliers'] == (series > df_val.at[col, 'Upper Fence']).sum()
+        assert counts.at[col, 'Extreme Upper Outliers'] == (series > df_val.at[col, 'Extreme Upper Fence']).sum()
+
+
+def test_count_numeric_flags_no_numeric_columns():
+    df = pd.DataFrame({'SKU': ['a', 'b']})
+    counts = count_numeric_flags(df, pd.DataFrame(), [])
+
+    assert counts.empty
+    assert list(counts.columns) == DESCRIBE_COUNT_COLS
+
+
+def test_box_plot_stats_whiskers_and_outliers():
+    df = pd.DataFrame({
+        'Units': [1, 2, 3, 4, 5, 100, 10, 11, 12, 13, 14, -50],
+        'Channel': ['Retail'] * 6 + ['Ecom'] * 6,
+    })
+
+    box_stats, outliers = box_plot_stats(df, 'Units', group_col='Channel')
+
+    assert box_stats.loc['Retail', 'median'] == 3.5
+    assert box_stats.loc['Retail', 'upperfence'] == 5
+    assert box_stats.loc['Ecom', 'lowerfence'] == 10
+    assert sorted(outliers['value']) == [-50, 100]
+
+
+def test_box_plot_stats_no_numeric_values():
+    for units in [[np.nan] * 4, []]:
+        df = pd.DataFrame({'Units': pd.Series(units, dtype='float64'), 'Channel': pd.Series(['Retail'] * len(units), dtype=object)})
+
+        for group_col in [None, 'Channel']:
+            box_stats, outliers = box_plot_stats(df, 'Units', group_col=group_col)
+
+            assert box_stats.empty
+            assert list(box_stats.columns) == BOX_STATS_COLS
+            assert outliers.empty
+            assert list(outliers.columns) == ['group', 'value']
+
+    # Still draws (an empty chart)
+    box_figure('Units', box_stats, title='Units', outliers=outliers)
+
+
+def test_histogram_bins_counts_every_value():
+    values = np.array([1.0, 2.0, np.nan, 2.5, 10.0])
+    edges, counts = histogram_bins(values)
+
+    assert counts.sum() == 4
+    assert len(edges) == len(counts) + 1
+
+
+def _chart_specs(columns: int) -> list[ColumnChartSpec]:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f'Col{i}': rng.normal(i, 1 + i, 500) for i in range(columns)})
+    df['Channel'] = rng.choice(['Retail', 'Ecom'], 500)
+
+    specs = []
+    for col in df.columns.drop('Channel'):
+        edges, counts = histogram_bins(df[col].to_numpy())
+        box_stats, outliers = box_plot_stats(df, col, group_col='Channel')
+        specs.append(ColumnChartSpec(col, edges, counts, box_stats, outliers, histogram_title=f'{col} histogram', box_plot_title=f'{col} box plot'))
+    return specs
+
+
+def test_build_charts_json_process_pool_matches_serial(monkeypatch):
+    specs = _chart_specs(DESCRIBE_PARALLEL_CHARTS_MIN_COLUMNS)
+    serial = [describer_functions.build_chart_json(spec) for spec in specs]
+
+    # Make sure the pool path runs, whatever this machine's CPU count
+    pools = []
+    class RecordingPool(describer_functions.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(describer_functions.os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(describer_functions, 'ProcessPoolExecutor', RecordingPool)
+
+    assert build_charts_json(specs) == serial
+    assert len(pools) == 1
+
+
+def test_write_charts_html_embeds_plotly_once(tmp_path):
+    from plotly.offline import get_plotlyjs
+
+    specs = _chart_specs(3)
+    charts_json = build_charts_json(specs)
+    path = tmp_path / 'charts.html'
+
+    write_charts_html(str(path), header_html='<h1>Header</h1>', summaries=[f'<p>{spec.col} summary</p>' for spec in specs], charts_json=charts_json)
+    html = path.read_text(encoding='utf-8')
+
+    assert html.count(get_plotlyjs()) == 1
+    assert html.count('<div class="chart"') == 2 * len(specs)
+    for i, spec in enumerate(specs):
+        assert html.count(f'<p>{spec.col} summary</p>') == 1
+        # A histogram + a box plot container per column, each with its figure JSON
+        for j in range(2):
+            assert html.count(f'data-figure="figure-{i}-{j}"') == 1
+            assert html.count(f'id="figure-{i}-{j}"') == 1
@@ -0,0 +1,88 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks download_table_from_query against a FakeConnection - dtypes (incl. NULLs), chunking, and result sets without rows
+'''
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from data_profiler.database.helpers.functions import download_table_from_query
+
+from tests.fake_pyodbc import FakeConnection, FakeResultSet
+
+
+QUERY = 'SELECT * FROM [OutputTables_Prod].[ItemMaster] WHERE [ProjectNumber] = ?'
+
+
+def _download(*result_sets: FakeResultSet, chunk_size: int = 2, **kwargs) -> pd.DataFrame:
+    connection = FakeConnection()
+    connection.add_results(*result_sets)
+    return download_table_from_query(connection, QUERY, params=('AAS26-0001',), chunk_size=chunk_size, **kwargs)
+
+
+def test_nulls_in_int_bool_and_datetime_columns():
+    # The NULLs are all in the second chunk
+    df = _download(FakeResultSet(columns=[('Units', int), ('Active', bool), ('ShipDate', datetime)], rows=[
+        (1, True, datetime(2026, 1, 1)),
+        (2, False, datetime(2026, 1, 2)),
+        (None, None, None),
+    ]))
+
+    assert str(df['Units'].dtype) == 'Int64'
+    assert df['Units'].tolist() == [1, 2, pd.NA]
+    assert str(df['Active'].dtype) == 'boolean'
+    assert df['Active'].tolist() == [True, False, pd.NA]
+    assert str(df['ShipDate'].dtype) == 'datetime64[us]'
+    assert df['ShipDate'].isna().tolist() == [False, False, True]
+
+
+def test_columns_without_nulls_and_object_columns():
+    df = _download(FakeResultSet(columns=[('SKU', str), ('Units', int), ('Cube', float), ('Price', Decimal), ('Received', date)], rows=[
+        ('A', 1, 1.5, Decimal('0.10'), date(2026, 1, 1)),
+        ('B', 2, None, None, None),
+    ]))
+
+    assert df.dtypes.astype(str).tolist() == ['object', 'int64', 'float64', 'object', 'object']
+    assert df['Cube'].isna().tolist() == [False, True]
+
+    # DECIMAL stays exact and DATE stays a date, like DataFrame.from_records
+    assert df['Price'].tolist() == [Decimal('0.10'), None]
+    assert df['Received'].tolist() == [date(2026, 1, 1), None]
+
+
+def test_empty_result_set_keeps_columns():
+    df = _download(FakeResultSet(columns=[('SKU', str), ('Units', int)], rows=[]))
+
+    assert df.empty
+    assert list(df.columns) == ['SKU', 'Units']
+
+
+def test_no_result_set():
+    assert _download(FakeResultSet(columns=None)).empty
+
+
+def test_skips_statements_without_rows():
+    # e.g. DECLARE / SET / a temp table insert before the SELECT
+    df = _download(FakeResultSet(columns=None), FakeResultSet(columns=None), FakeResultSet(columns=[('SKU', str)], rows=[('A',), ('B',)]))
+
+    assert df['SKU'].tolist() == ['A', 'B']
+
+
+@pytest.mark.parametrize('rows', [0, 1, 4, 5])
+def test_chunk_boundaries(rows):
+    data = [(f'SKU{i}', i, None if i % 3 == 0 else i * 0.5) for i in range(rows)]
+    events = []
+
+    df = _download(FakeResultSet(columns=[('SKU', str), ('Units', int), ('Cube', float)], rows=data), chunk_size=2, update_progress_func=events.append)
+
+    expected = pd.DataFrame.from_records(data, columns=['SKU', 'Units', 'Cube']).astype({'Cube': 'float64'})
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    # One progress event per fetched chunk
+    assert [event.rows_done for event in events] == list(range(2, rows, 2)) + ([rows] if rows else [])
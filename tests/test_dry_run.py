@@ -0,0 +1,110 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the pieces behind dry runs - throughput history predictions, spilled output tables round-tripping exactly, and the insert
+plan TransformService reports without a database
+'''
+
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from data_profiler.helpers.constants.app_constants import DEFAULT_INSERT_ROWS_PER_SECOND, INSERT_BATCH_SIZE
+from data_profiler.helpers.models.DataFiles import UploadFileType
+from data_profiler.helpers.models.Memory import ExecutionMode
+from data_profiler.helpers.models.TransformOptions import TransformOptions
+from data_profiler.helpers.throughput_history import ThroughputHistory
+from data_profiler.helpers.transform_spill import TransformSpill, transform_fingerprint
+
+
+@pytest.fixture
+def history(tmp_path) -> ThroughputHistory:
+    return ThroughputHistory(path=str(tmp_path / 'history' / 'insert_throughput.json'), max_records=3)
+
+
+@pytest.fixture
+def output_tables() -> dict[str, pd.DataFrame]:
+    # After fillna(''), numeric columns with blanks hold floats and strings together - what parquet can't store
+    return {
+        'ItemMaster': pd.DataFrame({'SKU': ['A', 'B', 'C'], 'UnitLength': [1.5, '', 3.0]}),
+        'OrderDetails': pd.DataFrame({'SKU': ['A'] * 250000, 'Quantity': range(250000)}),
+    }
+
+
+def test_history_predicts_from_median_then_other_tables_then_default(history):
+    assert history.rows_per_second('OrderDetails') == (DEFAULT_INSERT_ROWS_PER_SECOND, 0)
+
+    for seconds in [1, 2, 4, 100]:
+        history.record('OrderDetails', rows=100000, seconds=seconds)
+    history.record('OrderDetails', rows=10, seconds=1)          # too small to count
+    history.save()
+
+    reloaded = ThroughputHistory(path=history.path, max_records=3)
+    # Only the last 3 kept: 50k, 25k and 1k rows/s
+    assert reloaded.rows_per_second('OrderDetails') == (25000, 3)
+    assert reloaded.rows_per_second('ItemMaster') == (25000, 3)
+    assert reloaded.predict_seconds('OrderDetails', 50000) == 2
+
+
+def test_unreadable_history_falls_back_to_default(tmp_path):
+    path = tmp_path / 'insert_throughput.json'
+    path.write_text('{not json')
+
+    assert ThroughputHistory(path=str(path)).rows_per_second('ItemMaster') == (DEFAULT_INSERT_ROWS_PER_SECOND, 0)
+
+
+def test_spill_round_trips_exactly(tmp_path, output_tables):
+    spill = TransformSpill('abc', spill_dir=str(tmp_path))
+    assert not spill.exists()
+
+    spill.save(output_tables, execution_mode=ExecutionMode.CHUNKED)
+
+    assert spill.exists()
+    assert spill.execution_mode == ExecutionMode.CHUNKED
+    loaded = spill.load()
+    assert list(loaded) == list(output_tables)
+    for table, df in output_tables.items():
+        pd.testing.assert_frame_equal(loaded[table], df)
+
+    spill.delete()
+    assert not spill.exists()
+
+
+def test_fingerprint_changes_with_inputs(tmp_path):
+    path = tmp_path / 'ItemMaster.csv'
+    path.write_text('SKU\nA\n')
+    files = [(UploadFileType.ITEM_MASTER, str(path))]
+    fingerprint = transform_fingerprint(files, project_number='AAS26-0001', transform_options=TransformOptions())
+
+    assert transform_fingerprint(files, project_number='AAS26-0001', transform_options=TransformOptions()) == fingerprint
+    assert transform_fingerprint(files, project_number='AAS26-0002', transform_options=TransformOptions()) != fingerprint
+    assert transform_fingerprint(files, project_number='AAS26-0001', transform_options=TransformOptions(process_inbound_data=False)) != fingerprint
+
+    path.write_text('SKU\nA\nB\n')
+    os.utime(path, ns=(0, 0))
+    assert transform_fingerprint(files, project_number='AAS26-0001', transform_options=TransformOptions()) != fingerprint
+
+
+def test_plan_inserts_without_database(history, output_tables):
+    from data_profiler.services.transform_service import TransformService
+
+    history.record('OrderDetails', rows=100000, seconds=2)
+
+    service = TransformService(project_number='AAS26-0001', DataDirectoryObj=None, transform_options=TransformOptions(), throughput_history=history)
+    response = service.plan_inserts(output_tables, log_file=io.StringIO())
+
+    assert response.success
+    assert [estimate.table for estimate in response.tables] == ['ItemMaster', 'OrderDetails']
+
+    order_details = response.tables[1]
+    assert order_details.rows == 250000
+    assert order_details.batches == -(-250000 // INSERT_BATCH_SIZE)
+    assert order_details.bytes > 0
+    assert (order_details.rows_per_second, order_details.history_records, order_details.estimated_seconds) == (50000, 1, 5)
+
+    assert response.total_rows == 250003
+    assert response.rows_inserted.total_rows_inserted == 0
@@ -0,0 +1,47 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the cached Excel reader
+'''
+
+import os
+
+import pandas as pd
+import pytest
+
+from data_profiler.helpers import excel_reader
+from data_profiler.helpers.excel_reader import get_sheet_names, read_excel_header, read_excel_sheet, clear_excel_cache
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    file_path = str(tmp_path / 'book.xlsx')
+    with pd.ExcelWriter(file_path) as writer:
+        pd.DataFrame({'SKU': ['A', 'B'], 'Quantity': [1, 2]}).to_excel(writer, sheet_name='Items', index=False)
+        pd.DataFrame({'Order': [1]}).to_excel(writer, sheet_name='Orders', index=False)
+
+    yield file_path
+    clear_excel_cache()
+
+
+def test_sheet_header_and_load_share_one_parse(workbook):
+    assert get_sheet_names(workbook) == ['Items', 'Orders']
+    assert read_excel_header(workbook, 'Items') == ['SKU', 'Quantity']
+
+    cached_sheet = excel_reader._cached_sheets['Items']
+    df = read_excel_sheet(workbook, 'Items', usecols=['Quantity'])
+
+    assert excel_reader._cached_sheets['Items'] is cached_sheet
+    assert df['Quantity'].tolist() == [1, 2]
+
+
+def test_changed_file_is_reparsed(workbook):
+    read_excel_header(workbook, 'Items')
+
+    pd.DataFrame({'SKU': ['C'], 'Weight': [3.5]}).to_excel(workbook, sheet_name='Items', index=False)
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert read_excel_header(workbook, 'Items') == ['SKU', 'Weight']
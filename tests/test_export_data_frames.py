@@ -0,0 +1,87 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks download exports - the files written for each format, and the Excel row limit (incl. how report downloads report it)
+'''
+
+import os
+
+import pandas as pd
+import pytest
+
+from data_profiler.helpers.functions import functions
+from data_profiler.helpers.functions.functions import export_data_frames, file_format_extension
+from data_profiler.helpers.models.GeneralModels import DownloadFileFormat, UnitOfMeasure
+from data_profiler.services.output_tables_service import OutputTablesService
+
+from tests.fake_pyodbc import FakeConnection, FakeConnectionPool, FakeResultSet
+
+
+READERS = {
+    DownloadFileFormat.CSV: pd.read_csv,
+    DownloadFileFormat.EXCEL: pd.read_excel,
+    DownloadFileFormat.PARQUET: pd.read_parquet,
+    DownloadFileFormat.FEATHER: pd.read_feather,
+}
+
+
+@pytest.fixture
+def data_frames() -> dict[str, pd.DataFrame]:
+    return {
+        'Eaches': pd.DataFrame({'SKU': ['A', 'B'], 'Units': [1, 2]}),
+        'Pallets': pd.DataFrame({'SKU': ['C'], 'Units': [3]}),
+    }
+
+
+@pytest.mark.parametrize('file_format', list(DownloadFileFormat))
+def test_single_table_is_one_file(tmp_path, data_frames, file_format):
+    paths = export_data_frames({'Eaches': data_frames['Eaches']}, file_path=str(tmp_path / 'Report'), file_format=file_format)
+
+    assert paths == [str(tmp_path / f'Report.{file_format_extension(file_format)}')]
+    pd.testing.assert_frame_equal(READERS[file_format](paths[0]), data_frames['Eaches'])
+
+
+@pytest.mark.parametrize('file_format', [DownloadFileFormat.CSV, DownloadFileFormat.PARQUET, DownloadFileFormat.FEATHER])
+def test_several_tables_are_one_file_each(tmp_path, data_frames, file_format):
+    paths = export_data_frames(data_frames, file_path=str(tmp_path / 'Report'), file_format=file_format)
+
+    extension = file_format_extension(file_format)
+    assert paths == [str(tmp_path / f'Report - Eaches.{extension}'), str(tmp_path / f'Report - Pallets.{extension}')]
+    for path, df in zip(paths, data_frames.values()):
+        pd.testing.assert_frame_equal(READERS[file_format](path), df)
+
+
+def test_several_tables_are_sheets_of_one_excel_book(tmp_path, data_frames):
+    paths = export_data_frames(data_frames, file_path=str(tmp_path / 'Report'), file_format=DownloadFileFormat.EXCEL)
+
+    assert paths == [str(tmp_path / 'Report.xlsx')]
+    sheets = pd.read_excel(paths[0], sheet_name=None)
+    assert list(sheets) == ['Eaches', 'Pallets']
+    pd.testing.assert_frame_equal(sheets['Eaches'], data_frames['Eaches'])
+
+
+def test_excel_row_limit(tmp_path, data_frames, monkeypatch):
+    monkeypatch.setattr(functions, 'EXCEL_MAX_ROWS', 1)
+
+    with pytest.raises(ValueError, match='Eaches'):
+        export_data_frames(data_frames, file_path=str(tmp_path / 'Report'), file_format=DownloadFileFormat.EXCEL)
+    assert os.listdir(tmp_path) == []
+
+    # Other formats have no limit
+    assert len(export_data_frames(data_frames, file_path=str(tmp_path / 'Report'), file_format=DownloadFileFormat.CSV)) == 2
+
+
+def test_report_over_excel_row_limit_is_unsuccessful(tmp_path, monkeypatch):
+    monkeypatch.setattr(functions, 'EXCEL_MAX_ROWS', 1)
+
+    connection = FakeConnection()
+    connection.add_results(FakeResultSet(columns=[('SKU', str), ('Pallets', int)], rows=[('A', 1), ('B', 2)]))
+    service = OutputTablesService(connection_pool=FakeConnectionPool(connection))
+
+    response = service.download_items_material_flow_report(UnitOfMeasure.PALLET, project_number='AAS26-0001', download_folder=str(tmp_path),
+                                                           file_format=DownloadFileFormat.EXCEL)
+
+    assert not response.success
+    assert 'too many for Excel' in response.message
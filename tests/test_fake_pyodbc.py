@@ -0,0 +1,77 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the insert path against the recording FakeConnection - batching, commit points, cancellation, and update_item_master
+'''
+
+import io
+
+import pandas as pd
+import pytest
+
+from data_profiler.database.helpers.functions import insert_table_to_db
+from data_profiler.helpers.cancellation import CancellationToken, OperationCancelled
+from data_profiler.services.output_tables_service import OutputTablesService
+
+from tests.fake_pyodbc import FakeConnection, FakeConnectionPool
+
+
+INSERT_QUERY = 'INSERT INTO [OutputTables_Prod].[VelocityLadder] ([A], [B]) VALUES (?, ?)'
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({'A': [f'a{i}' for i in range(rows)], 'B': list(range(rows))})
+
+
+def test_insert_batches_and_commits():
+    connection = FakeConnection(record_params=True)
+    rows = insert_table_to_db(connection=connection, table_name='VelocityLadder', data_frame=_frame(25), insert_query=INSERT_QUERY,
+                              log_file=io.StringIO(), batch_size=10)
+
+    assert rows == 25
+    assert [statement.rows for statement in connection.statements] == [10, 10, 5]
+    assert all(statement.method == 'executemany' and statement.fast_executemany and not statement.autocommit for statement in connection.statements)
+    assert connection.commits == [1, 2, 3]
+    assert connection.statements[2].params == [['a20', 20], ['a21', 21], ['a22', 22], ['a23', 23], ['a24', 24]]
+    assert connection.autocommit
+
+
+def test_insert_cancelled_rolls_back():
+    cancel_token = CancellationToken()
+    cancel_token.cancel()
+
+    connection = FakeConnection()
+    with pytest.raises(OperationCancelled):
+        insert_table_to_db(connection=connection, table_name='VelocityLadder', data_frame=_frame(5), insert_query=INSERT_QUERY,
+                           log_file=io.StringIO(), cancel_token=cancel_token)
+
+    assert connection.statements == [] and connection.rollbacks == 1
+
+
+def test_parameter_count_mismatch():
+    with pytest.raises(ValueError):
+        FakeConnection().cursor().executemany(INSERT_QUERY, [('a', 1, 'extra')])
+
+
+def test_simulated_server_time():
+    connection = FakeConnection(latency=0.001, rows_per_second=10_000)
+    insert_table_to_db(connection=connection, table_name='VelocityLadder', data_frame=_frame(20), insert_query=INSERT_QUERY,
+                       log_file=io.StringIO(), batch_size=10)
+
+    # 2 executemany + 2 commits at 1 ms each, plus 20 rows at 10k rows/s
+    assert connection.server_seconds == pytest.approx(0.006)
+    assert connection.fake_seconds >= connection.server_seconds
+
+
+def test_update_item_master():
+    connection = FakeConnection(record_params=True)
+    service = OutputTablesService(connection_pool=FakeConnectionPool(connection))
+
+    rows = service.update_item_master(project_number='AAS24-0001', data_frame=pd.DataFrame({'SKU': ['1', '2'], 'Velocity': ['A', 'B']}))
+
+    assert rows == 2
+    statement = connection.statements[0]
+    assert 'UPDATE [OutputTables_Prod].[ItemMaster]' in statement.query
+    assert statement.params == [['A', 'AAS24-0001', '1'], ['B', 'AAS24-0001', '2']]
@@ -0,0 +1,131 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks spans nest under the active run, pick up row counts, and that the JSON report is written even when the run fails.
+Also checks the database call stats + latency histograms that go in the report
+'''
+
+import json
+
+import pandas as pd
+import pytest
+
+from data_profiler.helpers.instrumentation import RunInstrumentation, span, instrumented, current_run, LatencyHistogram, DatabaseCallStats
+from data_profiler.database import database_manager
+from data_profiler.database.database_manager import InstrumentedConnection
+from data_profiler.database.helpers.constants import DEV_OUTPUT_TABLES_SQL_FILE_INSERT_INTO_PROJECT
+from data_profiler.helpers.constants.app_constants import SQL_DIR, SQL_DIR_DEV
+
+from tests.fake_pyodbc import FakeConnection
+
+
+@instrumented()
+def create_table(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({'SKU': range(rows)})
+
+
+def test_spans_nest_and_count_rows():
+    with RunInstrumentation(name='transform', project_number='AAS24-0001') as run:
+        with span('transform_and_persist_dataframes'):
+            create_table(5)
+            with span('insert ItemMaster', rows=5):
+                pass
+
+    assert [(s.name, s.parent, s.depth, s.rows) for s in run.spans] == [
+        ('transform_and_persist_dataframes', None, 0, None),
+        ('create_table', 'transform_and_persist_dataframes', 1, 5),
+        ('insert ItemMaster', 'transform_and_persist_dataframes', 1, 5),
+    ]
+    assert all(s.wall_seconds is not None and s.cpu_seconds is not None for s in run.spans)
+    assert run.report()['project_number'] == 'AAS24-0001'
+    assert len(run.summary_lines()) == 3
+    assert current_run() is None
+
+
+def test_report_written_when_run_fails(tmp_path):
+    report_path = tmp_path / 'run_report.json'
+
+    with pytest.raises(ValueError):
+        with RunInstrumentation(name='transform', report_path=str(report_path), track_memory=True):
+            with span('create_item_master'):
+                raise ValueError('bad SKU')
+
+    report = json.loads(report_path.read_text())
+    assert report['error'] == 'ValueError: bad SKU'
+    assert report['spans'][0]['error'] == 'ValueError: bad SKU'
+    assert report['spans'][0]['tracemalloc_peak_mb'] is not None
+
+
+def test_span_outside_run_only_times():
+    with span('stray') as record:
+        pass
+
+    assert record.wall_seconds is not None
+    assert current_run() is None
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram()
+    for seconds in [0.0005, 0.003, 0.004, 0.150, 90]:
+        histogram.add(seconds)
+
+    summary = histogram.to_dict()
+    assert summary['count'] == 5
+    assert summary['buckets_ms'] == {'<=1': 1, '<=5': 2, '<=200': 1, '>60000': 1}
+    assert summary['p50_ms'] == 5.0
+    assert summary['p95_ms'] == 90000.0
+
+
+def test_database_stats_sorted_by_time():
+    stats = DatabaseCallStats()
+    stats.record_connect(0.2)
+    stats.record('DEV/insert/insert_into_item_master.sql', 'ItemMaster', execute_seconds=2.0, executions=1000, rows=1000, param_bytes=64000)
+    stats.record('DEV/insert/insert_into_item_master.sql', 'ItemMaster', commit_seconds=0.5)
+    stats.record('SELECT Project', 'Project', execute_seconds=0.01, executions=1)
+    stats.record('SELECT Project', 'Project', fetch_seconds=0.02, rows=1)
+
+    report = stats.report()
+    assert report['connect']['count'] == 1
+    assert [s['statement'] for s in report['statements']] == ['DEV/insert/insert_into_item_master.sql', 'SELECT Project']
+    assert report['statements'][0]['executions'] == 1000
+    assert report['statements'][0]['commit']['count'] == 1
+    assert report['statements'][1]['rows'] == 1
+
+
+@pytest.mark.parametrize('dev', [True, False])
+def test_statements_named_from_the_connections_templates(dev, monkeypatch):
+    requested = []
+    load_sql_registry = database_manager.load_sql_registry
+
+    def recording_load(sql_dir):
+        requested.append(sql_dir)
+        return load_sql_registry(sql_dir)
+
+    monkeypatch.setattr(database_manager, 'load_sql_registry', recording_load)
+
+    template = load_sql_registry(SQL_DIR_DEV).get(DEV_OUTPUT_TABLES_SQL_FILE_INSERT_INTO_PROJECT)
+    stats = DatabaseCallStats()
+    InstrumentedConnection(FakeConnection(), stats, dev=dev).cursor().execute(template.text, [None] * template.param_count)
+
+    assert requested == [SQL_DIR_DEV if dev else SQL_DIR]
+    if dev:
+        assert stats.report()['statements'][0]['statement'] == DEV_OUTPUT_TABLES_SQL_FILE_INSERT_INTO_PROJECT
+
+
+def test_executemany_param_bytes_estimate():
+    # Varying string lengths and NULLs, so a sample can't be exact by luck
+    rows = [[f'SKU{i}' * (1 + i % 7), i, None if i % 5 == 0 else i * 0.5, 'Each'] for i in range(100000)]
+    exact = sum(database_manager._param_bytes(row) for row in rows)
+
+    stats = DatabaseCallStats()
+    InstrumentedConnection(FakeConnection(), stats).cursor().executemany('INSERT INTO [OutputTables_Prod].[ItemMaster] VALUES (?, ?, ?, ?)', rows)
+
+    statement = stats.report()['statements'][0]
+    assert statement['rows'] == len(rows)
+    assert statement['param_bytes'] == pytest.approx(exact, rel=0.05)
+
+    # Batches no bigger than the sample are sized exactly
+    assert database_manager._estimate_param_bytes(rows[:500]) == sum(database_manager._param_bytes(row) for row in rows[:500])
+    assert database_manager._estimate_param_bytes([]) == 0
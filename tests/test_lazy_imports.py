@@ -0,0 +1,24 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the describer modules don't pull plotly in at import time (it's only needed once charts are drawn)
+'''
+
+import pytest
+
+from tests.benchmark_imports import measure_import
+
+
+@pytest.mark.parametrize('module', [
+    'data_profiler.helpers.excel_reader',
+    'data_profiler.helpers.functions.describer_functions',
+    'data_profiler.helpers.streaming_describer',
+])
+def test_describer_modules_defer_plotly(module):
+    timings, error = measure_import(module)
+
+    assert not error
+    assert module in timings
+    assert not [name for name in timings if name.split('.')[0] == 'plotly']
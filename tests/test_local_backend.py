@@ -0,0 +1,130 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the local SQLite backend runs the real sql/ templates - inserts (incl. executemany), selects, and the T-SQL-only
+deletes/reports that have to be translated
+'''
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from data_profiler.database.local_backend import connect_local, translate_tsql, _max_parameter
+from data_profiler.database.sql_registry import SqlRegistry
+from data_profiler.database.helpers.constants import OUTPUT_TABLES_ITEM_MASTER_COLS
+from data_profiler.helpers.constants.app_constants import DB_BACKEND_ENV_VAR, LOCAL_DB_BACKEND, LOCAL_DB_DIR_ENV_VAR
+from data_profiler.helpers.models.ProjectInfo import BaseProjectInfo
+
+
+PROJECT = 'AAS24-0001'
+
+
+@pytest.fixture(scope='module')
+def registry() -> SqlRegistry:
+    return SqlRegistry('./resources/sql')
+
+
+@pytest.fixture
+def connection(tmp_path):
+    connection = connect_local(str(tmp_path))
+    yield connection
+    connection.close()
+
+
+def _project_row(project_number: str) -> tuple:
+    return (project_number, 'Company', 'Sales', 'Location', 'Name', 'a@b.com', date(2026, 10, 1), 'Ship Date', 'Nearest Weekday', '',
+            True, pd.Timestamp('2026-10-02'), 'im.csv', '', '', '', '', 'od.csv', False, False, True)
+
+
+def _item_master_rows(project_number: str, skus: list[str]) -> list[tuple]:
+    rows = []
+    for sku in skus:
+        values = {col: None for col in OUTPUT_TABLES_ITEM_MASTER_COLS}
+        values.update(ProjectNumber_SKU=f'{project_number}-{sku}', ProjectNumber=project_number, SKU=sku, Velocity='A')
+        rows.append(tuple(values.values()))
+    return rows
+
+
+def test_every_template_translates(connection, registry):
+    for template in registry.templates.values():
+        for statement in translate_tsql(template.text):
+            connection._connection.execute('EXPLAIN ' + statement, [None] * _max_parameter(statement))
+
+
+def test_insert_and_select_project(connection, registry):
+    cursor = connection.cursor()
+    cursor.execute(*registry.get('DEV/insert/insert_into_project.sql').bind(*_project_row(PROJECT)))
+    connection.commit()
+
+    row = cursor.execute(*registry.get('DEV/select/select_all_from_project.sql').bind(PROJECT)).fetchone()
+
+    assert row[0] == PROJECT
+    assert row[6] == datetime(2026, 10, 1)
+    assert row[10] is True and row[18] is False
+
+
+def test_executemany_and_translated_deletes(connection, registry):
+    cursor = connection.cursor()
+    cursor.fast_executemany = True
+    insert_item_master = registry.get('DEV/insert/insert_into_item_master.sql').text
+    cursor.executemany(insert_item_master, _item_master_rows(PROJECT, ['1', '2']) + _item_master_rows('AAS24-0002', ['1']))
+
+    insert_order_details = registry.get('DEV/insert/insert_into_order_details.sql')
+    for project_number in [PROJECT, 'AAS24-0002']:
+        row = [f'{project_number}-O1', f'{project_number}-1'] + [None] * (insert_order_details.param_count - 2)
+        cursor.execute(*insert_order_details.bind(*row))
+    connection.commit()
+
+    # DELETE alias FROM ... JOIN
+    cursor.execute(*registry.get('DEV/delete/delete_from_order_details.sql').bind(PROJECT))
+    remaining = cursor.execute('SELECT ProjectNumber_OrderNumber FROM [OutputTables_Dev].[OrderDetails]').fetchall()
+    assert remaining == [('AAS24-0002-O1',)]
+
+    # Batch of "like CONCAT(?, '%')" deletes
+    batch = registry.get('DEV/delete/delete_from_tables_by_project_number.sql')
+    cursor.execute(*batch.bind(*[PROJECT] * batch.param_count))
+    cursor.execute(*registry.get('DEV/delete/delete_from_item_master.sql').bind(PROJECT))
+    connection.commit()
+
+    assert cursor.execute('SELECT COUNT(*) FROM OutputTables_Dev.ItemMaster').fetchone()[0] == 1
+
+
+def test_report_with_declares(connection, registry):
+    cursor = connection.cursor()
+    cursor.executemany(registry.get('DEV/insert/insert_into_item_master.sql').text, _item_master_rows(PROJECT, ['1', '2']))
+    cursor.executemany('INSERT INTO OutputTables_Dev.InventoryData (ProjectNumber_SKU, Period, UnitOfMeasure, Quantity) VALUES (?, ?, ?, ?)',
+                       [(f'{PROJECT}-1', date(2026, 1, 1), 'Each', 4), (f'{PROJECT}-1', date(2026, 2, 1), 'Each', 6),
+                        (f'{PROJECT}-2', date(2026, 1, 1), 'Each', 1)])
+    connection.commit()
+
+    cursor.execute(*registry.get('DEV/select/reports/inventory_stratification.sql').bind(PROJECT, 'Each'))
+    columns = [col[0] for col in cursor.description]
+    report = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    # SKU 1 averages 5 per period, SKU 2 averages 1
+    assert dict(zip(report['Range'], report['SKUs'])) == {'3-5': 1, '1': 1}
+    assert cursor.nextset() is False
+
+
+@pytest.mark.parametrize('start_date', ['', '2026-10-01'])
+def test_project_info_round_trip(tmp_path, monkeypatch, start_date):
+    from data_profiler.services.output_tables_service import OutputTablesService, clear_project_metadata_cache
+
+    monkeypatch.setenv(DB_BACKEND_ENV_VAR, LOCAL_DB_BACKEND)
+    monkeypatch.setenv(LOCAL_DB_DIR_ENV_VAR, str(tmp_path))
+    clear_project_metadata_cache()
+
+    project_info = BaseProjectInfo(project_number=PROJECT, company_name='Company', salesperson='Sales', company_location='Location',
+                                   project_name='Name', email='a@b.com', start_date=start_date, notes='')
+
+    with OutputTablesService(dev=True) as service:
+        assert service.insert_new_project_to_project_table(project_info) == 1
+        info = service.get_project_info(PROJECT)
+
+    # An empty start date comes back empty, the same as the server
+    assert info.start_date == start_date
+    assert info.upload_date == ''
+    clear_project_metadata_cache()
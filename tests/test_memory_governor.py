@@ -0,0 +1,79 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the memory governor's file estimates and the mode it picks for a given budget
+'''
+
+import pytest
+
+from data_profiler.helpers.memory_governor import MemoryGovernor, estimate_file_memory, available_memory_mb, _meminfo_available_mb
+from data_profiler.helpers.models.DataFiles import UploadFileType
+from data_profiler.helpers.models.Memory import ExecutionMode
+
+
+ROWS = 20000
+
+
+@pytest.fixture
+def item_master_file(tmp_path) -> str:
+    path = tmp_path / 'ItemMaster.csv'
+    with open(path, 'w') as f:
+        f.write('SKU,Description,UnitOfMeasure,Quantity\n')
+        for i in range(ROWS):
+            f.write(f'SKU{i:06d},Item number {i},Each,{i % 12}\n')
+    return str(path)
+
+
+def test_file_estimate_scales_sample_to_file_size(item_master_file):
+    estimate = estimate_file_memory(UploadFileType.ITEM_MASTER, item_master_file)
+
+    # The whole file is inside the sample here, so the row count is exact
+    assert estimate.rows == ROWS
+    assert estimate.memory_mb > estimate.file_size_mb
+
+
+def test_modes_follow_budget(item_master_file):
+    files = [(UploadFileType.ITEM_MASTER, item_master_file)]
+    estimate = MemoryGovernor(budget_mb=10**6).estimate(files)
+
+    assert estimate.chunked_peak_mb < estimate.in_memory_peak_mb
+    assert estimate.mode == ExecutionMode.IN_MEMORY
+
+    budget_between = (estimate.chunked_peak_mb + estimate.in_memory_peak_mb) / 2
+    assert MemoryGovernor(budget_mb=budget_between).estimate(files).mode == ExecutionMode.CHUNKED
+
+    too_small = MemoryGovernor(budget_mb=estimate.chunked_peak_mb / 2).estimate(files)
+    assert too_small.mode is None
+    assert too_small.message.startswith('Not enough memory')
+
+
+def test_budget_from_env_var(monkeypatch):
+    monkeypatch.setenv('DATA_PROFILER_MEMORY_BUDGET_MB', '512')
+    assert MemoryGovernor().budget_mb == 512
+
+
+def test_available_memory():
+    available = available_memory_mb()
+    assert available is None or available > 0
+
+
+def test_meminfo_available_counts_reclaimable_memory(tmp_path):
+    meminfo = tmp_path / 'meminfo'
+    meminfo.write_text('MemTotal:       16384000 kB\nMemFree:          512000 kB\nMemAvailable:    8192000 kB\nCached:          7000000 kB\n')
+    assert _meminfo_available_mb(str(meminfo)) == 8000
+
+    # No MemAvailable (or no /proc) - unknown, so the governor doesn't limit the upload
+    meminfo.write_text('MemTotal:       16384000 kB\nMemFree:          512000 kB\n')
+    assert _meminfo_available_mb(str(meminfo)) is None
+    assert _meminfo_available_mb(str(tmp_path / 'missing')) is None
+
+
+def test_unknown_available_memory_never_refuses(item_master_file, monkeypatch):
+    monkeypatch.delenv('DATA_PROFILER_MEMORY_BUDGET_MB', raising=False)
+    monkeypatch.setattr('data_profiler.helpers.memory_governor.available_memory_mb', lambda: None)
+
+    governor = MemoryGovernor()
+    assert governor.budget_mb is None
+    assert governor.estimate([(UploadFileType.ITEM_MASTER, item_master_file)]).mode == ExecutionMode.IN_MEMORY
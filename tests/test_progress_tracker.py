@@ -0,0 +1,81 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the progress tracker's stage-weighted percent complete, ETA and thread safety
+'''
+
+import threading
+
+import pytest
+
+from data_profiler.helpers.models.Progress import ProgressStage, ProgressEvent, ProgressSnapshot
+from data_profiler.helpers.progress_tracker import ProgressTracker, format_progress, DOWNLOAD_STAGE_WEIGHTS, UPLOAD_STAGE_WEIGHTS
+
+
+def test_percent_is_weighted_by_stage():
+    snapshots = []
+    tracker = ProgressTracker(on_update=snapshots.append, stage_weights=UPLOAD_STAGE_WEIGHTS)
+
+    tracker.update('Validating file uploads...')
+    assert snapshots[-1].percent is None
+
+    tracker.update(ProgressEvent(stage=ProgressStage.READ, table='ItemMaster', unit='bytes', rows_total=100))
+    tracker.update(ProgressEvent(stage=ProgressStage.READ, table='OrderDetails', unit='bytes', rows_total=300))
+    tracker.update(ProgressEvent(stage=ProgressStage.READ, table='ItemMaster', unit='bytes', rows_done=100, rows_total=100))
+    assert snapshots[-1].percent == pytest.approx(0.15 * 0.25)
+
+    # Starting the insert stage counts reading + transforming as done
+    tracker.plan(ProgressStage.INSERT, 'ItemMaster', rows_total=1000)
+    tracker.plan(ProgressStage.INSERT, 'OrderDetails', rows_total=3000)
+    tracker.update(ProgressEvent(stage=ProgressStage.INSERT, table='OrderDetails', rows_done=2000, rows_total=3000, rate=500))
+
+    snapshot = snapshots[-1]
+    assert snapshot.percent == pytest.approx(0.30 + 0.70 * 0.5)
+    assert snapshot.eta_seconds is not None
+    assert snapshot.rate == 500
+    assert 'OrderDetails (2,000 / 3,000 rows)' in snapshot.message
+
+
+def test_unknown_total_has_no_percent():
+    snapshots = []
+    tracker = ProgressTracker(on_update=snapshots.append, stage_weights=DOWNLOAD_STAGE_WEIGHTS)
+
+    # A single download only reports rows fetched so far
+    for rows_done in [10000, 20000, 30000]:
+        tracker.update(ProgressEvent(stage=ProgressStage.DOWNLOAD, table='ItemMaster', rows_done=rows_done))
+    assert [snapshot.percent for snapshot in snapshots] == [None, None, None]
+    assert snapshots[-1].eta_seconds is None
+    assert 'ItemMaster (30,000 rows)' in snapshots[-1].message
+
+    # Later stages with no total yet still credit the stages before them
+    tracker = ProgressTracker(stage_weights=UPLOAD_STAGE_WEIGHTS)
+    tracker.update(ProgressEvent(stage=ProgressStage.TRANSFORM, table='OrderDetails'))
+    assert tracker.snapshot().percent == pytest.approx(0.15)
+
+
+def test_parallel_reports_are_all_counted():
+    tracker = ProgressTracker()
+    tables = [f'Report {i}' for i in range(8)]
+    for table in tables:
+        tracker.plan(ProgressStage.DOWNLOAD, table, rows_total=1, unit='reports')
+
+    def finish(table):
+        for _ in range(200):
+            tracker.update(ProgressEvent(stage=ProgressStage.DOWNLOAD, table=table, unit='reports', rows_done=1, rows_total=1))
+
+    threads = [threading.Thread(target=finish, args=(table,)) for table in tables]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracker.snapshot().percent == 1
+
+
+def test_format_progress():
+    assert format_progress('Loading...') == 'Loading...'
+
+    text = format_progress(ProgressSnapshot(message='Uploading OrderDetails...', percent=0.5, rate=1234.4, eta_seconds=75))
+    assert text == 'Uploading OrderDetails...\n\n50%  |  1,234 rows/sec  |  about 1:15 left'
@@ -0,0 +1,56 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the run log renders the same text log as before and a JSON-lines record per line, with DEBUG kept out of the text
+'''
+
+import json
+import logging
+
+import pytest
+
+from data_profiler.helpers.instrumentation import RunInstrumentation, span
+from data_profiler.helpers.run_log import RunLogFile
+
+
+def _records(path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_text_and_jsonl_logs(tmp_path):
+    log_path = tmp_path / 'AAS24-0001_transform.txt'
+
+    with RunInstrumentation(name='transform'), RunLogFile(str(log_path), flush_interval=60) as log_file:
+        log_file.write('PROJECT NUMBER: AAS24-0001\n\n')
+        with span('insert ItemMaster'):
+            log_file.write('Deleting from ItemMaster - ')
+            log_file.write('rows deleted: 5\n')
+            log_file.info('Inserted batch', table='ItemMaster', rows=5)
+            log_file.debug('first row', row=['A', 1])
+        log_file.flush()
+
+    assert log_path.read_text() == 'PROJECT NUMBER: AAS24-0001\n\nDeleting from ItemMaster - rows deleted: 5\nInserted batch\n'
+
+    records = _records(tmp_path / 'AAS24-0001_transform.jsonl')
+    assert [r['message'] for r in records] == ['PROJECT NUMBER: AAS24-0001', 'Deleting from ItemMaster - rows deleted: 5', 'Inserted batch', 'first row']
+    assert records[0]['span'] is None
+    assert records[2] == {**records[2], 'level': 'INFO', 'span': 'insert ItemMaster', 'fields': {'table': 'ItemMaster', 'rows': 5}}
+    assert records[3]['level'] == 'DEBUG'
+
+
+def test_close_is_idempotent_and_final(tmp_path):
+    log_file = RunLogFile(str(tmp_path / 'run.txt'), text_level=logging.DEBUG)
+    log_file.debug('shown')
+    log_file.write('no newline at the end')
+    log_file.close()
+    log_file.close()
+
+    assert log_file.closed
+    assert (tmp_path / 'run.txt').read_text() == 'shown\nno newline at the end'
+    assert _records(tmp_path / 'run.jsonl')[-1]['message'] == 'no newline at the end'
+
+    with pytest.raises(ValueError):
+        log_file.write('too late')
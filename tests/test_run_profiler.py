@@ -0,0 +1,34 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks a profiled run saves its profile, and that a disabled profiler doesn't start or write anything
+'''
+
+import os
+import sys
+
+from data_profiler.helpers.run_profiler import RunProfiler
+
+
+def _work() -> int:
+    return sum(i * i for i in range(200_000))
+
+
+def test_profile_saved(tmp_path):
+    with RunProfiler(str(tmp_path / 'AAS24-0001_transform')) as profiler:
+        _work()
+
+    assert profiler.output_path.startswith(str(tmp_path / 'AAS24-0001_transform_profile'))
+    assert os.path.getsize(profiler.output_path) > 0
+
+
+def test_disabled_profiler_does_nothing(tmp_path):
+    with RunProfiler(None) as profiler:
+        assert sys.getprofile() is None
+        _work()
+
+    assert not profiler.enabled
+    assert profiler.output_path is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,63 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the SQL templates load, validate, and bind their parameters
+'''
+
+import os
+
+import pytest
+
+from data_profiler.database.sql_registry import SqlRegistry, SqlTemplate, count_sql_parameters, load_sql_registry
+from data_profiler.database.helpers.constants import SQL_FILE_DOWNLOAD_ITEMS_MATERIAL_FLOW_REPORT, DEV_SQL_FILE_DOWNLOAD_INVENTORY_STRATIFICATION_REPORT
+
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources', 'sql')
+
+
+def test_count_sql_parameters_ignores_comments_strings_and_identifiers():
+    query = '''
+        -- what about this?
+        /* or this? */
+        SELECT [Weird?Column], 'literal ?' FROM t WHERE a = ? AND b = ?
+    '''
+    assert count_sql_parameters(query) == 2
+
+
+def test_registry_loads_and_validates():
+    registry = load_sql_registry(SQL_DIR)
+
+    assert registry.validate() == []
+    assert SQL_FILE_DOWNLOAD_ITEMS_MATERIAL_FLOW_REPORT in registry
+    assert load_sql_registry(SQL_DIR) is registry
+
+
+def test_report_headers_are_parameterized():
+    registry = SqlRegistry(SQL_DIR)
+    template = registry.get(DEV_SQL_FILE_DOWNLOAD_INVENTORY_STRATIFICATION_REPORT)
+
+    query, params = template.bind('12345', 'Each')
+    assert params == ('12345', 'Each')
+    assert '12345' not in query
+
+    with pytest.raises(ValueError):
+        template.bind('12345')
+
+
+def test_validate_flags_cross_environment_schema(tmp_path):
+    (tmp_path / 'DEV').mkdir()
+    (tmp_path / 'DEV' / 'bad.sql').write_text('SELECT * FROM OutputTables_Prod.Project WHERE ProjectNumber = ?')
+
+    registry = SqlRegistry(str(tmp_path))
+    assert any('DEV/bad.sql references OutputTables_Prod' in problem for problem in registry.validate())
+    assert isinstance(registry.get('DEV/bad.sql'), SqlTemplate)
+
+
+def test_name_for_finds_template_by_text():
+    registry = SqlRegistry(SQL_DIR)
+    template = registry.get(DEV_SQL_FILE_DOWNLOAD_INVENTORY_STRATIFICATION_REPORT)
+
+    assert registry.name_for(template.text) == DEV_SQL_FILE_DOWNLOAD_INVENTORY_STRATIFICATION_REPORT
+    assert registry.name_for('SELECT 1') is None
@@ -0,0 +1,71 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the streaming describer against the in-memory describe table
+'''
+
+import numpy as np
+import pandas as pd
+
+from data_profiler.helpers.streaming_describer import describe_file_streaming, QuantileSketch, AdaptiveHistogram, DistinctCounter
+
+
+def test_quantile_sketch_rank_error_is_small():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 1, 200000)
+
+    sketch = QuantileSketch(k=2000)
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+
+    for q, estimate in zip([0.25, 0.5, 0.75], sketch.quantiles([0.25, 0.5, 0.75])):
+        assert abs((values < estimate).mean() - q) < 0.005
+
+
+def test_adaptive_histogram_keeps_every_value():
+    histogram = AdaptiveHistogram(n_bins=64)
+    histogram.update(np.arange(10, 20, dtype=float))
+    histogram.update(np.array([-500.0, 1000.0]))
+
+    assert histogram.counts.sum() == 12
+    assert histogram.count_below(-400) == 1
+    assert histogram.count_above(900) == 1
+
+
+def test_distinct_counter_exact_when_small():
+    counter = DistinctCounter(k=100)
+    counter.update(pd.Series(['a', 'b', 'a', None]))
+    counter.update(pd.Series(['c', 'b']))
+
+    assert counter.estimate() == 3
+
+
+def test_streaming_matches_in_memory_on_small_file(tmp_path):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'Quantity': rng.integers(-5, 100, 1000).astype(float),
+        'SKU': [f'SKU{i % 37}' for i in range(1000)],
+        'Channel': rng.choice(['Retail', 'Ecom'], 1000),
+    })
+    df.loc[::25, 'Quantity'] = np.nan
+    file_path = tmp_path / 'data.csv'
+    df.to_csv(file_path, index=False)
+
+    description = describe_file_streaming(str(file_path), columns=df.columns.tolist(), group_col='Channel', chunk_size=300)
+    expected = df.describe(include='all').transpose()
+
+    df_val = description.df_val
+    assert description.rows == 1000
+    assert description.original is None
+    assert set(description.group_stats['Quantity']) == {'Retail', 'Ecom'}
+
+    for stat in ['count', 'mean', 'std', 'min', 'max', '25%', '50%', '75%']:
+        assert np.isclose(df_val.loc['Quantity', stat], expected.loc['Quantity', stat])
+    for stat in ['count', 'unique', 'top', 'freq']:
+        assert df_val.loc['SKU', stat] == expected.loc['SKU', stat]
+
+    assert df_val.loc['Quantity', 'Negative Values'] == (df['Quantity'] < 0).sum()
+    assert df_val.loc['Quantity', 'Zero Values'] == (df['Quantity'] == 0).sum()
+    assert df_val.loc['Quantity', 'Missing Values'] == df['Quantity'].isna().sum()
@@ -0,0 +1,49 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the synthetic data generator writes directories DataDirectory accepts, and is repeatable per seed
+'''
+
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from data_profiler.helpers.constants.data_file_constants import FILE_TYPES_COLUMNS_MAPPER
+from data_profiler.helpers.data_directory import DataDirectory
+from data_profiler.helpers.models.DataFiles import DataDirectoryType
+from data_profiler.helpers.models.TransformOptions import TransformOptions
+
+from tests.synthetic_data import SyntheticDataSpec, write_data_directory
+
+
+SMALL_SPEC = SyntheticDataSpec(skus=200, orders=500, lines_per_order=3, months=3)
+
+
+@pytest.mark.parametrize('directory_type', [DataDirectoryType.REGULAR, DataDirectoryType.HEADERS])
+def test_directory_passes_validation(tmp_path, directory_type):
+    path = write_data_directory(str(tmp_path), SMALL_SPEC, directory_type=directory_type, chunk_lines=400)
+
+    for file_name in os.listdir(path):
+        file_type = file_name.removesuffix('.csv')
+        assert pd.read_csv(f'{path}/{file_name}', nrows=0).columns.tolist() == FILE_TYPES_COLUMNS_MAPPER[file_type]
+
+    data_directory = DataDirectory(path=path, transform_options=TransformOptions(data_directory_type=directory_type))
+    assert data_directory.validate_directory().is_valid
+
+    is_valid, message = data_directory.read_and_validate_file_contents(log_file=io.StringIO())
+    assert is_valid, message
+    assert data_directory.order_header['OrderNumber'].nunique() == SMALL_SPEC.orders
+    assert set(data_directory.order_details['UnitOfMeasure']) <= set(SMALL_SPEC.uom_mix)
+
+
+def test_same_seed_same_files(tmp_path):
+    first = write_data_directory(str(tmp_path / 'first'), SMALL_SPEC, directory_type=DataDirectoryType.HEADERS, chunk_lines=400)
+    second = write_data_directory(str(tmp_path / 'second'), SMALL_SPEC, directory_type=DataDirectoryType.HEADERS, chunk_lines=400)
+
+    for file_name in os.listdir(first):
+        with open(f'{first}/{file_name}') as a, open(f'{second}/{file_name}') as b:
+            assert a.read() == b.read(), file_name
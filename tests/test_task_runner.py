@@ -0,0 +1,74 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the background task runner marshals progress/results/errors back through the polling loop
+'''
+
+import threading
+import time
+
+from data_profiler.helpers.task_runner import BackgroundTaskRunner
+
+
+class FakeWidget():
+    ''' Stands in for Tk - after() callbacks are queued and run by drain() on the calling (main) thread '''
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, func):
+        self.pending.append(func)
+
+    def drain(self, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            self.pending.pop(0)()
+            time.sleep(0.001)
+
+
+def test_progress_and_result_arrive_on_main_thread():
+    widget = FakeWidget()
+    runner = BackgroundTaskRunner(widget)
+    progress, results, threads = [], [], []
+
+    def task(report_progress):
+        report_progress('step 1')
+        report_progress('step 2')
+        return 42
+
+    def on_progress(text):
+        progress.append(text)
+        threads.append(threading.current_thread())
+
+    def on_complete(result):
+        results.append(result)
+        threads.append(threading.current_thread())
+
+    assert runner.run(task, on_complete=on_complete, on_progress=on_progress)
+    widget.drain()
+
+    assert progress == ['step 1', 'step 2']
+    assert results == [42]
+    assert all(thread is threading.main_thread() for thread in threads)
+    assert not runner.is_busy()
+
+
+def test_error_is_passed_to_on_error_and_busy_runner_rejects():
+    widget = FakeWidget()
+    runner = BackgroundTaskRunner(widget)
+    release = threading.Event()
+    errors = []
+
+    def task(report_progress):
+        release.wait(5)
+        raise ValueError('bad file')
+
+    assert runner.run(task, on_complete=lambda result: None, on_error=errors.append)
+    assert not runner.run(task, on_complete=lambda result: None)
+
+    release.set()
+    widget.drain()
+
+    assert len(errors) == 1 and str(errors[0]) == 'bad file'
@@ -0,0 +1,52 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks the metadata cache serves entries until they expire and only loads once while they're live
+'''
+
+from data_profiler.helpers.ttl_cache import TTLCache
+
+
+class FakeClock():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, clock=clock)
+    loads = []
+
+    def load():
+        loads.append(clock.now)
+        return ['AAS24-0001']
+
+    assert cache.get_or_load('projects', load) == ['AAS24-0001']
+    clock.now = 9.9
+    assert cache.get_or_load('projects', load) == ['AAS24-0001']
+    assert loads == [0.0]
+
+    clock.now = 10
+    assert cache.get('projects') is None
+    cache.get_or_load('projects', load)
+    assert loads == [0.0, 10]
+
+
+def test_set_and_invalidate_write_through():
+    cache = TTLCache(ttl_seconds=10, clock=FakeClock())
+
+    cache.set(('info', 'A'), 1)
+    cache.set(('info', 'B'), 2)
+    cache.invalidate(('info', 'A'))
+    cache.invalidate(('info', 'missing'))
+
+    assert cache.get(('info', 'A'), 'gone') == 'gone'
+    assert cache.get(('info', 'B')) == 2
+
+    cache.clear()
+    assert cache.get(('info', 'B')) is None
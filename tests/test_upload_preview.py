@@ -0,0 +1,93 @@
+'''
+Jack Miller
+Apex Companies
+Oct 2026
+
+Checks upload preview sampling - the sample is a valid data directory with whole orders, and row estimates land near the full files
+'''
+
+import io
+import os
+import random
+
+import pytest
+
+from data_profiler.helpers.data_directory import DataDirectory
+from data_profiler.helpers.models.DataFiles import DataDirectoryType, UploadFileType
+from data_profiler.helpers.models.TransformOptions import TransformOptions
+from data_profiler.helpers.upload_preview import PreviewSampler, _normalize_key
+
+from tests.synthetic_data import SyntheticDataSpec, write_data_directory
+
+
+SPEC = SyntheticDataSpec(skus=300, orders=4000, lines_per_order=3, months=6)
+
+# Small enough that the details + header files are sampled in blocks/windows, not read whole
+SAMPLE_BYTES = 32 * 1024
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory) -> str:
+    return write_data_directory(str(tmp_path_factory.mktemp('preview_data')), SPEC, directory_type=DataDirectoryType.HEADERS)
+
+
+def _sample(data_dir: str, sample_dir: str) -> tuple[PreviewSampler, DataDirectory]:
+    transform_options = TransformOptions(data_directory_type=DataDirectoryType.HEADERS)
+
+    data_directory = DataDirectory(path=data_dir, transform_options=transform_options)
+    assert data_directory.validate_directory().is_valid
+
+    sampler = PreviewSampler(data_directory, sample_bytes=SAMPLE_BYTES, blocks=8)
+    sampler.write(sample_dir)
+
+    sample_directory = DataDirectory(path=sample_dir, transform_options=transform_options)
+    assert sample_directory.validate_directory().is_valid
+    is_valid, message = sample_directory.read_and_validate_file_contents(log_file=io.StringIO())
+    assert is_valid, message
+
+    return sampler, sample_directory
+
+
+def test_sample_has_whole_orders_and_estimates(data_dir, tmp_path):
+    sampler, sample_directory = _sample(data_dir, str(tmp_path))
+
+    assert 0 < sampler.sample_fraction < 0.5
+    assert sampler.warnings == []
+
+    # Every sampled order has its header, and all of its lines
+    full = DataDirectory(path=data_dir, transform_options=TransformOptions(data_directory_type=DataDirectoryType.HEADERS))
+    full.validate_directory()
+    full.read_and_validate_file_contents(log_file=io.StringIO())
+
+    sampled_orders = set(sample_directory.order_details['OrderNumber'])
+    assert sampled_orders == set(sample_directory.order_header['OrderNumber'])
+    full_lines = full.order_details[full.order_details['OrderNumber'].isin(sampled_orders)]
+    assert len(full_lines) == len(sample_directory.order_details)
+
+    for file_type, df in [(UploadFileType.ORDER_DETAILS, full.order_details), (UploadFileType.ORDER_HEADER, full.order_header),
+                          (UploadFileType.INVENTORY, full.inventory)]:
+        assert sampler.files[file_type].estimated_rows == pytest.approx(len(df), rel=0.1)
+
+
+def test_unsorted_header_is_scanned(data_dir, tmp_path):
+    shuffled_dir = tmp_path / 'shuffled'
+    shuffled_dir.mkdir()
+    for file_name in os.listdir(data_dir):
+        with open(f'{data_dir}/{file_name}', 'rb') as f:
+            header, *lines = f.readlines()
+        if file_name == f'{UploadFileType.ORDER_HEADER.value}.csv':
+            random.Random(0).shuffle(lines)
+        with open(shuffled_dir / file_name, 'wb') as f:
+            f.writelines([header] + lines)
+
+    sampler, sample_directory = _sample(str(shuffled_dir), str(tmp_path / 'sample'))
+
+    assert any(UploadFileType.ORDER_HEADER.value in warning for warning in sampler.warnings)
+    assert set(sample_directory.order_details['OrderNumber']) <= set(sample_directory.order_header['OrderNumber'])
+    assert sampler.files[UploadFileType.ORDER_HEADER].estimated_rows == SPEC.orders
+
+
+def test_normalize_key():
+    assert _normalize_key(b' "00123" ') == b'123'
+    assert _normalize_key(b'000') == b'0'
+    assert _normalize_key(b'SO-001') == b'SO-001'